@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark de pull de imagens antes/depois do perfil `--tuned` do Docker.
+
+Remove as imagens listadas, mede o tempo de pull de cada uma pela Engine
+API e grava o resultado com um rótulo. Quando existem resultados "before"
+e "after", mostra a comparação.
+
+Uso (requer Docker rodando e acesso ao socket):
+    python3 benchmarks/docker_pull.py --label before
+    python3 main.py docker tune
+    python3 benchmarks/docker_pull.py --label after
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.system.docker_daemon_config import DaemonConfig  # noqa: E402
+from src.system.docker_engine import DockerEngineClient, DockerEngineError  # noqa: E402
+
+
+DEFAULT_IMAGES = ["python:3.12-slim", "postgres:16", "nginx:1.25", "node:20-slim"]
+RESULTS_PATH = Path("bench_docker_pull.json")
+
+
+def measure(client: DockerEngineClient, images, rounds: int):
+    """Retorna {imagem: [segundos por rodada]} com cache frio em cada rodada."""
+    timings = {image: [] for image in images}
+    for round_number in range(1, rounds + 1):
+        for image in images:
+            client.remove_image(image)
+            start = time.monotonic()
+            client.pull_image(image)
+            elapsed = time.monotonic() - start
+            timings[image].append(elapsed)
+            print(f"  rodada {round_number}: {image:<22} {elapsed:6.2f}s")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--label", required=True, help="Rótulo da medição (ex: before, after)")
+    parser.add_argument("--images", nargs="+", default=DEFAULT_IMAGES, help="Imagens a medir")
+    parser.add_argument("--rounds", type=int, default=3, help="Rodadas por imagem")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="Arquivo de resultados (JSON)")
+    args = parser.parse_args()
+
+    client = DockerEngineClient()
+    status = client.ping()
+    if not status.ok:
+        sys.exit(f"Docker indisponível: {status.error}")
+
+    try:
+        config = DaemonConfig().load()
+    except (OSError, ValueError):
+        config = {}
+    print(f"Docker {status.version} — max-concurrent-downloads="
+          f"{config.get('max-concurrent-downloads', 3)}, registry-mirrors={config.get('registry-mirrors', [])}")
+
+    try:
+        timings = measure(client, args.images, args.rounds)
+    except DockerEngineError as e:
+        sys.exit(f"Falha no pull: {e}")
+
+    results = json.loads(args.output.read_text()) if args.output.exists() else {}
+    results[args.label] = {image: statistics.median(values) for image, values in timings.items()}
+    args.output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    print()
+    print(f"Mediana ({args.label}): {sum(results[args.label].values()):.2f}s no total")
+    if "before" in results and "after" in results:
+        print()
+        print(f"{'imagem':<22} {'before':>8} {'after':>8} {'ganho':>7}")
+        for image in sorted(set(results["before"]) & set(results["after"])):
+            before, after = results["before"][image], results["after"][image]
+            print(f"{image:<22} {before:7.2f}s {after:7.2f}s {before / after:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark da escolha de mirrors contra servidores locais com atrasos simulados.
+
+Sobe alguns servidores HTTP locais (cada um com latência e vazão próprias,
+além de um candidato fora do ar) e compara:
+
+- a medição paralela do `MirrorSelector` com a medição sequencial;
+- o mirror escolhido com o mais rápido esperado;
+- a consulta ao ranking em cache.
+
+Uso:
+    python3 benchmarks/mirror_selection.py [--rounds 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.network.mirror_selection import MirrorGroup, MirrorSelector, PROBE_BYTES, probe_mirror  # noqa: E402
+
+
+# (nome, atraso da resposta em segundos, vazão em bytes/s)
+STAND_INS = [
+    ("lento", 0.250, 256 * 1024),
+    ("medio", 0.080, 1024 * 1024),
+    ("rapido", 0.010, 8 * 1024 * 1024),
+    ("vazao-baixa", 0.010, 64 * 1024),
+]
+
+
+def make_handler(delay: float, rate: int):
+    """Cria um handler que responde com atraso e vazão limitada."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(206)
+            self.send_header("Content-Length", str(PROBE_BYTES))
+            self.end_headers()
+            chunk = b"x" * 8192
+            for _ in range(PROBE_BYTES // len(chunk)):
+                self.wfile.write(chunk)
+                time.sleep(len(chunk) / rate)
+
+    return Handler
+
+
+def start_stand_ins():
+    """Sobe os servidores e retorna (servidores, candidatos)."""
+    servers, candidates = [], []
+    for name, delay, rate in STAND_INS:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(delay, rate))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        candidates.append((name, f"http://127.0.0.1:{server.server_address[1]}/{name}"))
+
+    # Candidato fora do ar (porta sem servidor)
+    probe = ThreadingHTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    dead_port = probe.server_address[1]
+    probe.server_close()
+    candidates.append(("fora-do-ar", f"http://127.0.0.1:{dead_port}/fora"))
+    return servers, candidates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="Repetições de cada medição")
+    args = parser.parse_args()
+
+    servers, candidates = start_stand_ins()
+    names = {url: name for name, url in candidates}
+    group = MirrorGroup("bench", [url for _, url in candidates], "/probe")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ranking_path = Path(tmp) / "ranking.json"
+
+        sequential, parallel, chosen = [], [], set()
+        for _ in range(args.rounds):
+            start = time.monotonic()
+            for url in group.candidates:
+                probe_mirror(url, group.probe_path, timeout=2.0)
+            sequential.append(time.monotonic() - start)
+
+            selector = MirrorSelector({"bench": group}, path=ranking_path, timeout=2.0)
+            start = time.monotonic()
+            selector.rank(refresh=True)
+            parallel.append(time.monotonic() - start)
+            chosen.add(names[selector.best("bench")])
+
+        selector = MirrorSelector({"bench": group}, path=ranking_path, timeout=2.0)
+        start = time.monotonic()
+        for _ in range(1000):
+            selector.best("bench")
+        cached = (time.monotonic() - start) / 1000
+
+        ranking = selector.rank()["bench"]
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+    print(f"Candidatos: {len(candidates)} ({len(STAND_INS)} servidores locais + 1 fora do ar)")
+    print(f"Medição sequencial: {min(sequential):.3f}s (melhor de {args.rounds})")
+    print(f"Medição paralela:   {min(parallel):.3f}s (melhor de {args.rounds})")
+    print(f"Ganho:              {min(sequential) / min(parallel):.1f}x")
+    print(f"Ranking em cache:   {cached * 1e6:.1f}µs por consulta")
+    print(f"Escolhido:          {', '.join(sorted(chosen))} (esperado: rapido)")
+    print()
+    for position, result in enumerate(ranking, 1):
+        detail = (f"{result.score * 1000:7.1f} ms  {result.throughput / 1024:8.0f} KB/s"
+                  if result.healthy else f"falhou: {result.error}")
+        print(f"  {position}. {names[result.url]:<12} {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,27 @@
 
 import typer
 from rich import print
-from typing import Optional
+from typing import List, Optional
+from pathlib import Path
 
-from src.commands.install_commands import install_docker, uninstall_docker, check_docker_status, system_info, install_terraform, install_azure_cli, install_aws_cli
+from src.commands.install_commands import install_docker, uninstall_docker, check_docker_status, system_info, install_terraform, install_azure_cli, install_aws_cli, install_kubectl, install_ansible
 from src.commands.environment_commands import setup_environment, environment_status
+from src.commands.plan_commands import show_plan
+from src.commands.apply_commands import apply_desired_state
+from src.commands.fleet_commands import fleet_apply, fleet_status, fleet_query
+from src.commands.cache_commands import run_cache_server
+from src.commands.mirror_commands import show_mirrors
+from src.commands.terraform_commands import configure_terraform
+from src.commands.git_commands import configure_git
+from src.commands.toolchain_commands import use_tool, list_tool_versions, gc_tools
+from src.commands.docker_commands import tune_docker, prefetch_images, registry_mirror_up, registry_mirror_use, registry_mirror_down
+from src.network.cache_server import DEFAULT_BIND, DEFAULT_PORT
+from src.system.image_prefetch import DEFAULT_PARALLEL
+from src.system.registry_mirror import DEFAULT_REGISTRY_PORT, DEFAULT_UPSTREAM
+from src.network.mirrors import configure_mirror
+from src.config.profile import load_profile
+from src.config.toml_support import ConfigFileError
+from src.system.prompt_policy import configure_prompt_policy
 
 # --- Configuração da Aplicação ---
 app = typer.Typer(
@@ -25,7 +42,10 @@ def main(
         is_eager=True,
         help="Mostra esta mensagem de ajuda e sai.",
         show_default=False
-    )
+    ),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Responder 'sim' a todas as perguntas"),
+    profile: Optional[Path] = typer.Option(None, "--profile", "-p", help="Perfil TOML com as respostas (execução sem interação)"),
+    mirror: Optional[str] = typer.Option(None, "--mirror", help="Servidor de cache local (ex: http://10.0.0.5:3142)")
 ):
     """
     Callback principal para gerenciar opções globais como --help.
@@ -35,6 +55,22 @@ def main(
         typer.echo(ctx.get_help())
         raise typer.Exit()
     
+    # Resolver todas as perguntas antes de executar o comando
+    loaded_profile = None
+    if profile:
+        try:
+            loaded_profile = load_profile(profile)
+        except ConfigFileError as e:
+            print(f":x: [red]{e}[/red]")
+            raise typer.Exit(1)
+    configure_prompt_policy(assume_yes=yes, profile=loaded_profile)
+    
+    try:
+        configure_mirror(mirror)
+    except ValueError as e:
+        print(f":x: [red]{e}[/red]")
+        raise typer.Exit(1)
+    
     if ctx.invoked_subcommand is None:
         print("[bold yellow]Nenhum comando especificado. Use --help para ver as opções.[/bold yellow]")
         typer.echo(ctx.get_help())
@@ -44,6 +80,18 @@ def main(
 install_app = typer.Typer(help="Instala ferramentas necessárias (Docker, etc).")
 app.add_typer(install_app, name="install")
 
+fleet_app = typer.Typer(help="Configura e verifica vários hosts via SSH.")
+app.add_typer(fleet_app, name="fleet")
+
+docker_app = typer.Typer(help="Configura o Docker já instalado (daemon, cache, imagens).")
+app.add_typer(docker_app, name="docker")
+terraform_app = typer.Typer(help="Configura o Terraform já instalado (cache de providers, versões).")
+app.add_typer(terraform_app, name="terraform")
+git_app = typer.Typer(help="Configura o Git já instalado (identidade, desempenho, manutenção).")
+app.add_typer(git_app, name="git")
+docker_mirror_app = typer.Typer(help="Mirror de registry (pull-through cache) para o laboratório.")
+docker_app.add_typer(docker_mirror_app, name="mirror")
+
 # --- Comandos da CLI ---
 
 
@@ -54,43 +102,85 @@ def install_docker_command(
     check_only: bool = typer.Option(False, "--check-only", help="Apenas verificar se o Docker está instalado"),
     force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação mesmo se já estiver instalado"),
     manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual"),
-    no_test: bool = typer.Option(False, "--no-test", help="Não testar a instalação após completar")
+    no_test: bool = typer.Option(False, "--no-test", help="Não testar a instalação após completar"),
+    deep: bool = typer.Option(False, "--deep", help="Testar também executando um container"),
+    tuned: bool = typer.Option(False, "--tuned", help="Aplicar o perfil de desempenho no daemon.json"),
+    registry_mirrors: Optional[List[str]] = typer.Option(None, "--registry-mirror", help="Mirror de registry (pode repetir)")
 ):
     """Instala o Docker automaticamente baseado no sistema operacional."""
-    install_docker(check_only, force, manual, no_test)
+    install_docker(check_only, force, manual, no_test, deep, tuned, registry_mirrors)
 
 
 @install_app.command("azure-cli")
 def install_azure_cli_command(
     force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação mesmo se já estiver instalado"),
-    manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual")
+    manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual"),
+    prefix: Optional[Path] = typer.Option(None, "--prefix", help="Instalar no espaço do usuário, sem sudo (ex: ~/.leme)"),
+    venv: Optional[bool] = typer.Option(None, "--venv/--system", help="Virtualenv próprio ou gerenciador de pacotes (padrão: virtualenv se o wheelhouse tiver o azure-cli)"),
+    wheelhouse: Optional[str] = typer.Option(None, "--wheelhouse", help="Diretório ou URL de wheels (padrão: ~/.cache/leme/wheelhouse)"),
+    version: Optional[str] = typer.Option(None, "--version", "-v", help="Versão do azure-cli no virtualenv (ex: 2.61.0)"),
+    extensions: Optional[List[str]] = typer.Option(None, "--extension", "-e", help="Extensão a pré-instalar (pode repetir, ex: -e aks-preview)"),
+    no_warm_up: bool = typer.Option(False, "--no-warm-up", help="Não aquecer o az (índice de comandos, bytecode, prompts)")
 ):
     """Instala o Azure CLI automaticamente baseado no sistema operacional."""
-    install_azure_cli(force, manual)
+    install_azure_cli(force, manual, prefix, venv, wheelhouse, version, extensions, not no_warm_up)
 
 
 @install_app.command("terraform")
 def install_terraform_command(
     force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação mesmo se já estiver instalado"),
-    manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual")
+    manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual"),
+    no_plugin_cache: bool = typer.Option(False, "--no-plugin-cache", help="Não configurar o cache de providers no ~/.terraformrc"),
+    providers: Optional[Path] = typer.Option(None, "--providers", help="Lista de providers a pré-baixar (ex: hashicorp/aws@5.31.0)"),
+    provider_mirror: Optional[Path] = typer.Option(None, "--provider-mirror", help="Mirror de providers (padrão: ~/.terraform.d/providers-mirror)"),
+    prefix: Optional[Path] = typer.Option(None, "--prefix", help="Instalar no espaço do usuário, sem sudo (ex: ~/.leme)")
 ):
     """Instala o Terraform automaticamente baseado no sistema operacional."""
-    install_terraform(force, manual)
+    install_terraform(force, manual, not no_plugin_cache, providers, provider_mirror, prefix)
+
+
+@install_app.command("kubectl")
+def install_kubectl_command(
+    force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação mesmo se já estiver instalado"),
+    manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual"),
+    version: Optional[str] = typer.Option(None, "--version", "-v", help="Versão do kubectl (padrão: a estável atual, ex: 1.29.3)"),
+    prefix: Optional[Path] = typer.Option(None, "--prefix", help="Instalar no espaço do usuário, sem sudo (ex: ~/.leme)")
+):
+    """Instala o kubectl a partir do binário oficial, conferido com o checksum."""
+    install_kubectl(force, manual, version, prefix)
+
+
+@install_app.command("ansible")
+def install_ansible_command(
+    force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação mesmo se já estiver instalado"),
+    manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual"),
+    version: Optional[str] = typer.Option(None, "--version", "-v", help="Versão do pacote ansible (ex: 9.5.1)"),
+    wheelhouse: Optional[str] = typer.Option(None, "--wheelhouse", help="Diretório ou URL de wheels (padrão: ~/.cache/leme/wheelhouse)"),
+    prefix: Optional[Path] = typer.Option(None, "--prefix", help="Instalar no espaço do usuário, sem sudo (ex: ~/.leme)"),
+    tuned: bool = typer.Option(False, "--tuned", help="Aplicar o perfil de desempenho no ansible.cfg (pipelining, forks, ControlPersist, cache de facts)"),
+    config: Optional[Path] = typer.Option(None, "--config", help="ansible.cfg a configurar (padrão: ~/.ansible.cfg ou ANSIBLE_CONFIG)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Apenas mostrar o ansible.cfg resultante")
+):
+    """Instala o Ansible em um virtualenv próprio (sem sudo pip3)."""
+    install_ansible(force, manual, version, wheelhouse, prefix, tuned, config, dry_run)
 
 
 @install_app.command("aws-cli")
 def install_aws_cli_command(
     force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação mesmo se já estiver instalado"),
-    manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual")
+    manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual"),
+    prefix: Optional[Path] = typer.Option(None, "--prefix", help="Instalar no espaço do usuário, sem sudo (ex: ~/.leme)")
 ):
     """Instala o AWS CLI v2 automaticamente baseado no sistema operacional."""
-    install_aws_cli(force, manual)
+    install_aws_cli(force, manual, prefix)
 
 
 @app.command("status")
-def status_command():
+def status_command(
+    deep: bool = typer.Option(False, "--deep", help="Testar também executando um container")
+):
     """Verifica o status das ferramentas instaladas."""
-    check_docker_status()
+    check_docker_status(deep)
 
 
 @app.command("system-info")
@@ -112,11 +202,202 @@ def setup_environment_command(
     skip_docker: bool = typer.Option(False, "--skip-docker", help="Pular instalação do Docker"),
     force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação de ferramentas"),
     interactive: bool = typer.Option(False, "--interactive", "-i", help="Modo interativo (LEGACY - agora é padrão)"),
-    tools: Optional[str] = typer.Option(None, "--tools", "-t", help="Instalar apenas ferramentas específicas (ex: git,docker)")
+    tools: Optional[str] = typer.Option(None, "--tools", "-t", help="Instalar apenas ferramentas específicas (ex: git,docker)"),
+    fresh: bool = typer.Option(False, "--fresh", help="Ignorar etapas já concluídas e refazer tudo"),
+    prefix: Optional[Path] = typer.Option(None, "--prefix", help="Instalar no espaço do usuário, sem sudo (ex: ~/.leme)")
 ):
     """Configura o ambiente DevOps completo para o curso."""
     tools_list = tools.split(',') if tools else None
-    setup_environment(check_only, required_only, skip_docker, force, interactive, tools_list)
+    setup_environment(check_only, required_only, skip_docker, force, interactive, tools_list, fresh, prefix)
+
+
+@app.command("plan")
+def plan_command(
+    tools: Optional[str] = typer.Option(None, "--tools", "-t", help="Ferramentas do plano (ex: docker,git). Padrão: todas"),
+    emit_shell: bool = typer.Option(False, "--emit-shell", help="Exportar o plano como um único script POSIX"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Arquivo de saída do script (padrão: stdout)"),
+    target_os: Optional[str] = typer.Option(None, "--os", help="Sistema alvo (ex: ubuntu, debian, fedora). Padrão: detectado")
+):
+    """Mostra o plano de instalação consolidado das ferramentas."""
+    tools_list = tools.split(',') if tools else None
+    show_plan(tools_list, emit_shell, output, target_os)
+
+
+@app.command("apply")
+def apply_command(
+    file: Path = typer.Argument(Path("leme.toml"), help="Arquivo TOML com o estado desejado"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Apenas mostrar as diferenças, sem instalar")
+):
+    """Converge o ambiente para o estado desejado (instala/atualiza só o necessário)."""
+    apply_desired_state(file, dry_run)
+
+
+# --- Comandos do Docker ---
+
+@docker_app.command("tune")
+def docker_tune_command(
+    registry_mirrors: Optional[List[str]] = typer.Option(None, "--registry-mirror", help="Mirror de registry (pode repetir)"),
+    config: Optional[Path] = typer.Option(None, "--config", help="Outro daemon.json (ex: arquivo de teste); não recarrega o daemon"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Apenas mostrar o daemon.json resultante")
+):
+    """Aplica o perfil de desempenho (logs, live-restore, downloads, BuildKit) ao daemon."""
+    tune_docker(registry_mirrors, config, dry_run)
+
+
+@docker_app.command("prefetch")
+def docker_prefetch_command(
+    list_path: Path = typer.Option(..., "--list", "-l", help="Arquivo com uma imagem por linha"),
+    parallel: int = typer.Option(DEFAULT_PARALLEL, "--parallel", "-n", help="Número máximo de imagens simultâneas"),
+    save_dir: Optional[Path] = typer.Option(None, "--save", help="Salvar um tarball de cada imagem neste diretório"),
+    load_dir: Optional[Path] = typer.Option(None, "--load", help="Carregar tarballs deste diretório antes de ir ao registry")
+):
+    """Baixa antecipadamente as imagens do curso (pula as que já estão atualizadas)."""
+    prefetch_images(list_path, parallel, save_dir, load_dir)
+
+
+@docker_mirror_app.command("up")
+def docker_mirror_up_command(
+    port: int = typer.Option(DEFAULT_REGISTRY_PORT, "--port", help="Porta publicada no host"),
+    data_dir: Optional[Path] = typer.Option(None, "--dir", help="Diretório das camadas (padrão: ~/.cache/leme/registry)"),
+    upstream: str = typer.Option(DEFAULT_UPSTREAM, "--upstream", help="Registry de origem"),
+    no_configure: bool = typer.Option(False, "--no-configure", help="Não apontar o Docker desta máquina para o mirror")
+):
+    """Sobe um registry:2 como cache de pull do Docker Hub para o laboratório."""
+    registry_mirror_up(port, data_dir, upstream, not no_configure)
+
+
+@docker_mirror_app.command("use")
+def docker_mirror_use_command(
+    url: str = typer.Argument(..., help="URL do mirror (ex: http://192.168.0.10:5000)")
+):
+    """Configura o registry-mirrors do daemon.json desta máquina."""
+    registry_mirror_use(url)
+
+
+@docker_mirror_app.command("down")
+def docker_mirror_down_command():
+    """Remove o container do mirror (mantém o cache)."""
+    registry_mirror_down()
+
+
+@terraform_app.command("config")
+def terraform_config_command(
+    providers: Optional[Path] = typer.Option(None, "--providers", help="Lista de providers a pré-baixar (ex: hashicorp/aws@5.31.0)"),
+    mirror_dir: Optional[Path] = typer.Option(None, "--mirror-dir", help="Mirror de providers (padrão: ~/.terraform.d/providers-mirror)"),
+    rc: Optional[Path] = typer.Option(None, "--rc", help="Outro arquivo de configuração (padrão: ~/.terraformrc)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Apenas mostrar o arquivo resultante")
+):
+    """Configura o cache de plugins e o mirror local de providers."""
+    configure_terraform(providers, mirror_dir, rc, dry_run)
+
+
+@git_app.command("config")
+def git_config_command(
+    name: Optional[str] = typer.Option(None, "--name", help="Nome do usuário (user.name)"),
+    email: Optional[str] = typer.Option(None, "--email", help="Email do usuário (user.email)"),
+    performance: bool = typer.Option(False, "--performance", help="Perfil para repositórios grandes (manyFiles, untrackedCache, commit-graph, fsmonitor, threads)"),
+    maintenance: Optional[List[Path]] = typer.Option(None, "--maintenance", help="Repositório a registrar no git maintenance periódico (pode repetir)"),
+    file: Optional[Path] = typer.Option(None, "--file", help="Outro arquivo de configuração (padrão: ~/.gitconfig)"),
+    show: bool = typer.Option(False, "--show", help="Apenas mostrar a configuração atual"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Apenas mostrar o arquivo resultante")
+):
+    """Configura o Git (identidade e desempenho) em uma única gravação."""
+    configure_git(name, email, performance, maintenance, file, show, dry_run)
+
+
+# --- Versões de Ferramentas ---
+
+@app.command("use")
+def use_command(
+    tool: str = typer.Argument(..., help="Ferramenta (ex: terraform)"),
+    version: str = typer.Argument(..., help="Versão (ex: 1.6.6)"),
+    system: bool = typer.Option(False, "--system", help="Trocar a versão do sistema (/opt/leme, todos os usuários)")
+):
+    """Ativa uma versão de uma ferramenta (baixa só na primeira vez)."""
+    use_tool(tool, version, system)
+
+
+@app.command("versions")
+def versions_command(
+    tool: str = typer.Argument(..., help="Ferramenta (ex: terraform)"),
+    system: bool = typer.Option(False, "--system", help="Listar o armazém do sistema (/opt/leme)")
+):
+    """Lista as versões instaladas em ~/.leme/tools."""
+    list_tool_versions(tool, system)
+
+
+@app.command("gc")
+def gc_command(
+    tool: str = typer.Argument(..., help="Ferramenta (ex: terraform)"),
+    keep: Optional[List[str]] = typer.Option(None, "--keep", help="Versão a manter além da ativa (pode repetir)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Apenas listar o que seria removido"),
+    system: bool = typer.Option(False, "--system", help="Limpar o armazém do sistema (/opt/leme)")
+):
+    """Remove as versões que não estão em uso."""
+    gc_tools(tool, keep, dry_run, system)
+
+
+# --- Comandos de Frota ---
+
+@fleet_app.command("apply")
+def fleet_apply_command(
+    inventory: Optional[Path] = typer.Option(None, "--inventory", "-i", help="Arquivo com um host por linha ([usuario@]host[:porta])"),
+    parallel: int = typer.Option(10, "--parallel", "-n", help="Número máximo de hosts simultâneos"),
+    tools: Optional[str] = typer.Option(None, "--tools", "-t", help="Ferramentas desejadas (ex: docker,git). Padrão: todas"),
+    simulate: int = typer.Option(0, "--simulate", help="Simular N hosts em processo, sem SSH (testes)"),
+    latency: float = typer.Option(0.05, "--latency", help="Latência por comando nos hosts simulados (segundos)")
+):
+    """Executa o setup do ambiente em todos os hosts do inventário."""
+    tools_list = tools.split(',') if tools else None
+    fleet_apply(inventory, parallel, tools_list, simulate, latency)
+
+
+@fleet_app.command("status")
+def fleet_status_command(
+    inventory: Optional[Path] = typer.Option(None, "--inventory", "-i", help="Arquivo com um host por linha ([usuario@]host[:porta])"),
+    parallel: int = typer.Option(20, "--parallel", "-n", help="Número máximo de hosts simultâneos"),
+    ttl: float = typer.Option(3600, "--ttl", help="Reaproveitar dados mais novos que TTL segundos"),
+    refresh: bool = typer.Option(False, "--refresh", help="Verificar todos os hosts, ignorando o TTL"),
+    simulate: int = typer.Option(0, "--simulate", help="Simular N hosts em processo, sem SSH (testes)"),
+    latency: float = typer.Option(0.05, "--latency", help="Latência por comando nos hosts simulados (segundos)"),
+    store: Optional[Path] = typer.Option(None, "--store", help="Banco de resultados (padrão: ~/.local/state/leme/fleet.db)")
+):
+    """Verifica as ferramentas de todos os hosts e grava no banco local."""
+    fleet_status(inventory, parallel, ttl, refresh, simulate, latency, store)
+
+
+@fleet_app.command("query")
+def fleet_query_command(
+    missing: Optional[str] = typer.Option(None, "--missing", help="Hosts sem a ferramenta (ex: docker)"),
+    where: Optional[str] = typer.Option(None, "--where", help="Hosts por versão (ex: 'terraform<1.6')"),
+    store: Optional[Path] = typer.Option(None, "--store", help="Banco de resultados (padrão: ~/.local/state/leme/fleet.db)"),
+    simulate: bool = typer.Option(False, "--simulate", help="Consultar os hosts simulados (fleet-simulated.db)")
+):
+    """Consulta a última varredura da frota sem contatar os hosts."""
+    fleet_query(missing, where, store, simulate)
+
+
+@app.command("cache-server")
+def cache_server_command(
+    port: int = typer.Option(DEFAULT_PORT, "--port", help="Porta de escuta"),
+    bind: str = typer.Option(DEFAULT_BIND, "--bind", help="Endereço de escuta (0.0.0.0 para a rede local)"),
+    cache_dir: Optional[Path] = typer.Option(None, "--dir", help="Diretório do cache (padrão: ~/.cache/leme/mirror)"),
+    upstream: Optional[str] = typer.Option(None, "--upstream", help="Servidor que substitui as origens reais (testes)"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Registrar cada requisição"),
+    allow_hosts: Optional[str] = typer.Option(None, "--allow-hosts", help="Hosts extras que o cache pode buscar (ex: mirror.exemplo,ppa.launchpadcontent.net)")
+):
+    """Inicia um cache local de pacotes (apt/yum) e downloads para a sala de aula."""
+    run_cache_server(port, bind, cache_dir, upstream, verbose, allow_hosts)
+
+
+@app.command("mirrors")
+def mirrors_command(
+    repos: Optional[str] = typer.Option(None, "--repos", "-r", help="Repositórios (ex: docker,hashicorp). Padrão: todos"),
+    refresh: bool = typer.Option(False, "--refresh", help="Medir novamente, ignorando o ranking em cache")
+):
+    """Mostra o mirror mais rápido de cada repositório de pacotes."""
+    repos_list = repos.split(',') if repos else None
+    show_mirrors(repos_list, refresh)
 
 
 @app.command("environment-status") 
@@ -101,7 +101,7 @@ echo "Verificando Python..."
 python3 --version || (echo "ERRO: Erro ao verificar Python" && exit 1)
 
 echo "Instalando dependências Python..."
-$PIP_CMD install rich typer jinja2 || (echo "ERRO: Erro ao instalar dependências" && exit 1)
+$PIP_CMD install rich typer jinja2 "tomli; python_version < '3.11'" || (echo "ERRO: Erro ao instalar dependências" && exit 1)
 
 echo "SUCESSO: Dependências instaladas com sucesso!"
 echo ""
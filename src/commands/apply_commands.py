@@ -0,0 +1,180 @@
+"""Comando `apply`: converge o ambiente para o estado declarado em arquivo."""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich import print
+from rich.console import Console
+from rich.table import Table
+
+from .environment_commands import _install_tool
+from .toolchain_commands import VERSIONED_TOOLS
+from ..system.installers.ansible_installer import AnsibleInstaller
+from ..system.reconciler import Reconciler, ReconcileAction, ReconcileStep
+from ..system.tool_store import SYSTEM_HOME
+from ..system.version_utils import ANY_VERSION, parse_version, version_satisfies
+from ..config.constants import Tool, DEVOPS_TOOLS_CONFIG
+from ..config.desired_state import load_desired_state
+from ..config.toml_support import ConfigFileError
+
+
+ACTION_LABELS = {
+    ReconcileAction.INSTALL: "[green]instalar[/green]",
+    ReconcileAction.UPGRADE: "[yellow]atualizar[/yellow]",
+    ReconcileAction.KEEP: "[dim]manter[/dim]"
+}
+
+# Ferramentas com armazém de versões (nome em `leme use`): só elas aceitam versão fixada
+STORE_NAMES = {
+    Tool.TERRAFORM: "terraform",
+    Tool.KUBECTL: "kubectl",
+    Tool.AWS_CLI: "aws-cli",
+    Tool.ANSIBLE: "ansible",
+}
+
+# "1.6.2" ou "==1.6.2": versão exata, instalada sem consultar o armazém
+_EXACT_VERSION_RE = re.compile(r"^(?:==)?\s*v?\d+\.\d+\.\d+[\w.+-]*$")
+
+
+def _is_pinned(step: ReconcileStep) -> bool:
+    """Indica se o estado desejado restringe a versão da ferramenta."""
+    return step.wanted.strip().lower() not in ANY_VERSION
+
+
+def _published_version(installer, spec: str) -> Optional[str]:
+    """Versão publicada mais nova que atende, pelo índice de releases da ferramenta."""
+    try:
+        return installer.published_version(spec)
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f":warning: [yellow]Não foi possível consultar as versões publicadas: {e}[/yellow]")
+        return None
+
+
+def _resolve_version(installer, spec: str) -> Optional[str]:
+    """
+    Escolhe a versão que atende à restrição.
+
+    Versão exata é usada como está; senão, a mais nova do armazém que atende
+    (rollback sem download) e, por fim, a mais nova publicada que atende
+    (índice de releases da HashiCorp, stable-1.N.txt do dl.k8s.io, changelog
+    do AWS CLI, PyPI). No Ansible a restrição vale para o ansible-core (o que
+    `ansible --version` mostra) e a versão escolhida é a do pacote ansible.
+
+    Returns:
+        Optional[str]: Versão a ativar, ou None se nenhuma atender
+    """
+    is_ansible = isinstance(installer, AnsibleInstaller)
+    if _EXACT_VERSION_RE.match(spec.strip()) and not is_ansible:
+        return spec.strip().lstrip("=").strip().lstrip("v")
+
+    def reported(version: str) -> Optional[str]:
+        return installer.core_version(version, SYSTEM_HOME) if is_ansible else version
+
+    matching = [v for v in installer.get_store(SYSTEM_HOME).versions() if version_satisfies(reported(v), spec)]
+    if matching:
+        return max(matching, key=parse_version)
+    return _published_version(installer, spec)
+
+
+def _converge_pinned(step: ReconcileStep, system_info) -> bool:
+    """
+    Ativa no armazém do sistema (/opt/leme) a versão pedida e liga os executáveis em /usr/local/bin.
+
+    Returns:
+        bool: True se a versão ficou ativa
+    """
+    store_name = STORE_NAMES[step.tool]
+    installer = VERSIONED_TOOLS[store_name](system_info)
+    version = _resolve_version(installer, step.wanted)
+    if not version:
+        print(f":x: [red]Nenhuma versão publicada atende a {step.wanted}[/red]")
+        print(f"  [dim]Informe uma versão exata ou ative uma compatível: python3 main.py use --system {store_name} <versão>[/dim]")
+        return False
+
+    print(f":gear: [blue]Ativando {store_name} {version} (desejada: {step.wanted})...[/blue]")
+    if not installer.use_version(version, SYSTEM_HOME):
+        return False
+
+    try:
+        installer.get_store(SYSTEM_HOME).link_system_binaries()
+    except subprocess.CalledProcessError as e:
+        print(f":x: [red]Não foi possível ligar os executáveis em /usr/local/bin: {e.stderr or e}[/red]")
+        return False
+    return True
+
+
+def apply_desired_state(file: Path, dry_run: bool = False) -> None:
+    """
+    Instala ou atualiza apenas o que diverge do estado desejado.
+
+    Em um host já convergido o custo é apenas o da verificação (paralela e,
+    para ferramentas sem restrição de versão, sem executar nenhum binário),
+    então o comando pode rodar a cada login ou via cron.
+
+    Args:
+        file: Arquivo TOML com o estado desejado
+        dry_run: Apenas mostrar o diff, sem instalar nada
+    """
+    try:
+        desired = load_desired_state(file)
+    except ConfigFileError as e:
+        print(f":x: [red]{e}[/red]")
+        raise typer.Exit(1)
+
+    reconciler = Reconciler(desired)
+    pending = reconciler.pending()
+
+    if not pending:
+        print(f":white_check_mark: [green]Ambiente convergido ({len(desired.tools)} ferramenta(s) conforme {file})[/green]")
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Ferramenta", width=12)
+    table.add_column("Ação", width=10)
+    table.add_column("Atual", width=16)
+    table.add_column("Desejada", width=16)
+
+    for step in pending:
+        table.add_row(
+            DEVOPS_TOOLS_CONFIG[step.tool]["name"],
+            ACTION_LABELS[step.action],
+            step.current or "[dim]N/A[/dim]",
+            step.wanted
+        )
+
+    print(f":clipboard: [bold cyan]Diferenças em relação a {file}[/bold cyan]")
+    Console().print(table)
+
+    # Versão fixada só converge com um instalador que escolhe a versão
+    unsupported = [step for step in pending if _is_pinned(step) and step.tool not in STORE_NAMES]
+    if unsupported:
+        print("\n:x: [red]Estas ferramentas não aceitam versão fixada (use \"*\"):[/red]")
+        for step in unsupported:
+            print(f"  • {DEVOPS_TOOLS_CONFIG[step.tool]['name']}: {step.wanted}")
+        print(f"  [dim]Versões fixadas são suportadas em: {', '.join(STORE_NAMES.values())}[/dim]")
+        raise typer.Exit(1)
+
+    if dry_run:
+        return
+
+    system_info = reconciler.env_manager.system_info
+    for step in pending:
+        name = DEVOPS_TOOLS_CONFIG[step.tool]["name"]
+        print(f"\n:arrow_forward: [bold blue]{name}: {step.action.value}[/bold blue]")
+        if _is_pinned(step):
+            _converge_pinned(step, system_info)
+        else:
+            _install_tool(step.tool, system_info)
+
+    # Verificar novamente após as alterações
+    remaining = reconciler.pending()
+    if remaining:
+        print("\n:warning: [yellow]Ferramentas que ainda não atendem ao estado desejado:[/yellow]")
+        for step in remaining:
+            print(f"  • {DEVOPS_TOOLS_CONFIG[step.tool]['name']}: atual {step.current or 'N/A'}, desejada {step.wanted}")
+        raise typer.Exit(1)
+
+    print(f"\n:white_check_mark: [green]Ambiente convergido ({len(pending)} alteração(ões) aplicada(s))[/green]")
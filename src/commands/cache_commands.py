@@ -0,0 +1,71 @@
+"""Comandos do servidor de cache local de pacotes."""
+
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich import print
+
+from ..config.toml_support import ConfigFileError
+from ..network.cache_server import DEFAULT_BIND, CacheServer, default_allowed_hosts
+
+
+def run_cache_server(
+    port: int,
+    bind: str = DEFAULT_BIND,
+    cache_dir: Optional[Path] = None,
+    upstream: Optional[str] = None,
+    verbose: bool = False,
+    allow_hosts: Optional[str] = None
+) -> None:
+    """
+    Inicia o servidor de cache e atende até Ctrl+C.
+
+    Args:
+        port: Porta de escuta
+        bind: Endereço de escuta
+        cache_dir: Diretório do cache (padrão: ~/.cache/leme/mirror)
+        upstream: URL base que substitui os hosts originais (testes)
+        verbose: Registrar cada requisição
+        allow_hosts: Hosts extras permitidos, separados por vírgula
+    """
+    try:
+        allowed = default_allowed_hosts()
+    except ConfigFileError as e:
+        print(f":x: [red]{e}[/red]")
+        raise typer.Exit(1)
+    if allow_hosts:
+        allowed.update(host.strip().lower() for host in allow_hosts.split(",") if host.strip())
+
+    try:
+        server = CacheServer(bind, port, cache_dir, upstream, verbose, allowed)
+    except OSError as e:
+        print(f":x: [red]Não foi possível escutar em {bind}:{port}: {e}[/red]")
+        raise typer.Exit(1)
+
+    print(f":package: [bold cyan]Servidor de cache em {server.url}[/bold cyan]")
+    print(f"Diretório: [blue]{server.root}[/blue]")
+    if upstream:
+        print(f"Upstream: [yellow]{upstream}[/yellow]")
+    print(f"Hosts permitidos: [dim]{', '.join(sorted(server.allowed_hosts))}[/dim]")
+    print()
+    if bind == DEFAULT_BIND:
+        print("[yellow]Escutando apenas nesta máquina; para a sala de aula use --bind 0.0.0.0[/yellow]")
+    else:
+        print("Nas máquinas dos alunos, use:")
+        print(f"  [green]leme --mirror http://<ip-deste-host>:{server.server_address[1]} setup-environment[/green]")
+    print("[dim]Ctrl+C para encerrar[/dim]")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    stats = server.stats.as_dict()
+    print()
+    print(
+        f":white_check_mark: [green]Encerrado: {stats['hits']} acertos, {stats['misses']} downloads, "
+        f"{stats['bytes_served'] / 1e6:.1f} MB servidos[/green]"
+    )
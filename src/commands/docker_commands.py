@@ -0,0 +1,187 @@
+"""Comandos de configuração do Docker já instalado (daemon.json, cache, imagens)."""
+
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich import print
+
+from ..system.docker_daemon_config import DaemonConfig, render_config, tuned_profile
+from ..system.docker_engine import DockerEngineError
+from ..system.docker_installer import DockerInstaller
+from ..system.image_prefetch import (
+    ACTION_FAILED, ACTION_LOADED, ACTION_PRESENT, ACTION_PULLED, DEFAULT_PARALLEL,
+    ImagePrefetcher, read_image_list
+)
+from ..system.registry_mirror import DEFAULT_REGISTRY_PORT, DEFAULT_UPSTREAM, RegistryMirror
+
+
+def tune_docker(
+    registry_mirrors: Optional[List[str]] = None,
+    config_path: Optional[Path] = None,
+    dry_run: bool = False
+) -> None:
+    """
+    Aplica o perfil de desempenho ao daemon.json e recarrega o daemon.
+
+    Args:
+        registry_mirrors: Mirrors de registry a adicionar
+        config_path: Outro daemon.json (ex: arquivo de teste); o daemon não é recarregado
+        dry_run: Apenas mostrar o resultado, sem gravar
+    """
+    docker_installer = None
+    if config_path:
+        daemon_config = DaemonConfig(str(config_path))
+    else:
+        docker_installer = DockerInstaller()
+        if not docker_installer.installer:
+            print(f":x: [red]Sistema não suportado: {docker_installer.system_info.os_type.value}[/red]")
+            raise typer.Exit(1)
+        daemon_config = DaemonConfig(docker_installer.installer.get_daemon_config_path())
+
+    try:
+        overlay = tuned_profile(daemon_config.load(), registry_mirrors)
+
+        if dry_run:
+            changed = daemon_config.changed_keys(overlay)
+            print(f":clipboard: [bold cyan]{daemon_config.path}[/bold cyan] (simulação)")
+            print(f"Chaves alteradas: {', '.join(changed) if changed else 'nenhuma'}")
+            typer.echo(render_config(daemon_config.plan(overlay)), nl=False)
+            return
+
+        if docker_installer:
+            if not docker_installer.configure_daemon(overlay):
+                raise typer.Exit(1)
+        else:
+            changed = daemon_config.apply(overlay)
+            if changed:
+                print(f"  [green]✓[/green] {daemon_config.path} atualizado: {', '.join(changed)}")
+    except (OSError, ValueError) as e:
+        print(f":x: [red]{e}[/red]")
+        raise typer.Exit(1)
+
+    print(":white_check_mark: [green]Perfil de desempenho aplicado[/green]")
+
+
+def _use_registry_mirror(url: str) -> bool:
+    """Grava o mirror no daemon.json local pelo instalador do Docker."""
+    docker_installer = DockerInstaller()
+    return docker_installer.configure_daemon({"registry-mirrors": [url.rstrip("/")]})
+
+
+def registry_mirror_up(
+    port: int = DEFAULT_REGISTRY_PORT,
+    data_dir: Optional[Path] = None,
+    upstream: str = DEFAULT_UPSTREAM,
+    configure_local: bool = True
+) -> None:
+    """
+    Sobe o mirror de registry (registry:2 em modo pull-through cache).
+
+    Args:
+        port: Porta publicada no host
+        data_dir: Diretório das camadas em cache
+        upstream: Registry de origem
+        configure_local: Também apontar o daemon desta máquina para o mirror
+    """
+    mirror = RegistryMirror(port=port, data_dir=data_dir, upstream=upstream)
+    url = f"http://localhost:{port}"
+
+    print(f":whale: [blue]Subindo mirror de registry ({upstream})...[/blue]")
+    try:
+        mirror.up()
+    except DockerEngineError as e:
+        print(f":x: [red]{e}[/red]")
+        raise typer.Exit(1)
+
+    if not mirror.wait_ready(url):
+        print(f":x: [red]O mirror não respondeu em {url}/v2/[/red]")
+        raise typer.Exit(1)
+
+    print(f":white_check_mark: [green]Mirror rodando em {url}[/green] (cache em {mirror.data_dir})")
+
+    if configure_local and not _use_registry_mirror(url):
+        raise typer.Exit(1)
+
+    print()
+    print("Nas máquinas do laboratório:")
+    print(f"  [green]leme docker mirror use http://<ip-deste-host>:{port}[/green]")
+
+
+def registry_mirror_use(url: str) -> None:
+    """
+    Aponta o daemon desta máquina para um mirror de registry existente.
+
+    Args:
+        url: URL do mirror (ex: http://192.168.0.10:5000)
+    """
+    if not url.startswith(("http://", "https://")):
+        print(f":x: [red]URL de mirror inválida: {url} (use http:// ou https://)[/red]")
+        raise typer.Exit(1)
+    if not _use_registry_mirror(url):
+        raise typer.Exit(1)
+    print(f":white_check_mark: [green]Docker usando o mirror {url.rstrip('/')}[/green]")
+
+
+def registry_mirror_down() -> None:
+    """Remove o container do mirror (as camadas em cache são mantidas)."""
+    mirror = RegistryMirror()
+    try:
+        removed = mirror.down()
+    except DockerEngineError as e:
+        print(f":x: [red]{e}[/red]")
+        raise typer.Exit(1)
+    if removed:
+        print(f":white_check_mark: [green]Mirror removido[/green] (cache mantido em {mirror.data_dir})")
+    else:
+        print(f"  [dim]↷ Nenhum mirror {mirror.name} encontrado[/dim]")
+
+
+def prefetch_images(
+    list_path: Path,
+    parallel: int = DEFAULT_PARALLEL,
+    save_dir: Optional[Path] = None,
+    load_dir: Optional[Path] = None
+) -> None:
+    """
+    Baixa antecipadamente as imagens do curso.
+
+    Args:
+        list_path: Arquivo com uma imagem por linha
+        parallel: Número máximo de imagens simultâneas
+        save_dir: Diretório onde salvar os tarballs
+        load_dir: Diretório de tarballs a carregar antes de ir ao registry
+    """
+    try:
+        images = read_image_list(list_path)
+    except OSError as e:
+        print(f":x: [red]Não foi possível ler {list_path}: {e}[/red]")
+        raise typer.Exit(1)
+    if not images:
+        print(f":warning: [yellow]Nenhuma imagem em {list_path}[/yellow]")
+        return
+
+    docker_installer = DockerInstaller()
+    if not docker_installer.installer or not docker_installer.installer.is_docker_installed():
+        print(":x: [red]Docker não está instalado.[/red] Use: [green]leme install docker[/green]")
+        raise typer.Exit(1)
+
+    prefetcher = ImagePrefetcher(parallel=parallel, load_dir=load_dir, save_dir=save_dir)
+    engine = prefetcher.client.ping()
+    if not engine.ok:
+        print(f":x: [red]Docker não está respondendo: {engine.error}[/red]")
+        raise typer.Exit(1)
+
+    print(f":package: [blue]Preparando {len(images)} imagens ({prefetcher.parallel} em paralelo)...[/blue]")
+    results = prefetcher.prefetch(images)
+
+    counts = {action: sum(1 for r in results if r.action == action)
+              for action in (ACTION_PULLED, ACTION_LOADED, ACTION_PRESENT, ACTION_FAILED)}
+    print()
+    print(f"Baixadas: {counts[ACTION_PULLED]}  Carregadas: {counts[ACTION_LOADED]}  "
+          f"Já presentes: {counts[ACTION_PRESENT]}  Falhas: {counts[ACTION_FAILED]}")
+    if save_dir:
+        print(f"Tarballs em: [cyan]{save_dir}[/cyan]")
+    if counts[ACTION_FAILED]:
+        raise typer.Exit(1)
+    print(":white_check_mark: [green]Imagens prontas[/green]")
@@ -2,25 +2,39 @@
 
 import subprocess
 import typer
+from pathlib import Path
 from rich import print
 from typing import Optional, List
 
 from ..system.environment_manager import EnvironmentManager
+from ..system.package_sources import refresh_apt_index
+from ..system.privileged_helper import get_privileged_helper
+from ..system.prompt_policy import confirm
+from ..system.step_journal import get_step_journal
 from ..system.docker_installer import DockerInstaller
 from ..system.installers.git_installer import GitInstaller
 from ..system.installers.terraform_installer import TerraformInstaller
 from ..system.installers.aws_cli_installer import AwsCliInstaller
 from ..system.installers.azure_cli_installer import AzureCliInstaller
+from ..system.installers.kubectl_installer import KubectlInstaller
+from ..system.installers.ansible_installer import AnsibleInstaller
+from ..system.user_prefix import activate_prefix, print_path_snippet
 from ..config.constants import Tool, DEVOPS_TOOLS_CONFIG
 
 
+# Ferramentas que podem ser instaladas no prefixo do usuário (--prefix)
+PREFIX_TOOLS = [Tool.TERRAFORM, Tool.AWS_CLI, Tool.AZURE_CLI, Tool.KUBECTL, Tool.ANSIBLE]
+
+
 def setup_environment(
     check_only: bool = typer.Option(False, "--check-only", help="Apenas verificar o ambiente atual"),
     required_only: bool = typer.Option(False, "--required-only", help="Instalar apenas ferramentas obrigatórias"),
     skip_docker: bool = typer.Option(False, "--skip-docker", help="Pular instalação do Docker"),
     force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação de ferramentas"),
     interactive: bool = typer.Option(False, "--interactive", "-i", help="Modo interativo (LEGACY - agora é padrão)"),
-    tools: Optional[List[str]] = typer.Option(None, "--tools", "-t", help="Instalar apenas ferramentas específicas (ex: git,docker)")
+    tools: Optional[List[str]] = typer.Option(None, "--tools", "-t", help="Instalar apenas ferramentas específicas (ex: git,docker)"),
+    fresh: bool = typer.Option(False, "--fresh", help="Ignorar etapas já concluídas e refazer tudo"),
+    prefix: Optional[Path] = typer.Option(None, "--prefix", help="Instalar no espaço do usuário, sem sudo (ex: ~/.leme)")
 ) -> None:
     """
     Configura o ambiente DevOps completo para o curso.
@@ -33,10 +47,33 @@ def setup_environment(
     - kubectl (opcional)
     - Ansible (opcional)
     - watch (opcional)
+    
+    Etapas concluídas (chaves, repositórios, índices, downloads) ficam
+    registradas em ~/.local/state/leme, e uma execução interrompida é
+    retomada de onde parou. Use --fresh para refazer tudo.
+    
+    Com --prefix, as ferramentas distribuídas como binário ou pacote
+    Python são instaladas em <prefix> sem sudo; Docker, Git e watch
+    continuam dependendo do gerenciador de pacotes e são pulados.
     """
     print(":rocket: [bold green]Setup do Ambiente DevOps[/bold green]")
     print()
     
+    prefix_on_path = True
+    if prefix:
+        prefix = prefix.expanduser().resolve()
+        # Ferramentas já instaladas no prefixo contam como instaladas
+        prefix_on_path = activate_prefix(prefix)
+        print(f":house: [blue]Modo prefixo: instalando em {prefix} (sem sudo)[/blue]")
+        print()
+    
+    journal = get_step_journal()
+    if fresh:
+        journal.clear()
+    elif journal.interrupted and journal.steps and not check_only:
+        print(f":repeat: [blue]Retomando setup: {len(journal.steps)} etapa(s) já concluída(s) serão verificadas e puladas[/blue]")
+        print()
+    
     # Inicializar gerenciador
     env_manager = EnvironmentManager()
     
@@ -80,6 +117,12 @@ def setup_environment(
         tools_to_install.remove(Tool.DOCKER)
         print(":information: [blue]Docker será pulado conforme solicitado[/blue]")
     
+    if prefix:
+        system_tools = [t for t in tools_to_install if t not in PREFIX_TOOLS]
+        for tool in system_tools:
+            print(f":information: [yellow]{DEVOPS_TOOLS_CONFIG[tool]['name']} exige o gerenciador de pacotes e será pulado no modo prefixo[/yellow]")
+        tools_to_install = [t for t in tools_to_install if t in PREFIX_TOOLS]
+    
     # Verificar se há algo para instalar
     if not tools_to_install:
         print(":white_check_mark: [green]Todas as ferramentas selecionadas já estão instaladas![/green]")
@@ -98,8 +141,7 @@ def setup_environment(
             print(f"  {config['description']}")
             
             # Agora todas as ferramentas são opcionais - perguntar para todas
-            confirm = typer.confirm(f"  Deseja instalar {config['name']}?")
-            if confirm:
+            if confirm(f"install.{tool.value}", f"  Deseja instalar {config['name']}?"):
                 selected_tools.append(tool)
             else:
                 print(f"  :information: [yellow]Pulando {config['name']}[/yellow]")
@@ -124,6 +166,8 @@ def setup_environment(
             print(f"  • [blue]{config['name']}[/blue] {required_text} - {config['description']}")
     
     print("\n:gear: [bold green]Iniciando instalação das ferramentas...[/bold green]")
+    # Sem o marcador de conclusão, a próxima execução avisa que está retomando
+    journal.start_run()
     
     # Instalar ferramentas uma por vez
     success_count = 0
@@ -132,7 +176,7 @@ def setup_environment(
         print(f"\n:arrow_forward: [bold blue]Instalando {config['name']}...[/bold blue]")
         
         try:
-            success = _install_tool(tool, env_manager.system_info, force)
+            success = _install_tool(tool, env_manager.system_info, force, prefix)
             if success:
                 print(f":white_check_mark: [green]{config['name']} instalado com sucesso![/green]")
                 success_count += 1
@@ -141,12 +185,16 @@ def setup_environment(
         
         except Exception as e:
             print(f":x: [red]Erro ao instalar {config['name']}: {str(e)}[/red]")
+    journal.finish_run()
     
     # Relatório final
     print(f"\n:chart_with_upwards_trend: [bold cyan]Relatório de Instalação:[/bold cyan]")
     print(f"  • [green]Instaladas com sucesso:[/green] {success_count}")
     print(f"  • [red]Falharam:[/red] {len(tools_to_install) - success_count}")
     
+    if prefix and not prefix_on_path:
+        print_path_snippet(prefix)
+    
     # Verificar ambiente final
     print("\n:mag: [bold blue]Verificando ambiente após instalação...[/bold blue]")
     env_manager.check_all_tools()
@@ -168,7 +216,7 @@ def environment_status() -> None:
     env_manager.show_status_report()
 
 
-def _install_tool(tool: Tool, system_info, force: bool = False) -> bool:
+def _install_tool(tool: Tool, system_info, force: bool = False, prefix: Optional[Path] = None) -> bool:
     """
     Instala uma ferramenta específica.
     
@@ -176,10 +224,14 @@ def _install_tool(tool: Tool, system_info, force: bool = False) -> bool:
         tool: Ferramenta a ser instalada
         system_info: Informações do sistema
         force: Forçar reinstalação
+        prefix: Instalar no prefixo do usuário, sem sudo
         
     Returns:
         bool: True se a instalação foi bem-sucedida
     """
+    if prefix:
+        return _install_tool_to_prefix(tool, system_info, prefix)
+    
     try:
         if tool == Tool.DOCKER:
             # Docker já tem instalador dedicado
@@ -216,6 +268,36 @@ def _install_tool(tool: Tool, system_info, force: bool = False) -> bool:
         return False
 
 
+def _install_tool_to_prefix(tool: Tool, system_info, prefix: Path) -> bool:
+    """
+    Instala uma ferramenta no prefixo do usuário, sem sudo.
+    
+    Args:
+        tool: Ferramenta (uma de PREFIX_TOOLS)
+        system_info: Informações do sistema
+        prefix: Diretório do prefixo
+        
+    Returns:
+        bool: True se a instalação foi bem-sucedida
+    """
+    try:
+        if tool == Tool.TERRAFORM:
+            return TerraformInstaller(system_info).install_to_prefix(prefix)
+        elif tool == Tool.AWS_CLI:
+            return AwsCliInstaller(system_info).install_to_prefix(prefix)
+        elif tool == Tool.AZURE_CLI:
+            return AzureCliInstaller(system_info).install_to_prefix(prefix)
+        elif tool == Tool.KUBECTL:
+            return KubectlInstaller(system_info).install_to_prefix(prefix)
+        elif tool == Tool.ANSIBLE:
+            return AnsibleInstaller(system_info).install_to_prefix(prefix)
+        print(f":warning: [yellow]{tool.value} não pode ser instalado no modo prefixo[/yellow]")
+        return False
+    except Exception as e:
+        print(f":x: [red]Erro durante instalação de {tool.value} em {prefix}: {str(e)}[/red]")
+        return False
+
+
 def _install_git(system_info) -> bool:
     """Instala Git baseado no sistema operacional."""
     try:
@@ -257,151 +339,26 @@ def _install_aws_cli(system_info) -> bool:
 
 
 def _install_kubectl(system_info) -> bool:
-    """Instala kubectl baseado no sistema operacional."""
+    """Instala kubectl (binário oficial, conferido com o .sha256)."""
     try:
-        from ..system.system_detector import OperatingSystem
-        
-        print(":gear: [blue]Instalando kubectl...[/blue]")
-        
-        if system_info.os_type in [
-            OperatingSystem.UBUNTU, OperatingSystem.WSL_UBUNTU,
-            OperatingSystem.DEBIAN, OperatingSystem.WSL_DEBIAN
-        ]:
-            # Ubuntu/Debian - via repositório oficial do Kubernetes
-            # Limpar repositórios corrompidos primeiro
-            _cleanup_corrupted_repositories()
-            subprocess.run(["sudo", "apt-get", "update"], check=True, capture_output=True)
-            subprocess.run([
-                "sudo", "apt-get", "install", "-y", "ca-certificates", "curl", "apt-transport-https"
-            ], check=True, capture_output=True)
-            
-            # Adicionar chave GPG do Kubernetes
-            subprocess.run([
-                "sudo", "mkdir", "-p", "/etc/apt/keyrings"
-            ], capture_output=True)
-            subprocess.run([
-                "bash", "-c", 
-                "curl -fsSL https://pkgs.k8s.io/core:/stable:/v1.28/deb/Release.key | sudo gpg --dearmor -o /etc/apt/keyrings/kubernetes-apt-keyring.gpg"
-            ], check=True, capture_output=True)
-            
-            # Adicionar repositório
-            subprocess.run([
-                "bash", "-c",
-                "echo 'deb [signed-by=/etc/apt/keyrings/kubernetes-apt-keyring.gpg] https://pkgs.k8s.io/core:/stable:/v1.28/deb/ /' | sudo tee /etc/apt/sources.list.d/kubernetes.list"
-            ], check=True, capture_output=True)
-            
-            subprocess.run(["sudo", "apt-get", "update"], check=True, capture_output=True)
-            subprocess.run(["sudo", "apt-get", "install", "-y", "kubectl"], check=True, capture_output=True)
-            
-        elif system_info.os_type == OperatingSystem.MACOS:
-            # macOS - via Homebrew
-            subprocess.run(["brew", "install", "kubectl"], check=True, capture_output=True)
-            
-        elif system_info.os_type in [OperatingSystem.CENTOS, OperatingSystem.RHEL, OperatingSystem.FEDORA]:
-            # CentOS/RHEL/Fedora - via repositório oficial
-            repo_content = """[kubernetes]
-name=Kubernetes
-baseurl=https://pkgs.k8s.io/core:/stable:/v1.28/rpm/
-enabled=1
-gpgcheck=1
-gpgkey=https://pkgs.k8s.io/core:/stable:/v1.28/rpm/repodata/repomd.xml.key"""
-            
-            subprocess.run([
-                "bash", "-c", f"echo '{repo_content}' | sudo tee /etc/yum.repos.d/kubernetes.repo"
-            ], check=True)
-            
-            pkg_manager = "dnf" if system_info.os_type == OperatingSystem.FEDORA else "yum"
-            subprocess.run(["sudo", pkg_manager, "install", "-y", "kubectl"], check=True, capture_output=True)
-        
-        else:
-            print(":warning: [yellow]Sistema não suportado para kubectl[/yellow]")
-            return False
-            
-        print(":white_check_mark: [green]kubectl instalado com sucesso![/green]")
-        return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f":x: [red]Erro ao instalar kubectl: {e}[/red]")
-        return False
+        kubectl_installer = KubectlInstaller(system_info)
+        return kubectl_installer.install()
     except Exception as e:
-        print(f":x: [red]Erro inesperado ao instalar kubectl: {str(e)}[/red]")
+        print(f":x: [red]Erro durante instalação do kubectl: {str(e)}[/red]")
         return False
 
 
 def _install_ansible(system_info) -> bool:
-    """Instala Ansible baseado no sistema operacional."""
+    """Instala Ansible em um virtualenv próprio (sem `sudo pip3`)."""
     try:
-        from ..system.system_detector import OperatingSystem
-        
-        print(":gear: [blue]Instalando Ansible...[/blue]")
-        
-        if system_info.os_type in [
-            OperatingSystem.UBUNTU, OperatingSystem.WSL_UBUNTU,
-            OperatingSystem.DEBIAN, OperatingSystem.WSL_DEBIAN
-        ]:
-            # Ubuntu/Debian - via pip (método mais confiável)
-            # Limpar repositórios corrompidos primeiro
-            _cleanup_corrupted_repositories()
-            subprocess.run(["sudo", "apt-get", "update"], check=True, capture_output=True)
-            subprocess.run(["sudo", "apt-get", "install", "-y", "python3-pip"], check=True, capture_output=True)
-            
-            # Instalar Ansible globalmente para que fique disponível no PATH
-            subprocess.run(["sudo", "pip3", "install", "ansible"], check=True, capture_output=True)
-            
-            # Verificar se o binário está acessível e criar link se necessário
-            try:
-                subprocess.run(["ansible", "--version"], check=True, capture_output=True)
-            except (FileNotFoundError, subprocess.CalledProcessError):
-                # Se não encontrar, tentar criar link simbólico
-                ansible_paths = [
-                    "/usr/local/bin/ansible",
-                    "/home/user/.local/bin/ansible",
-                    "/usr/bin/ansible"
-                ]
-                for path in ansible_paths:
-                    if subprocess.run(["test", "-f", path], capture_output=True).returncode == 0:
-                        subprocess.run(["sudo", "ln", "-sf", path, "/usr/bin/ansible"], capture_output=True)
-                        break
-            
-        elif system_info.os_type == OperatingSystem.MACOS:
-            # macOS - via Homebrew
-            subprocess.run(["brew", "install", "ansible"], check=True, capture_output=True)
-            
-        elif system_info.os_type in [OperatingSystem.CENTOS, OperatingSystem.RHEL, OperatingSystem.FEDORA]:
-            # CentOS/RHEL/Fedora - via pip
-            pkg_manager = "dnf" if system_info.os_type == OperatingSystem.FEDORA else "yum"
-            subprocess.run(["sudo", pkg_manager, "install", "-y", "python3-pip"], check=True, capture_output=True)
-            
-            # Instalar Ansible globalmente
-            subprocess.run(["sudo", "pip3", "install", "ansible"], check=True, capture_output=True)
-            
-            # Verificar se o binário está acessível
-            try:
-                subprocess.run(["ansible", "--version"], check=True, capture_output=True)
-            except (FileNotFoundError, subprocess.CalledProcessError):
-                # Se não encontrar, tentar criar link simbólico
-                ansible_paths = [
-                    "/usr/local/bin/ansible",
-                    "/home/user/.local/bin/ansible",
-                    "/usr/bin/ansible"
-                ]
-                for path in ansible_paths:
-                    if subprocess.run(["test", "-f", path], capture_output=True).returncode == 0:
-                        subprocess.run(["sudo", "ln", "-sf", path, "/usr/bin/ansible"], capture_output=True)
-                        break
-        
-        else:
-            print(":warning: [yellow]Sistema não suportado para Ansible[/yellow]")
+        ansible_installer = AnsibleInstaller(system_info)
+        if not ansible_installer.install():
             return False
-            
-        print(":white_check_mark: [green]Ansible instalado com sucesso![/green]")
+        if confirm("ansible.tuned_config", "Gerar um ansible.cfg otimizado (pipelining, forks, cache de facts)?"):
+            ansible_installer.configure_performance()
         return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f":x: [red]Erro ao instalar Ansible: {e}[/red]")
-        return False
     except Exception as e:
-        print(f":x: [red]Erro inesperado ao instalar Ansible: {str(e)}[/red]")
+        print(f":x: [red]Erro durante instalação do Ansible: {str(e)}[/red]")
         return False
 
 
@@ -417,10 +374,10 @@ def _install_watch(system_info) -> bool:
             OperatingSystem.DEBIAN, OperatingSystem.WSL_DEBIAN
         ]:
             # Ubuntu/Debian - via apt
-            # Limpar repositórios corrompidos primeiro
-            _cleanup_corrupted_repositories()
-            subprocess.run(["sudo", "apt-get", "update"], check=True, capture_output=True)
-            subprocess.run(["sudo", "apt-get", "install", "-y", "procps"], check=True, capture_output=True)
+            # Limpar repositórios corrompidos apenas se o update falhar
+            _refresh_apt_index_or_cleanup()
+            privileged = get_privileged_helper()
+            privileged.run(["apt-get", "install", "-y", "procps"], check=True)
             
         elif system_info.os_type == OperatingSystem.MACOS:
             # macOS - via Homebrew
@@ -429,7 +386,7 @@ def _install_watch(system_info) -> bool:
         elif system_info.os_type in [OperatingSystem.CENTOS, OperatingSystem.RHEL, OperatingSystem.FEDORA]:
             # CentOS/RHEL/Fedora - via yum/dnf
             pkg_manager = "dnf" if system_info.os_type == OperatingSystem.FEDORA else "yum"
-            subprocess.run(["sudo", pkg_manager, "install", "-y", "procps-ng"], check=True, capture_output=True)
+            get_privileged_helper().run([pkg_manager, "install", "-y", "procps-ng"], check=True)
         
         else:
             print(":warning: [yellow]Sistema não suportado para watch[/yellow]")
@@ -446,6 +403,18 @@ def _install_watch(system_info) -> bool:
         return False
 
 
+def _refresh_apt_index_or_cleanup() -> None:
+    """
+    Atualiza os índices do apt, limpando repositórios de terceiros só se falhar.
+
+    Raises:
+        subprocess.CalledProcessError: Se o update falhar mesmo após a limpeza
+    """
+    if not refresh_apt_index(check=False):
+        _cleanup_corrupted_repositories()
+        refresh_apt_index()
+
+
 def _cleanup_corrupted_repositories() -> None:
     """Remove repositórios corrompidos que podem afetar apt-get update."""
     try:
@@ -467,24 +436,14 @@ def _cleanup_corrupted_repositories() -> None:
             "/etc/apt/trusted.gpg.d/microsoft.gpg"
         ]
         
-        # Remover arquivos de repositório corrompidos
-        for repo_file in corrupted_repos:
-            subprocess.run([
-                "sudo", "rm", "-f", repo_file
-            ], capture_output=True)
+        privileged = get_privileged_helper()
         
-        # Remover chaves GPG corrompidas
-        for key_file in corrupted_keys:
-            subprocess.run([
-                "sudo", "rm", "-f", key_file
-            ], capture_output=True)
+        # Remover arquivos de repositório e chaves GPG corrompidos
+        for path in corrupted_repos + corrupted_keys:
+            privileged.remove(path)
         
         # Tentar atualizar repositórios para limpar cache
-        result = subprocess.run([
-            "sudo", "apt-get", "update"
-        ], capture_output=True)
-        
-        if result.returncode == 0:
+        if refresh_apt_index(check=False):
             print(":white_check_mark: [green]Repositórios limpos com sucesso[/green]")
         else:
             print(":warning: [yellow]Aviso: Alguns repositórios ainda podem ter problemas[/yellow]")
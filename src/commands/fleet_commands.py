@@ -0,0 +1,357 @@
+"""Comandos do modo frota: setup e verificação de vários hosts via SSH."""
+
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import typer
+from rich import print
+from rich.console import Console, Group
+from rich.live import Live
+from rich.table import Table
+
+from .plan_commands import parse_tool_names
+from ..fleet.inventory import Host, load_inventory
+from ..fleet.runner import FleetRunner, HostResult
+from ..fleet.store import DEFAULT_STORE_PATH, FleetStore
+from ..fleet.transport import FakeTransport, SSHTransport, Transport
+from ..config.constants import Tool, DEVOPS_TOOLS_CONFIG
+from ..config.desired_state import resolve_tool_name
+
+
+# Hosts em andamento exibidos no painel
+DASHBOARD_ACTIVE_ROWS = 15
+FINISHED_STAGES = ("concluído", "falhou")
+
+# Banco separado para hosts simulados, para não misturar com a frota real
+SIMULATED_STORE_PATH = DEFAULT_STORE_PATH.with_name("fleet-simulated.db")
+
+
+class FleetDashboard:
+    """Painel `rich` com o progresso de cada host."""
+
+    def __init__(self, total: int, title: str):
+        """
+        Inicializa o painel.
+
+        Args:
+            total: Número de hosts
+            title: Título do painel
+        """
+        self.total = total
+        self.title = title
+        self.stages: Dict[Host, Tuple[str, float]] = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update(self, host: Host, stage: str) -> None:
+        """Registra a etapa atual de um host (chamado pelas threads do executor)."""
+        with self._lock:
+            self.stages[host] = (stage, time.monotonic())
+
+    def __rich__(self) -> Group:
+        """Renderiza o painel."""
+        with self._lock:
+            stages = dict(self.stages)
+
+        counts = Counter(stage for stage, _ in stages.values())
+        done = counts["concluído"] + counts["falhou"]
+        elapsed = time.monotonic() - self.started
+
+        summary = (
+            f"[bold cyan]{self.title}[/bold cyan]  "
+            f"{done}/{self.total} hosts  "
+            f"[green]✓ {counts['concluído']}[/green]  "
+            f"[red]✗ {counts['falhou']}[/red]  "
+            f"[dim]na fila {counts['na fila']}  •  {elapsed:.1f}s[/dim]"
+        )
+
+        table = Table(show_header=True, header_style="bold magenta", box=None)
+        table.add_column("Host", width=30)
+        table.add_column("Etapa", width=16)
+        table.add_column("Há", justify="right", width=7)
+
+        now = time.monotonic()
+        active = [
+            (host, stage, since) for host, (stage, since) in stages.items()
+            if stage not in FINISHED_STAGES and stage != "na fila"
+        ]
+        for host, stage, since in sorted(active, key=lambda item: item[2])[:DASHBOARD_ACTIVE_ROWS]:
+            table.add_row(host.name, f"[blue]{stage}[/blue]", f"{now - since:.1f}s")
+        if len(active) > DASHBOARD_ACTIVE_ROWS:
+            table.add_row(f"[dim]… e mais {len(active) - DASHBOARD_ACTIVE_ROWS}[/dim]", "", "")
+
+        return Group(summary, table)
+
+
+def build_transport(simulate: int, latency: float) -> Transport:
+    """
+    Cria o transporte: SSH real ou hosts simulados.
+
+    Args:
+        simulate: Número de hosts simulados (0 para SSH real)
+        latency: Latência injetada por comando nos hosts simulados
+
+    Returns:
+        Transport: Transporte escolhido
+    """
+    if simulate:
+        return FakeTransport(latency=latency, jitter=latency / 2)
+    return SSHTransport()
+
+
+def resolve_hosts(inventory: Optional[Path], simulate: int) -> List[Host]:
+    """
+    Carrega o inventário ou gera os hosts simulados.
+
+    Args:
+        inventory: Arquivo de inventário
+        simulate: Número de hosts simulados
+
+    Returns:
+        List[Host]: Hosts de destino
+    """
+    if simulate:
+        return [Host(address=f"sim-{index:03d}") for index in range(1, simulate + 1)]
+
+    if not inventory:
+        print(":x: [red]Informe o inventário com --inventory (ou use --simulate N)[/red]")
+        raise typer.Exit(1)
+
+    try:
+        hosts = load_inventory(inventory)
+    except (OSError, ValueError) as e:
+        print(f":x: [red]Erro no inventário: {e}[/red]")
+        raise typer.Exit(1)
+
+    if not hosts:
+        print(":x: [red]Inventário vazio[/red]")
+        raise typer.Exit(1)
+    return hosts
+
+
+def run_with_dashboard(runner: FleetRunner, hosts: List[Host], operation, title: str) -> List[HostResult]:
+    """
+    Executa uma operação em todos os hosts exibindo o painel de progresso.
+
+    Args:
+        runner: Executor da frota
+        hosts: Hosts de destino
+        operation: Operação por host
+        title: Título do painel
+
+    Returns:
+        List[HostResult]: Resultados por host
+    """
+    dashboard = FleetDashboard(len(hosts), title)
+    runner.on_update = dashboard.update
+    with Live(dashboard, refresh_per_second=8, transient=True):
+        results = runner.run_all(hosts, operation)
+    runner.transport.close()
+    return results
+
+
+def show_fleet_report(results: List[HostResult], tools: List[Tool], elapsed: float, show_installed_now: bool = True) -> None:
+    """
+    Exibe o relatório consolidado da frota a partir do `ToolStatus` de cada host.
+
+    Args:
+        results: Resultados por host
+        tools: Ferramentas a incluir no relatório
+        elapsed: Duração total em segundos
+        show_installed_now: Incluir a coluna de ferramentas instaladas nesta execução
+    """
+    ok = [r for r in results if r.ok]
+    failed = [r for r in results if not r.ok]
+    probed = [r for r in results if r.statuses]
+
+    print(f"\n:clipboard: [bold cyan]Relatório da Frota[/bold cyan] ({len(results)} hosts em {elapsed:.1f}s)")
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Ferramenta", width=12)
+    table.add_column("Instalada", justify="right", width=10)
+    if show_installed_now:
+        table.add_column("Nesta execução", justify="right", width=14)
+    table.add_column("Versões", width=36)
+
+    for tool in tools:
+        installed = [r.statuses[tool] for r in probed if tool in r.statuses and r.statuses[tool].installed]
+        versions = Counter(status.version or "?" for status in installed)
+        version_text = ", ".join(f"{version} ({count})" for version, count in versions.most_common(3))
+        if len(versions) > 3:
+            version_text += f", +{len(versions) - 3}"
+        row = [DEVOPS_TOOLS_CONFIG[tool]["name"], f"{len(installed)}/{len(probed)}"]
+        if show_installed_now:
+            row.append(str(sum(1 for r in results if tool in r.installed)))
+        table.add_row(*row, version_text or "[dim]-[/dim]")
+
+    Console().print(table)
+
+    print(f"\n  • [green]Hosts OK:[/green] {len(ok)}/{len(results)}")
+    if failed:
+        print(f"  • [red]Hosts com falha:[/red] {len(failed)}")
+        for result in failed[:20]:
+            print(f"    [red]✗[/red] {result.host.name}: {result.error}")
+        if len(failed) > 20:
+            print(f"    [dim]… e mais {len(failed) - 20}[/dim]")
+
+
+def fleet_apply(
+    inventory: Optional[Path],
+    parallel: int = 10,
+    tools: Optional[List[str]] = None,
+    simulate: int = 0,
+    latency: float = 0.05
+) -> None:
+    """
+    Executa o setup do ambiente em todos os hosts do inventário.
+
+    Cada host recebe, pelo stdin da sessão SSH, o plano consolidado
+    (`leme plan --emit-shell`) apenas com as ferramentas que faltam nele.
+    Os hosts precisam de acesso por chave e de `sudo` sem senha (ou root).
+
+    Args:
+        inventory: Arquivo com um host por linha ([usuario@]host[:porta])
+        parallel: Número máximo de hosts simultâneos
+        tools: Ferramentas desejadas (padrão: todas)
+        simulate: Simular N hosts em processo (sem SSH)
+        latency: Latência injetada nos hosts simulados
+    """
+    hosts = resolve_hosts(inventory, simulate)
+    selected_tools = parse_tool_names(tools)
+    if not selected_tools:
+        print(":x: [red]Nenhuma ferramenta válida especificada[/red]")
+        raise typer.Exit(1)
+
+    runner = FleetRunner(build_transport(simulate, latency), parallel=parallel)
+
+    start = time.monotonic()
+    results = run_with_dashboard(
+        runner, hosts,
+        lambda host: runner.apply_host(host, selected_tools),
+        f"Setup em {len(hosts)} hosts (paralelismo {runner.parallel})"
+    )
+    show_fleet_report(results, selected_tools, time.monotonic() - start)
+
+    if any(not r.ok for r in results):
+        raise typer.Exit(1)
+
+
+def fleet_status(
+    inventory: Optional[Path],
+    parallel: int = 20,
+    ttl: float = 3600,
+    refresh: bool = False,
+    simulate: int = 0,
+    latency: float = 0.05,
+    store_path: Optional[Path] = None
+) -> None:
+    """
+    Verifica as ferramentas de todos os hosts e grava o resultado no banco local.
+
+    A varredura é incremental: apenas hosts cujos dados são mais antigos que
+    o TTL (ou cuja última verificação falhou) são contatados.
+
+    Args:
+        inventory: Arquivo com um host por linha
+        parallel: Número máximo de hosts simultâneos
+        ttl: Validade dos dados em segundos
+        refresh: Verificar todos os hosts, ignorando o TTL
+        simulate: Simular N hosts em processo (sem SSH)
+        latency: Latência injetada nos hosts simulados
+        store_path: Arquivo do banco de resultados
+    """
+    hosts = resolve_hosts(inventory, simulate)
+    store = FleetStore(store_path or (SIMULATED_STORE_PATH if simulate else None))
+
+    stale = hosts if refresh else store.stale_hosts(hosts, ttl)
+    start = time.monotonic()
+
+    if stale:
+        runner = FleetRunner(build_transport(simulate, latency), parallel=parallel)
+
+        def probe_and_record(host: Host) -> HostResult:
+            # Gravar cada host ao terminar preserva o progresso se a varredura for interrompida
+            result = runner.status_host(host)
+            store.record(result)
+            return result
+
+        run_with_dashboard(
+            runner, stale, probe_and_record,
+            f"Verificando {len(stale)} de {len(hosts)} hosts (paralelismo {runner.parallel})"
+        )
+    else:
+        print(f":information: [blue]Dados de todos os {len(hosts)} hosts estão dentro do TTL ({ttl:.0f}s)[/blue]")
+
+    results = store.load(hosts)
+    store.close()
+
+    print(f"\n:arrows_counterclockwise: {len(stale)} host(s) verificado(s), {len(hosts) - len(stale)} do banco local")
+    show_fleet_report(
+        results,
+        sorted(Tool, key=lambda t: DEVOPS_TOOLS_CONFIG[t]["priority"]),
+        time.monotonic() - start,
+        show_installed_now=False
+    )
+
+
+def fleet_query(
+    missing: Optional[str] = None,
+    where: Optional[str] = None,
+    store_path: Optional[Path] = None,
+    simulate: bool = False
+) -> None:
+    """
+    Consulta o banco local da última varredura, sem contatar os hosts.
+
+    Args:
+        missing: Ferramenta ausente (ex: "docker")
+        where: Ferramenta e versão (ex: "terraform<1.6", "kubectl>=1.28,<1.30")
+        store_path: Arquivo do banco de resultados
+        simulate: Consultar o banco dos hosts simulados (`fleet status --simulate`)
+    """
+    if not missing and not where:
+        print(":x: [red]Informe --missing FERRAMENTA ou --where 'FERRAMENTA<VERSÃO'[/red]")
+        raise typer.Exit(1)
+
+    path = store_path or (SIMULATED_STORE_PATH if simulate else DEFAULT_STORE_PATH)
+    if not path.exists():
+        command = "fleet status --simulate N" if simulate else "fleet status"
+        print(f":x: [red]Nenhuma varredura encontrada em {path}. Execute '{command}' primeiro.[/red]")
+        raise typer.Exit(1)
+    store = FleetStore(path)
+
+    try:
+        if missing:
+            tool = _resolve_tool_or_exit(missing)
+            hosts = store.hosts_missing(tool)
+            print(f":mag: [bold cyan]Hosts sem {DEVOPS_TOOLS_CONFIG[tool]['name']}:[/bold cyan] {len(hosts)}")
+            for host in hosts:
+                print(f"  • {host}")
+
+        if where:
+            match = re.match(r"^\s*([A-Za-z][\w-]*)\s*(.*)$", where)
+            if not match or not match.group(2).strip():
+                print(f":x: [red]Consulta inválida: {where} (ex: terraform<1.6)[/red]")
+                raise typer.Exit(1)
+            tool = _resolve_tool_or_exit(match.group(1))
+            spec = match.group(2).strip()
+            rows = store.hosts_matching(tool, spec)
+            print(f":mag: [bold cyan]Hosts com {DEVOPS_TOOLS_CONFIG[tool]['name']} {spec}:[/bold cyan] {len(rows)}")
+            for row in rows:
+                age = (time.time() - row["probed_at"]) / 60
+                print(f"  • {row['host']}  [blue]{row['version']}[/blue]  [dim](há {age:.0f} min)[/dim]")
+    finally:
+        store.close()
+
+
+def _resolve_tool_or_exit(name: str) -> Tool:
+    """Converte o nome da ferramenta ou encerra com erro."""
+    try:
+        return resolve_tool_name(name)
+    except ValueError:
+        print(f":x: [red]Ferramenta desconhecida: {name}[/red]")
+        raise typer.Exit(1)
@@ -0,0 +1,51 @@
+"""Comandos de configuração do Git já instalado (identidade, desempenho, manutenção)."""
+
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich import print
+
+from ..system.git_config import GitConfig
+from ..system.installers.git_installer import GitInstaller
+from ..system.system_detector import SystemDetector
+
+
+def configure_git(
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    performance: bool = False,
+    maintenance_repos: Optional[List[Path]] = None,
+    config_path: Optional[Path] = None,
+    show: bool = False,
+    dry_run: bool = False
+) -> None:
+    """
+    Configura o Git em uma única gravação atômica da configuração global.
+
+    Args:
+        name: Nome do usuário
+        email: Email do usuário
+        performance: Aplicar o perfil para repositórios grandes
+        maintenance_repos: Repositórios a registrar no `git maintenance`
+        config_path: Outro arquivo de configuração (padrão: ~/.gitconfig)
+        show: Apenas mostrar a configuração atual
+        dry_run: Apenas mostrar o arquivo resultante
+    """
+    git_installer = GitInstaller(SystemDetector.detect())
+    if show:
+        if not git_installer.show_config(config_path):
+            raise typer.Exit(1)
+        return
+
+    if dry_run:
+        git_config = GitConfig(config_path)
+        settings = git_installer.config_settings(name, email, performance)
+        repos = git_installer.resolve_repositories(maintenance_repos) if maintenance_repos else []
+        additions = {"maintenance.repo": [str(repo) for repo in repos]} if repos else None
+        print(f":clipboard: [bold cyan]{git_config.path}[/bold cyan] (simulação)")
+        typer.echo(git_config.plan(settings, additions), nl=False)
+        return
+
+    if not git_installer.configure_git(name, email, performance, maintenance_repos, config_path):
+        raise typer.Exit(1)
@@ -1,21 +1,30 @@
 """Comandos para instalação de ferramentas."""
 
 import typer
+from pathlib import Path
 from rich import print
-from typing import Optional
+from typing import List, Optional
 
+from ..system.ansible_config import AnsibleConfig
 from ..system.docker_installer import DockerInstaller
 from ..system.installers.terraform_installer import TerraformInstaller
 from ..system.installers.azure_cli_installer import AzureCliInstaller
 from ..system.installers.aws_cli_installer import AwsCliInstaller
+from ..system.installers.kubectl_installer import KubectlInstaller
+from ..system.installers.ansible_installer import AnsibleInstaller
+from ..system.prompt_policy import confirm
 from ..system.system_detector import SystemDetector
+from ..system.user_prefix import activate_prefix, print_path_snippet
 
 
 def install_docker(
     check_only: bool = typer.Option(False, "--check-only", help="Apenas verificar se o Docker está instalado"),
     force: bool = typer.Option(False, "--force", "-f", help="Forçar reinstalação mesmo se já estiver instalado"),
     manual: bool = typer.Option(False, "--manual", help="Mostrar instruções para instalação manual"),
-    no_test: bool = typer.Option(False, "--no-test", help="Não testar a instalação após completar")
+    no_test: bool = typer.Option(False, "--no-test", help="Não testar a instalação após completar"),
+    deep: bool = typer.Option(False, "--deep", help="Testar também executando um container"),
+    tuned: bool = typer.Option(False, "--tuned", help="Aplicar o perfil de desempenho no daemon.json"),
+    registry_mirrors: Optional[List[str]] = typer.Option(None, "--registry-mirror", help="Mirror de registry (pode repetir)")
 ) -> None:
     """
     Instala o Docker automaticamente baseado no sistema operacional detectado.
@@ -32,7 +41,7 @@ def install_docker(
         if check_only:
             print(":mag: [bold blue]Verificando instalação do Docker...[/bold blue]")
             print()
-            docker_installer.print_status()
+            docker_installer.print_status(docker_installer.check_installation(deep))
             return
         
         # Modo instruções manuais
@@ -42,10 +51,18 @@ def install_docker(
             docker_installer.get_manual_instructions()
             return
         
+        daemon_config = None
+        if tuned:
+            daemon_config = docker_installer.tuned_daemon_config(registry_mirrors)
+        elif registry_mirrors:
+            daemon_config = {"registry-mirrors": list(registry_mirrors)}
+        
         # Instalação automática
         success = docker_installer.install(
             force=force, 
-            test_after_install=not no_test
+            test_after_install=not no_test,
+            deep=deep,
+            daemon_config=daemon_config
         )
         
         if success:
@@ -89,19 +106,22 @@ def uninstall_docker() -> None:
         raise typer.Exit(code=1)
 
 
-def check_docker_status() -> None:
+def check_docker_status(deep: bool = False) -> None:
     """
     Verifica o status da instalação do Docker.
+    
+    Args:
+        deep: Testar também executando um container
     """
     try:
         docker_installer = DockerInstaller()
         
         print(":whale: [bold blue]Status do Docker[/bold blue]")
         print()
-        docker_installer.print_status()
+        info = docker_installer.check_installation(deep)
+        docker_installer.print_status(info)
         
         # Informações adicionais
-        info = docker_installer.check_installation()
         print()
         
         if info['installed'] and info['working']:
@@ -151,14 +171,36 @@ def system_info() -> None:
         raise typer.Exit(code=1)
 
 
-def install_azure_cli(force: bool = False, manual: bool = False) -> None:
+def install_azure_cli(
+    force: bool = False,
+    manual: bool = False,
+    prefix: Optional[Path] = None,
+    venv: Optional[bool] = None,
+    wheelhouse: Optional[str] = None,
+    version: Optional[str] = None,
+    extensions: Optional[List[str]] = None,
+    warm_up: bool = True
+) -> None:
     """
     Instala o Azure CLI automaticamente baseado no sistema operacional.
     
     Args:
         force: Forçar reinstalação mesmo se já estiver instalado
         manual: Mostrar instruções para instalação manual
+        prefix: Instalar em um virtualenv no prefixo do usuário, sem sudo
+        venv: Instalar em um virtualenv próprio (padrão: automático pelo wheelhouse)
+        wheelhouse: Diretório ou URL de wheels do azure-cli
+        version: Versão do pacote azure-cli (modo virtualenv)
+        extensions: Extensões a pré-instalar no aquecimento
+        warm_up: Aquecer o Azure CLI após a instalação (índice, bytecode, prompts)
     """
+    if prefix:
+        _install_to_prefix(
+            AzureCliInstaller(SystemDetector.detect()), prefix,
+            version=version, wheelhouse=wheelhouse, extensions=extensions, warm_up=warm_up
+        )
+        return
+    
     try:
         system_info = SystemDetector.detect()
         azure_installer = AzureCliInstaller(system_info)
@@ -177,12 +219,17 @@ def install_azure_cli(force: bool = False, manual: bool = False) -> None:
             version = azure_installer.get_installed_version()
             print(f":white_check_mark: Azure CLI já está instalado (versão {version})")
             
-            if not typer.confirm("Deseja reinstalar?"):
+            if not confirm("reinstall.az", "Deseja reinstalar?"):
+                if warm_up and extensions:
+                    azure_installer.warm_up(extensions)
                 return
         
         # Instalar Azure CLI
         print()
-        success = azure_installer.install()
+        success = azure_installer.install(
+            use_venv=venv, wheelhouse=wheelhouse, version=version,
+            extensions=extensions, warm_up=warm_up
+        )
         
         if success:
             print()
@@ -200,14 +247,33 @@ def install_azure_cli(force: bool = False, manual: bool = False) -> None:
         raise typer.Exit(code=1)
 
 
-def install_terraform(force: bool = False, manual: bool = False) -> None:
+def install_terraform(
+    force: bool = False,
+    manual: bool = False,
+    plugin_cache: bool = True,
+    providers_file: Optional[Path] = None,
+    provider_mirror: Optional[Path] = None,
+    prefix: Optional[Path] = None
+) -> None:
     """
     Instala o Terraform automaticamente baseado no sistema operacional.
     
     Args:
         force: Forçar reinstalação mesmo se já estiver instalado
         manual: Mostrar instruções para instalação manual
+        plugin_cache: Configurar o cache de plugins no ~/.terraformrc
+        providers_file: Lista de providers a pré-baixar para o mirror local
+        provider_mirror: Diretório do mirror de providers
+        prefix: Instalar no prefixo do usuário, sem sudo
     """
+    if prefix:
+        terraform_installer = TerraformInstaller(SystemDetector.detect())
+        _install_to_prefix(terraform_installer, prefix)
+        if plugin_cache:
+            print()
+            terraform_installer.configure_cli(providers_file, provider_mirror)
+        return
+    
     try:
         system_info = SystemDetector.detect()
         terraform_installer = TerraformInstaller(system_info)
@@ -226,7 +292,9 @@ def install_terraform(force: bool = False, manual: bool = False) -> None:
             version = terraform_installer.get_installed_version()
             print(f":white_check_mark: Terraform já está instalado (versão {version})")
             
-            if not typer.confirm("Deseja reinstalar?"):
+            if not confirm("reinstall.terraform", "Deseja reinstalar?"):
+                if plugin_cache:
+                    terraform_installer.configure_cli(providers_file, provider_mirror)
                 return
         
         # Instalar Terraform
@@ -234,6 +302,9 @@ def install_terraform(force: bool = False, manual: bool = False) -> None:
         success = terraform_installer.install()
         
         if success:
+            if plugin_cache:
+                print()
+                terraform_installer.configure_cli(providers_file, provider_mirror)
             print()
             print(":white_check_mark: [bold green]Terraform instalado com sucesso![/bold green]")
             print("Teste com: [cyan]terraform --version[/cyan]")
@@ -249,14 +320,19 @@ def install_terraform(force: bool = False, manual: bool = False) -> None:
         raise typer.Exit(code=1)
 
 
-def install_aws_cli(force: bool = False, manual: bool = False) -> None:
+def install_aws_cli(force: bool = False, manual: bool = False, prefix: Optional[Path] = None) -> None:
     """
     Instala o AWS CLI v2 automaticamente baseado no sistema operacional.
     
     Args:
         force: Forçar reinstalação mesmo se já estiver instalado
         manual: Mostrar instruções para instalação manual
+        prefix: Instalar no prefixo do usuário, sem sudo
     """
+    if prefix:
+        _install_to_prefix(AwsCliInstaller(SystemDetector.detect()), prefix)
+        return
+    
     try:
         system_info = SystemDetector.detect()
         aws_installer = AwsCliInstaller(system_info)
@@ -275,12 +351,13 @@ def install_aws_cli(force: bool = False, manual: bool = False) -> None:
             version = aws_installer.get_installed_version()
             print(f":white_check_mark: AWS CLI v2 já está instalado (versão {version})")
             
-            if not typer.confirm("Deseja reinstalar?"):
+            # No Linux a versão do pacote é comparada e só há reinstalação se for diferente
+            if not aws_installer.can_upgrade_in_place() and not confirm("reinstall.aws", "Deseja reinstalar?"):
                 return
         
         # Instalar AWS CLI
         print()
-        success = aws_installer.install()
+        success = aws_installer.install(force=force)
         
         if success:
             print()
@@ -295,4 +372,158 @@ def install_aws_cli(force: bool = False, manual: bool = False) -> None:
             
     except Exception as e:
         print(f":x: [bold red]Erro inesperado:[/bold red] {e}")
-        raise typer.Exit(code=1)
\ No newline at end of file
+        raise typer.Exit(code=1)
+
+
+def install_kubectl(
+    force: bool = False,
+    manual: bool = False,
+    version: Optional[str] = None,
+    prefix: Optional[Path] = None
+) -> None:
+    """
+    Instala o kubectl a partir do binário oficial (conferido com o .sha256).
+    
+    Args:
+        force: Forçar reinstalação mesmo se já estiver instalado
+        manual: Mostrar instruções para instalação manual
+        version: Versão (padrão: a estável atual)
+        prefix: Instalar no prefixo do usuário, sem sudo
+    """
+    if prefix:
+        _install_to_prefix(KubectlInstaller(SystemDetector.detect()), prefix, version=version)
+        return
+    
+    try:
+        system_info = SystemDetector.detect()
+        kubectl_installer = KubectlInstaller(system_info)
+        
+        print(":wheel_of_dharma: [bold blue]Instalação do kubectl[/bold blue]")
+        print(f"Sistema detectado: [green]{system_info}[/green]")
+        print()
+        
+        # Mostrar instruções manuais se solicitado
+        if manual:
+            kubectl_installer.print_manual_instructions()
+            return
+        
+        # Verificar se já está instalado
+        if not force and not version and kubectl_installer.is_installed():
+            installed = kubectl_installer.get_installed_version()
+            print(f":white_check_mark: kubectl já está instalado (versão {installed})")
+            
+            if not confirm("reinstall.kubectl", "Deseja reinstalar?"):
+                return
+        
+        success = kubectl_installer.install(version)
+        
+        if success:
+            print()
+            print("Teste com: [cyan]kubectl version --client[/cyan]")
+        else:
+            print()
+            kubectl_installer.print_manual_instructions()
+            raise typer.Exit(code=1)
+            
+    except typer.Exit:
+        raise
+    except Exception as e:
+        print(f":x: [bold red]Erro inesperado:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+
+def install_ansible(
+    force: bool = False,
+    manual: bool = False,
+    version: Optional[str] = None,
+    wheelhouse: Optional[str] = None,
+    prefix: Optional[Path] = None,
+    tuned: bool = False,
+    config_path: Optional[Path] = None,
+    dry_run: bool = False
+) -> None:
+    """
+    Instala o Ansible em um virtualenv próprio, a partir do wheelhouse.
+    
+    Args:
+        force: Forçar reinstalação mesmo se já estiver instalado
+        manual: Mostrar instruções para instalação manual
+        version: Versão do pacote ansible (padrão: a mais nova do wheelhouse ou do PyPI)
+        wheelhouse: Diretório ou URL de wheels
+        prefix: Instalar no prefixo do usuário, sem sudo
+        tuned: Aplicar o perfil de desempenho no ansible.cfg
+        config_path: ansible.cfg a configurar (padrão: ~/.ansible.cfg)
+        dry_run: Apenas mostrar o ansible.cfg resultante
+    """
+    if dry_run:
+        ansible_config = AnsibleConfig(config_path, SystemDetector.detect().cpu_count)
+        print(f":clipboard: [bold cyan]{ansible_config.path}[/bold cyan] (simulação)")
+        missing = ansible_config.missing()
+        print(f"Opções acrescentadas: {', '.join(option.split(' = ')[0] for option in missing) if missing else 'nenhuma'}")
+        typer.echo(ansible_config.plan(), nl=False)
+        return
+    
+    if prefix:
+        ansible_installer = AnsibleInstaller(SystemDetector.detect())
+        _install_to_prefix(ansible_installer, prefix, version=version, wheelhouse=wheelhouse)
+        if tuned and not ansible_installer.configure_performance(config_path):
+            raise typer.Exit(code=1)
+        return
+    
+    try:
+        system_info = SystemDetector.detect()
+        ansible_installer = AnsibleInstaller(system_info)
+        
+        print(":gear: [bold blue]Instalação do Ansible[/bold blue]")
+        print(f"Sistema detectado: [green]{system_info}[/green]")
+        print()
+        
+        # Mostrar instruções manuais se solicitado
+        if manual:
+            ansible_installer.print_manual_instructions()
+            return
+        
+        # Verificar se já está instalado
+        if not force and not version and ansible_installer.is_installed():
+            installed = ansible_installer.get_installed_version()
+            print(f":white_check_mark: Ansible já está instalado (ansible-core {installed})")
+            
+            if not confirm("reinstall.ansible", "Deseja reinstalar?"):
+                if tuned and not ansible_installer.configure_performance(config_path):
+                    raise typer.Exit(code=1)
+                return
+        
+        success = ansible_installer.install(version, wheelhouse)
+        if success and tuned:
+            success = ansible_installer.configure_performance(config_path)
+        
+        if success:
+            print()
+            print("Teste com: [cyan]ansible --version[/cyan]")
+        else:
+            print()
+            ansible_installer.print_manual_instructions()
+            raise typer.Exit(code=1)
+            
+    except typer.Exit:
+        raise
+    except Exception as e:
+        print(f":x: [bold red]Erro inesperado:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+
+def _install_to_prefix(installer, prefix: Path, **options) -> None:
+    """
+    Instala uma ferramenta no prefixo do usuário e mostra o ajuste do PATH.
+    
+    Args:
+        installer: Instalador com `install_to_prefix`
+        prefix: Diretório do prefixo
+        **options: Argumentos extras de `install_to_prefix` (ex: version)
+    """
+    prefix = prefix.expanduser().resolve()
+    on_path = activate_prefix(prefix)
+    if not installer.install_to_prefix(prefix, **options):
+        raise typer.Exit(code=1)
+    if not on_path:
+        print_path_snippet(prefix)
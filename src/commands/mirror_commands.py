@@ -0,0 +1,61 @@
+"""Comandos do ranking de mirrors dos repositórios."""
+
+from typing import List, Optional
+
+import typer
+from rich import print
+from rich.console import Console
+from rich.table import Table
+
+from ..network.mirror_selection import MIRRORS_CONFIG, get_mirror_selector
+
+
+def show_mirrors(repos: Optional[List[str]] = None, refresh: bool = False) -> None:
+    """
+    Mede (ou lê do cache) e mostra o ranking de mirrors de cada repositório.
+
+    Args:
+        repos: Repositórios desejados (None para todos)
+        refresh: Medir novamente, ignorando o ranking em cache
+    """
+    selector = get_mirror_selector()
+    unknown = [name for name in repos or [] if name not in selector.groups]
+    if unknown:
+        print(f":x: [red]Repositório desconhecido: {', '.join(unknown)}[/red]")
+        print(f"Disponíveis: {', '.join(selector.groups)}")
+        raise typer.Exit(1)
+
+    print(":stopwatch: [bold cyan]Medindo mirrors...[/bold cyan]" if refresh else
+          ":stopwatch: [bold cyan]Ranking de mirrors (em cache por 24h)[/bold cyan]")
+    rankings = selector.rank(repos, refresh=refresh)
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Repositório", style="cyan")
+    table.add_column("#", justify="right", width=3)
+    table.add_column("Mirror")
+    table.add_column("Conexão", justify="right")
+    table.add_column("Vazão", justify="right")
+    table.add_column("Status")
+
+    for name, results in rankings.items():
+        for position, result in enumerate(results, 1):
+            if not result.healthy:
+                status = f"[red]✗ {result.error}[/red]"
+            elif len(results) == 1:
+                status = "[dim]só a origem[/dim]"
+            elif position == 1:
+                status = "[green]✓ escolhido[/green]"
+            else:
+                status = "[green]✓[/green]"
+            measured = result.transfer_time > 0
+            table.add_row(
+                name if position == 1 else "",
+                str(position),
+                result.url,
+                f"{result.connect_time * 1000:.0f} ms" if measured else "-",
+                f"{result.throughput / 1024:.0f} KB/s" if measured else "-",
+                status
+            )
+
+    Console().print(table)
+    print(f"[dim]Candidatos configuráveis em {MIRRORS_CONFIG}[/dim]")
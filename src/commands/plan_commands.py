@@ -0,0 +1,104 @@
+"""Comandos para geração do plano de instalação consolidado."""
+
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich import print
+from rich.console import Console
+from rich.table import Table
+
+from ..system.install_plan import InstallPlan
+from ..system.system_detector import SystemDetector, SystemInfo, OperatingSystem
+from ..config.constants import Tool, DEVOPS_TOOLS_CONFIG
+
+
+def parse_tool_names(names: Optional[List[str]]) -> List[Tool]:
+    """
+    Converte nomes de ferramentas em `Tool`, avisando sobre nomes desconhecidos.
+
+    Args:
+        names: Nomes informados pelo usuário (None para todas)
+
+    Returns:
+        List[Tool]: Ferramentas válidas, ordenadas por prioridade
+    """
+    if not names:
+        return sorted(Tool, key=lambda t: DEVOPS_TOOLS_CONFIG[t]["priority"])
+
+    tools = []
+    for name in names:
+        try:
+            tools.append(Tool(name.strip().lower()))
+        except ValueError:
+            print(f":warning: [yellow]Ferramenta desconhecida: {name}[/yellow]")
+    return sorted(set(tools), key=lambda t: DEVOPS_TOOLS_CONFIG[t]["priority"])
+
+
+def show_plan(
+    tools: Optional[List[str]] = None,
+    emit_shell: bool = False,
+    output: Optional[Path] = None,
+    target_os: Optional[str] = None
+) -> None:
+    """
+    Mostra o plano de instalação consolidado ou exporta como script shell.
+
+    Args:
+        tools: Ferramentas a incluir (None para todas)
+        emit_shell: Exportar o plano como script POSIX
+        output: Arquivo de destino do script (stdout se omitido)
+        target_os: Sistema alvo (padrão: sistema detectado)
+    """
+    system_info = SystemDetector.detect()
+    if target_os:
+        try:
+            system_info = SystemInfo(OperatingSystem(target_os.lower()), system_info.architecture)
+        except ValueError:
+            print(f":x: [red]Sistema desconhecido: {target_os}[/red]")
+            raise typer.Exit(1)
+
+    selected_tools = parse_tool_names(tools)
+    if not selected_tools:
+        print(":x: [red]Nenhuma ferramenta válida especificada[/red]")
+        raise typer.Exit(1)
+
+    try:
+        plan = InstallPlan(system_info, selected_tools)
+    except ValueError as e:
+        print(f":x: [red]{e}[/red]")
+        raise typer.Exit(1)
+
+    if emit_shell:
+        script = plan.to_shell()
+        if output:
+            output.write_text(script)
+            output.chmod(0o755)
+            print(f":white_check_mark: [green]Script gerado em {output}[/green]")
+        else:
+            # Escrita direta para permitir redirecionamento (ex: > setup.sh)
+            typer.echo(script, nl=False)
+        return
+
+    print(f":clipboard: [bold cyan]Plano de instalação para {system_info}[/bold cyan]")
+    print(f"Gerenciador de pacotes: [blue]{plan.package_manager}[/blue]")
+    print(f"Ferramentas: {', '.join(DEVOPS_TOOLS_CONFIG[t]['name'] for t in plan.tools)}")
+    print()
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("#", justify="right", width=3)
+    table.add_column("Etapa", width=40)
+    table.add_column("Root", justify="center", width=6)
+    table.add_column("Comandos", justify="right", width=9)
+
+    for index, step in enumerate(plan.steps(), 1):
+        table.add_row(
+            str(index),
+            step.title,
+            "✓" if step.privileged else "",
+            str(len(step.commands))
+        )
+
+    Console().print(table)
+    print()
+    print(":information: [blue]Use --emit-shell para exportar o plano como script POSIX[/blue]")
@@ -0,0 +1,29 @@
+"""Comandos de configuração do Terraform já instalado (cache de providers, versões)."""
+
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from ..system.installers.terraform_installer import TerraformInstaller
+from ..system.system_detector import SystemDetector
+
+
+def configure_terraform(
+    providers_file: Optional[Path] = None,
+    mirror_dir: Optional[Path] = None,
+    config_path: Optional[Path] = None,
+    dry_run: bool = False
+) -> None:
+    """
+    Configura o cache de plugins e o mirror local de providers.
+
+    Args:
+        providers_file: Lista de providers a pré-baixar para o mirror
+        mirror_dir: Diretório do mirror (um mirror existente pode ser usado sem lista)
+        config_path: Outro arquivo de configuração (ex: arquivo de teste)
+        dry_run: Apenas mostrar o arquivo resultante
+    """
+    terraform_installer = TerraformInstaller(SystemDetector.detect())
+    if not terraform_installer.configure_cli(providers_file, mirror_dir, config_path, dry_run):
+        raise typer.Exit(1)
@@ -0,0 +1,142 @@
+"""Comandos do armazém de versões (~/.leme/tools ou, com --system, /opt/leme/tools): troca de versão e limpeza."""
+
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich import print
+from rich.console import Console
+from rich.table import Table
+
+from ..system.installers.ansible_installer import AnsibleInstaller
+from ..system.installers.aws_cli_installer import AwsCliInstaller
+from ..system.installers.kubectl_installer import KubectlInstaller
+from ..system.installers.terraform_installer import TerraformInstaller
+from ..system.system_detector import SystemDetector
+from ..system.tool_store import SYSTEM_HOME
+
+
+# Ferramentas com armazém de versões
+VERSIONED_TOOLS = {
+    "terraform": TerraformInstaller,
+    "kubectl": KubectlInstaller,
+    "aws-cli": AwsCliInstaller,
+    "ansible": AnsibleInstaller,
+}
+
+
+def _get_installer(tool: str):
+    """Retorna o instalador de uma ferramenta com armazém de versões."""
+    installer_class = VERSIONED_TOOLS.get(tool)
+    if not installer_class:
+        print(f":x: [red]Ferramenta sem suporte a versões: {tool}[/red] (disponíveis: {', '.join(VERSIONED_TOOLS)})")
+        raise typer.Exit(1)
+    return installer_class(SystemDetector.detect())
+
+
+def _store_prefix(system: bool) -> Optional[Path]:
+    """Prefixo do armazém: o do sistema (/opt/leme) ou o do usuário (~/.leme)."""
+    return SYSTEM_HOME if system else None
+
+
+def _check_path(shim: str, binary: str) -> None:
+    """Avisa se o shim não é o executável encontrado primeiro no PATH."""
+    found = shutil.which(binary)
+    if found and os.path.realpath(found) == os.path.realpath(shim):
+        return
+    print()
+    print(f":information_source: [cyan]Para usar esta versão, coloque {os.path.dirname(shim)} no início do PATH:[/cyan]")
+    print(f'  [green]export PATH="{os.path.dirname(shim)}:$PATH"[/green]')
+
+
+def use_tool(tool: str, version: str, system: bool = False) -> None:
+    """
+    Ativa uma versão de uma ferramenta (baixando-a na primeira vez).
+
+    Args:
+        tool: Ferramenta (ex: terraform)
+        version: Versão (ex: 1.6.6)
+        system: Trocar a versão do armazém do sistema, usada por todos os usuários
+    """
+    installer = _get_installer(tool)
+    prefix = _store_prefix(system)
+    store = installer.get_store(prefix)
+    try:
+        cached = store.has(version)
+    except ValueError as e:
+        print(f":x: [red]{e}[/red]")
+        raise typer.Exit(1)
+
+    start = time.monotonic()
+    if not installer.use_version(version, prefix):
+        raise typer.Exit(1)
+    elapsed = time.monotonic() - start
+    if system:
+        try:
+            store.link_system_binaries()
+        except subprocess.CalledProcessError as e:
+            print(f":x: [red]Não foi possível ligar os executáveis em /usr/local/bin: {e.stderr or e}[/red]")
+            raise typer.Exit(1)
+
+    timing = f"{elapsed * 1000:.0f} ms" if cached else f"{elapsed:.1f}s, download incluído"
+    print(f":white_check_mark: [green]{tool} {version} ativo[/green] [dim]({timing})[/dim]")
+    _check_path(str(store.shim_path()), store.binaries[0])
+
+
+def list_tool_versions(tool: str, system: bool = False) -> None:
+    """
+    Lista as versões instaladas de uma ferramenta.
+
+    Args:
+        tool: Ferramenta
+        system: Listar o armazém do sistema
+    """
+    store = _get_installer(tool).get_store(_store_prefix(system))
+    versions = store.versions()
+    if not versions:
+        print(f"Nenhuma versão de {tool} em {store.root}")
+        return
+
+    current = store.current()
+    table = Table(title=tool)
+    table.add_column("Versão", style="cyan")
+    table.add_column("Ativa", justify="center")
+    table.add_column("Tamanho", justify="right")
+    for version in reversed(versions):
+        table.add_row(version, "✓" if version == current else "", f"{store.size(version) / 1024 / 1024:.1f} MB")
+    Console().print(table)
+    print(f"[dim]{store.root}[/dim]")
+
+
+def gc_tools(tool: str, keep: Optional[List[str]] = None, dry_run: bool = False, system: bool = False) -> None:
+    """
+    Remove as versões que não estão em uso.
+
+    Args:
+        tool: Ferramenta
+        keep: Versões a manter além da ativa
+        dry_run: Apenas listar o que seria removido
+        system: Limpar o armazém do sistema
+    """
+    store = _get_installer(tool).get_store(_store_prefix(system))
+    unused = store.unused(keep)
+    if not unused:
+        print(f"  [dim]↷ Nenhuma versão de {tool} para remover[/dim]")
+        return
+
+    freed = 0
+    for version in unused:
+        size = store.size(version)
+        if dry_run:
+            print(f"  [yellow]-[/yellow] {tool} {version} ({size / 1024 / 1024:.0f} MB)")
+            continue
+        store.remove(version)
+        freed += size
+        print(f"  [green]✓[/green] {tool} {version} removido")
+
+    if not dry_run:
+        print(f":broom: [green]{freed / 1024 / 1024:.0f} MB liberados[/green] (ativa: {store.current() or 'nenhuma'})")
@@ -0,0 +1,105 @@
+"""Arquivo de estado desejado (`leme apply`): ferramentas e versões declaradas."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from .constants import Tool
+from .toml_support import ConfigFileError, load_toml
+
+
+# Nomes alternativos aceitos (os mesmos dos comandos `install`)
+TOOL_ALIASES = {
+    "azure-cli": Tool.AZURE_CLI,
+    "aws-cli": Tool.AWS_CLI
+}
+
+
+def resolve_tool_name(name: str) -> Tool:
+    """
+    Converte um nome de ferramenta (valor do enum ou alias) em `Tool`.
+
+    Args:
+        name: Nome informado (ex: "terraform", "az", "azure-cli")
+
+    Returns:
+        Tool: Ferramenta correspondente
+
+    Raises:
+        ValueError: Se o nome não corresponder a nenhuma ferramenta
+    """
+    key = name.strip().lower()
+    if key in TOOL_ALIASES:
+        return TOOL_ALIASES[key]
+    return Tool(key)
+
+
+@dataclass
+class DesiredState:
+    """Ferramentas desejadas e a especificação de versão de cada uma."""
+    tools: Dict[Tool, str] = field(default_factory=dict)
+    source: Optional[Path] = None
+
+
+def load_desired_state(path: Path) -> DesiredState:
+    """
+    Carrega o estado desejado de um arquivo TOML.
+
+    Formato:
+
+        [tools]
+        docker = "*"                          # qualquer versão
+        terraform = ">=1.6"                   # restrição
+        kubectl = { version = "1.28" }        # prefixo de versão
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        DesiredState: Estado desejado
+
+    Raises:
+        ConfigFileError: Se o arquivo for inválido
+    """
+    data = load_toml(path)
+    tools_section = data.get("tools")
+    if not isinstance(tools_section, dict) or not tools_section:
+        raise ConfigFileError(f"{path}: seção [tools] ausente ou vazia")
+
+    return DesiredState(tools=parse_tools_section(tools_section, path), source=path)
+
+
+def parse_tools_section(section: Dict, path: Path) -> Dict[Tool, str]:
+    """
+    Converte a seção [tools] em especificações de versão por ferramenta.
+
+    Args:
+        section: Conteúdo da seção
+        path: Arquivo de origem (para mensagens de erro)
+
+    Returns:
+        Dict[Tool, str]: Especificação de versão de cada ferramenta
+
+    Raises:
+        ConfigFileError: Se houver ferramenta ou versão inválida
+    """
+    tools = {}
+    for name, spec in section.items():
+        try:
+            tool = resolve_tool_name(name)
+        except ValueError:
+            raise ConfigFileError(f"{path}: ferramenta desconhecida '{name}'")
+
+        if isinstance(spec, dict):
+            spec = spec.get("version", "*")
+        if isinstance(spec, bool):
+            # true = qualquer versão; false = ferramenta não gerenciada
+            if not spec:
+                continue
+            spec = "*"
+        if not isinstance(spec, str):
+            raise ConfigFileError(f"{path}: versão inválida para '{name}': {spec!r}")
+
+        tools[tool] = spec.strip()
+
+    return tools
@@ -0,0 +1,76 @@
+"""Perfil de respostas (`--profile curso.toml`) para execução sem interação."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from .constants import Tool
+from .desired_state import parse_tools_section
+from .toml_support import ConfigFileError, load_toml
+
+
+@dataclass
+class Profile:
+    """Ferramentas do curso e respostas pré-definidas para os prompts."""
+    tools: Dict[Tool, str] = field(default_factory=dict)
+    answers: Dict[str, bool] = field(default_factory=dict)
+    source: Optional[Path] = None
+
+
+def _flatten_answers(section: Dict, prefix: str = "") -> Dict[str, bool]:
+    """Converte tabelas aninhadas ([answers.docker]) em chaves pontuadas."""
+    answers = {}
+    for key, value in section.items():
+        full_key = f"{prefix}{key}".lower()
+        if isinstance(value, dict):
+            answers.update(_flatten_answers(value, full_key + "."))
+        elif isinstance(value, bool):
+            answers[full_key] = value
+        else:
+            raise ConfigFileError(f"Resposta inválida para '{full_key}': use true ou false")
+    return answers
+
+
+def load_profile(path: Path) -> Profile:
+    """
+    Carrega um perfil de respostas.
+
+    Formato:
+
+        [tools]                      # mesmo formato do `apply`
+        docker = "*"
+        terraform = ">=1.6"
+
+        [answers]
+        reinstall = false            # todos os "Deseja reinstalar?"
+        docker.add_user_to_group = true
+
+    As ferramentas listadas em [tools] respondem "sim" à pergunta de
+    instalação do setup-environment; as demais respondem "não".
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        Profile: Perfil carregado
+
+    Raises:
+        ConfigFileError: Se o arquivo for inválido
+    """
+    data = load_toml(path)
+    profile = Profile(source=path)
+
+    tools_section = data.get("tools", {})
+    if not isinstance(tools_section, dict):
+        raise ConfigFileError(f"{path}: [tools] deve ser uma tabela")
+    profile.tools = parse_tools_section(tools_section, path)
+
+    answers_section = data.get("answers", {})
+    if not isinstance(answers_section, dict):
+        raise ConfigFileError(f"{path}: [answers] deve ser uma tabela")
+    try:
+        profile.answers = _flatten_answers(answers_section)
+    except ConfigFileError as e:
+        raise ConfigFileError(f"{path}: {e}")
+
+    return profile
@@ -0,0 +1,41 @@
+"""Leitura de arquivos TOML (tomllib no Python 3.11+, tomli nas versões anteriores)."""
+
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+class ConfigFileError(Exception):
+    """Erro ao ler ou validar um arquivo de configuração."""
+
+
+def load_toml(path: Path) -> Dict[str, Any]:
+    """
+    Carrega um arquivo TOML.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        Dict[str, Any]: Conteúdo do arquivo
+
+    Raises:
+        ConfigFileError: Se o arquivo não existir, for inválido ou não houver parser TOML
+    """
+    if tomllib is None:
+        raise ConfigFileError("Leitura de TOML requer Python 3.11+ ou o pacote 'tomli' (pip install tomli)")
+
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        raise ConfigFileError(f"Arquivo não encontrado: {path}")
+    except tomllib.TOMLDecodeError as e:
+        raise ConfigFileError(f"TOML inválido em {path}: {e}")
@@ -0,0 +1,81 @@
+"""Inventário de hosts do modo frota."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class Host:
+    """Host acessível por SSH."""
+    address: str
+    user: Optional[str] = None
+    port: int = 22
+
+    @property
+    def name(self) -> str:
+        """Nome de exibição (ex: aluno@lab-01:2222)."""
+        target = f"{self.user}@{self.address}" if self.user else self.address
+        return target if self.port == 22 else f"{target}:{self.port}"
+
+    @classmethod
+    def parse(cls, spec: str) -> "Host":
+        """
+        Converte uma linha do inventário em `Host`.
+
+        Args:
+            spec: Host no formato [usuario@]endereco[:porta]
+
+        Returns:
+            Host: Host correspondente
+
+        Raises:
+            ValueError: Se a linha for inválida
+        """
+        spec = spec.strip()
+        user = None
+        if "@" in spec:
+            user, spec = spec.split("@", 1)
+
+        port = 22
+        if spec.count(":") == 1:
+            spec, port_text = spec.split(":")
+            if not port_text.isdigit():
+                raise ValueError(f"Porta inválida: {port_text}")
+            port = int(port_text)
+
+        if not spec or any(c.isspace() for c in spec):
+            raise ValueError(f"Host inválido: {spec!r}")
+
+        return cls(address=spec, user=user or None, port=port)
+
+
+def load_inventory(path: Path) -> List[Host]:
+    """
+    Carrega o inventário: um host por linha, `#` inicia comentário.
+
+    Args:
+        path: Arquivo de inventário
+
+    Returns:
+        List[Host]: Hosts sem duplicatas, na ordem do arquivo
+
+    Raises:
+        ValueError: Se alguma linha for inválida
+        OSError: Se o arquivo não puder ser lido
+    """
+    hosts = []
+    seen = set()
+    with open(path, "r") as f:
+        for number, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                host = Host.parse(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}")
+            if host not in seen:
+                seen.add(host)
+                hosts.append(host)
+    return hosts
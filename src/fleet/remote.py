@@ -0,0 +1,99 @@
+"""Scripts executados nos hosts remotos e interpretação das suas saídas.
+
+Os scripts são POSIX `sh` puro e chegam pelo stdin da sessão SSH, então os
+hosts não precisam de Python nem de uma cópia da CLI.
+"""
+
+import shlex
+from typing import Dict, Tuple
+
+from ..config.constants import Tool, DEVOPS_TOOLS_CONFIG
+from ..system.environment_manager import EnvironmentManager, ToolStatus
+from ..system.system_detector import SystemDetector, SystemInfo
+
+
+SECTION_MARKER = "@@leme"
+
+# Comando remoto que executa um script recebido pelo stdin
+RUN_SCRIPT_COMMAND = "sh -s"
+
+
+def build_probe_script() -> str:
+    """
+    Gera o script que coleta os dados do sistema e verifica as ferramentas.
+
+    Executa os mesmos comandos de `EnvironmentManager.check_tool`, em uma
+    única ida e volta.
+
+    Returns:
+        str: Script POSIX
+    """
+    lines = [
+        "# leme-probe",
+        f"echo '{SECTION_MARKER} os-release'",
+        "cat /etc/os-release 2>/dev/null",
+        f"echo '{SECTION_MARKER} machine'",
+        "uname -m",
+        f"echo '{SECTION_MARKER} proc-version'",
+        "cat /proc/version 2>/dev/null",
+        f"echo '{SECTION_MARKER} nproc'",
+        "nproc 2>/dev/null",
+        "leme_probe() {",
+        '    tool="$1"; shift',
+        '    out=$("$@" 2>&1); rc=$?',
+        f'    printf \'%s tool %s %s\\n%s\\n\' \'{SECTION_MARKER}\' "$tool" "$rc" "$out"',
+        "}",
+    ]
+    for tool in Tool:
+        command = " ".join(shlex.quote(part) for part in DEVOPS_TOOLS_CONFIG[tool]["check_command"])
+        lines.append(f"leme_probe {tool.value} {command}")
+    return "\n".join(lines) + "\n"
+
+
+def parse_probe_output(output: str, env_manager: EnvironmentManager) -> Tuple[SystemInfo, Dict[Tool, ToolStatus]]:
+    """
+    Interpreta a saída do script de verificação.
+
+    Args:
+        output: Saída do script
+        env_manager: Gerenciador usado para extrair as versões
+
+    Returns:
+        Tuple[SystemInfo, Dict[Tool, ToolStatus]]: Sistema do host e status das ferramentas
+    """
+    sections: Dict[str, list] = {}
+    tool_codes: Dict[str, int] = {}
+    current = None
+
+    for line in output.splitlines():
+        if line.startswith(SECTION_MARKER + " "):
+            parts = line.split()
+            if parts[1] == "tool" and len(parts) == 4:
+                current = f"tool:{parts[2]}"
+                tool_codes[parts[2]] = int(parts[3]) if parts[3].lstrip("-").isdigit() else 1
+            else:
+                current = parts[1]
+            sections[current] = []
+        elif current:
+            sections[current].append(line)
+
+    system_info = SystemDetector.from_facts(
+        "\n".join(sections.get("os-release", [])),
+        "\n".join(sections.get("machine", [])),
+        "\n".join(sections.get("proc-version", [])),
+        "\n".join(sections.get("nproc", []))
+    )
+
+    statuses = {}
+    for tool in Tool:
+        text = "\n".join(sections.get(f"tool:{tool.value}", []))
+        if tool.value not in tool_codes:
+            statuses[tool] = ToolStatus(tool=tool, installed=False, error="Sem resposta")
+            continue
+        returncode = tool_codes[tool.value]
+        if returncode == 0:
+            statuses[tool] = env_manager.status_from_output(tool, 0, text)
+        else:
+            statuses[tool] = env_manager.status_from_output(tool, returncode, "", text)
+
+    return system_info, statuses
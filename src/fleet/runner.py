@@ -0,0 +1,161 @@
+"""Execução concorrente do setup e da verificação em vários hosts."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .inventory import Host
+from .remote import RUN_SCRIPT_COMMAND, build_probe_script, parse_probe_output
+from .transport import Transport
+from ..config.constants import Tool
+from ..system.environment_manager import EnvironmentManager, ToolStatus
+from ..system.install_plan import InstallPlan
+from ..system.system_detector import SystemInfo
+
+
+PROBE_TIMEOUT = 60
+APPLY_TIMEOUT = 1800  # 30 minutos por host
+
+
+@dataclass
+class HostResult:
+    """Resultado da execução em um host."""
+    host: Host
+    ok: bool
+    statuses: Dict[Tool, ToolStatus] = field(default_factory=dict)
+    system_info: Optional[SystemInfo] = None
+    installed: List[Tool] = field(default_factory=list)
+    error: Optional[str] = None
+    duration: float = 0.0
+    probe_latency: float = 0.0
+
+
+class HostError(Exception):
+    """Falha em uma etapa de um host."""
+
+
+class FleetRunner:
+    """Executa operações em vários hosts com paralelismo limitado."""
+
+    def __init__(
+        self,
+        transport: Transport,
+        parallel: int = 10,
+        on_update: Optional[Callable[[Host, str], None]] = None
+    ):
+        """
+        Inicializa o executor.
+
+        Args:
+            transport: Transporte usado para falar com os hosts
+            parallel: Número máximo de hosts simultâneos
+            on_update: Chamado a cada mudança de etapa (host, etapa)
+        """
+        self.transport = transport
+        self.parallel = max(1, parallel)
+        self.on_update = on_update or (lambda host, stage: None)
+        self.env_manager = EnvironmentManager()
+        self.probe_script = build_probe_script()
+
+    def _probe(self, host: Host, result: HostResult) -> None:
+        """Coleta sistema e status das ferramentas do host."""
+        start = time.monotonic()
+        response = self.transport.run(host, RUN_SCRIPT_COMMAND, input=self.probe_script, timeout=PROBE_TIMEOUT)
+        result.probe_latency = time.monotonic() - start
+
+        if response.returncode != 0:
+            raise HostError(_last_line(response.stderr) or f"verificação falhou (código {response.returncode})")
+
+        result.system_info, result.statuses = parse_probe_output(response.stdout, self.env_manager)
+
+    def status_host(self, host: Host) -> HostResult:
+        """
+        Verifica as ferramentas de um host.
+
+        Args:
+            host: Host a verificar
+
+        Returns:
+            HostResult: Resultado da verificação
+        """
+        result = HostResult(host=host, ok=False)
+        start = time.monotonic()
+        try:
+            self.on_update(host, "verificando")
+            self._probe(host, result)
+            result.ok = True
+        except HostError as e:
+            result.error = str(e)
+        result.duration = time.monotonic() - start
+        self.on_update(host, "concluído" if result.ok else "falhou")
+        return result
+
+    def apply_host(self, host: Host, tools: List[Tool]) -> HostResult:
+        """
+        Instala no host as ferramentas que faltam e verifica o resultado.
+
+        O plano consolidado (`InstallPlan`) é gerado para o sistema detectado
+        no host e enviado como script pelo stdin da sessão SSH.
+
+        Args:
+            host: Host de destino
+            tools: Ferramentas desejadas
+
+        Returns:
+            HostResult: Resultado do setup
+        """
+        result = HostResult(host=host, ok=False)
+        start = time.monotonic()
+        try:
+            self.on_update(host, "verificando")
+            self._probe(host, result)
+
+            missing = [t for t in tools if not result.statuses[t].installed]
+            if missing:
+                try:
+                    script = InstallPlan(result.system_info, missing).to_shell()
+                except ValueError as e:
+                    raise HostError(str(e))
+
+                self.on_update(host, f"instalando {len(missing)}")
+                response = self.transport.run(host, RUN_SCRIPT_COMMAND, input=script, timeout=APPLY_TIMEOUT)
+                if response.returncode != 0:
+                    raise HostError(_last_line(response.stderr) or f"plano falhou (código {response.returncode})")
+
+                self.on_update(host, "confirmando")
+                self._probe(host, result)
+                result.installed = [t for t in missing if result.statuses[t].installed]
+
+            still_missing = [t for t in tools if not result.statuses[t].installed]
+            if still_missing:
+                raise HostError(f"ainda faltam: {', '.join(t.value for t in still_missing)}")
+            result.ok = True
+        except HostError as e:
+            result.error = str(e)
+
+        result.duration = time.monotonic() - start
+        self.on_update(host, "concluído" if result.ok else "falhou")
+        return result
+
+    def run_all(self, hosts: List[Host], operation: Callable[[Host], HostResult]) -> List[HostResult]:
+        """
+        Executa uma operação em todos os hosts, no máximo `parallel` por vez.
+
+        Args:
+            hosts: Hosts de destino
+            operation: Operação por host (ex: `status_host`)
+
+        Returns:
+            List[HostResult]: Resultados na ordem dos hosts
+        """
+        for host in hosts:
+            self.on_update(host, "na fila")
+        with ThreadPoolExecutor(max_workers=min(self.parallel, max(1, len(hosts)))) as executor:
+            return list(executor.map(operation, hosts))
+
+
+def _last_line(text: str) -> str:
+    """Retorna a última linha não vazia de uma saída de erro."""
+    lines = [line.strip() for line in (text or "").splitlines() if line.strip()]
+    return lines[-1] if lines else ""
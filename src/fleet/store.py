@@ -0,0 +1,178 @@
+"""Armazenamento local (SQLite) dos resultados de verificação da frota."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .inventory import Host
+from .runner import HostResult
+from ..config.constants import Tool
+from ..system.environment_manager import ToolStatus
+from ..system.step_journal import STATE_DIR
+from ..system.version_utils import version_satisfies
+
+
+DEFAULT_STORE_PATH = STATE_DIR / "fleet.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    system TEXT,
+    ok INTEGER NOT NULL,
+    error TEXT,
+    probe_latency REAL,
+    probed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tools (
+    host TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    installed INTEGER NOT NULL,
+    version TEXT,
+    probed_at REAL NOT NULL,
+    PRIMARY KEY (host, tool)
+);
+CREATE INDEX IF NOT EXISTS tools_by_tool ON tools (tool, installed);
+"""
+
+
+class FleetStore:
+    """Último resultado de verificação de cada host e ferramenta."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Abre (ou cria) o banco.
+
+        Args:
+            path: Arquivo do banco (padrão: ~/.local/state/leme/fleet.db)
+        """
+        self.path = path or DEFAULT_STORE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        # Permite filtrar versões no próprio SQL (ex: terraform < 1.6)
+        self._conn.create_function("version_satisfies", 2, lambda v, spec: int(version_satisfies(v, spec)))
+        self._lock = threading.Lock()
+
+    def record(self, result: HostResult) -> None:
+        """
+        Grava o resultado de um host (substitui o anterior).
+
+        Se a verificação falhou, os dados das ferramentas anteriores são
+        mantidos e apenas o estado do host é atualizado. A latência é a da
+        verificação inteira (um comando por host), e fica só na tabela hosts.
+
+        Args:
+            result: Resultado da verificação
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hosts VALUES (?, ?, ?, ?, ?, ?)",
+                (result.host.name, str(result.system_info) if result.system_info else None,
+                 int(result.ok), result.error, result.probe_latency, now)
+            )
+            if result.statuses:
+                # Colunas explícitas: bancos antigos ainda têm tools.probe_latency
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO tools (host, tool, installed, version, probed_at) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (result.host.name, tool.value, int(status.installed), status.version, now)
+                        for tool, status in result.statuses.items()
+                    ]
+                )
+
+    def stale_hosts(self, hosts: List[Host], ttl: float) -> List[Host]:
+        """
+        Filtra os hosts sem verificação bem-sucedida mais recente que o TTL.
+
+        Args:
+            hosts: Hosts do inventário
+            ttl: Validade dos dados em segundos
+
+        Returns:
+            List[Host]: Hosts que precisam ser verificados novamente
+        """
+        limit = time.time() - ttl
+        with self._lock:
+            fresh = {
+                row[0] for row in self._conn.execute(
+                    "SELECT host FROM hosts WHERE ok = 1 AND probed_at >= ?", (limit,)
+                )
+            }
+        return [host for host in hosts if host.name not in fresh]
+
+    def load(self, hosts: List[Host]) -> List[HostResult]:
+        """
+        Monta os resultados armazenados dos hosts informados.
+
+        Args:
+            hosts: Hosts desejados
+
+        Returns:
+            List[HostResult]: Resultados (hosts nunca verificados aparecem com erro)
+        """
+        with self._lock:
+            host_rows = {row[0]: row for row in self._conn.execute("SELECT * FROM hosts")}
+            tool_rows: Dict[str, Dict[Tool, ToolStatus]] = {}
+            for host, tool, installed, version in self._conn.execute("SELECT host, tool, installed, version FROM tools"):
+                try:
+                    status = ToolStatus(tool=Tool(tool), installed=bool(installed), version=version)
+                except ValueError:
+                    continue
+                tool_rows.setdefault(host, {})[status.tool] = status
+
+        results = []
+        for host in hosts:
+            row = host_rows.get(host.name)
+            if not row:
+                results.append(HostResult(host=host, ok=False, error="nunca verificado"))
+                continue
+            results.append(HostResult(
+                host=host,
+                ok=bool(row[2]),
+                error=row[3],
+                probe_latency=row[4] or 0.0,
+                statuses=tool_rows.get(host.name, {})
+            ))
+        return results
+
+    def hosts_missing(self, tool: Tool) -> List[str]:
+        """
+        Lista os hosts em que a ferramenta não está instalada.
+
+        Args:
+            tool: Ferramenta
+
+        Returns:
+            List[str]: Nomes dos hosts
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT host FROM tools WHERE tool = ? AND installed = 0 ORDER BY host", (tool.value,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def hosts_matching(self, tool: Tool, spec: str) -> List[Dict]:
+        """
+        Lista os hosts com a ferramenta instalada em versão que satisfaz a especificação.
+
+        Args:
+            tool: Ferramenta
+            spec: Especificação de versão (ex: "<1.6", ">=2,<3")
+
+        Returns:
+            List[Dict]: Host, versão e data da verificação
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT host, version, probed_at FROM tools "
+                "WHERE tool = ? AND installed = 1 AND version_satisfies(version, ?) ORDER BY host",
+                (tool.value, spec)
+            ).fetchall()
+        return [{"host": host, "version": version, "probed_at": probed_at} for host, version, probed_at in rows]
+
+    def close(self) -> None:
+        """Fecha o banco."""
+        self._conn.close()
@@ -0,0 +1,209 @@
+"""Transportes do modo frota: SSH real e um transporte falso em processo.
+
+O transporte só sabe executar um comando em um host, opcionalmente com
+dados no stdin. O transporte falso simula centenas de hosts com latência
+injetada, para testar o modo frota sem máquinas reais.
+"""
+
+import random
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .inventory import Host
+from .remote import SECTION_MARKER
+from ..config.constants import Tool, DEVOPS_TOOLS_CONFIG
+
+
+@dataclass
+class CommandResult:
+    """Resultado de um comando remoto."""
+    returncode: int
+    stdout: str = ""
+    stderr: str = ""
+
+
+class Transport:
+    """Interface dos transportes."""
+
+    def run(self, host: Host, command: str, input: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        """
+        Executa um comando no host.
+
+        Args:
+            host: Host de destino
+            command: Comando shell remoto
+            input: Dados enviados ao stdin do comando
+            timeout: Tempo máximo em segundos
+
+        Returns:
+            CommandResult: Resultado do comando
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libera recursos do transporte."""
+
+
+class SSHTransport(Transport):
+    """Transporte via cliente `ssh` do sistema (chaves/agent, sem senha)."""
+
+    def __init__(self, connect_timeout: int = 10, options: Optional[List[str]] = None):
+        """
+        Inicializa o transporte.
+
+        Args:
+            connect_timeout: Tempo máximo para estabelecer a conexão
+            options: Opções extras para o ssh (ex: ["-i", "~/.ssh/lab"])
+        """
+        self.connect_timeout = connect_timeout
+        self.options = options or []
+        self.control_dir = Path.home() / ".ssh"
+
+    def _ssh_command(self, host: Host, command: str) -> List[str]:
+        """Monta a linha de comando do ssh."""
+        target = f"{host.user}@{host.address}" if host.user else host.address
+        return [
+            "ssh",
+            "-o", "BatchMode=yes",
+            "-o", f"ConnectTimeout={self.connect_timeout}",
+            "-o", "StrictHostKeyChecking=accept-new",
+            # Reaproveitar a conexão entre as etapas do mesmo host
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self.control_dir}/leme-%C",
+            "-o", "ControlPersist=60",
+            "-p", str(host.port),
+        ] + self.options + [target, command]
+
+    def run(self, host: Host, command: str, input: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        """Executa um comando no host via ssh."""
+        try:
+            result = subprocess.run(
+                self._ssh_command(host, command),
+                input=input,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            return CommandResult(124, "", f"Tempo esgotado após {timeout}s")
+        except FileNotFoundError:
+            return CommandResult(127, "", "Cliente ssh não encontrado")
+        return CommandResult(result.returncode, result.stdout, result.stderr)
+
+
+# Saídas de `check_command` usadas pelos hosts simulados
+FAKE_TOOL_OUTPUTS = {
+    Tool.DOCKER: "Docker version 24.0.7, build afdd53b",
+    Tool.TERRAFORM: "Terraform v1.6.6",
+    Tool.GIT: "git version 2.39.2",
+    Tool.AZURE_CLI: "azure-cli                         2.60.0",
+    Tool.AWS_CLI: "aws-cli/2.15.0 Python/3.11.6 Linux/6.1.0 exe/x86_64",
+    Tool.KUBECTL: "Client Version: v1.28.4",
+    Tool.ANSIBLE: "ansible [core 2.16.2]",
+    Tool.WATCH: "watch from procps-ng 4.0.2"
+}
+
+FAKE_OS_RELEASE = 'NAME="Ubuntu"\nVERSION="22.04.3 LTS (Jammy Jellyfish)"\nID=ubuntu\nVERSION_CODENAME=jammy'
+
+
+@dataclass
+class FakeHostState:
+    """Estado de um host simulado."""
+    tools: Dict[Tool, str] = field(default_factory=dict)
+    os_release: str = FAKE_OS_RELEASE
+    machine: str = "x86_64"
+
+
+class FakeTransport(Transport):
+    """
+    Transporte em processo que simula hosts.
+
+    Entende o script de verificação (responde conforme as ferramentas do
+    host) e os planos gerados por `InstallPlan.to_shell` (marca como
+    instaladas as ferramentas do cabeçalho "# Ferramentas:").
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        installed: Optional[Dict[Tool, str]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Inicializa o transporte falso.
+
+        Args:
+            latency: Latência injetada em cada comando (segundos)
+            jitter: Variação aleatória adicional da latência (segundos)
+            failure_rate: Fração de comandos que falham como erro de conexão
+            installed: Ferramentas já instaladas em cada host novo (ferramenta → saída)
+            seed: Semente para resultados reprodutíveis
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.installed = installed or {}
+        self.hosts: Dict[Host, FakeHostState] = {}
+        self.commands_run = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def state_for(self, host: Host) -> FakeHostState:
+        """Retorna (criando se necessário) o estado do host simulado."""
+        with self._lock:
+            if host not in self.hosts:
+                self.hosts[host] = FakeHostState(tools=dict(self.installed))
+            return self.hosts[host]
+
+    def run(self, host: Host, command: str, input: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        """Simula a execução de um comando no host."""
+        with self._lock:
+            self.commands_run += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fails = self._random.random() < self.failure_rate
+
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            return CommandResult(124, "", f"Tempo esgotado após {timeout}s")
+        time.sleep(delay)
+
+        if fails:
+            return CommandResult(255, "", f"ssh: connect to host {host.address} port {host.port}: Connection timed out")
+
+        state = self.state_for(host)
+        script = input or ""
+
+        if script.startswith("# leme-probe"):
+            return CommandResult(0, self._probe_output(state))
+
+        for line in script.splitlines():
+            if line.startswith("# Ferramentas:"):
+                names = [n.strip() for n in line.split(":", 1)[1].split(",") if n.strip()]
+                with self._lock:
+                    for name in names:
+                        tool = Tool(name)
+                        state.tools[tool] = FAKE_TOOL_OUTPUTS[tool]
+                return CommandResult(0, f"Plano aplicado: {', '.join(names)}\n")
+
+        return CommandResult(127, "", f"sh: {command}: not found")
+
+    def _probe_output(self, state: FakeHostState) -> str:
+        """Gera a saída do script de verificação para o host simulado."""
+        lines = [
+            f"{SECTION_MARKER} os-release", state.os_release,
+            f"{SECTION_MARKER} machine", state.machine,
+            f"{SECTION_MARKER} proc-version", "Linux version 6.1.0",
+        ]
+        for tool in Tool:
+            executable = DEVOPS_TOOLS_CONFIG[tool]["check_command"][0]
+            if tool in state.tools:
+                lines += [f"{SECTION_MARKER} tool {tool.value} 0", state.tools[tool]]
+            else:
+                lines += [f"{SECTION_MARKER} tool {tool.value} 127", f"sh: 1: {executable}: not found"]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,315 @@
+"""Servidor de cache local (pull-through) para pacotes e downloads de fornecedores.
+
+Os clientes acessam `http://servidor:porta/<host-original>/<caminho>`, e o
+servidor busca `https://<host-original>/<caminho>` uma única vez, guarda em
+disco e serve as próximas requisições da rede local. Requisições no formato
+de proxy HTTP (`GET http://host/caminho`), usadas pelo `Acquire::http::Proxy`
+do apt, também são aceitas e mantêm o esquema original.
+
+Só os hosts permitidos são buscados (por padrão, os mirrors configurados e
+as origens de download da CLI), para que o servidor não vire um proxy
+aberto. Por padrão ele escuta apenas em 127.0.0.1.
+
+Pacotes (.deb, .rpm, .zip, ...) são imutáveis e ficam no cache para sempre;
+índices de repositório (Release, Packages, repomd.xml, ...) são revalidados
+após alguns minutos.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from .mirror_selection import load_mirror_groups
+from ..system.artifact_cache import CACHE_DIR
+
+
+DEFAULT_BIND = "127.0.0.1"
+DEFAULT_PORT = 3142
+DEFAULT_CACHE_ROOT = CACHE_DIR / "mirror"
+METADATA_TTL = 300  # índices são revalidados após 5 minutos
+UPSTREAM_TIMEOUT = 60
+CHUNK_SIZE = 256 * 1024
+
+IMMUTABLE_SUFFIXES = (
+    ".deb", ".udeb", ".rpm", ".drpm", ".zip", ".pkg",
+    ".tar.gz", ".tgz", ".tar.xz", ".whl"
+)
+
+
+# Origens de download usadas fora dos repositórios de `mirror_selection`
+DOWNLOAD_HOSTS = {
+    "releases.hashicorp.com", "rpm.releases.hashicorp.com",
+    "awscli.amazonaws.com", "dl.k8s.io", "cdn.dl.k8s.io",
+    # Repositórios da distribuição (tráfego http:// do apt via 90leme-mirror)
+    "archive.ubuntu.com", "br.archive.ubuntu.com", "security.ubuntu.com", "ports.ubuntu.com",
+    "deb.debian.org", "ftp.br.debian.org", "security.debian.org",
+}
+
+_HOST_RE = re.compile(r"^[A-Za-z0-9.-]+(?::\d+)?$")
+
+
+def default_allowed_hosts() -> Set[str]:
+    """
+    Hosts que o servidor aceita buscar: os mirrors configurados e as origens de download.
+
+    Raises:
+        ConfigFileError: Se ~/.config/leme/mirrors.toml for inválido
+    """
+    hosts = set(DOWNLOAD_HOSTS)
+    for group in load_mirror_groups().values():
+        hosts.update(urlsplit(url).hostname for url in group.candidates)
+    return {host.lower() for host in hosts if host}
+
+
+def is_immutable(path: str) -> bool:
+    """Indica se o artefato nunca muda no upstream (pode ficar no cache para sempre)."""
+    return path.endswith(IMMUTABLE_SUFFIXES) or "/by-hash/" in path
+
+
+class CacheStats:
+    """Contadores de uso do cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.bytes_fetched = 0
+        self._lock = threading.Lock()
+
+    def add(self, **values: int) -> None:
+        """Incrementa contadores."""
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, int]:
+        """Retorna os contadores."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_served": self.bytes_served,
+                "bytes_fetched": self.bytes_fetched
+            }
+
+
+class CachingHandler(BaseHTTPRequestHandler):
+    """Atende requisições servindo do cache ou buscando no upstream."""
+
+    server_version = "leme-cache"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        """Registra acessos apenas em modo verboso."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_HEAD(self) -> None:
+        self._handle(send_body=False)
+
+    def do_GET(self) -> None:
+        self._handle(send_body=True)
+
+    def _handle(self, send_body: bool) -> None:
+        """Resolve a requisição e responde."""
+        if self.path == "/_leme/stats":
+            body = json.dumps(self.server.stats.as_dict()).encode()
+            self._send_headers(200, len(body), "application/json")
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        target = self._resolve_target()
+        if not target:
+            self.send_error(400, "Use /<host>/<caminho>")
+            return
+        scheme, host, path = target
+        if not self.server.is_allowed(host):
+            self.send_error(403, f"Host não permitido: {host}")
+            return
+
+        cache_file = self.server.cache_path(host, path)
+        lock = self.server.lock_for(cache_file)
+
+        # Um único download por artefato, mesmo com vários clientes simultâneos
+        with lock:
+            if not self.server.is_fresh(cache_file, path):
+                error = self.server.fetch(scheme, host, path, cache_file)
+                if error and not cache_file.exists():
+                    self.send_error(error[0], error[1])
+                    return
+            else:
+                self.server.stats.add(hits=1)
+
+        self._send_file(cache_file, send_body)
+
+    def _resolve_target(self) -> Optional[Tuple[str, str, str]]:
+        """
+        Extrai esquema, host e caminho originais (formato de caminho ou de proxy).
+
+        No formato de caminho o esquema é https; no de proxy, o da requisição
+        (o apt usa http:// para o arquivo da distribuição).
+        """
+        if self.path.startswith(("http://", "https://")):
+            parts = urlsplit(self.path)
+            scheme, host, path = parts.scheme, parts.netloc, parts.path
+        else:
+            pieces = self.path.lstrip("/").split("/", 1)
+            if len(pieces) != 2 or not pieces[0]:
+                return None
+            scheme, host, path = "https", pieces[0], "/" + pieces[1].split("?", 1)[0]
+
+        # O host vira um diretório do cache: nada de ".", ".." ou "/"
+        if not _HOST_RE.match(host) or host.strip(".") == "" or ".." in path.split("/"):
+            return None
+        return scheme, host.lower(), path
+
+    def _send_headers(self, status: int, length: int, content_type: str = "application/octet-stream") -> None:
+        """Envia status e cabeçalhos."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+
+    def _send_file(self, cache_file: Path, send_body: bool) -> None:
+        """Envia um arquivo do cache."""
+        size = cache_file.stat().st_size
+        self._send_headers(200, size)
+        if not send_body:
+            return
+        with open(cache_file, "rb") as f:
+            shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+        self.server.stats.add(bytes_served=size)
+
+
+class CacheServer(ThreadingHTTPServer):
+    """Servidor HTTP de cache pull-through."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        bind: str = DEFAULT_BIND,
+        port: int = DEFAULT_PORT,
+        root: Optional[Path] = None,
+        upstream: Optional[str] = None,
+        verbose: bool = False,
+        allowed_hosts: Optional[Iterable[str]] = None
+    ):
+        """
+        Inicializa o servidor.
+
+        Args:
+            bind: Endereço de escuta (0.0.0.0 para atender a rede local)
+            port: Porta de escuta (0 para escolher uma livre)
+            root: Diretório do cache (padrão: ~/.cache/leme/mirror)
+            upstream: URL base que substitui os hosts originais
+                (ex: servidor de testes "http://127.0.0.1:9000")
+            verbose: Registrar cada requisição
+            allowed_hosts: Hosts que podem ser buscados (padrão: `default_allowed_hosts()`)
+
+        Raises:
+            ConfigFileError: Se a lista padrão for usada e mirrors.toml for inválido
+        """
+        super().__init__((bind, port), CachingHandler)
+        self.root = root or DEFAULT_CACHE_ROOT
+        self.upstream = upstream.rstrip("/") if upstream else None
+        hosts = default_allowed_hosts() if allowed_hosts is None else allowed_hosts
+        self.allowed_hosts = {host.lower() for host in hosts}
+        self.verbose = verbose
+        self.stats = CacheStats()
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """URL base do servidor."""
+        host, port = self.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def is_allowed(self, host: str) -> bool:
+        """Indica se o host (com ou sem porta) pode ser buscado."""
+        return host in self.allowed_hosts or host.rsplit(":", 1)[0] in self.allowed_hosts
+
+    def cache_path(self, host: str, path: str) -> Path:
+        """Caminho no disco de um artefato."""
+        return self.root / host / path.lstrip("/")
+
+    def lock_for(self, cache_file: Path) -> threading.Lock:
+        """Lock exclusivo por artefato."""
+        with self._locks_guard:
+            return self._locks.setdefault(cache_file, threading.Lock())
+
+    def is_fresh(self, cache_file: Path, path: str) -> bool:
+        """Indica se o arquivo em cache pode ser servido sem consultar o upstream."""
+        if not cache_file.is_file():
+            return False
+        return is_immutable(path) or time.time() - cache_file.stat().st_mtime < METADATA_TTL
+
+    def upstream_url(self, scheme: str, host: str, path: str) -> str:
+        """URL original do artefato."""
+        if self.upstream:
+            return f"{self.upstream}/{host}{path}"
+        return f"{scheme}://{host}{path}"
+
+    def fetch(self, scheme: str, host: str, path: str, cache_file: Path) -> Optional[Tuple[int, str]]:
+        """
+        Baixa um artefato do upstream para o cache.
+
+        Args:
+            scheme: Esquema original (http ou https)
+            host: Host original
+            path: Caminho original
+            cache_file: Destino no cache
+
+        Returns:
+            Optional[Tuple[int, str]]: None em caso de sucesso, ou (status, mensagem)
+        """
+        self.stats.add(misses=1)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        request = urllib.request.Request(self.upstream_url(scheme, host, path), headers={"User-Agent": "leme-cache"})
+
+        try:
+            with urllib.request.urlopen(request, timeout=UPSTREAM_TIMEOUT) as response:
+                fd, temp_path = tempfile.mkstemp(dir=str(cache_file.parent), prefix=".part-")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        shutil.copyfileobj(response, f, CHUNK_SIZE)
+                    self.stats.add(bytes_fetched=os.path.getsize(temp_path))
+                    os.replace(temp_path, cache_file)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.unlink(temp_path)
+                    raise
+        except urllib.error.HTTPError as e:
+            return e.code, e.reason
+        except (urllib.error.URLError, OSError) as e:
+            # Índices antigos continuam sendo servidos se o upstream estiver fora
+            return 502, f"Upstream indisponível: {e}"
+        return None
+
+    def start_in_thread(self) -> threading.Thread:
+        """
+        Inicia o servidor em uma thread (uso em testes e benchmarks).
+
+        Returns:
+            threading.Thread: Thread do servidor
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """Para o servidor."""
+        self.shutdown()
+        self.server_close()
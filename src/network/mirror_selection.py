@@ -0,0 +1,326 @@
+"""Escolha do mirror mais rápido de cada repositório por latência e vazão.
+
+Cada repositório que o Leme adiciona (Docker, HashiCorp, Microsoft) tem uma
+lista de candidatos (o primeiro é a origem oficial). Por padrão a lista só
+tem a origem, que é usada sem medição; mirrors de terceiros precisam ser
+acrescentados em mirrors.toml. O repositório da distribuição (sources.list)
+não é alterado: para ele, use o cache de pacotes (`--mirror`).
+Os candidatos são testados em paralelo com uma conexão TCP e um GET parcial
+(`Range`) de um arquivo pequeno; o ranking fica em cache por um dia.
+"""
+
+import json
+import os
+import socket
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from rich import print
+
+from ..config.toml_support import ConfigFileError, load_toml
+from ..system.artifact_cache import CACHE_DIR
+from ..system.step_journal import fingerprint
+
+
+CONFIG_DIR = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config") / "leme"
+MIRRORS_CONFIG = CONFIG_DIR / "mirrors.toml"
+RANKING_PATH = CACHE_DIR / "mirror-ranking.json"
+RANKING_TTL = 24 * 3600
+RANKING_VERSION = 1
+PROBE_BYTES = 64 * 1024
+PROBE_TIMEOUT = 5.0
+
+
+@dataclass
+class MirrorGroup:
+    """Candidatos de um repositório (o primeiro é a origem oficial)."""
+    name: str
+    candidates: List[str]
+    probe_path: str
+
+    @property
+    def origin(self) -> str:
+        """URL base oficial, usada nos arquivos de repositório."""
+        return self.candidates[0]
+
+
+DEFAULT_GROUPS = {
+    "docker": MirrorGroup("docker", ["https://download.docker.com"], "/linux/ubuntu/gpg"),
+    "hashicorp": MirrorGroup("hashicorp", ["https://apt.releases.hashicorp.com"], "/gpg"),
+    "microsoft": MirrorGroup("microsoft", ["https://packages.microsoft.com"], "/keys/microsoft.asc")
+}
+
+
+@dataclass
+class ProbeResult:
+    """Medição de um candidato."""
+    url: str
+    healthy: bool
+    connect_time: float = 0.0
+    transfer_time: float = 0.0
+    bytes_read: int = 0
+    error: Optional[str] = None
+
+    @property
+    def score(self) -> float:
+        """Tempo total da medição (menor é melhor)."""
+        return self.connect_time + self.transfer_time
+
+    @property
+    def throughput(self) -> float:
+        """Vazão do GET parcial em bytes por segundo."""
+        return self.bytes_read / self.transfer_time if self.transfer_time > 0 else 0.0
+
+
+def probe_mirror(base_url: str, probe_path: str, timeout: float = PROBE_TIMEOUT) -> ProbeResult:
+    """
+    Mede a latência de conexão e a vazão de um candidato.
+
+    Args:
+        base_url: URL base do candidato
+        probe_path: Arquivo pequeno presente em todos os candidatos
+        timeout: Tempo máximo de cada operação
+
+    Returns:
+        ProbeResult: Resultado (healthy=False em caso de erro)
+    """
+    parts = urlsplit(base_url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+
+    try:
+        start = time.monotonic()
+        with socket.create_connection((parts.hostname, port), timeout=timeout):
+            connect_time = time.monotonic() - start
+
+        request = urllib.request.Request(
+            base_url.rstrip("/") + probe_path,
+            headers={"Range": f"bytes=0-{PROBE_BYTES - 1}", "User-Agent": "leme-mirror-probe"}
+        )
+        start = time.monotonic()
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = response.read(PROBE_BYTES)
+        transfer_time = time.monotonic() - start
+    except (OSError, urllib.error.URLError) as e:
+        return ProbeResult(url=base_url, healthy=False, error=str(getattr(e, "reason", e)))
+
+    return ProbeResult(
+        url=base_url,
+        healthy=True,
+        connect_time=connect_time,
+        transfer_time=transfer_time,
+        bytes_read=len(data)
+    )
+
+
+def load_mirror_groups(path: Optional[Path] = None) -> Dict[str, MirrorGroup]:
+    """
+    Carrega os candidatos padrão, sobrepostos pelo arquivo de configuração.
+
+    Formato do arquivo (~/.config/leme/mirrors.toml):
+
+        [docker]
+        candidates = ["https://download.docker.com", "https://mirror.exemplo"]
+        probe = "/linux/ubuntu/gpg"
+
+    Args:
+        path: Arquivo de configuração (padrão: ~/.config/leme/mirrors.toml)
+
+    Returns:
+        Dict[str, MirrorGroup]: Grupos por nome
+
+    Raises:
+        ConfigFileError: Se o arquivo for inválido
+    """
+    groups = dict(DEFAULT_GROUPS)
+    path = path or MIRRORS_CONFIG
+    if not path.exists():
+        return groups
+
+    for name, section in load_toml(path).items():
+        default = groups.get(name)
+        candidates = section.get("candidates") if isinstance(section, dict) else None
+        if not isinstance(candidates, list) or not candidates or not all(isinstance(c, str) for c in candidates):
+            raise ConfigFileError(f"{path}: [{name}] precisa de 'candidates' (lista de URLs)")
+        probe_path = section.get("probe") or (default.probe_path if default else "/")
+        groups[name] = MirrorGroup(name, [c.rstrip("/") for c in candidates], probe_path)
+    return groups
+
+
+class MirrorSelector:
+    """Ranking dos candidatos de cada repositório, com cache em disco."""
+
+    def __init__(
+        self,
+        groups: Optional[Dict[str, MirrorGroup]] = None,
+        path: Optional[Path] = None,
+        ttl: float = RANKING_TTL,
+        timeout: float = PROBE_TIMEOUT
+    ):
+        """
+        Inicializa o seletor.
+
+        Args:
+            groups: Repositórios e candidatos (padrão: `load_mirror_groups()`)
+            path: Arquivo do ranking (padrão: ~/.cache/leme/mirror-ranking.json)
+            ttl: Validade do ranking em segundos
+            timeout: Tempo máximo de cada medição
+        """
+        self.groups = groups if groups is not None else load_mirror_groups()
+        self.path = path or RANKING_PATH
+        self.ttl = ttl
+        self.timeout = timeout
+        self.rankings: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Carrega o ranking do disco, ignorando arquivos corrompidos."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == RANKING_VERSION:
+                return data.get("groups", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save(self) -> None:
+        """Grava o ranking de forma atômica."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".ranking-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": RANKING_VERSION, "groups": self.rankings}, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def _cached(self, group: MirrorGroup) -> Optional[List[ProbeResult]]:
+        """Retorna o ranking em cache, se ainda válido para os mesmos candidatos."""
+        entry = self.rankings.get(group.name)
+        if not entry or entry.get("fingerprint") != fingerprint(group.candidates, group.probe_path):
+            return None
+        if time.time() - entry.get("ranked_at", 0) > self.ttl:
+            return None
+        return [ProbeResult(**result) for result in entry.get("results", [])]
+
+    def rank(self, names: Optional[List[str]] = None, refresh: bool = False) -> Dict[str, List[ProbeResult]]:
+        """
+        Ordena os candidatos dos repositórios, medindo todos em paralelo.
+
+        Args:
+            names: Repositórios desejados (None para todos)
+            refresh: Ignorar o ranking em cache
+
+        Returns:
+            Dict[str, List[ProbeResult]]: Candidatos do mais rápido ao mais lento
+                (os que falharam ficam no final)
+        """
+        groups = [self.groups[name] for name in (names or self.groups) if name in self.groups]
+        rankings: Dict[str, List[ProbeResult]] = {}
+        to_probe = []
+        for group in groups:
+            cached = None if refresh else self._cached(group)
+            if cached is not None:
+                rankings[group.name] = cached
+            elif len(group.candidates) == 1:
+                # Sem alternativas: não há o que medir
+                rankings[group.name] = [ProbeResult(url=group.origin, healthy=True)]
+            else:
+                to_probe.append(group)
+
+        if to_probe:
+            jobs = [(group, url) for group in to_probe for url in group.candidates]
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                results = list(executor.map(
+                    lambda job: probe_mirror(job[1], job[0].probe_path, self.timeout), jobs
+                ))
+
+            now = time.time()
+            for group in to_probe:
+                measured = [r for (g, _), r in zip(jobs, results) if g is group]
+                measured.sort(key=lambda r: (not r.healthy, r.score))
+                rankings[group.name] = measured
+                # Sem nenhum candidato respondendo (ex: offline), medir de novo na próxima vez
+                if any(r.healthy for r in measured):
+                    self.rankings[group.name] = {
+                        "fingerprint": fingerprint(group.candidates, group.probe_path),
+                        "ranked_at": now,
+                        "results": [asdict(r) for r in measured]
+                    }
+            self._save()
+
+        return {group.name: rankings[group.name] for group in groups}
+
+    def best(self, name: str) -> str:
+        """
+        Retorna o candidato mais rápido e saudável de um repositório.
+
+        Args:
+            name: Nome do repositório
+
+        Returns:
+            str: URL base (a origem oficial se nenhum candidato responder)
+        """
+        group = self.groups[name]
+        for result in self.rank([name]).get(name, []):
+            if result.healthy:
+                return result.url
+        return group.origin
+
+    def apply(self, content: str) -> str:
+        """
+        Troca, em um arquivo de repositório, cada origem oficial pelo mirror mais rápido.
+
+        Só os repositórios presentes no conteúdo são medidos. As linhas
+        `gpgkey=` continuam apontando para a origem oficial.
+
+        Args:
+            content: Conteúdo do arquivo (.list/.repo)
+
+        Returns:
+            str: Conteúdo com os mirrors escolhidos
+        """
+        for group in self.groups.values():
+            if group.origin not in content:
+                continue
+            best = self.best(group.name)
+            if best == group.origin:
+                continue
+            print(f"  [dim]⚡ Mirror mais rápido para {group.name}: {best}[/dim]")
+            content = "".join(
+                line if line.lstrip().startswith("gpgkey") else line.replace(group.origin, best)
+                for line in content.splitlines(keepends=True)
+            )
+        return content
+
+
+_selector: Optional[MirrorSelector] = None
+
+
+def get_mirror_selector() -> MirrorSelector:
+    """
+    Retorna o seletor de mirrors compartilhado pelo processo.
+
+    Um arquivo de configuração inválido é informado e os candidatos padrão
+    são usados.
+
+    Returns:
+        MirrorSelector: Instância única
+    """
+    global _selector
+    if _selector is None:
+        try:
+            groups = load_mirror_groups()
+        except ConfigFileError as e:
+            print(f":warning: [yellow]{e} — usando os mirrors padrão[/yellow]")
+            groups = dict(DEFAULT_GROUPS)
+        _selector = MirrorSelector(groups)
+    return _selector
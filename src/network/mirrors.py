@@ -0,0 +1,89 @@
+"""Redirecionamento de repositórios e downloads para um servidor de cache local.
+
+Com `--mirror http://host:porta`, URLs como
+`https://download.docker.com/linux/ubuntu` passam a ser acessadas como
+`http://host:porta/download.docker.com/linux/ubuntu` (ver `leme cache-server`).
+"""
+
+import re
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+_mirror: Optional[str] = None
+
+_URL_PATTERN = re.compile(r"https?://[^\s\"']+")
+
+
+def configure_mirror(url: Optional[str]) -> None:
+    """
+    Define o servidor de cache usado pelo processo.
+
+    Args:
+        url: URL base do servidor (ex: "http://10.0.0.5:3142") ou None
+
+    Raises:
+        ValueError: Se a URL não for http(s)://host[:porta]
+    """
+    global _mirror
+    if not url:
+        _mirror = None
+        return
+
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(f"Mirror inválido: {url} (use http://host:porta)")
+    _mirror = f"{parts.scheme}://{parts.netloc}{parts.path.rstrip('/')}"
+
+
+def get_mirror() -> Optional[str]:
+    """
+    Retorna o servidor de cache configurado.
+
+    Returns:
+        Optional[str]: URL base ou None
+    """
+    return _mirror
+
+
+def mirror_url(url: str) -> str:
+    """
+    Reescreve uma URL para passar pelo servidor de cache, se configurado.
+
+    Args:
+        url: URL original
+
+    Returns:
+        str: URL via cache (ou a original, sem mirror)
+    """
+    if not _mirror or url.startswith(_mirror):
+        return url
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return url
+    rewritten = f"{_mirror}/{parts.netloc}{parts.path}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+
+def mirror_sources(content: str) -> str:
+    """
+    Reescreve as URLs de um arquivo de repositório (.list/.repo).
+
+    As linhas `gpgkey=` não são alteradas: a chave continua vindo da
+    origem oficial, de modo que o cache não pode substituí-la.
+
+    Args:
+        content: Conteúdo do arquivo
+
+    Returns:
+        str: Conteúdo com as URLs via cache
+    """
+    if not _mirror:
+        return content
+
+    lines = []
+    for line in content.splitlines(keepends=True):
+        if not line.lstrip().startswith("gpgkey"):
+            line = _URL_PATTERN.sub(lambda m: mirror_url(m.group(0)), line)
+        lines.append(line)
+    return "".join(lines)
@@ -0,0 +1,196 @@
+"""Configuração de desempenho do Ansible (~/.ansible.cfg).
+
+Com os padrões, cada tarefa abre uma conexão SSH nova, copia o módulo para
+o host antes de executá-lo, roda em no máximo 5 hosts por vez e coleta os
+facts de novo a cada playbook. O perfil gerado aqui liga o pipelining, a
+reutilização de conexões (ControlMaster/ControlPersist), dimensiona os
+forks pelo número de CPUs e guarda os facts em cache (jsonfile). O callback
+`profile_tasks` mostra o tempo de cada tarefa.
+
+O arquivo do usuário é preservado: só são acrescentadas as opções que ainda
+não estão definidas, então aplicar o perfil de novo não muda nada.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .file_utils import atomic_write_text
+
+
+ANSIBLE_DIR = Path.home() / ".ansible"
+FACT_CACHE_DIR = ANSIBLE_DIR / "facts"
+CONTROL_PATH_DIR = ANSIBLE_DIR / "cp"
+FACT_CACHE_TIMEOUT = 86400
+CONTROL_PERSIST = "60s"
+
+# Os forks passam a maior parte do tempo esperando o SSH: alguns por CPU
+FORKS_PER_CPU = 5
+MIN_FORKS = 5
+MAX_FORKS = 50
+
+_SECTION_RE = re.compile(r"^\s*\[(?P<name>[^\]]+)\]")
+_OPTION_RE = re.compile(r"^\s*(?P<key>[\w.-]+)\s*[=:]")
+
+
+def default_ansible_cfg() -> Path:
+    """Caminho do arquivo de configuração (respeita ANSIBLE_CONFIG)."""
+    return Path(os.environ.get("ANSIBLE_CONFIG") or Path.home() / ".ansible.cfg").expanduser()
+
+
+def forks_for(cpu_count: Optional[int]) -> int:
+    """Número de forks para uma máquina com `cpu_count` CPUs."""
+    return max(MIN_FORKS, min(MAX_FORKS, (cpu_count or 1) * FORKS_PER_CPU))
+
+
+def tuned_settings(cpu_count: Optional[int] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Opções do perfil de desempenho, por seção.
+
+    Args:
+        cpu_count: CPUs da máquina de controle (de `SystemInfo.cpu_count`)
+
+    Returns:
+        Dict[str, Dict[str, str]]: Opções por seção do ansible.cfg
+    """
+    return {
+        "defaults": {
+            "forks": str(forks_for(cpu_count)),
+            "gathering": "smart",
+            "fact_caching": "jsonfile",
+            "fact_caching_connection": str(FACT_CACHE_DIR),
+            "fact_caching_timeout": str(FACT_CACHE_TIMEOUT),
+            "callbacks_enabled": "ansible.posix.profile_tasks",
+        },
+        "ssh_connection": {
+            "pipelining": "True",
+            "ssh_args": f"-o ControlMaster=auto -o ControlPersist={CONTROL_PERSIST}",
+            "control_path_dir": str(CONTROL_PATH_DIR),
+        },
+    }
+
+
+def defined_options(existing: str) -> Dict[str, List[str]]:
+    """Opções já definidas em um ansible.cfg, por seção (comentários são ignorados)."""
+    options: Dict[str, List[str]] = {}
+    section = None
+    for line in existing.splitlines():
+        match = _SECTION_RE.match(line)
+        if match:
+            section = match.group("name").strip()
+            options.setdefault(section, [])
+            continue
+        match = _OPTION_RE.match(line)
+        if section and match:
+            options[section].append(match.group("key"))
+    return options
+
+
+def merge_ansible_cfg(existing: str, settings: Dict[str, Dict[str, str]]) -> str:
+    """
+    Acrescenta as opções ausentes, preservando o resto do arquivo.
+
+    Opções faltantes de uma seção existente entram logo após a última opção
+    dela; seções novas vão para o fim. Comentários e valores do usuário não
+    são alterados.
+
+    Args:
+        existing: Conteúdo atual
+        settings: Opções por seção (ex: de `tuned_settings`)
+
+    Returns:
+        str: Novo conteúdo
+    """
+    defined = defined_options(existing)
+    missing = {
+        section: {key: value for key, value in options.items() if key not in defined.get(section, [])}
+        for section, options in settings.items()
+    }
+
+    lines = existing.splitlines()
+    # Posição de inserção de cada seção: após a última linha não vazia dela
+    insert_at: Dict[str, int] = {}
+    section = None
+    for index, line in enumerate(lines):
+        match = _SECTION_RE.match(line)
+        if match:
+            section = match.group("name").strip()
+            insert_at[section] = index + 1
+        elif section and line.strip() and not line.lstrip().startswith(("#", ";")):
+            insert_at[section] = index + 1
+
+    for section in sorted(insert_at, key=insert_at.get, reverse=True):
+        added = [f"{key} = {value}" for key, value in missing.get(section, {}).items()]
+        lines[insert_at[section]:insert_at[section]] = added
+
+    for section, options in missing.items():
+        if section in insert_at or not options:
+            continue
+        if lines and lines[-1].strip():
+            lines.append("")
+        lines.append(f"[{section}]")
+        lines.extend(f"{key} = {value}" for key, value in options.items())
+
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class AnsibleConfig:
+    """Aplica o perfil de desempenho ao ansible.cfg do usuário."""
+
+    def __init__(self, path: Optional[Path] = None, cpu_count: Optional[int] = None):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            path: Arquivo de configuração (padrão: ~/.ansible.cfg ou ANSIBLE_CONFIG)
+            cpu_count: CPUs da máquina de controle (dimensiona os forks)
+        """
+        self.path = path or default_ansible_cfg()
+        self.settings = tuned_settings(cpu_count)
+
+    def _existing(self) -> str:
+        """Conteúdo atual do arquivo (vazio se não existir)."""
+        return self.path.read_text() if self.path.exists() else ""
+
+    def missing(self) -> List[str]:
+        """
+        Opções do perfil que ainda não estão definidas.
+
+        Returns:
+            List[str]: Opções no formato "seção.opção = valor"
+        """
+        defined = defined_options(self._existing())
+        return [
+            f"{section}.{key} = {value}"
+            for section, options in self.settings.items()
+            for key, value in options.items()
+            if key not in defined.get(section, [])
+        ]
+
+    def plan(self) -> str:
+        """
+        Calcula o novo conteúdo sem gravar.
+
+        Returns:
+            str: Conteúdo resultante
+        """
+        return merge_ansible_cfg(self._existing(), self.settings)
+
+    def apply(self) -> List[str]:
+        """
+        Grava a configuração (atomicamente) e cria os diretórios de cache.
+
+        Returns:
+            List[str]: Opções acrescentadas (vazia se nada mudou)
+
+        Raises:
+            OSError: Se não for possível gravar
+        """
+        FACT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        CONTROL_PATH_DIR.mkdir(parents=True, exist_ok=True)
+        added = self.missing()
+        if not added:
+            return []
+        atomic_write_text(self.path, self.plan())
+        return added
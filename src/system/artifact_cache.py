@@ -0,0 +1,105 @@
+"""Cache local de artefatos baixados (zips, instaladores, binários)."""
+
+import hashlib
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional
+from rich import print
+from ..network.mirrors import mirror_url
+
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "leme"
+
+
+def sha256_file(path: Path) -> str:
+    """Calcula o SHA-256 de um arquivo."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """Cache de downloads com retomada de transferências interrompidas."""
+
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Inicializa o cache.
+
+        Args:
+            root: Diretório do cache (padrão: ~/.cache/leme/artifacts)
+        """
+        self.root = root or CACHE_DIR / "artifacts"
+
+    def path_for(self, url: str) -> Path:
+        """Retorna o caminho local de um artefato."""
+        key = hashlib.sha256(url.encode()).hexdigest()[:16]
+        name = url.rstrip("/").split("/")[-1] or "artifact"
+        return self.root / f"{key}-{name}"
+
+    def fetch(self, url: str, sha256: Optional[str] = None, max_age: Optional[float] = None) -> Path:
+        """
+        Obtém um artefato do cache ou baixa-o.
+
+        O download é feito em um arquivo `.part` e retomado (curl -C -) se
+        uma execução anterior tiver sido interrompida. Com `--mirror`, o
+        download passa pelo servidor de cache; a chave local continua sendo
+        a URL original.
+
+        Args:
+            url: URL do artefato
+            sha256: Checksum esperado (opcional)
+            max_age: Idade máxima em segundos para URLs sem versão (ex: "latest")
+
+        Returns:
+            Path: Caminho do artefato no cache
+
+        Raises:
+            subprocess.CalledProcessError: Se o download falhar
+            ValueError: Se o checksum não conferir
+        """
+        path = self.path_for(url)
+
+        if path.exists():
+            fresh = max_age is None or time.time() - path.stat().st_mtime <= max_age
+            if fresh and (not sha256 or sha256_file(path) == sha256.lower()):
+                print(f"  [dim]↷ Usando artefato em cache: {path.name}[/dim]")
+                return path
+            path.unlink()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        part = path.with_name(path.name + ".part")
+        source = mirror_url(url)
+
+        result = subprocess.run(["curl", "-fL", "-C", "-", "-o", str(part), source], capture_output=True)
+        if result.returncode != 0:
+            # Retomada pode falhar se o servidor não suportar ranges; tentar do zero
+            if part.exists():
+                part.unlink()
+            subprocess.run(["curl", "-fL", "-o", str(part), source], capture_output=True, check=True)
+
+        if sha256 and sha256_file(part) != sha256.lower():
+            part.unlink()
+            raise ValueError(f"Checksum inválido para {url}")
+
+        os.replace(part, path)
+        return path
+
+
+_cache: Optional[ArtifactCache] = None
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """
+    Retorna o cache de artefatos compartilhado pelo processo.
+
+    Returns:
+        ArtifactCache: Instância única
+    """
+    global _cache
+    if _cache is None:
+        _cache = ArtifactCache()
+    return _cache
@@ -0,0 +1,246 @@
+"""Configuração do daemon do Docker (daemon.json) com mesclagem idempotente.
+
+As alterações são mescladas ao arquivo existente: chaves do usuário que o
+perfil não conhece são preservadas, listas (ex: `registry-mirrors`) são
+unidas e o arquivo só é regravado — e o daemon recarregado — quando o
+resultado difere do conteúdo atual.
+"""
+
+import copy
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from rich import print
+
+from .package_sources import ensure_root_file
+
+
+DAEMON_CONFIG_PATH = "/etc/docker/daemon.json"
+
+# Perfil de desempenho (`--tuned`)
+TUNED_PROFILE: Dict[str, Any] = {
+    # Logs de containers com rotação (o padrão json-file cresce sem limite)
+    "log-driver": "json-file",
+    "log-opts": {"max-size": "10m", "max-file": "3"},
+    # Containers continuam rodando durante reload/restart do daemon
+    "live-restore": True,
+    # Mais camadas baixadas/enviadas em paralelo (padrão: 3 e 5)
+    "max-concurrent-downloads": 10,
+    "max-concurrent-uploads": 10,
+    # BuildKit com coleta de lixo do cache de build
+    "features": {"buildkit": True},
+    "builder": {"gc": {"enabled": True, "defaultKeepStorage": "20GB"}},
+}
+
+# Drivers de log que aceitam max-size/max-file
+ROTATING_LOG_DRIVERS = ("json-file", "local")
+
+# Opções aplicadas com `systemctl reload` (SIGHUP); as demais exigem restart
+RELOADABLE_KEYS = {
+    "debug", "labels", "live-restore", "max-concurrent-downloads",
+    "max-concurrent-uploads", "max-download-attempts", "registry-mirrors",
+    "insecure-registries", "default-runtime", "runtimes", "shutdown-timeout",
+    "features",
+}
+
+
+def _unset_only(existing: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Filtra dos padrões as opções que o usuário já definiu (recursivamente)."""
+    result = {}
+    for key, value in defaults.items():
+        if key not in existing:
+            result[key] = copy.deepcopy(value)
+        elif isinstance(existing[key], dict) and isinstance(value, dict):
+            nested = _unset_only(existing[key], value)
+            if nested:
+                result[key] = nested
+    return result
+
+
+def tuned_profile(existing: Dict[str, Any], registry_mirrors: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Monta o perfil de desempenho respeitando a configuração atual.
+
+    O perfil só preenche opções ainda não definidas: valores escolhidos
+    pelo administrador (ex: max-size de 50m) são mantidos. Se o usuário já
+    usa outro driver de log (ex: journald), a rotação de json-file não é
+    aplicada.
+
+    Args:
+        existing: daemon.json atual
+        registry_mirrors: Mirrors de registry a adicionar
+
+    Returns:
+        Dict[str, Any]: Configuração a mesclar
+    """
+    defaults = copy.deepcopy(TUNED_PROFILE)
+    if existing.get("log-driver", "json-file") not in ROTATING_LOG_DRIVERS:
+        del defaults["log-driver"]
+        del defaults["log-opts"]
+    profile = _unset_only(existing, defaults)
+    if registry_mirrors:
+        profile["registry-mirrors"] = list(registry_mirrors)
+    return profile
+
+
+def merge_config(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mescla duas configurações sem perder chaves existentes.
+
+    Dicionários são mesclados recursivamente, listas são unidas (sem
+    duplicar, na ordem original) e valores simples do overlay prevalecem.
+
+    Args:
+        base: Configuração atual
+        overlay: Alterações desejadas
+
+    Returns:
+        Dict[str, Any]: Nova configuração (as entradas não são alteradas)
+    """
+    merged = copy.deepcopy(base)
+    for key, value in overlay.items():
+        current = merged.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[key] = merge_config(current, value)
+        elif isinstance(current, list) and isinstance(value, list):
+            merged[key] = current + [item for item in value if item not in current]
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def render_config(config: Dict[str, Any]) -> str:
+    """Serializa a configuração de forma estável (mesma entrada, mesmo arquivo)."""
+    return json.dumps(config, indent=2, sort_keys=True) + "\n"
+
+
+class DaemonConfig:
+    """Leitura, mesclagem e gravação do daemon.json."""
+
+    def __init__(self, path: str = DAEMON_CONFIG_PATH):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            path: Caminho do daemon.json
+        """
+        self.path = path
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Lê a configuração atual.
+
+        Returns:
+            Dict[str, Any]: Configuração (vazia se o arquivo não existir)
+
+        Raises:
+            ValueError: Se o arquivo existir mas não for um objeto JSON válido
+        """
+        try:
+            with open(self.path, "r") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return {}
+        if not text.strip():
+            return {}
+        try:
+            config = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"{self.path} não é um JSON válido: {e}")
+        if not isinstance(config, dict):
+            raise ValueError(f"{self.path} deve conter um objeto JSON")
+        return config
+
+    def plan(self, overlay: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Calcula a configuração resultante sem gravar.
+
+        Args:
+            overlay: Alterações desejadas
+
+        Returns:
+            Dict[str, Any]: Configuração mesclada
+        """
+        return merge_config(self.load(), overlay)
+
+    def changed_keys(self, overlay: Dict[str, Any]) -> List[str]:
+        """
+        Lista as chaves de primeiro nível que a mesclagem alteraria.
+
+        Args:
+            overlay: Alterações desejadas
+
+        Returns:
+            List[str]: Chaves alteradas (vazia se nada muda)
+        """
+        current = self.load()
+        merged = merge_config(current, overlay)
+        return sorted(key for key in merged if merged.get(key) != current.get(key))
+
+    def validate(self, config: Dict[str, Any]) -> Optional[str]:
+        """
+        Valida a configuração com `dockerd --validate`, se disponível.
+
+        Args:
+            config: Configuração a validar
+
+        Returns:
+            Optional[str]: Mensagem de erro, ou None se válida (ou sem dockerd)
+        """
+        if not shutil.which("dockerd"):
+            return None
+        fd, temp_path = tempfile.mkstemp(prefix="leme-daemon-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(render_config(config))
+            result = subprocess.run(
+                ["dockerd", "--validate", "--config-file", temp_path],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        finally:
+            os.unlink(temp_path)
+        # dockerd anterior ao 23.0 não conhece --validate
+        if result.returncode != 0 and "unknown flag" not in result.stderr:
+            return (result.stderr or result.stdout).strip()
+        return None
+
+    def apply(self, overlay: Dict[str, Any]) -> List[str]:
+        """
+        Mescla e grava o daemon.json, se algo mudou.
+
+        Args:
+            overlay: Alterações desejadas
+
+        Returns:
+            List[str]: Chaves alteradas (vazia se o arquivo já estava configurado)
+
+        Raises:
+            ValueError: Se o arquivo atual ou o resultado forem inválidos
+            subprocess.CalledProcessError: Se a gravação privilegiada falhar
+        """
+        changed = self.changed_keys(overlay)
+        if not changed:
+            print(f"  [dim]↷ {self.path} já está configurado[/dim]")
+            return []
+
+        config = self.plan(overlay)
+        error = self.validate(config)
+        if error:
+            raise ValueError(f"Configuração rejeitada pelo dockerd: {error}")
+
+        content = render_config(config)
+        if self.path.startswith("/etc/"):
+            ensure_root_file(self.path, content)
+        else:
+            # Docker Desktop: arquivo do próprio usuário
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            Path(self.path).write_text(content)
+        return changed
@@ -0,0 +1,559 @@
+"""Cliente mínimo da Docker Engine API via socket unix.
+
+Verifica se o daemon está vivo com `/_ping` e `/version` diretamente no
+socket, sem iniciar o cliente `docker` nem executar containers, e
+distingue os motivos de falha (socket ausente, sem permissão, daemon
+parado, sem resposta).
+"""
+
+import http.client
+import json
+import os
+import shutil
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+
+DEFAULT_SOCKET_PATHS = [
+    "/var/run/docker.sock",
+    str(Path.home() / ".docker" / "run" / "docker.sock"),  # Docker Desktop (macOS)
+]
+ENGINE_TIMEOUT = 2.0
+PULL_TIMEOUT = 600.0
+
+# Espera pelo daemon após `systemctl start`: backoff exponencial até o orçamento total
+READY_BUDGET = 60.0
+READY_INITIAL_DELAY = 0.05
+READY_MAX_DELAY = 0.5
+
+# Tipos de falha reportados em EngineStatus.error_kind
+ERROR_NOT_FOUND = "not_found"
+ERROR_PERMISSION = "permission"
+ERROR_REFUSED = "refused"
+ERROR_TIMEOUT = "timeout"
+ERROR_PROTOCOL = "protocol"
+
+
+def default_socket_path() -> str:
+    """
+    Retorna o socket do daemon: DOCKER_HOST (unix://) ou o primeiro caminho padrão existente.
+
+    Returns:
+        str: Caminho do socket
+    """
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):]
+    for path in DEFAULT_SOCKET_PATHS:
+        if os.path.exists(path):
+            return path
+    return DEFAULT_SOCKET_PATHS[0]
+
+
+@dataclass
+class EngineStatus:
+    """Resultado da verificação do daemon."""
+    ok: bool
+    socket_path: str
+    version: Optional[str] = None
+    api_version: Optional[str] = None
+    error: Optional[str] = None
+    error_kind: Optional[str] = None
+    latency: float = 0.0
+
+
+class DockerEngineError(Exception):
+    """Falha ao falar com o daemon."""
+
+    def __init__(self, message: str, kind: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Conexão HTTP sobre socket unix."""
+
+    def __init__(self, socket_path: str, timeout: float = ENGINE_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class DockerEngineClient:
+    """Cliente da Engine API sobre o socket unix do daemon."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = ENGINE_TIMEOUT):
+        """
+        Inicializa o cliente.
+
+        Args:
+            socket_path: Socket do daemon (padrão: DOCKER_HOST ou /var/run/docker.sock)
+            timeout: Tempo máximo de cada requisição em segundos
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body=None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        output: Optional[BinaryIO] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Envia uma requisição à Engine API.
+
+        Args:
+            method: Método HTTP
+            path: Caminho (ex: "/_ping")
+            body: Corpo da requisição (bytes ou arquivo aberto)
+            headers: Cabeçalhos extras
+            timeout: Tempo máximo (padrão: o do cliente)
+            output: Arquivo que recebe o corpo da resposta em partes
+                (para respostas grandes, como `docker save`)
+
+        Returns:
+            Tuple[int, Dict[str, str], bytes]: Status, cabeçalhos e corpo
+                (corpo vazio quando `output` é informado e a resposta é 200)
+
+        Raises:
+            DockerEngineError: Se o daemon não puder ser acessado
+        """
+        connection = UnixHTTPConnection(self.socket_path, timeout or self.timeout)
+        try:
+            connection.request(method, path, body=body, headers=headers or {})
+            response = connection.getresponse()
+            if output is not None and response.status == 200:
+                shutil.copyfileobj(response, output, 1024 * 1024)
+                return response.status, dict(response.getheaders()), b""
+            return response.status, dict(response.getheaders()), response.read()
+        except FileNotFoundError:
+            raise DockerEngineError(
+                f"Socket {self.socket_path} não existe: o daemon do Docker não está rodando",
+                ERROR_NOT_FOUND
+            )
+        except PermissionError:
+            raise DockerEngineError(
+                f"Sem permissão para acessar {self.socket_path}: o usuário não está no grupo 'docker'",
+                ERROR_PERMISSION
+            )
+        except ConnectionRefusedError:
+            raise DockerEngineError(
+                f"Conexão recusada em {self.socket_path}: o daemon do Docker está parado",
+                ERROR_REFUSED
+            )
+        except socket.timeout:
+            raise DockerEngineError(
+                f"O daemon do Docker não respondeu em {timeout or self.timeout:g}s",
+                ERROR_TIMEOUT
+            )
+        except (OSError, http.client.HTTPException) as e:
+            raise DockerEngineError(f"Resposta inválida do daemon: {e}", ERROR_PROTOCOL)
+        finally:
+            connection.close()
+
+    def get_json(self, path: str, timeout: Optional[float] = None):
+        """
+        Faz um GET e decodifica a resposta JSON.
+
+        Args:
+            path: Caminho da API
+            timeout: Tempo máximo
+
+        Returns:
+            Objeto JSON decodificado
+
+        Raises:
+            DockerEngineError: Se a requisição falhar ou não retornar 200
+        """
+        status, _, body = self.request("GET", path, timeout=timeout)
+        if status != 200:
+            raise DockerEngineError(f"{path} retornou HTTP {status}", ERROR_PROTOCOL)
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise DockerEngineError(f"{path} retornou JSON inválido: {e}", ERROR_PROTOCOL)
+
+    def post_json(self, path: str, payload: Optional[Dict] = None, timeout: Optional[float] = None) -> Tuple[int, bytes]:
+        """
+        Faz um POST com corpo JSON.
+
+        Args:
+            path: Caminho da API
+            payload: Corpo (None para vazio)
+            timeout: Tempo máximo
+
+        Returns:
+            Tuple[int, bytes]: Status e corpo da resposta
+
+        Raises:
+            DockerEngineError: Se o daemon não puder ser acessado
+        """
+        body = json.dumps(payload).encode() if payload is not None else b""
+        status, _, response = self.request(
+            "POST", path, body=body, headers={"Content-Type": "application/json"}, timeout=timeout
+        )
+        return status, response
+
+    def ping(self) -> EngineStatus:
+        """
+        Verifica se o daemon está vivo (`/_ping` + `/version`).
+
+        Returns:
+            EngineStatus: Estado do daemon
+        """
+        start = time.monotonic()
+        try:
+            status, _, body = self.request("GET", "/_ping")
+            if status != 200 or body.strip() != b"OK":
+                raise DockerEngineError(f"/_ping retornou HTTP {status}", ERROR_PROTOCOL)
+            version = self.get_json("/version")
+        except DockerEngineError as e:
+            return EngineStatus(
+                ok=False,
+                socket_path=self.socket_path,
+                error=str(e),
+                error_kind=e.kind,
+                latency=time.monotonic() - start
+            )
+
+        return EngineStatus(
+            ok=True,
+            socket_path=self.socket_path,
+            version=version.get("Version"),
+            api_version=version.get("ApiVersion"),
+            latency=time.monotonic() - start
+        )
+
+    def wait_until_ready(
+        self,
+        budget: float = READY_BUDGET,
+        should_abort: Optional[Callable[[], bool]] = None
+    ) -> EngineStatus:
+        """
+        Aguarda o daemon responder, com backoff exponencial.
+
+        Socket ausente, conexão recusada e timeout significam que o daemon
+        ainda está inicializando; erro de permissão significa que ele já
+        responde (o problema é do usuário), então a espera termina.
+
+        Args:
+            budget: Tempo máximo total em segundos
+            should_abort: Verificação opcional para desistir antes do prazo
+                (ex: serviço em estado "failed")
+
+        Returns:
+            EngineStatus: Último estado observado
+        """
+        deadline = time.monotonic() + budget
+        delay = READY_INITIAL_DELAY
+        while True:
+            engine = self.ping()
+            if engine.ok or engine.error_kind == ERROR_PERMISSION:
+                return engine
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (should_abort and should_abort()):
+                return engine
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, READY_MAX_DELAY)
+
+    def image_exists(self, reference: str) -> bool:
+        """
+        Verifica se uma imagem está presente no daemon.
+
+        Args:
+            reference: Imagem (ex: "hello-world:latest")
+
+        Returns:
+            bool: True se a imagem existe localmente
+
+        Raises:
+            DockerEngineError: Se o daemon não puder ser acessado
+        """
+        status, _, _ = self.request("GET", f"/images/{quote(reference, safe='/:@')}/json")
+        return status == 200
+
+    def image_digests(self, reference: str) -> Optional[List[str]]:
+        """
+        Lista os digests de registry de uma imagem local (`RepoDigests`).
+
+        Args:
+            reference: Imagem
+
+        Returns:
+            Optional[List[str]]: Digests (ex: "nginx@sha256:..."), ou None se
+                a imagem não existir localmente
+
+        Raises:
+            DockerEngineError: Se o daemon não puder ser acessado
+        """
+        status, _, body = self.request("GET", f"/images/{quote(reference, safe='/:@')}/json")
+        if status == 404:
+            return None
+        if status != 200:
+            raise DockerEngineError(f"inspect de {reference} retornou HTTP {status}: {error_message(body)}", ERROR_PROTOCOL)
+        try:
+            return json.loads(body).get("RepoDigests") or []
+        except ValueError as e:
+            raise DockerEngineError(f"inspect de {reference} retornou JSON inválido: {e}", ERROR_PROTOCOL)
+
+    def registry_digest(self, reference: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Consulta no registry o digest atual de uma tag (sem baixar camadas).
+
+        Args:
+            reference: Imagem
+            timeout: Tempo máximo
+
+        Returns:
+            Optional[str]: Digest (ex: "sha256:..."), ou None se o registry
+                não puder ser consultado (ex: sem rede)
+
+        Raises:
+            DockerEngineError: Se o daemon não puder ser acessado
+        """
+        status, _, body = self.request(
+            "GET", f"/distribution/{quote(reference, safe='/:@')}/json", timeout=timeout
+        )
+        if status != 200:
+            return None
+        try:
+            return json.loads(body).get("Descriptor", {}).get("digest")
+        except ValueError:
+            return None
+
+    def pull_image(self, reference: str, timeout: float = PULL_TIMEOUT) -> None:
+        """
+        Baixa uma imagem do registry (equivalente a `docker pull`).
+
+        Args:
+            reference: Imagem (ex: "nginx:1.25" ou "nginx@sha256:...")
+            timeout: Tempo máximo do download
+
+        Raises:
+            DockerEngineError: Se o daemon ou o registry falharem
+        """
+        name, tag = split_image_reference(reference)
+        query = {"fromImage": name}
+        if tag:
+            query["tag"] = tag
+        status, _, body = self.request("POST", f"/images/create?{urlencode(query)}", timeout=timeout)
+        _check_progress(status, body, f"pull de {reference}")
+
+    def remove_image(self, reference: str) -> bool:
+        """
+        Remove uma imagem local (equivalente a `docker rmi -f`).
+
+        Args:
+            reference: Imagem
+
+        Returns:
+            bool: True se foi removida, False se não existia
+
+        Raises:
+            DockerEngineError: Se o daemon recusar a remoção
+        """
+        status, _, body = self.request("DELETE", f"/images/{quote(reference, safe='/:@')}?force=1")
+        if status == 404:
+            return False
+        if status != 200:
+            raise DockerEngineError(f"remoção de {reference} retornou HTTP {status}: {error_message(body)}", ERROR_PROTOCOL)
+        return True
+
+    def load_image(self, tarball: Path, timeout: float = PULL_TIMEOUT) -> None:
+        """
+        Carrega imagens de um tarball (equivalente a `docker load`).
+
+        Args:
+            tarball: Arquivo gerado por `docker save`
+            timeout: Tempo máximo
+
+        Raises:
+            DockerEngineError: Se o daemon recusar o arquivo
+        """
+        with open(tarball, "rb") as f:
+            status, _, body = self.request(
+                "POST",
+                "/images/load?quiet=1",
+                body=f,
+                headers={"Content-Type": "application/x-tar", "Content-Length": str(os.path.getsize(tarball))},
+                timeout=timeout
+            )
+        _check_progress(status, body, f"load de {tarball.name}")
+
+    def save_image(self, references: List[str], dest: Path, timeout: float = PULL_TIMEOUT) -> None:
+        """
+        Exporta imagens para um tarball (equivalente a `docker save`), de forma atômica.
+
+        Args:
+            references: Imagens a exportar
+            dest: Arquivo de destino
+            timeout: Tempo máximo
+
+        Raises:
+            DockerEngineError: Se o daemon falhar
+        """
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part = dest.with_name(dest.name + ".part")
+        query = urlencode([("names", reference) for reference in references])
+        try:
+            with open(part, "wb") as f:
+                status, _, body = self.request("GET", f"/images/get?{query}", timeout=timeout, output=f)
+            if status != 200:
+                raise DockerEngineError(f"save retornou HTTP {status}: {error_message(body)}", ERROR_PROTOCOL)
+            os.replace(part, dest)
+        finally:
+            if part.exists():
+                part.unlink()
+
+
+def split_image_reference(reference: str) -> Tuple[str, str]:
+    """
+    Separa uma referência de imagem em nome e tag (padrão "latest").
+
+    Args:
+        reference: Ex: "nginx", "nginx:1.25", "registry:5000/app", "app@sha256:..."
+
+    Returns:
+        Tuple[str, str]: Nome e tag (tag vazia para referências por digest)
+    """
+    if "@" in reference:
+        return reference, ""
+    name, sep, tag = reference.rpartition(":")
+    if not sep or "/" in tag:
+        return reference, "latest"
+    return name, tag
+
+
+def error_message(body: bytes) -> str:
+    """Extrai a mensagem de erro de uma resposta JSON da Engine API."""
+    try:
+        return json.loads(body).get("message", "") or body.decode(errors="replace")
+    except (ValueError, AttributeError):
+        return body.decode(errors="replace").strip()
+
+
+def _check_progress(status: int, body: bytes, operation: str) -> None:
+    """
+    Verifica uma resposta de progresso (JSON por linha) de pull/load.
+
+    Raises:
+        DockerEngineError: Se o status não for 200 ou alguma linha trouxer erro
+    """
+    if status != 200:
+        raise DockerEngineError(f"{operation} retornou HTTP {status}: {error_message(body)}", ERROR_PROTOCOL)
+    for line in body.splitlines():
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict) and message.get("error"):
+            raise DockerEngineError(f"{operation} falhou: {message['error']}", ERROR_PROTOCOL)
+
+
+class _FakeEngineHandler(BaseHTTPRequestHandler):
+    """Responde como a Engine API a partir das rotas do servidor falso."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _reply(self, method: str) -> None:
+        self.server.requests.append((method, self.path))
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        route = self.server.routes.get((method, self.path.split("?", 1)[0]))
+        if route is None:
+            status, payload = 404, {"message": f"page not found: {self.path}"}
+        else:
+            status, payload = route(self.path, body) if callable(route) else route
+
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain" if isinstance(payload, bytes) else "application/json")
+        self.send_header("Api-Version", self.server.api_version)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        self._reply("GET")
+
+    def do_HEAD(self) -> None:
+        self._reply("HEAD")
+
+    def do_POST(self) -> None:
+        self._reply("POST")
+
+    def do_DELETE(self) -> None:
+        self._reply("DELETE")
+
+
+class FakeDockerEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Daemon falso em um socket unix, para testes sem Docker.
+
+    Responde `/_ping` e `/version`; outras rotas podem ser adicionadas em
+    `routes` como {(método, caminho): (status, corpo)} ou uma função
+    `(caminho, corpo) -> (status, corpo)`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, version: str = "24.0.7", api_version: str = "1.43", delay: float = 0.0):
+        """
+        Cria o daemon falso.
+
+        Args:
+            socket_path: Caminho do socket a criar
+            version: Versão reportada em /version
+            api_version: Versão da API reportada
+            delay: Atraso de cada resposta em segundos
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _FakeEngineHandler)
+        self.socket_path = socket_path
+        self.api_version = api_version
+        self.delay = delay
+        self.requests: List[Tuple[str, str]] = []
+        self.routes = {
+            ("GET", "/_ping"): (200, b"OK"),
+            ("HEAD", "/_ping"): (200, b""),
+            ("GET", "/version"): (200, {"Version": version, "ApiVersion": api_version, "Os": "linux"}),
+        }
+
+    def start_in_thread(self) -> threading.Thread:
+        """Inicia o servidor em uma thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """Para o servidor e remove o socket."""
+        self.shutdown()
+        self.server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
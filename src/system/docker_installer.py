@@ -1,11 +1,15 @@
 """Gerenciador principal para instalação do Docker."""
 
-from typing import Optional
+import subprocess
+from typing import Any, Dict, List, Optional
 from rich import print
-import typer
 
 from .system_detector import SystemDetector, SystemInfo, OperatingSystem
 from .installers.base_installer import BaseInstaller
+from .docker_daemon_config import DaemonConfig, RELOADABLE_KEYS, tuned_profile
+from .docker_engine import DockerEngineClient, ERROR_NOT_FOUND, ERROR_REFUSED, ERROR_TIMEOUT
+from .privileged_helper import get_privileged_helper
+from .prompt_policy import confirm
 from .installers.ubuntu_installer import UbuntuInstaller
 from .installers.macos_installer import MacOSInstaller
 from .installers.redhat_installer import RedHatInstaller
@@ -42,13 +46,21 @@ class DockerInstaller:
         
         return None
     
-    def install(self, force: bool = False, test_after_install: bool = True) -> bool:
+    def install(
+        self,
+        force: bool = False,
+        test_after_install: bool = True,
+        deep: bool = False,
+        daemon_config: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """
         Instala o Docker no sistema.
         
         Args:
             force: Forçar reinstalação mesmo se já estiver instalado
             test_after_install: Testar instalação após completar
+            deep: Testar também executando um container
+            daemon_config: Opções a mesclar no daemon.json (ex: perfil `--tuned`)
             
         Returns:
             bool: True se a instalação foi bem-sucedida
@@ -68,8 +80,8 @@ class DockerInstaller:
             version = self.installer.get_docker_version()
             print(f":white_check_mark: Docker já está instalado (versão {version})")
             
-            if not typer.confirm("Deseja reinstalar?"):
-                return True
+            if not confirm("reinstall.docker", "Deseja reinstalar?"):
+                return self.configure_daemon(daemon_config) if daemon_config else True
         
         # Verificar pré-requisitos
         if not self.installer.check_prerequisites():
@@ -87,10 +99,13 @@ class DockerInstaller:
             self.installer.print_manual_instructions()
             return False
         
+        if daemon_config and not self.configure_daemon(daemon_config):
+            return False
+        
         # Testar instalação
         if test_after_install:
             print()
-            test_result = self.installer.test_docker_installation()
+            test_result = self.installer.test_docker_installation(deep)
             if test_result:
                 print()
                 print(":whale: [bold green]Docker instalado e funcionando![/bold green]")
@@ -101,6 +116,60 @@ class DockerInstaller:
         
         return True
     
+    def tuned_daemon_config(self, registry_mirrors: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Monta o perfil de desempenho (`--tuned`) para o daemon.json deste sistema.
+        
+        Args:
+            registry_mirrors: Mirrors de registry a adicionar
+            
+        Returns:
+            Dict[str, Any]: Opções a mesclar
+        """
+        try:
+            existing = DaemonConfig(self.installer.get_daemon_config_path()).load() if self.installer else {}
+        except (OSError, ValueError):
+            existing = {}
+        return tuned_profile(existing, registry_mirrors)
+    
+    def configure_daemon(self, overlay: Dict[str, Any]) -> bool:
+        """
+        Mescla opções no daemon.json e recarrega o daemon se algo mudou.
+        
+        Args:
+            overlay: Opções desejadas
+            
+        Returns:
+            bool: True se a configuração está aplicada
+        """
+        if not self.installer:
+            print(f":x: [bold red]Sistema não suportado:[/bold red] {self.system_info.os_type.value}")
+            return False
+        
+        print()
+        print(":gear: [blue]Configurando o daemon do Docker...[/blue]")
+        daemon_config = DaemonConfig(self.installer.get_daemon_config_path())
+        try:
+            changed = daemon_config.apply(overlay)
+            if changed:
+                print(f"  [green]✓[/green] {daemon_config.path} atualizado: {', '.join(changed)}")
+                needs_restart = [key for key in changed if key not in RELOADABLE_KEYS]
+                restart = False
+                if needs_restart:
+                    print(f"  [yellow]![/yellow] {', '.join(needs_restart)} só vale após reiniciar o Docker "
+                          "(containers sem live-restore serão parados)")
+                    restart = confirm("docker.restart_daemon", "Reiniciar o Docker agora?")
+                    if not restart:
+                        print("  [dim]Reinicie depois com: sudo systemctl restart docker[/dim]")
+                self.installer.reload_docker_daemon(restart=restart)
+        except (OSError, ValueError) as e:
+            print(f"  [red]✗[/red] {e}")
+            return False
+        except subprocess.CalledProcessError as e:
+            print(f"  [red]✗[/red] Falha ao aplicar a configuração do daemon: {e}")
+            return False
+        return True
+    
     def _handle_docker_permission_issues(self) -> None:
         """Lida com problemas comuns de permissão do Docker."""
         print()
@@ -108,7 +177,6 @@ class DockerInstaller:
         
         # Verificar se é problema de permissão (apenas Linux)
         if self.system_info.os_type != OperatingSystem.MACOS:
-            import subprocess
             import os
             
             # Verificar se usuário está no grupo docker
@@ -130,12 +198,9 @@ class DockerInstaller:
                     print()
                     
                     # Tentar adicionar automaticamente se confirmado
-                    import typer
-                    if typer.confirm("Deseja tentar adicionar automaticamente ao grupo docker?"):
+                    if confirm("docker.add_user_to_group", "Deseja tentar adicionar automaticamente ao grupo docker?"):
                         try:
-                            subprocess.run([
-                                "sudo", "usermod", "-aG", "docker", os.getenv('USER', 'user')
-                            ], check=True)
+                            get_privileged_helper().add_user_to_group(os.getenv('USER', 'user'), "docker")
                             print(":white_check_mark: [green]Usuário adicionado ao grupo docker![/green]")
                             print(":information: [blue]Execute 'newgrp docker' ou faça logout/login para aplicar[/blue]")
                         except subprocess.CalledProcessError:
@@ -147,22 +212,19 @@ class DockerInstaller:
                 pass
         
         # Verificar se Docker daemon está rodando
-        try:
-            result = subprocess.run(["docker", "version"], capture_output=True, text=True)
-            if "Cannot connect to the Docker daemon" in result.stderr:
-                print(":warning: [yellow]Docker daemon não está rodando[/yellow]")
-                print()
-                print("[bold]Soluções:[/bold]")
-                if self.system_info.os_type == OperatingSystem.MACOS:
-                    print("1. [blue]Abrir Docker Desktop:[/blue]")
-                    print("   open /Applications/Docker.app")
-                else:
-                    print("1. [blue]Iniciar Docker daemon:[/blue]")
-                    print("   sudo systemctl start docker")
-                    print("   sudo systemctl enable docker")
-                print()
-        except Exception:
-            pass
+        engine = DockerEngineClient().ping()
+        if engine.error_kind in (ERROR_NOT_FOUND, ERROR_REFUSED, ERROR_TIMEOUT):
+            print(f":warning: [yellow]{engine.error}[/yellow]")
+            print()
+            print("[bold]Soluções:[/bold]")
+            if self.system_info.os_type == OperatingSystem.MACOS:
+                print("1. [blue]Abrir Docker Desktop:[/blue]")
+                print("   open /Applications/Docker.app")
+            else:
+                print("1. [blue]Iniciar Docker daemon:[/blue]")
+                print("   sudo systemctl start docker")
+                print("   sudo systemctl enable docker")
+            print()
         
         print("[bold]Para mais ajuda:[/bold]")
         print("• Documentação: https://docs.docker.com/engine/install/linux-postinstall/")
@@ -184,15 +246,18 @@ class DockerInstaller:
             return True
         
         print(":warning: [bold yellow]Esta ação removerá o Docker completamente do sistema.[/bold yellow]")
-        if not typer.confirm("Tem certeza que deseja continuar?"):
+        if not confirm("uninstall.docker", "Tem certeza que deseja continuar?"):
             return False
         
         return self.installer.uninstall()
     
-    def check_installation(self) -> dict:
+    def check_installation(self, deep: bool = False) -> dict:
         """
         Verifica o status da instalação do Docker.
         
+        Args:
+            deep: Testar também executando um container
+        
         Returns:
             dict: Informações sobre a instalação
         """
@@ -208,13 +273,18 @@ class DockerInstaller:
             info["installed"] = self.installer.is_docker_installed()
             if info["installed"]:
                 info["version"] = self.installer.get_docker_version()
-                info["working"] = self.installer.test_docker_installation()
+                info["working"] = self.installer.test_docker_installation(deep)
         
         return info
     
-    def print_status(self) -> None:
-        """Imprime o status atual da instalação."""
-        info = self.check_installation()
+    def print_status(self, info: Optional[dict] = None) -> None:
+        """
+        Imprime o status atual da instalação.
+        
+        Args:
+            info: Resultado de `check_installation` (verificado agora se omitido)
+        """
+        info = info or self.check_installation()
         
         print(f":computer: [bold]Sistema:[/bold] {info['system']}")
         print(f":gear: [bold]Suportado:[/bold] {'✓' if info['supported'] else '✗'}")
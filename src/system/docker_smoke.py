@@ -0,0 +1,82 @@
+"""Imagem de teste do Docker mantida em cache local.
+
+O teste com container (`--deep`) usa uma imagem mínima que é carregada de
+`~/.cache/leme/images` com `docker load`. Ela só é baixada do Docker Hub
+na primeira vez (e então salva no cache); daí em diante a verificação não
+depende de rede nem de limites de pull do registry. O tarball pode ser
+copiado para outras máquinas (ex: imagens de laboratório) para que nenhuma
+delas precise baixá-la.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Optional
+from rich import print
+
+from .artifact_cache import CACHE_DIR
+from .docker_engine import DockerEngineClient
+
+
+SMOKE_IMAGE = "hello-world:latest"
+IMAGES_DIR = CACHE_DIR / "images"
+SMOKE_TARBALL = IMAGES_DIR / "hello-world.tar"
+SMOKE_RUN_TIMEOUT = 30
+
+
+class SmokeImage:
+    """Garante a imagem de teste no daemon sem depender do registry."""
+
+    def __init__(self, client: Optional[DockerEngineClient] = None, tarball: Optional[Path] = None):
+        """
+        Inicializa o gerenciador da imagem de teste.
+
+        Args:
+            client: Cliente da Engine API
+            tarball: Tarball da imagem (padrão: ~/.cache/leme/images/hello-world.tar)
+        """
+        self.client = client or DockerEngineClient()
+        self.tarball = tarball or SMOKE_TARBALL
+
+    def ensure(self) -> None:
+        """
+        Deixa a imagem de teste disponível no daemon.
+
+        Ordem: imagem já presente → `docker load` do tarball em cache →
+        pull do registry (uma única vez), salvando o tarball para as
+        próximas verificações.
+
+        Raises:
+            DockerEngineError: Se não for possível obter a imagem
+        """
+        if self.client.image_exists(SMOKE_IMAGE):
+            if not self.tarball.exists():
+                self.client.save_image([SMOKE_IMAGE], self.tarball)
+            return
+
+        if self.tarball.exists():
+            print(f"  [dim]↷ Carregando imagem de teste do cache: {self.tarball.name}[/dim]")
+            self.client.load_image(self.tarball)
+            return
+
+        print(f"  [blue]⬇[/blue] Baixando imagem de teste ({SMOKE_IMAGE}) pela primeira vez...")
+        self.client.pull_image(SMOKE_IMAGE)
+        self.client.save_image([SMOKE_IMAGE], self.tarball)
+
+    def run(self) -> subprocess.CompletedProcess:
+        """
+        Executa o container de teste sem rede.
+
+        Returns:
+            subprocess.CompletedProcess: Resultado do `docker run`
+
+        Raises:
+            DockerEngineError: Se a imagem não puder ser obtida
+            subprocess.TimeoutExpired: Se o container não terminar a tempo
+        """
+        self.ensure()
+        return subprocess.run(
+            ["docker", "run", "--rm", "--network", "none", SMOKE_IMAGE],
+            capture_output=True,
+            text=True,
+            timeout=SMOKE_RUN_TIMEOUT
+        )
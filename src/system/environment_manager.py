@@ -1,7 +1,9 @@
 """Gerenciador de ambiente DevOps - Setup de todas as ferramentas necessárias."""
 
+import shutil
 import subprocess
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 from rich import print
 from rich.console import Console
@@ -50,12 +52,7 @@ class EnvironmentManager:
                 timeout=10
             )
             
-            if result.returncode == 0:
-                # Extrair versão do output
-                version = self._extract_version(tool, result.stdout)
-                return ToolStatus(tool=tool, installed=True, version=version)
-            else:
-                return ToolStatus(tool=tool, installed=False, error=result.stderr.strip())
+            return self.status_from_output(tool, result.returncode, result.stdout, result.stderr)
                 
         except subprocess.TimeoutExpired:
             return ToolStatus(tool=tool, installed=False, error="Timeout")
@@ -64,6 +61,27 @@ class EnvironmentManager:
         except Exception as e:
             return ToolStatus(tool=tool, installed=False, error=str(e))
     
+    def status_from_output(self, tool: Tool, returncode: int, stdout: str, stderr: str = "") -> ToolStatus:
+        """
+        Monta o status de uma ferramenta a partir da saída do comando de verificação.
+        
+        Também usado para saídas coletadas em hosts remotos.
+        
+        Args:
+            tool: A ferramenta
+            returncode: Código de saída do comando
+            stdout: Saída padrão
+            stderr: Saída de erro
+            
+        Returns:
+            ToolStatus: Status da ferramenta
+        """
+        if returncode == 0:
+            # Extrair versão do output
+            version = self._extract_version(tool, stdout)
+            return ToolStatus(tool=tool, installed=True, version=version)
+        return ToolStatus(tool=tool, installed=False, error=stderr.strip())
+    
     def _extract_version(self, tool: Tool, output: str) -> Optional[str]:
         """
         Extrai a versão do output do comando.
@@ -129,6 +147,9 @@ class EnvironmentManager:
                     minor = re.search(r'Minor:"([^"]+)"', first_line)
                     if major and minor:
                         return f"v{major.group(1)}.{minor.group(1)}"
+                else:
+                    # Client Version: v1.29.3
+                    return first_line.split()[-1]
         
         elif tool == Tool.ANSIBLE:
             # ansible [core 2.15.3]
@@ -157,12 +178,52 @@ class EnvironmentManager:
         with Progress() as progress:
             task = progress.add_task("[blue]Verificando...", total=len(Tool))
             
-            for tool in Tool:
-                self.tools_status[tool] = self.check_tool(tool)
-                progress.update(task, advance=1)
+            # Verificações em paralelo: o tempo total é o da ferramenta mais lenta
+            with ThreadPoolExecutor(max_workers=len(Tool)) as executor:
+                futures = {executor.submit(self.check_tool, tool): tool for tool in Tool}
+                for future in as_completed(futures):
+                    self.tools_status[futures[future]] = future.result()
+                    progress.update(task, advance=1)
         
         return self.tools_status
     
+    def check_tools(self, tools: Iterable[Tool], presence_only: Iterable[Tool] = ()) -> Dict[Tool, ToolStatus]:
+        """
+        Verifica um conjunto de ferramentas em paralelo, sem saída no terminal.
+        
+        Ferramentas em `presence_only` são verificadas apenas pela presença do
+        executável no PATH, sem executá-lo (mais rápido, mas sem versão).
+        
+        Args:
+            tools: Ferramentas a verificar
+            presence_only: Ferramentas para as quais a versão não importa
+            
+        Returns:
+            Dict[Tool, ToolStatus]: Status das ferramentas verificadas
+        """
+        tools = list(tools)
+        presence_only = set(presence_only)
+        
+        to_run = []
+        for tool in tools:
+            if tool in presence_only:
+                executable = DEVOPS_TOOLS_CONFIG[tool]["check_command"][0]
+                installed = shutil.which(executable) is not None
+                self.tools_status[tool] = ToolStatus(
+                    tool=tool,
+                    installed=installed,
+                    error=None if installed else "Command not found"
+                )
+            else:
+                to_run.append(tool)
+        
+        if to_run:
+            with ThreadPoolExecutor(max_workers=len(to_run)) as executor:
+                for tool, status in zip(to_run, executor.map(self.check_tool, to_run)):
+                    self.tools_status[tool] = status
+        
+        return {tool: self.tools_status[tool] for tool in tools}
+    
     def show_status_report(self) -> None:
         """Exibe um relatório detalhado do status das ferramentas."""
         if not self.tools_status:
@@ -0,0 +1,47 @@
+"""Utilitários para gravar arquivos de configuração do usuário."""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+
+def atomic_write_text(path: Path, content: str) -> Path:
+    """
+    Grava um arquivo de texto de forma atômica (temporário + rename).
+
+    Se o caminho for um link simbólico (ex: ~/.gitconfig vindo de um
+    repositório de dotfiles), o destino do link é que é gravado, e o link
+    continua no lugar. As permissões do arquivo existente são mantidas;
+    um arquivo novo segue a umask, como se fosse criado com `open`.
+
+    Args:
+        path: Arquivo de destino
+        content: Conteúdo completo
+
+    Returns:
+        Path: Arquivo efetivamente gravado (o destino do link, se houver)
+
+    Raises:
+        OSError: Se não for possível gravar
+    """
+    target = Path(os.path.realpath(path))
+    try:
+        mode = stat.S_IMODE(target.stat().st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return target
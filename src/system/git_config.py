@@ -0,0 +1,314 @@
+"""Configuração global do Git (~/.gitconfig) lida e gravada pela própria CLI.
+
+Cada `git config --global chave valor` é um processo que relê e regrava o
+arquivo inteiro; aplicar um perfil com uma dúzia de opções assim é lento e,
+se um comando falhar no meio, deixa o arquivo meio configurado. Aqui todas
+as opções são aplicadas em uma única gravação atômica. Para decidir o que
+gravar o arquivo é lido sem processos; para mostrar a configuração efetiva
+(com [include] e [includeIf]) basta um único `git config --list`.
+
+Só as linhas das opções alteradas mudam: comentários, seções e opções do
+usuário são preservados.
+"""
+
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .file_utils import atomic_write_text
+from .system_detector import OperatingSystem, SystemInfo
+from .version_utils import version_satisfies
+
+
+# O fsmonitor embutido (git fsmonitor--daemon) só existe no macOS e no Windows
+FSMONITOR_MIN_VERSION = ">=2.37"
+FSMONITOR_SYSTEMS = [OperatingSystem.MACOS, OperatingSystem.WINDOWS]
+# `git maintenance start` agenda as tarefas (cron, systemd ou launchd)
+MAINTENANCE_MIN_VERSION = ">=2.30"
+
+_SECTION_RE = re.compile(r'^\s*\[\s*(?P<section>[\w.-]+)(?:\s+"(?P<subsection>(?:[^"\\]|\\.)*)")?\s*\]')
+_OPTION_RE = re.compile(r"^\s*(?P<key>[A-Za-z][\w-]*)\s*(?:=\s*(?P<value>.*))?$")
+_ESCAPES = {"n": "\n", "t": "\t", "b": "\b", '"': '"', "\\": "\\"}
+
+
+def default_gitconfig() -> Path:
+    """
+    Arquivo de configuração global, na mesma ordem que o Git procura.
+
+    GIT_CONFIG_GLOBAL, depois ~/.gitconfig e, se ele não existir,
+    $XDG_CONFIG_HOME/git/config.
+    """
+    if os.environ.get("GIT_CONFIG_GLOBAL"):
+        return Path(os.environ["GIT_CONFIG_GLOBAL"]).expanduser()
+    home_config = Path.home() / ".gitconfig"
+    xdg_config = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config") / "git" / "config"
+    if not home_config.exists() and xdg_config.exists():
+        return xdg_config
+    return home_config
+
+
+def split_key(key: str) -> Tuple[str, str]:
+    """
+    Separa "seção[.subseção].opção" em seção normalizada e opção.
+
+    Seção e opção não diferenciam maiúsculas; a subseção sim.
+
+    Returns:
+        Tuple[str, str]: ("seção" ou "seção.subseção", "opção")
+    """
+    section, _, name = key.rpartition(".")
+    head, dot, subsection = section.partition(".")
+    return head.lower() + dot + subsection, name.lower()
+
+
+def parse_value(raw: str) -> str:
+    """Interpreta um valor do arquivo: aspas, escapes e comentários no fim da linha."""
+    value = []
+    quoted = False
+    pending_space = ""
+    index = 0
+    while index < len(raw):
+        char = raw[index]
+        if char == "\\" and index + 1 < len(raw):
+            value.append(pending_space + _ESCAPES.get(raw[index + 1], raw[index + 1]))
+            pending_space = ""
+            index += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char in "#;":
+            break
+        elif not quoted and char.isspace():
+            pending_space += char
+        else:
+            value.append(pending_space + char)
+            pending_space = ""
+        index += 1
+    return "".join(value)
+
+
+def format_value(value: str) -> str:
+    """Valor pronto para o arquivo (entre aspas quando necessário)."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\t", "\\t")
+    if value != value.strip() or any(char in value for char in "#;"):
+        return f'"{escaped}"'
+    return escaped
+
+
+def format_section(section: str) -> str:
+    """Cabeçalho de seção (ex: "maintenance" → [maintenance], "url.x" → [url "x"])."""
+    head, dot, subsection = section.partition(".")
+    if dot:
+        return f'[{head} "{subsection}"]'
+    return f"[{head}]"
+
+
+def _scan(lines: List[str]) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """Para cada linha: (seção, opção, valor) — opção e valor None se a linha não tiver opção."""
+    scanned = []
+    section = None
+    for line in lines:
+        match = _SECTION_RE.match(line)
+        if match:
+            head = match.group("section")
+            subsection = match.group("subsection")
+            if subsection is not None:
+                section = head.lower() + "." + re.sub(r"\\(.)", r"\1", subsection)
+            else:
+                # Sintaxe antiga: [seção.subseção] (a subseção também fica minúscula)
+                section = head.lower()
+            # Opções podem vir na mesma linha do cabeçalho: [core] editor = vim
+            line = line[match.end():]
+        stripped = line.strip()
+        option = _OPTION_RE.match(stripped) if stripped and stripped[0] not in "#;" else None
+        if section and option:
+            raw = option.group("value")
+            # Opção sem valor ("bare") é verdadeira
+            scanned.append((section, option.group("key").lower(), "true" if raw is None else parse_value(raw)))
+        else:
+            scanned.append((section, None, None))
+    return scanned
+
+
+def read_git_config(text: str) -> Dict[str, List[str]]:
+    """
+    Lê um arquivo de configuração do Git.
+
+    Args:
+        text: Conteúdo do arquivo
+
+    Returns:
+        Dict[str, List[str]]: Valores de cada "seção.opção" (várias entradas para opções multivaloradas)
+    """
+    values: Dict[str, List[str]] = {}
+    for section, key, value in _scan(text.splitlines()):
+        if key is not None:
+            values.setdefault(f"{section}.{key}", []).append(value)
+    return values
+
+
+def merge_git_config(existing: str, settings: Dict[str, str], additions: Optional[Dict[str, List[str]]] = None) -> str:
+    """
+    Aplica opções a um arquivo de configuração, preservando o resto.
+
+    Opções já presentes têm a última ocorrência (a que vale) substituída;
+    as novas entram no fim da última ocorrência da seção, ou em uma seção
+    nova no fim do arquivo (como o próprio `git config` faz).
+
+    Args:
+        existing: Conteúdo atual
+        settings: Opções "seção.opção" → valor
+        additions: Valores a acrescentar em opções multivaloradas, se ausentes
+            (ex: maintenance.repo)
+
+    Returns:
+        str: Novo conteúdo
+    """
+    lines = existing.splitlines()
+    current = read_git_config(existing)
+    # (seção, opção como escrita, valor, substituir a ocorrência existente)
+    pending: List[Tuple[str, str, str, bool]] = []
+    for key, value in settings.items():
+        section, name = split_key(key)
+        if current.get(f"{section}.{name}", [None])[-1] != value:
+            pending.append((section, key.rpartition(".")[2], value, True))
+    for key, values in (additions or {}).items():
+        section, name = split_key(key)
+        for value in values:
+            if value not in current.get(f"{section}.{name}", []):
+                pending.append((section, key.rpartition(".")[2], value, False))
+
+    for section, name, value, replace in pending:
+        entry = f"\t{name} = {format_value(value)}"
+        scanned = _scan(lines)
+        in_section = [index for index, (line_section, _, _) in enumerate(scanned)
+                      if line_section == section and (scanned[index][1] or _SECTION_RE.match(lines[index]))]
+        occurrences = [index for index in in_section
+                       if scanned[index][1] == name.lower() and not _SECTION_RE.match(lines[index])]
+        if replace and occurrences:
+            lines[occurrences[-1]] = entry
+        elif in_section:
+            lines.insert(in_section[-1] + 1, entry)
+        else:
+            lines.extend([format_section(section), entry])
+
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def performance_profile(system_info: SystemInfo, git_version: Optional[str]) -> Dict[str, str]:
+    """
+    Opções para repositórios grandes (monorepos).
+
+    Args:
+        system_info: Sistema (CPUs e suporte ao fsmonitor)
+        git_version: Versão do Git instalado (ex: "2.39.2")
+
+    Returns:
+        Dict[str, str]: Opções "seção.opção" → valor
+    """
+    threads = str(system_info.cpu_count or 0)  # 0 = o Git detecta os núcleos
+    profile = {
+        # index.version 4 e cache de arquivos não rastreados
+        "feature.manyFiles": "true",
+        "core.untrackedCache": "true",
+        # O grafo de commits acelera log, merge-base e status em históricos longos
+        "fetch.writeCommitGraph": "true",
+        "pack.threads": threads,
+        "index.threads": "true",
+    }
+    if system_info.os_type in FSMONITOR_SYSTEMS and version_satisfies(git_version, FSMONITOR_MIN_VERSION):
+        profile["core.fsmonitor"] = "true"
+    return profile
+
+
+class GitConfig:
+    """Lê e grava um arquivo de configuração do Git sem chamar `git config`."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            path: Arquivo de configuração (padrão: o global, ver `default_gitconfig`)
+        """
+        self.path = path or default_gitconfig()
+
+    def _existing(self) -> str:
+        """Conteúdo atual do arquivo (vazio se não existir)."""
+        return self.path.read_text() if self.path.exists() else ""
+
+    def read(self) -> Dict[str, List[str]]:
+        """
+        Lê todas as opções do arquivo.
+
+        Returns:
+            Dict[str, List[str]]: Valores de cada "seção.opção"
+        """
+        return read_git_config(self._existing())
+
+    def read_effective(self) -> Dict[str, List[str]]:
+        """
+        Lê as opções como o Git as vê, seguindo [include] e [includeIf].
+
+        Usa uma única chamada a `git config --includes --list -z`.
+
+        Returns:
+            Dict[str, List[str]]: Valores de cada "seção.opção" (vazio se o arquivo não existir)
+
+        Raises:
+            subprocess.CalledProcessError: Se o git falhar (ex: arquivo inválido)
+        """
+        if not self.path.exists():
+            return {}
+        result = subprocess.run(
+            ["git", "config", "--file", str(self.path), "--includes", "--list", "-z"],
+            capture_output=True, text=True, check=True, timeout=30
+        )
+        values: Dict[str, List[str]] = {}
+        # Entradas separadas por NUL; chave e valor por "\n" (sem "\n": opção "bare", verdadeira)
+        for entry in result.stdout.split("\0"):
+            if not entry:
+                continue
+            key, newline, value = entry.partition("\n")
+            values.setdefault(".".join(split_key(key)), []).append(value if newline else "true")
+        return values
+
+    def get(self, key: str) -> Optional[str]:
+        """Valor efetivo de uma opção (a última ocorrência), ou None."""
+        return self.read().get(".".join(split_key(key)), [None])[-1]
+
+    def plan(self, settings: Dict[str, str], additions: Optional[Dict[str, List[str]]] = None) -> str:
+        """
+        Calcula o novo conteúdo sem gravar.
+
+        Returns:
+            str: Conteúdo resultante
+        """
+        return merge_git_config(self._existing(), settings, additions)
+
+    def apply(self, settings: Dict[str, str], additions: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        """
+        Grava todas as opções de uma vez (atomicamente).
+
+        Args:
+            settings: Opções "seção.opção" → valor
+            additions: Valores a acrescentar em opções multivaloradas
+
+        Returns:
+            List[str]: Opções alteradas (vazia se nada mudou)
+
+        Raises:
+            OSError: Se não for possível gravar
+        """
+        existing = self._existing()
+        current = read_git_config(existing)
+        changed = [key for key, value in settings.items()
+                   if current.get(".".join(split_key(key)), [None])[-1] != value]
+        changed += [key for key, values in (additions or {}).items()
+                    if any(value not in current.get(".".join(split_key(key)), []) for value in values)]
+        if not changed:
+            return []
+        atomic_write_text(self.path, merge_git_config(existing, settings, additions))
+        return changed
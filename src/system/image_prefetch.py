@@ -0,0 +1,180 @@
+"""Pré-download das imagens Docker usadas no curso.
+
+As imagens listadas são obtidas em paralelo (com limite de concorrência)
+pela Engine API. Imagens cujo digest já está no daemon são puladas, e um
+diretório de tarballs compartilhado permite semear um laboratório sem
+acesso ao registry: uma máquina baixa e salva (`--save`), as demais só
+carregam (`--load`).
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from rich import print
+
+from .docker_engine import DockerEngineClient, DockerEngineError, ERROR_PROTOCOL, ERROR_TIMEOUT
+
+
+DEFAULT_PARALLEL = 4
+REGISTRY_TIMEOUT = 15.0
+
+ACTION_PRESENT = "present"
+ACTION_LOADED = "loaded"
+ACTION_PULLED = "pulled"
+ACTION_FAILED = "failed"
+
+
+def read_image_list(path: Path) -> List[str]:
+    """
+    Lê a lista de imagens (uma por linha; `#` inicia comentário).
+
+    Args:
+        path: Arquivo da lista
+
+    Returns:
+        List[str]: Imagens, sem duplicatas e na ordem do arquivo
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+    """
+    images: List[str] = []
+    for line in path.read_text().splitlines():
+        image = line.split("#", 1)[0].strip()
+        if image and image not in images:
+            images.append(image)
+    return images
+
+
+def tarball_name(reference: str) -> str:
+    """Nome do tarball de uma imagem (ex: "nginx:1.25" → "nginx_1.25.tar")."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", reference) + ".tar"
+
+
+@dataclass
+class PrefetchResult:
+    """Resultado do pré-download de uma imagem."""
+    reference: str
+    action: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class ImagePrefetcher:
+    """Baixa, carrega e salva um conjunto de imagens com concorrência limitada."""
+
+    def __init__(
+        self,
+        client: Optional[DockerEngineClient] = None,
+        parallel: int = DEFAULT_PARALLEL,
+        load_dir: Optional[Path] = None,
+        save_dir: Optional[Path] = None
+    ):
+        """
+        Inicializa o prefetcher.
+
+        Args:
+            client: Cliente da Engine API
+            parallel: Número máximo de imagens simultâneas
+            load_dir: Diretório de onde carregar tarballs antes de ir ao registry
+            save_dir: Diretório onde salvar um tarball de cada imagem
+        """
+        self.client = client or DockerEngineClient()
+        self.parallel = max(1, parallel)
+        self.load_dir = load_dir
+        self.save_dir = save_dir
+
+    def is_current(self, reference: str) -> bool:
+        """
+        Indica se a imagem local já corresponde ao digest do registry.
+
+        Referências fixadas por digest (`@sha256:`) bastam estar presentes.
+        Se o registry não responder (ex: laboratório offline) ou a consulta
+        passar de REGISTRY_TIMEOUT, a imagem local é considerada atual.
+
+        Args:
+            reference: Imagem
+
+        Returns:
+            bool: True se não há nada a baixar
+
+        Raises:
+            DockerEngineError: Se o daemon não puder ser acessado
+        """
+        digests = self.client.image_digests(reference)
+        if digests is None:
+            return False
+        if "@" in reference:
+            return True
+        try:
+            remote = self.client.registry_digest(reference, timeout=REGISTRY_TIMEOUT)
+        except DockerEngineError as e:
+            # O daemon demorou a consultar o registry: a imagem local basta
+            if e.kind in (ERROR_TIMEOUT, ERROR_PROTOCOL):
+                return True
+            raise
+        return remote is None or any(digest.endswith(f"@{remote}") for digest in digests)
+
+    def fetch(self, reference: str) -> PrefetchResult:
+        """
+        Deixa uma imagem disponível no daemon (e salva o tarball, se pedido).
+
+        Ordem: digest já presente → tarball do `load_dir` → pull do registry.
+
+        Args:
+            reference: Imagem
+
+        Returns:
+            PrefetchResult: O que foi feito (erros não são propagados)
+        """
+        start = time.monotonic()
+        try:
+            if self.is_current(reference):
+                action = ACTION_PRESENT
+            elif self.load_dir and (self.load_dir / tarball_name(reference)).exists():
+                self.client.load_image(self.load_dir / tarball_name(reference))
+                action = ACTION_LOADED
+            else:
+                self.client.pull_image(reference)
+                action = ACTION_PULLED
+
+            if self.save_dir:
+                tarball = self.save_dir / tarball_name(reference)
+                if action != ACTION_PRESENT or not tarball.exists():
+                    self.client.save_image([reference], tarball)
+        except (DockerEngineError, OSError) as e:
+            return PrefetchResult(reference, ACTION_FAILED, time.monotonic() - start, str(e))
+        return PrefetchResult(reference, action, time.monotonic() - start)
+
+    def prefetch(self, references: List[str]) -> List[PrefetchResult]:
+        """
+        Processa todas as imagens, no máximo `parallel` ao mesmo tempo.
+
+        Args:
+            references: Imagens
+
+        Returns:
+            List[PrefetchResult]: Resultados na ordem da lista
+        """
+        if self.save_dir:
+            self.save_dir.mkdir(parents=True, exist_ok=True)
+
+        labels = {
+            ACTION_PRESENT: "[dim]↷ já presente[/dim]",
+            ACTION_LOADED: "[green]✓[/green] carregada do tarball",
+            ACTION_PULLED: "[green]✓[/green] baixada",
+        }
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            futures = {executor.submit(self.fetch, reference): reference for reference in references}
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.reference] = result
+                if result.action == ACTION_FAILED:
+                    print(f"  [red]✗[/red] {result.reference}: {result.error}")
+                else:
+                    print(f"  {labels[result.action]} {result.reference} [dim]({result.seconds:.1f}s)[/dim]")
+        return [results[reference] for reference in references]
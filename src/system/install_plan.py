@@ -0,0 +1,450 @@
+"""Plano de instalação consolidado para várias ferramentas e exportação como script shell."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .system_detector import SystemInfo, OperatingSystem
+from ..config.constants import Tool, DEVOPS_TOOLS_CONFIG
+
+
+APT_SYSTEMS = [
+    OperatingSystem.UBUNTU, OperatingSystem.WSL_UBUNTU,
+    OperatingSystem.DEBIAN, OperatingSystem.WSL_DEBIAN
+]
+
+RPM_SYSTEMS = [
+    OperatingSystem.CENTOS, OperatingSystem.RHEL, OperatingSystem.FEDORA
+]
+
+AWS_CLI_INSTALL_SNIPPET = (
+    'LEME_AWS_TMP="$(mktemp -d)"\n'
+    'curl -fsSL -o "$LEME_AWS_TMP/awscliv2.zip" "https://awscli.amazonaws.com/awscli-exe-linux-$(uname -m).zip"\n'
+    'unzip -q "$LEME_AWS_TMP/awscliv2.zip" -d "$LEME_AWS_TMP"\n'
+    '"$LEME_AWS_TMP/aws/install" --update\n'
+    'rm -rf "$LEME_AWS_TMP"'
+)
+
+KUBECTL_INSTALL_SNIPPET = (
+    'LEME_KUBECTL_TMP="$(mktemp -d)"\n'
+    'LEME_KUBECTL_ARCH="$(uname -m | sed -e s/x86_64/amd64/ -e s/aarch64/arm64/)"\n'
+    'LEME_KUBECTL_VERSION="${LEME_KUBECTL_VERSION:-$(curl -fsSL https://dl.k8s.io/release/stable.txt)}"\n'
+    'LEME_KUBECTL_URL="https://dl.k8s.io/release/v${LEME_KUBECTL_VERSION#v}/bin/linux/$LEME_KUBECTL_ARCH/kubectl"\n'
+    'curl -fsSL -o "$LEME_KUBECTL_TMP/kubectl" "$LEME_KUBECTL_URL"\n'
+    'echo "$(curl -fsSL "$LEME_KUBECTL_URL.sha256")  $LEME_KUBECTL_TMP/kubectl" | sha256sum --check --quiet\n'
+    'install -m 0755 "$LEME_KUBECTL_TMP/kubectl" /usr/local/bin/kubectl\n'
+    'rm -rf "$LEME_KUBECTL_TMP"'
+)
+
+# Variáveis do usuário lidas pelos passos privilegiados (o sudo limpa o ambiente)
+PLAN_VARIABLES = {
+    Tool.KUBECTL: "LEME_KUBECTL_VERSION",
+    Tool.ANSIBLE: "LEME_ANSIBLE_VERSION",
+}
+
+# Ansible em virtualenv próprio: não disputa o site-packages do Python do sistema
+ANSIBLE_VENV_DIR = "/opt/leme/ansible"
+ANSIBLE_INSTALL_SNIPPET = (
+    f'python3 -m venv {ANSIBLE_VENV_DIR}\n'
+    f'{ANSIBLE_VENV_DIR}/bin/pip install --quiet "ansible${{LEME_ANSIBLE_VERSION:+==$LEME_ANSIBLE_VERSION}}"\n'
+    f'{ANSIBLE_VENV_DIR}/bin/python -m compileall -q -j 0 {ANSIBLE_VENV_DIR}/lib || true\n'
+    'for LEME_ANSIBLE_BIN in ansible ansible-playbook ansible-galaxy ansible-vault ansible-inventory ansible-config ansible-doc; do\n'
+    f'  ln -sf "{ANSIBLE_VENV_DIR}/bin/$LEME_ANSIBLE_BIN" "/usr/local/bin/$LEME_ANSIBLE_BIN"\n'
+    'done'
+)
+
+
+@dataclass
+class RepositorySpec:
+    """Repositório de pacotes de terceiros exigido por uma ferramenta."""
+    name: str
+    source_path: str
+    source_content: Optional[str] = None
+    source_url: Optional[str] = None
+    key_url: Optional[str] = None
+    key_path: Optional[str] = None
+
+
+@dataclass
+class ToolRecipe:
+    """Receita de instalação de uma ferramenta para uma família de gerenciador de pacotes."""
+    packages: List[str] = field(default_factory=list)
+    prerequisites: List[str] = field(default_factory=list)
+    repositories: List[RepositorySpec] = field(default_factory=list)
+    post_install: List[str] = field(default_factory=list)
+    casks: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PlanStep:
+    """Etapa do plano consolidado."""
+    step_id: str
+    title: str
+    commands: List[str]
+    privileged: bool = True
+
+
+def _apt_recipes(os_type: OperatingSystem) -> Dict[Tool, ToolRecipe]:
+    """Receitas para Ubuntu/Debian (apt)."""
+    distro = "ubuntu" if "ubuntu" in os_type.value else "debian"
+
+    return {
+        Tool.DOCKER: ToolRecipe(
+            prerequisites=["ca-certificates", "curl", "gnupg"],
+            repositories=[RepositorySpec(
+                name="docker",
+                key_url=f"https://download.docker.com/linux/{distro}/gpg",
+                key_path="/usr/share/keyrings/docker-archive-keyring.gpg",
+                source_path="/etc/apt/sources.list.d/docker.list",
+                source_content=(
+                    "deb [arch=$(dpkg --print-architecture) signed-by=/usr/share/keyrings/docker-archive-keyring.gpg] "
+                    f"https://download.docker.com/linux/{distro} $LEME_CODENAME stable"
+                )
+            )],
+            packages=["docker-ce", "docker-ce-cli", "containerd.io"],
+            post_install=[
+                'if [ "$LEME_USER" != "root" ]; then usermod -aG docker "$LEME_USER"; fi',
+                "if [ -d /run/systemd/system ]; then systemctl enable --now docker; fi"
+            ]
+        ),
+        Tool.TERRAFORM: ToolRecipe(
+            prerequisites=["gnupg", "curl"],
+            repositories=[RepositorySpec(
+                name="hashicorp",
+                key_url="https://apt.releases.hashicorp.com/gpg",
+                key_path="/etc/apt/keyrings/hashicorp.gpg",
+                source_path="/etc/apt/sources.list.d/hashicorp.list",
+                source_content="deb [signed-by=/etc/apt/keyrings/hashicorp.gpg] https://apt.releases.hashicorp.com $LEME_CODENAME main"
+            )],
+            packages=["terraform"]
+        ),
+        Tool.GIT: ToolRecipe(packages=["git"]),
+        Tool.AZURE_CLI: ToolRecipe(
+            prerequisites=["ca-certificates", "curl", "apt-transport-https", "gnupg"],
+            repositories=[RepositorySpec(
+                name="azure-cli",
+                key_url="https://packages.microsoft.com/keys/microsoft.asc",
+                key_path="/etc/apt/keyrings/microsoft.gpg",
+                source_path="/etc/apt/sources.list.d/azure-cli.list",
+                source_content=(
+                    "deb [arch=amd64,arm64,armhf signed-by=/etc/apt/keyrings/microsoft.gpg] "
+                    "https://packages.microsoft.com/repos/azure-cli/ $LEME_CODENAME main"
+                )
+            )],
+            packages=["azure-cli"]
+        ),
+        Tool.AWS_CLI: ToolRecipe(
+            packages=["curl", "unzip"],
+            post_install=[AWS_CLI_INSTALL_SNIPPET]
+        ),
+        Tool.KUBECTL: ToolRecipe(
+            packages=["curl"],
+            post_install=[KUBECTL_INSTALL_SNIPPET]
+        ),
+        Tool.ANSIBLE: ToolRecipe(
+            packages=["python3-venv"],
+            post_install=[ANSIBLE_INSTALL_SNIPPET]
+        ),
+        Tool.WATCH: ToolRecipe(packages=["procps"])
+    }
+
+
+def _rpm_recipes(os_type: OperatingSystem) -> Dict[Tool, ToolRecipe]:
+    """Receitas para CentOS/RHEL/Fedora (yum/dnf)."""
+    docker_distro = "fedora" if os_type == OperatingSystem.FEDORA else "centos"
+    hashicorp_distro = "fedora" if os_type == OperatingSystem.FEDORA else "RHEL"
+
+    return {
+        Tool.DOCKER: ToolRecipe(
+            repositories=[RepositorySpec(
+                name="docker-ce",
+                source_path="/etc/yum.repos.d/docker-ce.repo",
+                source_url=f"https://download.docker.com/linux/{docker_distro}/docker-ce.repo"
+            )],
+            packages=["docker-ce", "docker-ce-cli", "containerd.io"],
+            post_install=[
+                'if [ "$LEME_USER" != "root" ]; then usermod -aG docker "$LEME_USER"; fi',
+                "if [ -d /run/systemd/system ]; then systemctl enable --now docker; fi"
+            ]
+        ),
+        Tool.TERRAFORM: ToolRecipe(
+            repositories=[RepositorySpec(
+                name="hashicorp",
+                source_path="/etc/yum.repos.d/hashicorp.repo",
+                source_url=f"https://rpm.releases.hashicorp.com/{hashicorp_distro}/hashicorp.repo"
+            )],
+            packages=["terraform"]
+        ),
+        Tool.GIT: ToolRecipe(packages=["git"]),
+        Tool.AZURE_CLI: ToolRecipe(
+            repositories=[RepositorySpec(
+                name="azure-cli",
+                source_path="/etc/yum.repos.d/azure-cli.repo",
+                source_content=(
+                    "[azure-cli]\n"
+                    "name=Azure CLI\n"
+                    "baseurl=https://packages.microsoft.com/yumrepos/azure-cli\n"
+                    "enabled=1\n"
+                    "gpgcheck=1\n"
+                    "gpgkey=https://packages.microsoft.com/keys/microsoft.asc"
+                )
+            )],
+            packages=["azure-cli"]
+        ),
+        Tool.AWS_CLI: ToolRecipe(
+            packages=["curl", "unzip"],
+            post_install=[AWS_CLI_INSTALL_SNIPPET]
+        ),
+        Tool.KUBECTL: ToolRecipe(
+            packages=["curl"],
+            post_install=[KUBECTL_INSTALL_SNIPPET]
+        ),
+        Tool.ANSIBLE: ToolRecipe(
+            packages=["python3"],
+            post_install=[ANSIBLE_INSTALL_SNIPPET]
+        ),
+        Tool.WATCH: ToolRecipe(packages=["procps-ng"])
+    }
+
+
+def _brew_recipes() -> Dict[Tool, ToolRecipe]:
+    """Receitas para macOS (Homebrew)."""
+    return {
+        Tool.DOCKER: ToolRecipe(casks=["docker"]),
+        Tool.TERRAFORM: ToolRecipe(packages=["terraform"]),
+        Tool.GIT: ToolRecipe(packages=["git"]),
+        Tool.AZURE_CLI: ToolRecipe(packages=["azure-cli"]),
+        Tool.AWS_CLI: ToolRecipe(packages=["awscli"]),
+        Tool.KUBECTL: ToolRecipe(packages=["kubectl"]),
+        Tool.ANSIBLE: ToolRecipe(packages=["ansible"]),
+        Tool.WATCH: ToolRecipe(packages=["watch"])
+    }
+
+
+def _unique(items: List[str]) -> List[str]:
+    """Remove duplicados preservando a ordem."""
+    seen = set()
+    result = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result
+
+
+def _shell_quote(value: str) -> str:
+    """Protege um valor literal para uso em shell POSIX."""
+    return "'" + value.replace("'", "'\"'\"'") + "'"
+
+
+class InstallPlan:
+    """Plano de instalação consolidado para um conjunto de ferramentas."""
+
+    def __init__(self, system_info: SystemInfo, tools: List[Tool]):
+        """
+        Monta o plano consolidado.
+
+        Args:
+            system_info: Informações do sistema alvo
+            tools: Ferramentas a incluir no plano
+
+        Raises:
+            ValueError: Se o sistema não for suportado
+        """
+        self.system_info = system_info
+        self.tools = sorted(_unique(tools), key=lambda t: DEVOPS_TOOLS_CONFIG[t]["priority"])
+
+        os_type = system_info.os_type
+        if os_type in APT_SYSTEMS:
+            self.package_manager = "apt"
+            recipes = _apt_recipes(os_type)
+        elif os_type in RPM_SYSTEMS:
+            self.package_manager = "dnf" if os_type == OperatingSystem.FEDORA else "yum"
+            recipes = _rpm_recipes(os_type)
+        elif os_type == OperatingSystem.MACOS:
+            self.package_manager = "brew"
+            recipes = _brew_recipes()
+        else:
+            raise ValueError(f"Sistema {os_type.value} não suportado para geração de plano")
+
+        self.recipes = {tool: recipes[tool] for tool in self.tools}
+
+    @property
+    def prerequisites(self) -> List[str]:
+        """Pacotes necessários antes de adicionar repositórios de terceiros."""
+        return _unique([p for r in self.recipes.values() if r.repositories for p in r.prerequisites])
+
+    @property
+    def repositories(self) -> List[RepositorySpec]:
+        """Repositórios de terceiros, sem duplicados."""
+        repos: Dict[str, RepositorySpec] = {}
+        for recipe in self.recipes.values():
+            for repo in recipe.repositories:
+                repos.setdefault(repo.name, repo)
+        return list(repos.values())
+
+    @property
+    def packages(self) -> List[str]:
+        """Todos os pacotes instalados na transação principal."""
+        packages = [p for r in self.recipes.values() for p in r.packages]
+        # Pré-requisitos de ferramentas sem repositório próprio entram na transação principal
+        packages += [p for r in self.recipes.values() if not r.repositories for p in r.prerequisites]
+        return _unique(packages)
+
+    @property
+    def casks(self) -> List[str]:
+        """Casks do Homebrew (apenas macOS)."""
+        return _unique([c for r in self.recipes.values() for c in r.casks])
+
+    @property
+    def post_install(self) -> List[str]:
+        """Comandos executados após a transação de pacotes."""
+        return [c for r in self.recipes.values() for c in r.post_install]
+
+    def steps(self) -> List[PlanStep]:
+        """
+        Compila o plano em etapas ordenadas.
+
+        Returns:
+            List[PlanStep]: Etapas do plano
+        """
+        if self.package_manager == "apt":
+            return self._apt_steps()
+        elif self.package_manager == "brew":
+            return self._brew_steps()
+        return self._rpm_steps()
+
+    def _apt_steps(self) -> List[PlanStep]:
+        """Etapas para apt: cada índice é atualizado uma única vez."""
+        steps = [PlanStep("apt-refresh-base", "Atualizar índice base", ["apt-get update"])]
+
+        if self.prerequisites:
+            packages = " ".join(self.prerequisites)
+            steps.append(PlanStep("apt-prerequisites", "Instalar pré-requisitos ausentes", [
+                "LEME_MISSING=''",
+                f'for pkg in {packages}; do dpkg -s "$pkg" >/dev/null 2>&1 || LEME_MISSING="$LEME_MISSING $pkg"; done',
+                'if [ -n "$LEME_MISSING" ]; then apt-get install -y --no-install-recommends $LEME_MISSING; fi'
+            ]))
+
+        repositories = self.repositories
+        for index, repo in enumerate(repositories):
+            commands = ["install -m 0755 -d /etc/apt/keyrings"] if index == 0 else []
+            if repo.key_url and repo.key_path:
+                commands.append(f"curl -fsSL {repo.key_url} | gpg --dearmor --yes -o {repo.key_path}")
+                commands.append(f"chmod go+r {repo.key_path}")
+            commands.append(f'printf \'%s\\n\' "{repo.source_content}" > {repo.source_path}')
+            steps.append(PlanStep(f"repo-{repo.name}", f"Adicionar repositório {repo.name}", commands))
+
+        if repositories:
+            # Atualiza apenas as listas recém-adicionadas, sem baixar de novo o índice base
+            links = [f'ln -s {repo.source_path} "$LEME_PARTS/"' for repo in repositories]
+            steps.append(PlanStep("apt-refresh-repos", "Atualizar índices dos novos repositórios", [
+                'LEME_PARTS="$(mktemp -d)"',
+                *links,
+                'apt-get update -o Dir::Etc::sourcelist=/dev/null -o Dir::Etc::sourceparts="$LEME_PARTS" -o APT::Get::List-Cleanup=0',
+                'rm -rf "$LEME_PARTS"'
+            ]))
+
+        if self.packages:
+            steps.append(PlanStep("apt-install", "Instalar pacotes em uma única transação", [
+                f"apt-get install -y --no-install-recommends {' '.join(self.packages)}"
+            ]))
+
+        if self.post_install:
+            steps.append(PlanStep("post-install", "Configuração pós-instalação", self.post_install))
+
+        return steps
+
+    def _rpm_steps(self) -> List[PlanStep]:
+        """Etapas para yum/dnf: os metadados são atualizados pela própria transação."""
+        steps = []
+
+        for repo in self.repositories:
+            if repo.source_url:
+                commands = [f"curl -fsSL -o {repo.source_path} {repo.source_url}"]
+            else:
+                commands = [f"cat > {repo.source_path} <<'LEME_REPO'\n{repo.source_content}\nLEME_REPO"]
+            steps.append(PlanStep(f"repo-{repo.name}", f"Adicionar repositório {repo.name}", commands))
+
+        if self.packages:
+            steps.append(PlanStep(f"{self.package_manager}-install", "Instalar pacotes em uma única transação", [
+                f"{self.package_manager} install -y {' '.join(self.packages)}"
+            ]))
+
+        if self.post_install:
+            steps.append(PlanStep("post-install", "Configuração pós-instalação", self.post_install))
+
+        return steps
+
+    def _brew_steps(self) -> List[PlanStep]:
+        """Etapas para Homebrew (executadas sem privilégios)."""
+        steps = []
+
+        if self.packages:
+            steps.append(PlanStep("brew-install", "Instalar fórmulas", [
+                f"brew install {' '.join(self.packages)}"
+            ], privileged=False))
+
+        if self.casks:
+            steps.append(PlanStep("brew-cask", "Instalar casks", [
+                f"brew install --cask {' '.join(self.casks)}"
+            ], privileged=False))
+
+        return steps
+
+    def to_shell(self) -> str:
+        """
+        Renderiza o plano como um único script POSIX.
+
+        Todas as etapas privilegiadas são agrupadas em uma única seção
+        executada com um só `sudo`.
+
+        Returns:
+            str: Conteúdo do script
+        """
+        tool_names = ", ".join(t.value for t in self.tools)
+        lines = [
+            "#!/bin/sh",
+            "# Gerado por: leme plan --emit-shell",
+            f"# Sistema: {self.system_info}",
+            f"# Ferramentas: {tool_names}",
+        ]
+        variables = [name for tool, name in PLAN_VARIABLES.items() if tool in self.tools]
+        if variables:
+            lines.append(f"# Versões (opcional): {' '.join(f'{name}=...' for name in variables)} sh <script>")
+        lines += ["set -eu", ""]
+
+        steps = self.steps()
+        privileged = [s for s in steps if s.privileged]
+        unprivileged = [s for s in steps if not s.privileged]
+
+        if privileged:
+            forwarded = ['LEME_USER="$LEME_USER"']
+            forwarded += [f'{name}="${{{name}:-}}"' for name in variables]
+            lines += [
+                'LEME_USER="${SUDO_USER:-$(id -un)}"',
+                'if [ "$(id -u)" -eq 0 ]; then SUDO=""; else SUDO="sudo"; fi',
+                "",
+                f"$SUDO env {' '.join(forwarded)} sh -eu <<'LEME_PRIVILEGED'",
+            ]
+            if self.package_manager == "apt":
+                lines += [
+                    "export DEBIAN_FRONTEND=noninteractive",
+                    ". /etc/os-release",
+                    'LEME_CODENAME="${VERSION_CODENAME:-bookworm}"',
+                ]
+            lines += self._render_steps(privileged)
+            lines += ["LEME_PRIVILEGED", ""]
+
+        lines += self._render_steps(unprivileged)
+        lines.append('echo "leme: plano concluído"')
+        return "\n".join(lines) + "\n"
+
+    def _render_steps(self, steps: List[PlanStep]) -> List[str]:
+        """Renderiza etapas com cabeçalhos numerados."""
+        lines = []
+        for index, step in enumerate(steps, 1):
+            lines.append(f"# [{index}/{len(steps)}] {step.title}")
+            lines.append(f"echo {_shell_quote(f'leme: {step.title}')}")
+            lines.extend(step.commands)
+            lines.append("")
+        return lines
@@ -0,0 +1,289 @@
+"""Instalador do Ansible em virtualenv próprio (sem `sudo pip3`)."""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional, List
+from rich import print
+
+from .base_installer import BaseInstaller
+from ..ansible_config import AnsibleConfig, forks_for
+from ..privileged_helper import get_privileged_helper
+from ..system_detector import SystemInfo
+from ..tool_store import SYSTEM_HOME, ToolStore
+from ..user_prefix import VenvTool, pypi_metadata, pypi_releases
+from ..version_utils import highest_satisfying, parse_version, version_satisfies
+
+
+ANSIBLE_PACKAGE = "ansible"
+ANSIBLE_BINARIES = [
+    "ansible", "ansible-playbook", "ansible-galaxy", "ansible-vault",
+    "ansible-inventory", "ansible-config", "ansible-doc",
+]
+SYSTEM_BIN_DIR = Path("/usr/local/bin")
+# "ansible-core~=2.16.6" ou "ansible-core (~=2.16.6)" em requires_dist
+_CORE_REQUIREMENT_RE = re.compile(r"^ansible-core\s*\(?\s*([^;)]+)")
+
+
+class AnsibleInstaller(BaseInstaller):
+    """Instalador especializado para Ansible."""
+    
+    def __init__(self, system_info: SystemInfo):
+        """
+        Inicializa o instalador do Ansible.
+        
+        Args:
+            system_info: Informações do sistema operacional
+        """
+        super().__init__(system_info)
+        self.tool_name = "Ansible"
+    
+    def is_installed(self) -> bool:
+        """
+        Verifica se o Ansible está instalado.
+        
+        Returns:
+            bool: True se o Ansible estiver instalado
+        """
+        return self.get_installed_version() is not None
+    
+    def get_installed_version(self) -> Optional[str]:
+        """
+        Obtém a versão instalada do ansible-core.
+        
+        Returns:
+            Optional[str]: Versão instalada ou None
+        """
+        try:
+            result = subprocess.run(
+                ["ansible", "--version"],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            if result.returncode == 0:
+                # ansible [core 2.15.3]
+                first_line = result.stdout.strip().split('\n')[0]
+                if "[core " in first_line:
+                    return first_line.split("[core ", 1)[1].rstrip("]")
+            return None
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+    
+    def get_venv_tool(self, prefix: Optional[Path] = None, wheelhouse: Optional[str] = None) -> VenvTool:
+        """
+        Retorna o Ansible em virtualenv (~/.leme/tools/ansible/<versão>).
+        
+        Args:
+            prefix: Outro prefixo (padrão: ~/.leme; SYSTEM_HOME para o armazém do sistema)
+            wheelhouse: Diretório ou URL de wheels (padrão: ~/.cache/leme/wheelhouse)
+        
+        Returns:
+            VenvTool: Ferramenta em virtualenv
+        """
+        return VenvTool("ansible", ANSIBLE_PACKAGE, ANSIBLE_BINARIES, prefix, wheelhouse)
+    
+    def get_store(self, prefix: Optional[Path] = None) -> ToolStore:
+        """Retorna o armazém de versões (~/.leme/tools/ansible)."""
+        return self.get_venv_tool(prefix).store
+    
+    def core_version(self, version: str, prefix: Optional[Path] = None) -> Optional[str]:
+        """
+        Versão do ansible-core de uma versão do armazém.
+        
+        É a versão mostrada por `ansible --version`, e não a do pacote ansible
+        que dá nome ao diretório (ex: ansible 9.5.1 → ansible-core 2.16.6).
+        
+        Args:
+            version: Versão do pacote ansible no armazém
+            prefix: Outro prefixo (padrão: ~/.leme)
+        
+        Returns:
+            Optional[str]: Versão do ansible-core, ou None se não encontrada
+        """
+        venv_dir = self.get_store(prefix).version_dir(version)
+        for dist_info in venv_dir.glob("lib/python*/site-packages/ansible_core-*.dist-info"):
+            return dist_info.name[len("ansible_core-"):-len(".dist-info")]
+        return None
+    
+    def published_version(self, spec: str) -> Optional[str]:
+        """
+        Versão publicada do pacote ansible cujo ansible-core atende à restrição.
+        
+        A restrição vale para o ansible-core (o que `ansible --version` mostra).
+        Cada versão maior do pacote ansible fixa um minor do ansible-core
+        (ex: ansible 9 → ansible-core ~=2.16.x) e o pip instala a patch mais
+        nova dele; por isso basta consultar, no PyPI, a versão mais nova de
+        cada maior.
+        
+        Args:
+            spec: Restrição de versão do ansible-core (ex: ">=2.15,<2.17")
+        
+        Returns:
+            Optional[str]: Versão do pacote ansible, ou None se nenhuma atender
+        
+        Raises:
+            OSError: Se o PyPI não responder
+            ValueError: Se a resposta do PyPI for inválida
+        """
+        core_releases = pypi_releases("ansible-core")
+        newest_by_major: Dict[int, str] = {}
+        for version in pypi_releases(ANSIBLE_PACKAGE):
+            major = parse_version(version)[0]
+            if major not in newest_by_major or parse_version(version) > parse_version(newest_by_major[major]):
+                newest_by_major[major] = version
+        
+        for major in sorted(newest_by_major, reverse=True):
+            version = newest_by_major[major]
+            requires = pypi_metadata(ANSIBLE_PACKAGE, version)["info"].get("requires_dist") or []
+            requirement = next((m.group(1) for m in map(_CORE_REQUIREMENT_RE.match, requires) if m), None)
+            if not requirement:
+                # Antes do ansible 4 o pacote não dependia do ansible-core
+                break
+            core = highest_satisfying(core_releases, requirement)
+            if core and version_satisfies(core, spec):
+                return version
+        return None
+    
+    def use_version(self, version: Optional[str] = None, prefix: Optional[Path] = None, wheelhouse: Optional[str] = None) -> Optional[str]:
+        """
+        Ativa uma versão do pacote ansible, criando o virtualenv se necessário.
+        
+        O virtualenv é montado a partir do wheelhouse (sem rede quando as
+        wheels já estão lá) e pré-compilado para bytecode.
+        
+        Args:
+            version: Versão do pacote ansible (padrão: a mais nova do wheelhouse ou do PyPI)
+            prefix: Outro prefixo (padrão: ~/.leme)
+            wheelhouse: Diretório ou URL de wheels
+        
+        Returns:
+            Optional[str]: Versão ativa, ou None em caso de falha
+        """
+        if not self.ensure_python_venv():
+            return None
+        venv_tool = self.get_venv_tool(prefix, wheelhouse)
+        try:
+            return venv_tool.install(version)
+        except subprocess.CalledProcessError as e:
+            print(f":x: [red]Falha ao criar o virtualenv: {(e.stderr or b'').decode(errors='replace').strip() or e}[/red]")
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            print(f":x: [red]{e}[/red]")
+        return None
+    
+    def install(self, version: Optional[str] = None, wheelhouse: Optional[str] = None) -> bool:
+        """
+        Instala o Ansible em um virtualenv do armazém do sistema (/opt/leme) e
+        liga os executáveis em /usr/local/bin.
+        
+        Args:
+            version: Versão do pacote ansible (padrão: a mais nova do wheelhouse ou do PyPI)
+            wheelhouse: Diretório ou URL de wheels
+        
+        Returns:
+            bool: True se a instalação foi bem-sucedida
+        """
+        print(f":gear: [blue]Instalando {self.tool_name} (virtualenv)...[/blue]")
+        
+        try:
+            version = self.use_version(version, SYSTEM_HOME, wheelhouse)
+            if not version:
+                return False
+            
+            # O virtualenv é do root e compartilhado: `use --system ansible X` troca a versão
+            self.get_store(SYSTEM_HOME).link_system_binaries(SYSTEM_BIN_DIR)
+            
+            print(f":white_check_mark: [green]Ansible {version} instalado em virtualenv![/green]")
+            return True
+        
+        except Exception as e:
+            print(f":x: [red]Erro durante instalação do Ansible: {str(e)}[/red]")
+            return False
+    
+    def install_to_prefix(self, prefix: Path, version: Optional[str] = None, wheelhouse: Optional[str] = None) -> bool:
+        """
+        Instala em um virtualenv no prefixo do usuário, sem sudo.
+        
+        Args:
+            prefix: Diretório do prefixo (ex: ~/.leme)
+            version: Versão do pacote ansible
+            wheelhouse: Diretório ou URL de wheels
+        
+        Returns:
+            bool: True se a instalação foi bem-sucedida
+        """
+        print(f":gear: [blue]Instalando {self.tool_name} em {prefix} (virtualenv)...[/blue]")
+        version = self.use_version(version, prefix, wheelhouse)
+        if not version:
+            return False
+        print(f":white_check_mark: [green]{self.tool_name} {version} em {self.get_store(prefix).shim_path()}[/green]")
+        return True
+    
+    def configure_performance(self, config_path: Optional[Path] = None) -> bool:
+        """
+        Aplica o perfil de desempenho ao ansible.cfg do usuário.
+        
+        Pipelining, ControlPersist, forks pelo número de CPUs, cache de facts
+        (jsonfile) e o callback profile_tasks. Opções já definidas são mantidas.
+        
+        Args:
+            config_path: Arquivo de configuração (padrão: ~/.ansible.cfg ou ANSIBLE_CONFIG)
+            
+        Returns:
+            bool: True se a configuração está aplicada
+        """
+        cpu_count = self.system_info.cpu_count
+        print(f":gear: [blue]Configurando o Ansible ({cpu_count or '?'} CPUs → forks = {forks_for(cpu_count)})...[/blue]")
+        cfg = AnsibleConfig(config_path, cpu_count)
+        try:
+            added = cfg.apply()
+        except OSError as e:
+            print(f"  [red]✗[/red] {e}")
+            return False
+        if not added:
+            print(f"  [dim]↷ {cfg.path} já está configurado[/dim]")
+            return True
+        for option in added:
+            print(f"  [green]✓[/green] {option}")
+        print(f"  [dim]{cfg.path} atualizado[/dim]")
+        return True
+    
+    def get_install_commands(self) -> List[str]:
+        """
+        Retorna lista de comandos para instalação manual.
+        
+        Returns:
+            List[str]: Lista de comandos
+        """
+        return [
+            "# Virtualenv dedicado (não conflita com o Python do sistema)",
+            "sudo python3 -m venv /opt/leme/ansible",
+            "sudo /opt/leme/ansible/bin/pip install ansible",
+            "sudo ln -sf /opt/leme/ansible/bin/ansible* /usr/local/bin/",
+            "ansible --version"
+        ]
+    
+    def uninstall(self) -> bool:
+        """
+        Remove os links do Ansible em /usr/local/bin (as versões ficam no armazém).
+        
+        Returns:
+            bool: True se a remoção foi bem-sucedida
+        """
+        print(f":wastebasket: [blue]Removendo {self.tool_name}...[/blue]")
+        
+        try:
+            links = [SYSTEM_BIN_DIR / binary for binary in ANSIBLE_BINARIES]
+            links = [link for link in links if link.is_symlink()]
+            if not links:
+                print(":x: [red]Ansible não encontrado para remoção[/red]")
+                return False
+            privileged = get_privileged_helper()
+            for link in links:
+                privileged.remove(str(link))
+            print(":white_check_mark: [green]Ansible removido![/green] [dim](limpe versões com: python3 main.py gc --system ansible)[/dim]")
+            return True
+        
+        except Exception as e:
+            print(f":x: [red]Erro ao remover Ansible: {str(e)}[/red]")
+            return False
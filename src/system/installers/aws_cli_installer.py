@@ -2,15 +2,34 @@
 
 import subprocess
 import os
+import re
 import tempfile
 import zipfile
 import shutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List, Tuple
 from rich import print
 
 from .base_installer import BaseInstaller
+from ..artifact_cache import CACHE_DIR, get_artifact_cache
+from ..privileged_helper import get_privileged_helper
 from ..system_detector import SystemInfo, OperatingSystem
+from ..tool_store import SYSTEM_HOME, ToolStore
+from ..version_utils import highest_satisfying
+
+
+# Os pacotes oficiais não têm versão na URL; o cache é renovado diariamente
+ARTIFACT_MAX_AGE = 24 * 3600
+AWS_BINARIES = ["aws", "aws_completer"]
+# Chave PGP do AWS CLI (impressão digital publicada na documentação da AWS).
+# A chave vem do keyserver e fica em cache; só a impressão digital é confiável.
+AWS_CLI_KEY_FINGERPRINT = "FB5DB77FD5C118B80511ADA8A6310ACC4672475C"
+KEYSERVER = "hkps://keyserver.ubuntu.com"
+KEY_CACHE = CACHE_DIR / "keys" / f"{AWS_CLI_KEY_FINGERPRINT}.gpg"
+# Não há índice de pacotes; as versões publicadas vêm do changelog do ramo v2
+CHANGELOG_URL = "https://raw.githubusercontent.com/aws/aws-cli/v2/CHANGELOG.rst"
+_CHANGELOG_VERSION_RE = re.compile(r"^(2\.\d+\.\d+)\s*$", re.MULTILINE)
 
 
 class AwsCliInstaller(BaseInstaller):
@@ -68,10 +87,13 @@ class AwsCliInstaller(BaseInstaller):
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return None
     
-    def install(self) -> bool:
+    def install(self, force: bool = False) -> bool:
         """
         Instala o AWS CLI v2 baseado no sistema operacional.
         
+        Args:
+            force: No Linux, reinstalar mesmo se a versão mais recente já estiver instalada
+            
         Returns:
             bool: True se a instalação foi bem-sucedida
         """
@@ -87,7 +109,7 @@ class AwsCliInstaller(BaseInstaller):
                 OperatingSystem.CENTOS, OperatingSystem.RHEL,
                 OperatingSystem.FEDORA
             ]:
-                return self._install_linux()
+                return self._install_linux(force)
             
             else:
                 print(f":warning: [yellow]Sistema {self.system_info.os_type.value} não suportado para instalação automática do AWS CLI[/yellow]")
@@ -110,123 +132,332 @@ class AwsCliInstaller(BaseInstaller):
             
             url = f"https://awscli.amazonaws.com/AWSCLIV2-{arch}.pkg"
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                pkg_file = temp_path / "AWSCLIV2.pkg"
-                
-                # Download
-                print(f":arrow_down: [blue]Baixando AWS CLI v2 para {arch}...[/blue]")
-                result = subprocess.run([
-                    "curl", "-L", "-o", str(pkg_file), url
-                ], capture_output=True)
-                
-                if result.returncode != 0:
-                    print(":x: [red]Falha no download[/red]")
-                    return False
-                
-                # Instalar
-                print(":package: [blue]Instalando AWS CLI v2...[/blue]")
-                result = subprocess.run([
-                    "sudo", "installer", "-pkg", str(pkg_file), "-target", "/"
-                ], capture_output=True)
-                
-                if result.returncode == 0:
-                    print(":white_check_mark: [green]AWS CLI v2 instalado via instalador oficial![/green]")
-                    return True
-                else:
-                    print(f":x: [red]Falha na instalação: {result.stderr.decode()}[/red]")
-                    return False
+            # Download (reaproveitado do cache se já baixado antes)
+            print(f":arrow_down: [blue]Baixando AWS CLI v2 para {arch}...[/blue]")
+            try:
+                pkg_file = get_artifact_cache().fetch(url, max_age=ARTIFACT_MAX_AGE)
+            except subprocess.CalledProcessError:
+                print(":x: [red]Falha no download[/red]")
+                return False
+            
+            # Instalar
+            print(":package: [blue]Instalando AWS CLI v2...[/blue]")
+            result = get_privileged_helper().install_pkg(str(pkg_file))
+            
+            if result.returncode == 0:
+                print(":white_check_mark: [green]AWS CLI v2 instalado via instalador oficial![/green]")
+                return True
+            else:
+                print(f":x: [red]Falha na instalação: {result.stderr}[/red]")
+                return False
         
         except Exception as e:
             print(f":x: [red]Erro na instalação para macOS: {str(e)}[/red]")
             return False
     
-    def _install_linux(self) -> bool:
-        """Instala AWS CLI v2 no Linux."""
-        print(":penguin: [blue]Detectado Linux - usando instalador oficial[/blue]")
+    def can_upgrade_in_place(self) -> bool:
+        """Indica se o sistema usa o armazém de versões (Linux) em vez do .pkg do macOS."""
+        return self.system_info.os_type != OperatingSystem.MACOS
+    
+    def get_store(self, prefix: Optional[Path] = None) -> ToolStore:
+        """
+        Retorna o armazém de versões (~/.leme/tools/aws-cli).
+        
+        Cada versão é uma instalação completa do instalador oficial
+        (`<versão>/v2/current/bin/aws`).
+        
+        Args:
+            prefix: Outro prefixo (padrão: ~/.leme; SYSTEM_HOME para o armazém do sistema)
+            
+        Returns:
+            ToolStore: Armazém do AWS CLI
+        """
+        return ToolStore("aws-cli", AWS_BINARIES, home=prefix, bin_subdir="v2/current/bin")
+    
+    def published_version(self, spec: str) -> Optional[str]:
+        """
+        Versão publicada mais nova que atende à restrição (ex: ">=2.15,<2.16").
         
+        Raises:
+            subprocess.CalledProcessError: Se o changelog não puder ser baixado
+        """
+        changelog = get_artifact_cache().fetch(CHANGELOG_URL, max_age=ARTIFACT_MAX_AGE)
+        return highest_satisfying(_CHANGELOG_VERSION_RE.findall(changelog.read_text()), spec)
+    
+    @contextmanager
+    def _unpacked_package(self, version: Optional[str] = None) -> Iterator[Tuple[Path, str]]:
+        """
+        Baixa e extrai o pacote oficial do Linux.
+        
+        Args:
+            version: Versão (padrão: a mais recente, renovada diariamente no cache)
+            
+        Yields:
+            Tuple[Path, str]: Diretório `aws` extraído e a versão do pacote
+            
+        Raises:
+            subprocess.CalledProcessError: Se o download falhar
+            ValueError: Se a arquitetura não for suportada, o pacote for inválido
+                ou a assinatura PGP não conferir
+        """
+        arch = self._get_linux_architecture()
+        if not arch:
+            raise ValueError("Não foi possível determinar arquitetura do Linux")
+        
+        suffix = f"-{version}" if version else ""
+        url = f"https://awscli.amazonaws.com/awscli-exe-linux-{arch}{suffix}.zip"
+        print(f":arrow_down: [blue]Baixando AWS CLI v2{' ' + version if version else ''} para {arch}...[/blue]")
+        # Pacotes com versão na URL nunca mudam; o "mais recente" é renovado diariamente
+        max_age = None if version else ARTIFACT_MAX_AGE
+        zip_file = get_artifact_cache().fetch(url, max_age=max_age)
+        sig_file = get_artifact_cache().fetch(f"{url}.sig", max_age=max_age)
         try:
-            # Determinar arquitetura
-            arch = self._get_linux_architecture()
-            if not arch:
-                print(":x: [red]Não foi possível determinar arquitetura do Linux[/red]")
-                return False
+            self._verify_signature(zip_file, sig_file)
+        except ValueError:
+            if version:
+                raise
+            # O "mais recente" pode ter sido renovado entre o pacote e a assinatura
+            zip_file = get_artifact_cache().fetch(url, max_age=0)
+            sig_file = get_artifact_cache().fetch(f"{url}.sig", max_age=0)
+            self._verify_signature(zip_file, sig_file)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            print(":package: [blue]Extraindo arquivo...[/blue]")
+            with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+                zip_ref.extractall(temp_path)
             
-            url = f"https://awscli.amazonaws.com/awscli-exe-linux-{arch}.zip"
+            aws_dir = temp_path / "aws"
+            if not (aws_dir / "install").exists():
+                raise ValueError("Script de instalação não encontrado no pacote")
+            # zipfile não preserva o bit de execução
+            for path in aws_dir.rglob("*"):
+                if path.is_file():
+                    path.chmod(0o755)
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                zip_file = temp_path / "awscliv2.zip"
-                
-                # Download
-                print(f":arrow_down: [blue]Baixando AWS CLI v2 para {arch}...[/blue]")
-                result = subprocess.run([
-                    "curl", "-L", "-o", str(zip_file), url
-                ], capture_output=True)
-                
-                if result.returncode != 0:
-                    print(":x: [red]Falha no download[/red]")
-                    return False
-                
-                # Extrair
-                print(":package: [blue]Extraindo arquivo...[/blue]")
-                with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                    zip_ref.extractall(temp_path)
-                
-                # Instalar
-                install_script = temp_path / "aws" / "install"
-                if not install_script.exists():
-                    print(":x: [red]Script de instalação não encontrado[/red]")
-                    return False
-                
-                # Tornar script executável
-                install_script.chmod(0o755)
-                
-                print(":gear: [blue]Executando instalador...[/blue]")
-                result = subprocess.run([
-                    "sudo", str(install_script)
-                ], capture_output=True)
-                
-                if result.returncode == 0:
-                    # Corrigir permissões dos binários
-                    self._fix_binary_permissions()
-                    print(":white_check_mark: [green]AWS CLI v2 instalado via instalador oficial![/green]")
-                    return True
+            yield aws_dir, self._package_version(aws_dir)
+    
+    def _verify_signature(self, zip_file: Path, sig_file: Path) -> bool:
+        """
+        Confere a assinatura PGP do pacote com a chave do AWS CLI.
+        
+        A verificação usa um GNUPGHOME temporário (o chaveiro do usuário não
+        muda) e só aceita uma assinatura válida da chave com a impressão
+        digital AWS_CLI_KEY_FINGERPRINT.
+        
+        Returns:
+            bool: True se conferida; False se não foi possível verificar
+                (sem gpg ou sem a chave), o que é avisado
+            
+        Raises:
+            ValueError: Se a assinatura não conferir
+        """
+        if not shutil.which("gpg"):
+            print(":warning: [yellow]gpg não encontrado: o pacote do AWS CLI não foi verificado[/yellow]")
+            return False
+        
+        with tempfile.TemporaryDirectory() as gnupg_home:
+            gpg = ["gpg", "--batch", "--homedir", gnupg_home]
+            try:
+                if KEY_CACHE.exists():
+                    subprocess.run(gpg + ["--import", str(KEY_CACHE)], check=True, capture_output=True, timeout=30)
                 else:
-                    # Tentar instalação sem sudo em diretório local
-                    print(":information: [blue]Tentando instalação sem sudo...[/blue]")
-                    return self._install_linux_local(install_script)
+                    subprocess.run(
+                        gpg + ["--keyserver", KEYSERVER, "--recv-keys", AWS_CLI_KEY_FINGERPRINT],
+                        check=True, capture_output=True, timeout=60
+                    )
+                    exported = subprocess.run(
+                        gpg + ["--export", AWS_CLI_KEY_FINGERPRINT],
+                        check=True, capture_output=True, timeout=30
+                    ).stdout
+                    KEY_CACHE.parent.mkdir(parents=True, exist_ok=True)
+                    KEY_CACHE.write_bytes(exported)
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                print(":warning: [yellow]Chave PGP do AWS CLI indisponível: o pacote não foi verificado[/yellow]")
+                return False
+            
+            result = subprocess.run(
+                gpg + ["--status-fd", "1", "--verify", str(sig_file), str(zip_file)],
+                capture_output=True, text=True, timeout=120
+            )
         
-        except Exception as e:
-            print(f":x: [red]Erro na instalação para Linux: {str(e)}[/red]")
+        # [GNUPG:] VALIDSIG <assinatura> ... <impressão digital da chave primária>
+        signers = [line.split()[-1] for line in result.stdout.splitlines() if line.startswith("[GNUPG:] VALIDSIG ")]
+        if AWS_CLI_KEY_FINGERPRINT not in signers:
+            raise ValueError("A assinatura PGP do pacote do AWS CLI não confere")
+        print(":lock: [green]Assinatura PGP do pacote conferida[/green]")
+        return True
+    
+    def _package_version(self, aws_dir: Path) -> str:
+        """
+        Lê a versão de um pacote extraído (`aws/dist/aws --version`).
+        
+        Raises:
+            ValueError: Se a versão não puder ser determinada
+        """
+        result = subprocess.run(
+            [str(aws_dir / "dist" / "aws"), "--version"],
+            capture_output=True, text=True, timeout=30
+        )
+        # aws-cli/2.15.30 Python/3.11.8 Linux/6.5.0 exe/x86_64.ubuntu.22
+        output = result.stdout.strip()
+        if result.returncode != 0 or not output.startswith("aws-cli/"):
+            raise ValueError(f"Não foi possível ler a versão do pacote: {result.stderr.strip() or output}")
+        return output.split()[0].replace("aws-cli/", "")
+    
+    def _add_version(self, aws_dir: Path, version: str, store: ToolStore, force: bool = False) -> None:
+        """
+        Executa o instalador oficial em um `--install-dir` próprio da versão.
+        
+        A versão é montada em um diretório temporário e só então publicada;
+        com `force`, a instalação atual continua no lugar (e ativa) até a
+        nova terminar.
+        
+        Args:
+            aws_dir: Diretório `aws` extraído do pacote
+            version: Versão do pacote
+            store: Armazém de versões
+            force: Reinstalar a versão mesmo se já estiver no armazém
+        
+        Raises:
+            subprocess.CalledProcessError: Se o instalador falhar
+        """
+        if store.has(version) and not force:
+            return
+        
+        def run_installer(version_dir: Path) -> None:
+            bin_dir = version_dir / ".bin"
+            subprocess.run([
+                str(aws_dir / "install"),
+                "--install-dir", str(version_dir),
+                "--bin-dir", str(bin_dir),
+                "--update"
+            ], check=True, capture_output=True, text=True)
+            # Os executáveis são expostos pelos shims do armazém
+            shutil.rmtree(bin_dir, ignore_errors=True)
+            # O único caminho absoluto gravado é o link v2/current; relativo,
+            # a instalação pode ser montada fora do destino final
+            current = version_dir / "v2" / "current"
+            target = Path(os.readlink(current)).name
+            current.unlink()
+            current.symlink_to(target)
+        
+        action = "Reinstalando" if store.has(version) else "Executando instalador"
+        print(f":gear: [blue]{action} (versão {version})...[/blue]")
+        store.add(version, run_installer, replace=force)
+    
+    def install_version(self, version: Optional[str] = None, prefix: Optional[Path] = None) -> str:
+        """
+        Instala uma versão no armazém (se ainda não estiver lá).
+        
+        Args:
+            version: Versão (padrão: a mais recente)
+            prefix: Outro prefixo (padrão: ~/.leme)
+            
+        Returns:
+            str: Versão instalada
+            
+        Raises:
+            subprocess.CalledProcessError: Se o download ou o instalador falharem
+            ValueError: Se a arquitetura não for suportada ou o pacote for inválido
+        """
+        store = self.get_store(prefix)
+        if version and store.has(version):
+            return version
+        with self._unpacked_package(version) as (aws_dir, package_version):
+            self._add_version(aws_dir, package_version, store)
+        return package_version
+    
+    def use_version(self, version: str, prefix: Optional[Path] = None) -> bool:
+        """
+        Ativa uma versão do armazém (rollback instantâneo), instalando-a se necessário.
+        
+        Args:
+            version: Versão (ex: "2.15.30")
+            prefix: Outro prefixo (padrão: ~/.leme)
+            
+        Returns:
+            bool: True se a versão ficou ativa
+        """
+        if not self.can_upgrade_in_place():
+            print(":warning: [yellow]Versões lado a lado do AWS CLI só são suportadas no Linux[/yellow]")
             return False
+        try:
+            installed = self.install_version(version, prefix)
+            self.get_store(prefix).activate(installed)
+        except subprocess.CalledProcessError as e:
+            print(f":x: [red]Falha ao instalar o AWS CLI {version}: {(e.stderr or '').strip() or e}[/red]")
+            return False
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f":x: [red]{e}[/red]")
+            return False
+        return True
     
-    def _install_linux_local(self, install_script: Path) -> bool:
-        """Instala AWS CLI v2 em diretório local no Linux."""
+    def _install_linux(self, force: bool = False) -> bool:
+        """
+        Instala ou atualiza o AWS CLI v2 no Linux.
+        
+        A versão do pacote é comparada com a instalada: versões iguais não
+        são reinstaladas (a menos que `force`), e uma versão nova é montada
+        ao lado das antigas, que continuam disponíveis para rollback. As
+        versões ficam no armazém do sistema (/opt/leme), do root.
+        """
+        print(":penguin: [blue]Detectado Linux - usando instalador oficial[/blue]")
+        
         try:
-            # Criar diretório local
-            local_dir = Path.home() / ".local"
-            local_dir.mkdir(exist_ok=True)
-            
-            # Tornar script executável
-            install_script.chmod(0o755)
+            store = self.get_store(SYSTEM_HOME)
+            installed = self.get_installed_version()
+            with self._unpacked_package() as (aws_dir, version):
+                if installed == version and not force:
+                    print(f":white_check_mark: [green]AWS CLI v2 já está na versão mais recente ({version})[/green]")
+                    return True
+                if installed and installed != version:
+                    print(f":arrows_counterclockwise: [blue]Atualizando AWS CLI v2: {installed} → {version}[/blue]")
+                self._add_version(aws_dir, version, store, force=force)
             
-            result = subprocess.run([
-                str(install_script), "--install-dir", str(local_dir / "aws-cli"),
-                "--bin-dir", str(local_dir / "bin")
-            ], capture_output=True)
+            store.activate(version)
+            store.link_system_binaries()
             
-            if result.returncode == 0:
-                print(":white_check_mark: [green]AWS CLI v2 instalado em ~/.local/![/green]")
-                print(":information: [blue]Adicione ~/.local/bin ao seu PATH se necessário[/blue]")
-                return True
-            else:
-                print(f":x: [red]Falha na instalação local: {result.stderr.decode()}[/red]")
-                return False
+            print(f":white_check_mark: [green]AWS CLI v2 {version} instalado via instalador oficial![/green]")
+            previous = [v for v in store.versions() if v != version]
+            if previous:
+                print(f"  [dim]Versões anteriores mantidas para rollback: {', '.join(previous)} (python3 main.py use --system aws-cli <versão>)[/dim]")
+            return True
         
+        except subprocess.CalledProcessError as e:
+            print(f":x: [red]Falha no instalador: {(e.stderr or '').strip() or e}[/red]")
+            return False
         except Exception as e:
-            print(f":x: [red]Erro na instalação local: {str(e)}[/red]")
+            print(f":x: [red]Erro na instalação para Linux: {str(e)}[/red]")
+            return False
+    
+    def install_to_prefix(self, prefix: Path) -> bool:
+        """
+        Instala no prefixo do usuário, sem sudo (somente Linux).
+        
+        Args:
+            prefix: Diretório do prefixo (ex: ~/.leme)
+            
+        Returns:
+            bool: True se a instalação foi bem-sucedida
+        """
+        if not self.can_upgrade_in_place():
+            print(":warning: [yellow]O pacote do AWS CLI para macOS exige o instalador do sistema; use Homebrew: brew install awscli[/yellow]")
             return False
+        
+        print(f":gear: [blue]Instalando {self.tool_name} em {prefix}...[/blue]")
+        try:
+            version = self.install_version(prefix=prefix)
+        except subprocess.CalledProcessError as e:
+            print(f":x: [red]Falha na instalação: {(e.stderr or '').strip() or e}[/red]")
+            return False
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f":x: [red]{e}[/red]")
+            return False
+        store = self.get_store(prefix)
+        store.activate(version)
+        print(f":white_check_mark: [green]AWS CLI v2 {version} em {store.shim_path()}[/green]")
+        return True
     
     def _get_macos_architecture(self) -> Optional[str]:
         """Retorna a arquitetura para macOS."""
@@ -256,16 +487,6 @@ class AwsCliInstaller(BaseInstaller):
             pass
         return None
     
-    def _fix_binary_permissions(self) -> None:
-        """Corrige permissões dos binários do AWS CLI."""
-        try:
-            binaries = ["/usr/local/bin/aws", "/usr/local/bin/aws_completer"]
-            for binary in binaries:
-                if Path(binary).exists():
-                    subprocess.run(["sudo", "chmod", "755", binary], capture_output=True)
-        except Exception:
-            pass  # Não é crítico se falhar
-    
     def _show_manual_instructions(self) -> bool:
         """Mostra instruções para instalação manual."""
         print(":information_source: [cyan]Instruções para instalação manual do AWS CLI v2:[/cyan]")
@@ -346,7 +567,7 @@ class AwsCliInstaller(BaseInstaller):
             for path in paths_to_remove:
                 if Path(path).exists():
                     try:
-                        subprocess.run(["sudo", "rm", "-rf", path], check=True)
+                        get_privileged_helper().remove(path, recursive=True)
                         print(f":white_check_mark: [green]Removido: {path}[/green]")
                         removed_any = True
                     except subprocess.CalledProcessError:
@@ -1,13 +1,42 @@
 """Instalador do Azure CLI para diferentes sistemas operacionais."""
 
+import configparser
+import io
+import os
+import re
+import shutil
 import subprocess
-import tempfile
+import time
 from pathlib import Path
 from typing import Optional, List
 from rich import print
 
 from .base_installer import BaseInstaller
+from ..file_utils import atomic_write_text
+from ..package_sources import ensure_apt_key, ensure_repo_file, refresh_apt_index
+from ..privileged_helper import get_privileged_helper
 from ..system_detector import SystemInfo, OperatingSystem
+from ..tool_store import SYSTEM_HOME
+from ..user_prefix import WHEELHOUSE_DIR, VenvTool, wheelhouse_versions
+
+
+AZURE_CLI_PACKAGE = "azure-cli"
+WARM_UP_TIMEOUT = 600
+# Gerado pela primeira execução completa do az (no AZURE_CONFIG_DIR)
+COMMAND_INDEX_FILE = "commandIndex.json"
+
+# Opções do ~/.azure/config que evitam prompts e mensagens no primeiro uso
+AZURE_QUIET_CONFIG = {
+    "core": {"collect_telemetry": "no", "survey_message": "no"},
+    "extension": {"use_dynamic_install": "yes_without_prompt"},
+    "auto-upgrade": {"enable": "no"},
+}
+_PYTHON_IN_SCRIPT_RE = re.compile(r"""(/[^\s"']+/bin/python(?:3(?:\.\d+)?)?)\b""")
+
+
+def azure_config_dir() -> Path:
+    """Diretório de configuração do Azure CLI (respeita AZURE_CONFIG_DIR)."""
+    return Path(os.environ.get("AZURE_CONFIG_DIR") or Path.home() / ".azure")
 
 
 class AzureCliInstaller(BaseInstaller):
@@ -67,29 +96,50 @@ class AzureCliInstaller(BaseInstaller):
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return None
     
-    def install(self) -> bool:
+    def install(
+        self,
+        use_venv: Optional[bool] = None,
+        wheelhouse: Optional[str] = None,
+        version: Optional[str] = None,
+        extensions: Optional[List[str]] = None,
+        warm_up: bool = True
+    ) -> bool:
         """
         Instala o Azure CLI baseado no sistema operacional.
         
+        Args:
+            use_venv: Instalar em um virtualenv próprio (padrão: sim, se o
+                wheelhouse já tiver o azure-cli; senão, pelo gerenciador de pacotes)
+            wheelhouse: Diretório ou URL de wheels (padrão: ~/.cache/leme/wheelhouse)
+            version: Versão do pacote azure-cli no modo virtualenv
+            extensions: Extensões a pré-instalar no aquecimento
+            warm_up: Aquecer o Azure CLI após a instalação
+            
         Returns:
             bool: True se a instalação foi bem-sucedida
         """
         print(f":gear: [blue]Instalando {self.tool_name}...[/blue]")
         
+        if use_venv is None:
+            use_venv = bool(wheelhouse_versions(wheelhouse or WHEELHOUSE_DIR, AZURE_CLI_PACKAGE))
+        
         try:
-            if self.system_info.os_type == OperatingSystem.MACOS:
-                return self._install_macos()
+            if use_venv:
+                installed = self._install_venv(wheelhouse, version)
+            
+            elif self.system_info.os_type == OperatingSystem.MACOS:
+                installed = self._install_macos()
             
             elif self.system_info.os_type in [
                 OperatingSystem.UBUNTU, OperatingSystem.WSL_UBUNTU,
                 OperatingSystem.DEBIAN, OperatingSystem.WSL_DEBIAN
             ]:
-                return self._install_ubuntu()
+                installed = self._install_ubuntu()
             
             elif self.system_info.os_type in [
                 OperatingSystem.CENTOS, OperatingSystem.RHEL, OperatingSystem.FEDORA
             ]:
-                return self._install_redhat()
+                installed = self._install_redhat()
             
             else:
                 print(f":warning: [yellow]Sistema {self.system_info.os_type.value} não suportado para instalação automática do Azure CLI[/yellow]")
@@ -98,6 +148,255 @@ class AzureCliInstaller(BaseInstaller):
         except Exception as e:
             print(f":x: [red]Erro durante instalação do Azure CLI: {str(e)}[/red]")
             return False
+        
+        if installed and warm_up:
+            # Falhas no aquecimento não invalidam a instalação; no modo
+            # virtualenv, aquece o az recém-instalado, e não o primeiro do PATH
+            az = str(self.get_venv_tool(SYSTEM_HOME).store.shim_path()) if use_venv else None
+            self.warm_up(extensions, az=az)
+        return installed
+    
+    def warm_up(self, extensions: Optional[List[str]] = None, az: Optional[str] = None) -> bool:
+        """
+        Prepara o Azure CLI para o primeiro uso do aluno.
+        
+        Desativa os prompts de telemetria/pesquisa, gera o índice de comandos
+        (~/.azure/commandIndex.json), pré-compila os pacotes Python para
+        bytecode e instala as extensões pedidas. Mostra a latência da
+        primeira execução e a da execução aquecida.
+        
+        Args:
+            extensions: Extensões a pré-instalar (ex: ["aks-preview"])
+            az: Executável do az (padrão: o do PATH)
+            
+        Returns:
+            bool: True se todas as etapas foram concluídas
+        """
+        az = az or shutil.which("az")
+        if not az:
+            print(":warning: [yellow]az não encontrado no PATH; aquecimento ignorado[/yellow]")
+            return False
+        
+        print(":fire: [blue]Aquecendo o Azure CLI...[/blue]")
+        ok = True
+        
+        try:
+            if self._disable_prompts():
+                print(f"  [green]✓[/green] Telemetria e pesquisas desativadas ({azure_config_dir() / 'config'})")
+            else:
+                print("  [dim]↷ Telemetria e pesquisas já configuradas[/dim]")
+        except OSError as e:
+            print(f"  [red]✗[/red] Configuração do Azure CLI: {e}")
+            ok = False
+        
+        # A primeira execução completa monta o índice de comandos
+        command_index = azure_config_dir() / COMMAND_INDEX_FILE
+        cold = self._timed_run([az, "--help"])
+        if cold is None:
+            print("  [red]✗[/red] Falha ao executar 'az --help'")
+            return False
+        if command_index.exists():
+            print("  [green]✓[/green] Índice de comandos gerado")
+        else:
+            print(f"  [yellow]![/yellow] Índice de comandos não foi gerado ({command_index})")
+            ok = False
+        
+        python = self._az_python(az)
+        if python and self._compile_bytecode(python):
+            print(f"  [green]✓[/green] Pacotes Python pré-compilados ({python})")
+        else:
+            print("  [yellow]![/yellow] Não foi possível pré-compilar os pacotes Python")
+            ok = False
+        
+        for extension in extensions or []:
+            if self._add_extension(az, extension):
+                print(f"  [green]✓[/green] Extensão {extension}")
+            else:
+                print(f"  [red]✗[/red] Extensão {extension}")
+                ok = False
+        
+        warm = self._timed_run([az, "--help"])
+        if warm is not None:
+            print(f"  [dim]Primeira execução: {cold:.1f}s → aquecido: {warm:.1f}s[/dim]")
+        return ok
+    
+    def _timed_run(self, command: List[str]) -> Optional[float]:
+        """Executa um comando e retorna a duração em segundos (None se falhar)."""
+        start = time.monotonic()
+        try:
+            result = subprocess.run(command, capture_output=True, timeout=WARM_UP_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        return time.monotonic() - start
+    
+    def _disable_prompts(self) -> bool:
+        """
+        Grava no config do Azure CLI as opções que evitam prompts interativos.
+        
+        Valores já definidos pelo usuário são preservados.
+        
+        Returns:
+            bool: True se o arquivo foi alterado
+            
+        Raises:
+            OSError: Se não for possível gravar
+        """
+        path = azure_config_dir() / "config"
+        config = configparser.ConfigParser()
+        config.read(path)
+        changed = False
+        for section, options in AZURE_QUIET_CONFIG.items():
+            if not config.has_section(section):
+                config.add_section(section)
+            for key, value in options.items():
+                if not config.has_option(section, key):
+                    config.set(section, key, value)
+                    changed = True
+        if not changed:
+            return False
+        
+        content = io.StringIO()
+        config.write(content)
+        atomic_write_text(path, content.getvalue())
+        return True
+    
+    def _az_python(self, az: str) -> Optional[Path]:
+        """
+        Localiza o interpretador Python usado pelo az.
+        
+        Virtualenvs têm o python ao lado do az; nos pacotes apt/yum/Homebrew
+        o az é um script que chama o interpretador embutido (ex: /opt/az/bin/python3).
+        """
+        real = Path(os.path.realpath(az))
+        for candidate in (real.parent / "python", real.parent / "python3"):
+            if candidate.exists():
+                return candidate
+        try:
+            with open(real, "r", errors="ignore") as f:
+                head = f.read(4096)
+        except OSError:
+            return None
+        match = _PYTHON_IN_SCRIPT_RE.search(head)
+        if match and Path(match.group(1)).exists():
+            return Path(match.group(1))
+        return None
+    
+    def _compile_bytecode(self, python: Path) -> bool:
+        """Pré-compila os pacotes do interpretador do az (com sudo se o diretório for do root)."""
+        result = subprocess.run(
+            [str(python), "-c", "import sysconfig; print(sysconfig.get_paths()['purelib'])"],
+            capture_output=True, text=True, timeout=30
+        )
+        if result.returncode != 0:
+            return False
+        site_packages = result.stdout.strip()
+        command = [str(python), "-m", "compileall", "-q", "-j", "0", site_packages]
+        try:
+            if os.access(site_packages, os.W_OK):
+                returncode = subprocess.run(command, capture_output=True, timeout=WARM_UP_TIMEOUT).returncode
+            else:
+                # Pacote apt/yum (/opt/az) ou armazém do sistema (/opt/leme): operação
+                # própria do auxiliar, restrita a esses diretórios
+                returncode = get_privileged_helper().compile_bytecode(site_packages, timeout=WARM_UP_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired, subprocess.CalledProcessError):
+            return False
+        # compileall retorna 1 se algum arquivo (ex: testes de dependências) não compilar
+        return returncode in (0, 1)
+    
+    def _add_extension(self, az: str, extension: str) -> bool:
+        """Instala uma extensão do Azure CLI (sem efeito se já estiver instalada)."""
+        try:
+            present = subprocess.run(
+                [az, "extension", "show", "--name", extension],
+                capture_output=True, timeout=WARM_UP_TIMEOUT
+            )
+            if present.returncode == 0:
+                return True
+            added = subprocess.run(
+                [az, "extension", "add", "--name", extension, "--yes", "--only-show-errors"],
+                capture_output=True, timeout=WARM_UP_TIMEOUT
+            )
+            return added.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+    
+    def get_venv_tool(self, prefix: Optional[Path] = None, wheelhouse: Optional[str] = None) -> VenvTool:
+        """
+        Retorna o Azure CLI em virtualenv (~/.leme/tools/azure-cli/<versão>).
+        
+        Args:
+            prefix: Outro prefixo (padrão: ~/.leme; SYSTEM_HOME para o armazém do sistema)
+            wheelhouse: Diretório ou URL de wheels (padrão: ~/.cache/leme/wheelhouse)
+            
+        Returns:
+            VenvTool: Ferramenta em virtualenv
+        """
+        return VenvTool("azure-cli", AZURE_CLI_PACKAGE, ["az"], prefix, wheelhouse)
+    
+    def _install_into_venv(self, venv_tool: VenvTool, version: Optional[str] = None) -> Optional[str]:
+        """Cria o virtualenv e retorna a versão ativa (None em caso de falha)."""
+        if not self.ensure_python_venv():
+            return None
+        try:
+            return venv_tool.install(version)
+        except subprocess.CalledProcessError as e:
+            print(f":x: [red]Falha ao criar o virtualenv: {(e.stderr or b'').decode(errors='replace').strip() or e}[/red]")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f":x: [red]{e}[/red]")
+        return None
+    
+    def _install_venv(self, wheelhouse: Optional[str] = None, version: Optional[str] = None) -> bool:
+        """
+        Instala em um virtualenv do armazém do sistema (/opt/leme) e liga
+        /usr/local/bin/az ao shim.
+        
+        Não usa repositórios apt/yum: com o wheelhouse preenchido, a
+        instalação não acessa a rede.
+        """
+        venv_tool = self.get_venv_tool(SYSTEM_HOME, wheelhouse)
+        print(f":snake: [blue]Instalando em virtualenv (wheelhouse: {venv_tool.wheelhouse})[/blue]")
+        version = self._install_into_venv(venv_tool, version)
+        if not version:
+            return False
+        
+        # O virtualenv é do root e compartilhado por todos os usuários
+        venv_tool.store.link_system_binaries()
+        
+        print(f":white_check_mark: [green]Azure CLI {version} instalado em virtualenv![/green]")
+        return True
+    
+    def install_to_prefix(
+        self,
+        prefix: Path,
+        version: Optional[str] = None,
+        wheelhouse: Optional[str] = None,
+        extensions: Optional[List[str]] = None,
+        warm_up: bool = True
+    ) -> bool:
+        """
+        Instala em um virtualenv no prefixo do usuário, sem sudo.
+        
+        Args:
+            prefix: Diretório do prefixo (ex: ~/.leme)
+            version: Versão do pacote azure-cli (padrão: a mais nova do wheelhouse ou do PyPI)
+            wheelhouse: Diretório ou URL de wheels (padrão: ~/.cache/leme/wheelhouse)
+            extensions: Extensões a pré-instalar no aquecimento
+            warm_up: Aquecer o Azure CLI após a instalação
+            
+        Returns:
+            bool: True se a instalação foi bem-sucedida
+        """
+        print(f":gear: [blue]Instalando {self.tool_name} em {prefix} (virtualenv)...[/blue]")
+        venv_tool = self.get_venv_tool(prefix, wheelhouse)
+        version = self._install_into_venv(venv_tool, version)
+        if not version:
+            return False
+        print(f":white_check_mark: [green]{self.tool_name} {version} em {venv_tool.store.shim_path()}[/green]")
+        if warm_up:
+            self.warm_up(extensions, az=str(venv_tool.store.shim_path()))
+        return True
     
     def _install_macos(self) -> bool:
         """Instala Azure CLI no macOS."""
@@ -146,46 +445,34 @@ class AzureCliInstaller(BaseInstaller):
             # Instalar dependências
             print(":package: [blue]Instalando dependências...[/blue]")
             
-            # Limpar repositórios corrompidos antes de tentar atualizar
-            self._cleanup_corrupted_repositories()
+            # Limpar repositórios corrompidos apenas se o update falhar
+            if not refresh_apt_index(check=False):
+                self._cleanup_corrupted_repositories()
+                refresh_apt_index()
             
-            subprocess.run([
-                "sudo", "apt-get", "update"
-            ], check=True, capture_output=True)
+            privileged = get_privileged_helper()
             
-            subprocess.run([
-                "sudo", "apt-get", "install", "-y", "ca-certificates", "curl", "apt-transport-https", "lsb-release", "gnupg"
-            ], check=True, capture_output=True)
+            privileged.run([
+                "apt-get", "install", "-y", "ca-certificates", "curl", "apt-transport-https", "lsb-release", "gnupg"
+            ], check=True)
             
             # Adicionar chave GPG da Microsoft
             print(":key: [blue]Adicionando chave GPG da Microsoft...[/blue]")
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as f:
-                f.write("""#!/bin/bash
-# Criar diretório de keyrings se não existir
-sudo mkdir -p /etc/apt/keyrings
-curl -sLS https://packages.microsoft.com/keys/microsoft.asc | gpg --dearmor | sudo tee /etc/apt/keyrings/microsoft.gpg > /dev/null
-sudo chmod go+r /etc/apt/keyrings/microsoft.gpg
-""")
-                script_path = f.name
-            
-            subprocess.run(["bash", script_path], check=True)
-            Path(script_path).unlink()
+            ensure_apt_key("https://packages.microsoft.com/keys/microsoft.asc", "/etc/apt/keyrings/microsoft.gpg")
             
             # Adicionar repositório
             print(":package: [blue]Adicionando repositório Microsoft...[/blue]")
             distro = self._get_ubuntu_codename()
             repo_line = f"deb [arch=amd64,arm64,armhf signed-by=/etc/apt/keyrings/microsoft.gpg] https://packages.microsoft.com/repos/azure-cli/ {distro} main"
             
-            subprocess.run([
-                "bash", "-c", f"echo '{repo_line}' | sudo tee /etc/apt/sources.list.d/azure-cli.list"
-            ], check=True)
+            ensure_repo_file("/etc/apt/sources.list.d/azure-cli.list", repo_line + "\n")
             
             # Atualizar e instalar
             print(":arrows_counterclockwise: [blue]Atualizando repositórios...[/blue]")
-            subprocess.run(["sudo", "apt-get", "update"], check=True, capture_output=True)
+            refresh_apt_index()
             
             print(":package: [blue]Instalando Azure CLI...[/blue]")
-            subprocess.run(["sudo", "apt-get", "install", "-y", "azure-cli"], check=True)
+            privileged.run(["apt-get", "install", "-y", "azure-cli"], check=True)
             
             print(":white_check_mark: [green]Azure CLI instalado via repositório oficial![/green]")
             return True
@@ -205,11 +492,11 @@ sudo chmod go+r /etc/apt/keyrings/microsoft.gpg
             else:
                 pkg_manager = "yum"
             
+            privileged = get_privileged_helper()
+            
             # Importar chave GPG da Microsoft
             print(":key: [blue]Importando chave GPG da Microsoft...[/blue]")
-            subprocess.run([
-                "sudo", "rpm", "--import", "https://packages.microsoft.com/keys/microsoft.asc"
-            ], check=True)
+            privileged.import_rpm_key("https://packages.microsoft.com/keys/microsoft.asc")
             
             # Adicionar repositório
             print(":package: [blue]Adicionando repositório Microsoft...[/blue]")
@@ -220,14 +507,12 @@ enabled=1
 gpgcheck=1
 gpgkey=https://packages.microsoft.com/keys/microsoft.asc"""
             
-            subprocess.run([
-                "bash", "-c", f"echo '{repo_content}' | sudo tee /etc/yum.repos.d/azure-cli.repo"
-            ], check=True)
+            ensure_repo_file("/etc/yum.repos.d/azure-cli.repo", repo_content + "\n")
             
             # Instalar Azure CLI
             print(":package: [blue]Instalando Azure CLI...[/blue]")
-            subprocess.run([
-                "sudo", pkg_manager, "install", "-y", "azure-cli"
+            privileged.run([
+                pkg_manager, "install", "-y", "azure-cli"
             ], check=True)
             
             print(":white_check_mark: [green]Azure CLI instalado via repositório oficial![/green]")
@@ -383,7 +668,7 @@ gpgkey=https://packages.microsoft.com/keys/microsoft.asc"""
                 OperatingSystem.DEBIAN, OperatingSystem.WSL_DEBIAN
             ]:
                 try:
-                    subprocess.run(["sudo", "apt-get", "remove", "-y", "azure-cli"], check=True)
+                    get_privileged_helper().run(["apt-get", "remove", "-y", "azure-cli"], check=True)
                     print(":white_check_mark: [green]Azure CLI removido via apt![/green]")
                     return True
                 except subprocess.CalledProcessError:
@@ -394,7 +679,7 @@ gpgkey=https://packages.microsoft.com/keys/microsoft.asc"""
             ]:
                 pkg_manager = "dnf" if self.system_info.os_type == OperatingSystem.FEDORA else "yum"
                 try:
-                    subprocess.run(["sudo", pkg_manager, "remove", "-y", "azure-cli"], check=True)
+                    get_privileged_helper().run([pkg_manager, "remove", "-y", "azure-cli"], check=True)
                     print(f":white_check_mark: [green]Azure CLI removido via {pkg_manager}![/green]")
                     return True
                 except subprocess.CalledProcessError:
@@ -426,24 +711,14 @@ gpgkey=https://packages.microsoft.com/keys/microsoft.asc"""
                 "/etc/apt/trusted.gpg.d/microsoft.gpg"
             ]
             
-            # Remover arquivos de repositório corrompidos
-            for repo_file in corrupted_repos:
-                subprocess.run([
-                    "sudo", "rm", "-f", repo_file
-                ], capture_output=True)
+            privileged = get_privileged_helper()
             
-            # Remover chaves GPG corrompidas
-            for key_file in corrupted_keys:
-                subprocess.run([
-                    "sudo", "rm", "-f", key_file
-                ], capture_output=True)
+            # Remover arquivos de repositório e chaves GPG corrompidos
+            for path in corrupted_repos + corrupted_keys:
+                privileged.remove(path)
             
             # Tentar atualizar repositórios para limpar cache
-            result = subprocess.run([
-                "sudo", "apt-get", "update"
-            ], capture_output=True)
-            
-            if result.returncode == 0:
+            if refresh_apt_index(check=False):
                 print(":white_check_mark: [green]Repositórios limpos com sucesso[/green]")
             else:
                 print(":warning: [yellow]Aviso: Alguns repositórios ainda podem ter problemas[/yellow]")
@@ -2,11 +2,17 @@
 
 import subprocess
 import shutil
+import time
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from rich import print
 
 from ..system_detector import SystemInfo
+from ..docker_daemon_config import DAEMON_CONFIG_PATH
+from ..docker_engine import DockerEngineClient, DockerEngineError, ERROR_PERMISSION, READY_BUDGET
+from ..docker_smoke import SmokeImage
+from ..privileged_helper import get_privileged_helper
+from ..user_prefix import venv_supported
 
 
 class BaseInstaller(ABC):
@@ -20,6 +26,7 @@ class BaseInstaller(ABC):
             system_info: Informações do sistema
         """
         self.system_info = system_info
+        self.last_engine_status = None
     
     @abstractmethod
     def install(self) -> bool:
@@ -51,6 +58,76 @@ class BaseInstaller(ABC):
         """
         pass
     
+    def get_daemon_config_path(self) -> str:
+        """
+        Retorna o caminho do daemon.json do sistema.
+        
+        Returns:
+            str: Caminho do arquivo de configuração do daemon
+        """
+        return DAEMON_CONFIG_PATH
+    
+    def reload_docker_daemon(self, restart: bool = False) -> None:
+        """
+        Aplica uma nova configuração do daemon.
+        
+        Args:
+            restart: Reiniciar o serviço (opções que não são recarregáveis)
+            
+        Raises:
+            subprocess.CalledProcessError: Se o systemctl falhar
+        """
+        action = "restart" if restart else "reload"
+        print(f"  [blue]🔄[/blue] Aplicando configuração do daemon (systemctl {action} docker)...")
+        get_privileged_helper().service(action, "docker")
+        if restart:
+            self.wait_for_docker_ready()
+    
+    def _docker_service_failed(self) -> bool:
+        """
+        Indica se o systemd já desistiu do serviço docker.
+        
+        Returns:
+            bool: True se `systemctl is-active docker` reporta "failed"
+        """
+        if not shutil.which("systemctl"):
+            return False
+        try:
+            result = subprocess.run(
+                ["systemctl", "is-active", "docker"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return result.stdout.strip() == "failed"
+    
+    def wait_for_docker_ready(self, budget: float = READY_BUDGET) -> bool:
+        """
+        Aguarda o daemon responder após iniciar/reiniciar o serviço.
+        
+        Evita testar a instalação enquanto o daemon ainda inicializa (o que
+        gerava falsos diagnósticos de permissão).
+        
+        Args:
+            budget: Tempo máximo de espera em segundos
+            
+        Returns:
+            bool: True se o daemon respondeu (mesmo que com erro de permissão)
+        """
+        start = time.monotonic()
+        engine = DockerEngineClient().wait_until_ready(budget, should_abort=self._docker_service_failed)
+        self.last_engine_status = engine
+        if engine.ok or engine.error_kind == ERROR_PERMISSION:
+            print(f"  [green]✓[/green] Daemon do Docker pronto ({time.monotonic() - start:.1f}s)")
+            return True
+        if self._docker_service_failed():
+            print("  [red]✗[/red] O serviço docker falhou ao iniciar. Veja: [cyan]journalctl -u docker --no-pager | tail[/cyan]")
+        else:
+            print(f"  [yellow]![/yellow] Daemon do Docker não respondeu em {budget:g}s: {engine.error}")
+        return False
+    
     def is_docker_installed(self) -> bool:
         """
         Verifica se o Docker está instalado.
@@ -83,40 +160,39 @@ class BaseInstaller(ABC):
         except Exception:
             return None
     
-    def test_docker_installation(self) -> bool:
+    def test_docker_installation(self, deep: bool = False) -> bool:
         """
         Testa se o Docker está funcionando corretamente.
         
+        A verificação padrão consulta o daemon pela Engine API (`/_ping` e
+        `/version` no socket), sem rede e em milissegundos. Com `deep`,
+        também executa um container de teste.
+        
+        Args:
+            deep: Executar também o container de teste (hello-world)
+        
         Returns:
             bool: True se o Docker está funcionando
         """
+        print("  [blue]🧪[/blue] Verificando o daemon do Docker...")
+        engine = DockerEngineClient().ping()
+        self.last_engine_status = engine
+        
+        if not engine.ok:
+            if engine.error_kind == ERROR_PERMISSION:
+                print(f"  [red]✗[/red] {engine.error}")
+            else:
+                print(f"  [yellow]![/yellow] {engine.error}")
+            return False
+        
+        print(f"  [green]✓[/green] Docker Engine {engine.version} respondendo (API {engine.api_version}, {engine.latency * 1000:.0f} ms)")
+        if not deep:
+            return True
+        
         try:
-            print("  [blue]🧪[/blue] Testando instalação do Docker...")
-            
-            # Testar comando docker version
-            result = subprocess.run(
-                ["docker", "version"],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                # Verificar se é problema de permissão específico
-                if "permission denied" in result.stderr.lower() or "connect: permission denied" in result.stderr.lower():
-                    print("  [red]✗[/red] Problema de permissão detectado no Docker daemon")
-                else:
-                    print("  [yellow]![/yellow] Docker instalado mas não está rodando")
-                return False
-            
-            # Tentar rodar container de teste
+            # Container de teste com imagem do cache local, sem rede
             print("  [blue]🧪[/blue] Executando container de teste...")
-            result = subprocess.run(
-                ["docker", "run", "--rm", "hello-world"],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = SmokeImage().run()
             
             if result.returncode == 0:
                 print("  [green]✓[/green] Docker está funcionando corretamente!")
@@ -129,6 +205,9 @@ class BaseInstaller(ABC):
                     print("  [yellow]![/yellow] Docker instalado mas não consegue executar containers")
                 return False
                 
+        except DockerEngineError as e:
+            print(f"  [yellow]![/yellow] Imagem de teste indisponível: {e}")
+            return False
         except subprocess.TimeoutExpired:
             print("  [yellow]![/yellow] Timeout ao testar Docker")
             return False
@@ -152,6 +231,11 @@ class BaseInstaller(ABC):
             subprocess.CalledProcessError: Se o comando falhar e ignore_errors=False
         """
         try:
+            if not shell and command and command[0] == "sudo":
+                # Operações de root passam pelo auxiliar privilegiado (um único sudo);
+                # gerenciadores de pacotes não têm tempo máximo
+                return get_privileged_helper().run(command[1:], check=not ignore_errors)
+            
             if shell:
                 cmd_str = " ".join(command)
                 result = subprocess.run(
@@ -208,6 +292,28 @@ class BaseInstaller(ABC):
         
         return True
     
+    def ensure_python_venv(self) -> bool:
+        """
+        Garante que o Python da CLI consegue criar virtualenvs.
+        
+        No Debian/Ubuntu o módulo ensurepip vem no pacote python3-venv.
+        
+        Returns:
+            bool: True se virtualenvs podem ser criados
+        """
+        if venv_supported():
+            return True
+        if self.system_info.os_type.value in ["ubuntu", "debian", "wsl_ubuntu", "wsl_debian"]:
+            print(":package: [blue]Instalando python3-venv...[/blue]")
+            try:
+                get_privileged_helper().run(["apt-get", "install", "-y", "python3-venv"], check=True)
+            except subprocess.CalledProcessError:
+                pass
+            if venv_supported():
+                return True
+        print(":x: [red]O Python não consegue criar virtualenvs (instale o pacote python3-venv)[/red]")
+        return False
+    
     def print_manual_instructions(self) -> None:
         """Imprime instruções para instalação manual."""
         print(f"\n[bold yellow]📋 Instruções para instalação manual no {self.system_info.os_type.value}:[/bold yellow]")
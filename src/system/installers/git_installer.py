@@ -1,11 +1,17 @@
 """Instalador do Git para diferentes sistemas operacionais."""
 
+import os
 import subprocess
-from typing import Optional, List
+from pathlib import Path
+from typing import Dict, Optional, List
 from rich import print
 
 from .base_installer import BaseInstaller
+from ..git_config import GitConfig, MAINTENANCE_MIN_VERSION, performance_profile
+from ..package_sources import refresh_apt_index
+from ..privileged_helper import get_privileged_helper
 from ..system_detector import SystemInfo, OperatingSystem
+from ..version_utils import version_satisfies
 
 
 class GitInstaller(BaseInstaller):
@@ -123,11 +129,12 @@ class GitInstaller(BaseInstaller):
         try:
             # Atualizar repositórios
             print(":arrows_counterclockwise: [blue]Atualizando repositórios...[/blue]")
-            subprocess.run(["sudo", "apt", "update"], check=True, capture_output=True)
+            refresh_apt_index()
+            privileged = get_privileged_helper()
             
             # Instalar Git
             print(":package: [blue]Instalando Git...[/blue]")
-            subprocess.run(["sudo", "apt", "install", "-y", "git"], check=True)
+            privileged.run(["apt", "install", "-y", "git"], check=True)
             
             # Verificar instalação
             if self.is_installed():
@@ -154,7 +161,7 @@ class GitInstaller(BaseInstaller):
                 pkg_manager = "yum"
             
             print(f":package: [blue]Instalando Git via {pkg_manager}...[/blue]")
-            subprocess.run(["sudo", pkg_manager, "install", "-y", "git"], check=True)
+            get_privileged_helper().run([pkg_manager, "install", "-y", "git"], check=True)
             
             # Verificar instalação
             if self.is_installed():
@@ -346,7 +353,7 @@ class GitInstaller(BaseInstaller):
                 OperatingSystem.UBUNTU, OperatingSystem.WSL_UBUNTU,
                 OperatingSystem.DEBIAN, OperatingSystem.WSL_DEBIAN
             ]:
-                subprocess.run(["sudo", "apt", "remove", "-y", "git"], check=True)
+                get_privileged_helper().run(["apt", "remove", "-y", "git"], check=True)
                 print(":white_check_mark: [green]Git removido via apt![/green]")
                 return True
             
@@ -354,7 +361,7 @@ class GitInstaller(BaseInstaller):
                 OperatingSystem.CENTOS, OperatingSystem.RHEL, OperatingSystem.FEDORA
             ]:
                 pkg_manager = "dnf" if self.system_info.os_type == OperatingSystem.FEDORA else "yum"
-                subprocess.run(["sudo", pkg_manager, "remove", "-y", "git"], check=True)
+                get_privileged_helper().run([pkg_manager, "remove", "-y", "git"], check=True)
                 print(f":white_check_mark: [green]Git removido via {pkg_manager}![/green]")
                 return True
             
@@ -369,13 +376,78 @@ class GitInstaller(BaseInstaller):
             print(f":x: [red]Erro ao remover Git: {str(e)}[/red]")
             return False
     
-    def configure_git(self, name: Optional[str] = None, email: Optional[str] = None) -> bool:
+    def config_settings(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        performance: bool = False
+    ) -> Dict[str, str]:
+        """
+        Opções da configuração global a aplicar.
+        
+        Args:
+            name: Nome do usuário
+            email: Email do usuário
+            performance: Incluir o perfil para repositórios grandes
+            
+        Returns:
+            Dict[str, str]: Opções "seção.opção" → valor
+        """
+        settings = {}
+        if name:
+            settings["user.name"] = name
+        if email:
+            settings["user.email"] = email
+        # Configurações recomendadas
+        settings["init.defaultBranch"] = "main"
+        settings["pull.rebase"] = "false"
+        if performance:
+            settings.update(performance_profile(self.system_info, self.get_installed_version()))
+        return settings
+    
+    def resolve_repositories(self, repos: List[Path]) -> List[Path]:
+        """
+        Raiz de cada repositório (como o `git maintenance register` registra).
+        
+        Args:
+            repos: Diretórios dentro de repositórios
+            
+        Returns:
+            List[Path]: Raízes dos repositórios válidos
+        """
+        roots = []
+        for repo in repos:
+            result = subprocess.run(
+                ["git", "-C", str(repo.expanduser()), "rev-parse", "--show-toplevel"],
+                capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                print(f"  [red]✗[/red] {repo} não é um repositório Git")
+                continue
+            roots.append(Path(result.stdout.strip()))
+        return roots
+    
+    def configure_git(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        performance: bool = False,
+        maintenance_repos: Optional[List[Path]] = None,
+        config_path: Optional[Path] = None
+    ) -> bool:
         """
         Configura Git com nome e email do usuário.
         
+        Todas as opções vão para a configuração global em uma única gravação
+        atômica, sem um `git config` por opção.
+        
         Args:
             name: Nome do usuário
             email: Email do usuário
+            performance: Aplicar o perfil para repositórios grandes (manyFiles,
+                untrackedCache, commit-graph, fsmonitor onde houver, threads)
+            maintenance_repos: Repositórios a registrar no `git maintenance`
+            config_path: Arquivo de configuração (padrão: ~/.gitconfig)
             
         Returns:
             bool: True se a configuração foi bem-sucedida
@@ -384,32 +456,84 @@ class GitInstaller(BaseInstaller):
             print(":x: [red]Git não está instalado[/red]")
             return False
         
+        print(":gear: [blue]Configurando Git...[/blue]")
+        settings = self.config_settings(name, email, performance)
+        repos = self.resolve_repositories(maintenance_repos) if maintenance_repos else []
+        if maintenance_repos and not repos:
+            return False
+        additions = {"maintenance.repo": [str(repo) for repo in repos]} if repos else None
+        
+        git_config = GitConfig(config_path)
         try:
-            print(":gear: [blue]Configurando Git...[/blue]")
-            
-            if name:
-                subprocess.run(["git", "config", "--global", "user.name", name], check=True)
-                print(f":white_check_mark: [green]Nome configurado: {name}[/green]")
-            
-            if email:
-                subprocess.run(["git", "config", "--global", "user.email", email], check=True)
-                print(f":white_check_mark: [green]Email configurado: {email}[/green]")
-            
-            # Configurações recomendadas
-            subprocess.run(["git", "config", "--global", "init.defaultBranch", "main"], check=True)
-            subprocess.run(["git", "config", "--global", "pull.rebase", "false"], check=True)
+            changed = git_config.apply(settings, additions)
+        except OSError as e:
+            print(f":x: [red]Erro ao configurar Git: {e}[/red]")
+            return False
+        
+        for key in changed:
+            value = ", ".join(additions[key]) if additions and key in additions else settings[key]
+            print(f"  [green]✓[/green] {key} = {value}")
+        if not changed:
+            print(f"  [dim]↷ {git_config.path} já está configurado[/dim]")
+        
+        if repos and not self._schedule_maintenance(repos, git_config.path):
+            return False
+        
+        print(":white_check_mark: [green]Git configurado com sucesso![/green]")
+        return True
+    
+    def _schedule_maintenance(self, repos: List[Path], config_path: Path) -> bool:
+        """
+        Prepara os repositórios e agenda o `git maintenance` periódico.
+        
+        Os repositórios já estão em maintenance.repo (configuração global); o
+        agendamento (cron, systemd ou launchd) percorre essa lista.
+        
+        Args:
+            repos: Raízes dos repositórios registrados
+            config_path: Configuração global onde eles foram registrados
             
-            print(":white_check_mark: [green]Git configurado com sucesso![/green]")
-            return True
+        Returns:
+            bool: True se a manutenção ficou agendada
+        """
+        if not version_satisfies(self.get_installed_version(), MAINTENANCE_MIN_VERSION):
+            print(f":warning: [yellow]git maintenance exige Git {MAINTENANCE_MIN_VERSION.lstrip('>=')} ou mais novo[/yellow]")
+            return False
         
-        except subprocess.CalledProcessError as e:
-            print(f":x: [red]Erro ao configurar Git: {e}[/red]")
+        for repo in repos:
+            # O que `git maintenance register` grava no repositório: sem gc automático
+            # no meio dos comandos, tarefas incrementais no agendamento
+            result = subprocess.run(
+                ["git", "-C", str(repo), "rev-parse", "--absolute-git-dir"],
+                capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                continue
+            local_config = GitConfig(Path(result.stdout.strip()) / "config")
+            local_config.apply({"maintenance.auto": "false", "maintenance.strategy": "incremental"})
+        
+        # O `start` também registra o repositório: no mesmo arquivo (ex: --file)
+        result = subprocess.run(
+            ["git", "-C", str(repos[0]), "maintenance", "start"],
+            capture_output=True, text=True,
+            env=dict(os.environ, GIT_CONFIG_GLOBAL=str(config_path))
+        )
+        if result.returncode != 0:
+            print(f":warning: [yellow]Não foi possível agendar o git maintenance: {result.stderr.strip()}[/yellow]")
             return False
+        print(f"  [green]✓[/green] git maintenance agendado ({len(repos)} repositório(s))")
+        return True
     
-    def show_config(self) -> bool:
+    def show_config(self, config_path: Optional[Path] = None) -> bool:
         """
         Mostra a configuração atual do Git.
         
+        Um único `git config --list` (e não um por opção), que também
+        segue os arquivos de [include] e [includeIf].
+        
+        Args:
+            config_path: Arquivo de configuração (padrão: ~/.gitconfig)
+            
         Returns:
             bool: True se conseguiu mostrar a configuração
         """
@@ -418,26 +542,36 @@ class GitInstaller(BaseInstaller):
             return False
         
         try:
-            print(":gear: [blue]Configuração atual do Git:[/blue]")
+            git_config = GitConfig(config_path)
+            values = git_config.read_effective()
+            print(f":gear: [blue]Configuração atual do Git ({git_config.path}):[/blue]")
             
-            # Nome
-            try:
-                result = subprocess.run(["git", "config", "--global", "user.name"], 
-                                     capture_output=True, text=True, check=True)
-                print(f":person: [green]Nome: {result.stdout.strip()}[/green]")
-            except subprocess.CalledProcessError:
+            name = values.get("user.name", [None])[-1]
+            if name:
+                print(f":person: [green]Nome: {name}[/green]")
+            else:
                 print(":warning: [yellow]Nome não configurado[/yellow]")
             
-            # Email
-            try:
-                result = subprocess.run(["git", "config", "--global", "user.email"], 
-                                     capture_output=True, text=True, check=True)
-                print(f":email: [green]Email: {result.stdout.strip()}[/green]")
-            except subprocess.CalledProcessError:
+            email = values.get("user.email", [None])[-1]
+            if email:
+                print(f":email: [green]Email: {email}[/green]")
+            else:
                 print(":warning: [yellow]Email não configurado[/yellow]")
             
+            profile = performance_profile(self.system_info, self.get_installed_version())
+            applied = [key for key, value in profile.items()
+                       if values.get(key.lower(), [None])[-1] == value]
+            if len(applied) == len(profile):
+                print(":rocket: [green]Perfil de desempenho aplicado[/green]")
+            elif applied:
+                print(f":rocket: [yellow]Perfil de desempenho parcial ({len(applied)}/{len(profile)} opções)[/yellow]")
+            
+            repos = values.get("maintenance.repo", [])
+            if repos:
+                print(f":broom: [green]git maintenance: {len(repos)} repositório(s)[/green]")
+            
             return True
         
         except Exception as e:
             print(f":x: [red]Erro ao mostrar configuração: {str(e)}[/red]")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,320 @@
+"""Instalador do kubectl via binário oficial (sem repositórios apt/yum)."""
+
+import subprocess
+import shutil
+from pathlib import Path
+from typing import Optional, List
+from rich import print
+
+from .base_installer import BaseInstaller
+from ..artifact_cache import get_artifact_cache
+from ..privileged_helper import get_privileged_helper
+from ..system_detector import SystemInfo, OperatingSystem
+from ..tool_store import SYSTEM_HOME, ToolStore
+from ..version_utils import highest_satisfying, parse_version
+
+
+RELEASES_URL = "https://dl.k8s.io/release"
+STABLE_URL = f"{RELEASES_URL}/stable.txt"
+# stable.txt muda a cada release; o cache é renovado diariamente
+STABLE_MAX_AGE = 24 * 3600
+INSTALL_PATH = Path("/usr/local/bin/kubectl")
+
+
+def normalize_version(version: str) -> str:
+    """Versão sem o prefixo "v" (ex: "v1.29.3" → "1.29.3"), como no armazém."""
+    return version.strip().lstrip("v")
+
+
+class KubectlInstaller(BaseInstaller):
+    """Instalador especializado para kubectl."""
+    
+    def __init__(self, system_info: SystemInfo):
+        """
+        Inicializa o instalador do kubectl.
+        
+        Args:
+            system_info: Informações do sistema operacional
+        """
+        super().__init__(system_info)
+        self.tool_name = "kubectl"
+    
+    def is_installed(self) -> bool:
+        """
+        Verifica se o kubectl está instalado.
+        
+        Returns:
+            bool: True se o kubectl estiver instalado
+        """
+        return self.get_installed_version() is not None
+    
+    def get_installed_version(self) -> Optional[str]:
+        """
+        Obtém a versão instalada do kubectl.
+        
+        Returns:
+            Optional[str]: Versão instalada (ex: "v1.29.3") ou None
+        """
+        try:
+            result = subprocess.run(
+                ["kubectl", "version", "--client", "-o", "json"],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            if result.returncode == 0:
+                # "gitVersion": "v1.29.3"
+                for line in result.stdout.splitlines():
+                    if '"gitVersion"' in line:
+                        return line.split(":", 1)[1].strip().strip('",')
+            return None
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+    
+    def resolve_version(self, version: Optional[str] = None) -> str:
+        """
+        Resolve a versão a instalar.
+        
+        Args:
+            version: Versão pedida (padrão: a estável atual, de stable.txt)
+        
+        Returns:
+            str: Versão sem o prefixo "v"
+        
+        Raises:
+            subprocess.CalledProcessError: Se stable.txt não puder ser baixado
+        """
+        if version and version != "stable":
+            return normalize_version(version)
+        stable = get_artifact_cache().fetch(STABLE_URL, max_age=STABLE_MAX_AGE)
+        return normalize_version(stable.read_text())
+    
+    def published_version(self, spec: str) -> Optional[str]:
+        """
+        Versão publicada mais nova que atende à restrição (ex: "1.28", ">=1.27,<1.29").
+        
+        O dl.k8s.io não tem uma listagem de versões, mas publica a última
+        patch de cada minor (stable-1.N.txt); como as patches são sequenciais,
+        as versões de cada minor são 1.N.0 até ela. Os minors são percorridos
+        do estável para trás até o primeiro que tenha uma versão que atende.
+        
+        Args:
+            spec: Restrição de versão
+        
+        Returns:
+            Optional[str]: Versão sem o prefixo "v", ou None se nenhuma atender
+        
+        Raises:
+            subprocess.CalledProcessError: Se stable.txt não puder ser baixado
+        """
+        major, minor = parse_version(self.resolve_version())[:2]
+        for current_minor in range(minor, -1, -1):
+            try:
+                latest = get_artifact_cache().fetch(
+                    f"{RELEASES_URL}/stable-{major}.{current_minor}.txt", max_age=STABLE_MAX_AGE
+                )
+            except subprocess.CalledProcessError:
+                # Minors antigos demais não têm stable-1.N.txt
+                break
+            last_patch = parse_version(latest.read_text())[2]
+            candidates = [f"{major}.{current_minor}.{patch}" for patch in range(last_patch + 1)]
+            found = highest_satisfying(candidates, spec)
+            if found:
+                return found
+        return None
+    
+    def install(self, version: Optional[str] = None) -> bool:
+        """
+        Instala o kubectl a partir do binário oficial.
+        
+        O binário vai para o armazém do sistema (/opt/leme/tools/kubectl), do
+        root, e /usr/local/bin/kubectl aponta para a versão ativa.
+        
+        Args:
+            version: Versão (padrão: a estável atual)
+        
+        Returns:
+            bool: True se a instalação foi bem-sucedida
+        """
+        print(f":gear: [blue]Instalando {self.tool_name}...[/blue]")
+        
+        try:
+            version = self.resolve_version(version)
+            if not self.use_version(version, SYSTEM_HOME):
+                return False
+            
+            # /usr/local/bin/kubectl aponta para o shim do armazém do root (/opt/leme),
+            # usado por todos os usuários; `use --system kubectl X` troca a versão
+            self.get_store(SYSTEM_HOME).link_system_binaries()
+            
+            print(f":white_check_mark: [green]kubectl {version} instalado![/green]")
+            return True
+        
+        except Exception as e:
+            print(f":x: [red]Erro durante instalação do kubectl: {str(e)}[/red]")
+            return False
+    
+    def get_store(self, prefix: Optional[Path] = None) -> ToolStore:
+        """
+        Retorna o armazém de versões (~/.leme/tools/kubectl).
+        
+        Args:
+            prefix: Outro prefixo (padrão: ~/.leme; SYSTEM_HOME para o armazém do sistema)
+        
+        Returns:
+            ToolStore: Armazém do kubectl
+        """
+        return ToolStore("kubectl", ["kubectl"], home=prefix)
+    
+    def download_url(self, version: str) -> str:
+        """
+        URL do binário de uma versão para este sistema.
+        
+        Raises:
+            ValueError: Se a plataforma não for suportada
+        """
+        arch = self._get_architecture()
+        os_name = self._get_os_name()
+        if not arch or not os_name:
+            raise ValueError("Não foi possível detectar arquitetura ou SO")
+        return f"{RELEASES_URL}/v{normalize_version(version)}/bin/{os_name}/{arch}/kubectl"
+    
+    def install_version(self, version: str, prefix: Optional[Path] = None) -> Path:
+        """
+        Baixa (pelo cache de artefatos, com checksum) uma versão para o armazém.
+        
+        Args:
+            version: Versão (ex: "1.29.3")
+            prefix: Outro prefixo (padrão: ~/.leme)
+        
+        Returns:
+            Path: Diretório da versão
+        
+        Raises:
+            subprocess.CalledProcessError: Se o download falhar
+            ValueError: Se a plataforma não for suportada ou o checksum não conferir
+        """
+        version = normalize_version(version)
+        store = self.get_store(prefix)
+        if store.has(version):
+            return store.version_dir(version)
+        
+        url = self.download_url(version)
+        print(f":arrow_down: [blue]Baixando kubectl {version}...[/blue]")
+        cache = get_artifact_cache()
+        sha256 = cache.fetch(url + ".sha256").read_text().split()[0]
+        binary = cache.fetch(url, sha256=sha256)
+        
+        def populate(staging: Path) -> None:
+            shutil.copyfile(binary, staging / "kubectl")
+            (staging / "kubectl").chmod(0o755)
+        
+        return store.add(version, populate)
+    
+    def use_version(self, version: str, prefix: Optional[Path] = None) -> bool:
+        """
+        Ativa uma versão do armazém, instalando-a se necessário.
+        
+        Args:
+            version: Versão (ex: "1.29.3")
+            prefix: Outro prefixo (padrão: ~/.leme)
+        
+        Returns:
+            bool: True se a versão ficou ativa
+        """
+        version = normalize_version(version)
+        try:
+            self.install_version(version, prefix)
+            self.get_store(prefix).activate(version)
+        except (OSError, ValueError) as e:
+            print(f":x: [red]{e}[/red]")
+            return False
+        except subprocess.CalledProcessError:
+            print(f":x: [red]Falha no download do kubectl {version} (a versão existe?)[/red]")
+            return False
+        return True
+    
+    def install_to_prefix(self, prefix: Path, version: Optional[str] = None) -> bool:
+        """
+        Instala no prefixo do usuário, sem sudo nem gerenciador de pacotes.
+        
+        Args:
+            prefix: Diretório do prefixo (ex: ~/.leme)
+            version: Versão (padrão: a estável atual)
+        
+        Returns:
+            bool: True se a instalação foi bem-sucedida
+        """
+        try:
+            version = self.resolve_version(version)
+        except subprocess.CalledProcessError:
+            print(f":x: [red]Não foi possível consultar a versão estável em {STABLE_URL}[/red]")
+            return False
+        print(f":gear: [blue]Instalando {self.tool_name} {version} em {prefix}...[/blue]")
+        if not self.use_version(version, prefix):
+            return False
+        print(f":white_check_mark: [green]{self.tool_name} {version} em {self.get_store(prefix).shim_path()}[/green]")
+        return True
+    
+    def _get_architecture(self) -> Optional[str]:
+        """Retorna a arquitetura para download."""
+        try:
+            result = subprocess.run(["uname", "-m"], capture_output=True, text=True)
+            if result.returncode == 0:
+                arch = result.stdout.strip()
+                if arch in ["x86_64", "amd64"]:
+                    return "amd64"
+                elif arch in ["aarch64", "arm64"]:
+                    return "arm64"
+        except Exception:
+            pass
+        return None
+    
+    def _get_os_name(self) -> Optional[str]:
+        """Retorna o nome do SO para download."""
+        if self.system_info.os_type == OperatingSystem.MACOS:
+            return "darwin"
+        elif self.system_info.os_type not in [OperatingSystem.WINDOWS, OperatingSystem.UNKNOWN]:
+            return "linux"
+        return None
+    
+    def get_install_commands(self) -> List[str]:
+        """
+        Retorna lista de comandos para instalação manual.
+        
+        Returns:
+            List[str]: Lista de comandos
+        """
+        os_name = self._get_os_name() or "linux"
+        arch = self._get_architecture() or "amd64"
+        url = f'{RELEASES_URL}/$(curl -fsSL {STABLE_URL})/bin/{os_name}/{arch}/kubectl'
+        check = "shasum -a 256 --check" if os_name == "darwin" else "sha256sum --check"
+        return [
+            "# Binário oficial, conferido com o .sha256 publicado",
+            f'curl -fsSLO "{url}"',
+            f'curl -fsSLO "{url}.sha256"',
+            f'echo "$(cat kubectl.sha256)  kubectl" | {check}',
+            f"sudo install -m 0755 kubectl {INSTALL_PATH}",
+            "kubectl version --client"
+        ]
+    
+    def uninstall(self) -> bool:
+        """
+        Remove o link /usr/local/bin/kubectl (as versões ficam no armazém).
+        
+        Returns:
+            bool: True se a remoção foi bem-sucedida
+        """
+        print(f":wastebasket: [blue]Removendo {self.tool_name}...[/blue]")
+        
+        try:
+            if not INSTALL_PATH.exists() and not INSTALL_PATH.is_symlink():
+                print(":x: [red]kubectl não encontrado para remoção[/red]")
+                return False
+            get_privileged_helper().remove(str(INSTALL_PATH))
+            print(":white_check_mark: [green]kubectl removido![/green] [dim](limpe versões com: python3 main.py gc --system kubectl)[/dim]")
+            return True
+        
+        except Exception as e:
+            print(f":x: [red]Erro ao remover kubectl: {str(e)}[/red]")
+            return False
@@ -2,10 +2,12 @@
 
 import subprocess
 import shutil
+from pathlib import Path
 from typing import List
 from rich import print
 
 from .base_installer import BaseInstaller
+from ..docker_engine import ERROR_PERMISSION
 
 
 class MacOSInstaller(BaseInstaller):
@@ -109,10 +111,21 @@ class MacOSInstaller(BaseInstaller):
             "open /Applications/Docker.app"
         ]
     
-    def test_docker_installation(self) -> bool:
+    def get_daemon_config_path(self) -> str:
+        """Docker Desktop lê a configuração do daemon em ~/.docker/daemon.json."""
+        return str(Path.home() / ".docker" / "daemon.json")
+    
+    def reload_docker_daemon(self, restart: bool = False) -> None:
+        """Docker Desktop só aplica a configuração ao ser reiniciado."""
+        print("  [yellow]⚠[/yellow] Reinicie o Docker Desktop para aplicar a nova configuração")
+    
+    def test_docker_installation(self, deep: bool = False) -> bool:
         """
         Testa se o Docker está funcionando no macOS.
         
+        Args:
+            deep: Executar também o container de teste
+        
         Returns:
             bool: True se o Docker está funcionando
         """
@@ -120,24 +133,8 @@ class MacOSInstaller(BaseInstaller):
         if not self.is_docker_installed():
             return False
         
-        print("  [blue]🧪[/blue] Verificando se Docker Desktop está rodando...")
-        
-        try:
-            # Verificar se Docker daemon está ativo
-            result = subprocess.run(
-                ["docker", "info"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                print("  [yellow]![/yellow] Docker Desktop não está rodando")
+        working = super().test_docker_installation(deep)
+        if not working and self.last_engine_status and not self.last_engine_status.ok:
+            if self.last_engine_status.error_kind != ERROR_PERMISSION:
                 print("  [blue]💡[/blue] Inicie o Docker Desktop manualmente")
-                return False
-            
-            return super().test_docker_installation()
-            
-        except Exception as e:
-            print(f"  [yellow]![/yellow] Erro ao verificar Docker: {e}")
-            return False
\ No newline at end of file
+        return working
\ No newline at end of file
@@ -5,6 +5,7 @@ from typing import List
 from rich import print
 
 from .base_installer import BaseInstaller
+from ..privileged_helper import get_privileged_helper
 from ..system_detector import OperatingSystem
 
 
@@ -103,14 +104,15 @@ class RedHatInstaller(BaseInstaller):
         """Configura o serviço Docker."""
         try:
             # Iniciar e habilitar Docker
-            self._run_command(["sudo", "systemctl", "start", "docker"])
-            self._run_command(["sudo", "systemctl", "enable", "docker"])
+            get_privileged_helper().service("start", "docker")
+            get_privileged_helper().service("enable", "docker")
+            self.wait_for_docker_ready()
             
             # Adicionar usuário ao grupo docker
             import os
             username = os.getenv("USER")
             if username:
-                self._run_command(["sudo", "usermod", "-aG", "docker", username])
+                get_privileged_helper().add_user_to_group(username, "docker")
                 print(f"  [green]✓[/green] Usuário {username} adicionado ao grupo docker")
                 print("  [yellow]⚠[/yellow] Faça logout/login para aplicar as permissões")
             
@@ -128,8 +130,8 @@ class RedHatInstaller(BaseInstaller):
             print(":wastebasket: Removendo Docker...")
             
             # Parar serviços
-            self._run_command(["sudo", "systemctl", "stop", "docker"], ignore_errors=True)
-            self._run_command(["sudo", "systemctl", "disable", "docker"], ignore_errors=True)
+            get_privileged_helper().service("stop", "docker", check=False)
+            get_privileged_helper().service("disable", "docker", check=False)
             
             # Remover pacotes
             if self.system_info.os_type == OperatingSystem.FEDORA:
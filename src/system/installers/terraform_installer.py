@@ -2,7 +2,8 @@
 
 import subprocess
 import os
-import tempfile
+import re
+import json
 import zipfile
 import stat
 from pathlib import Path
@@ -10,7 +11,24 @@ from typing import Optional, List
 from rich import print
 
 from .base_installer import BaseInstaller
+from ..artifact_cache import get_artifact_cache
+from ..package_sources import ensure_apt_key, ensure_repo_file, refresh_apt_index
+from ..privileged_helper import get_privileged_helper
 from ..system_detector import SystemInfo, OperatingSystem
+from ..terraform_cli_config import (
+    PLUGIN_CACHE_DIR, PROVIDER_MIRROR_DIR, ProviderMirror, TerraformCliConfig, read_provider_list
+)
+from ..tool_store import SYSTEM_HOME, ToolStore
+from ..version_utils import highest_satisfying
+
+
+DEFAULT_TERRAFORM_VERSION = "1.5.7"  # Versão estável conhecida
+RELEASES_URL = "https://releases.hashicorp.com/terraform"
+RELEASES_INDEX_URL = f"{RELEASES_URL}/index.json"
+# O índice de releases muda a cada versão; o cache é renovado diariamente
+RELEASES_INDEX_MAX_AGE = 24 * 3600
+# Apenas versões finais (sem -alpha, -beta, -rc)
+_RELEASE_RE = re.compile(r"^\d+\.\d+\.\d+$")
 
 
 class TerraformInstaller(BaseInstaller):
@@ -99,6 +117,63 @@ class TerraformInstaller(BaseInstaller):
             print(f":x: [red]Erro durante instalação do Terraform: {str(e)}[/red]")
             return False
     
+    def configure_cli(
+        self,
+        providers_file: Optional[Path] = None,
+        mirror_dir: Optional[Path] = None,
+        config_path: Optional[Path] = None,
+        dry_run: bool = False
+    ) -> bool:
+        """
+        Configura o cache de plugins e, opcionalmente, o mirror de providers.
+        
+        Args:
+            providers_file: Lista de providers a baixar para o mirror
+            mirror_dir: Mirror de providers (padrão: ~/.terraform.d/providers-mirror,
+                se houver lista ou se ele já existir)
+            config_path: Arquivo de configuração (padrão: ~/.terraformrc)
+            dry_run: Apenas mostrar o arquivo resultante
+            
+        Returns:
+            bool: True se a configuração está aplicada
+        """
+        print(":gear: [blue]Configurando cache de providers do Terraform...[/blue]")
+        try:
+            if not mirror_dir and (providers_file or PROVIDER_MIRROR_DIR.is_dir()):
+                mirror_dir = PROVIDER_MIRROR_DIR
+            pending = []
+            if providers_file:
+                specs = read_provider_list(providers_file)
+                arch = self._get_architecture()
+                os_name = self._get_os_name()
+                if not arch or not os_name:
+                    print("  [red]✗[/red] Não foi possível detectar arquitetura ou SO")
+                    return False
+                mirror = ProviderMirror(mirror_dir, os_name, arch)
+                if dry_run:
+                    # A simulação não baixa nada: só lista o que falta no mirror
+                    pending = mirror.missing(specs)
+                    for spec in pending:
+                        print(f"  [dim]↓ {spec.source} {spec.version} seria baixado para {mirror_dir}[/dim]")
+                else:
+                    print(f":arrow_down: [blue]Populando mirror em {mirror_dir} ({os_name}_{arch})...[/blue]")
+                    if not mirror.populate(specs):
+                        return False
+            
+            cli_config = TerraformCliConfig(config_path, PLUGIN_CACHE_DIR, mirror_dir)
+            if dry_run:
+                print(f":clipboard: [bold cyan]{cli_config.path}[/bold cyan] (simulação)")
+                print(cli_config.plan([spec.source for spec in pending]), end="")
+                return True
+            if cli_config.apply():
+                print(f"  [green]✓[/green] {cli_config.path} atualizado (plugin_cache_dir = {cli_config.cache_dir})")
+            else:
+                print(f"  [dim]↷ {cli_config.path} já está configurado[/dim]")
+            return True
+        except (OSError, ValueError) as e:
+            print(f"  [red]✗[/red] {e}")
+            return False
+    
     def _install_macos(self) -> bool:
         """Instala Terraform no macOS."""
         print(":apple: [blue]Detectado macOS - tentando Homebrew primeiro[/blue]")
@@ -143,26 +218,19 @@ class TerraformInstaller(BaseInstaller):
     def _install_ubuntu_repo(self) -> bool:
         """Instala via repositório oficial da HashiCorp."""
         try:
+            privileged = get_privileged_helper()
+            
             # Instalar dependências
             print(":package: [blue]Instalando dependências...[/blue]")
-            subprocess.run([
-                "sudo", "apt-get", "update"
-            ], check=True, capture_output=True)
+            refresh_apt_index()
             
-            subprocess.run([
-                "sudo", "apt-get", "install", "-y", "gnupg", "software-properties-common", "curl"
-            ], check=True, capture_output=True)
+            privileged.run([
+                "apt-get", "install", "-y", "gnupg", "software-properties-common", "curl"
+            ], check=True)
             
             # Adicionar chave GPG da HashiCorp
             print(":key: [blue]Adicionando chave GPG da HashiCorp...[/blue]")
-            subprocess.run([
-                "sudo", "mkdir", "-p", "/etc/apt/keyrings"
-            ], capture_output=True)
-            
-            subprocess.run([
-                "bash", "-c",
-                "curl -fsSL https://apt.releases.hashicorp.com/gpg | sudo gpg --dearmor -o /etc/apt/keyrings/hashicorp.gpg"
-            ], check=True, capture_output=True)
+            ensure_apt_key("https://apt.releases.hashicorp.com/gpg", "/etc/apt/keyrings/hashicorp.gpg")
             
             # Adicionar repositório
             print(":package: [blue]Adicionando repositório HashiCorp...[/blue]")
@@ -179,17 +247,14 @@ class TerraformInstaller(BaseInstaller):
                 codename = "bookworm"  # Debian 12 padrão
             
             repo_line = f"deb [signed-by=/etc/apt/keyrings/hashicorp.gpg] https://apt.releases.hashicorp.com {codename} main"
-            subprocess.run([
-                "bash", "-c",
-                f"echo '{repo_line}' | sudo tee /etc/apt/sources.list.d/hashicorp.list"
-            ], check=True)
+            ensure_repo_file("/etc/apt/sources.list.d/hashicorp.list", repo_line + "\n")
             
             # Atualizar e instalar
             print(":arrows_counterclockwise: [blue]Atualizando repositórios...[/blue]")
-            subprocess.run(["sudo", "apt-get", "update"], check=True, capture_output=True)
+            refresh_apt_index()
             
             print(":package: [blue]Instalando Terraform...[/blue]")
-            subprocess.run(["sudo", "apt-get", "install", "-y", "terraform"], check=True)
+            privileged.run(["apt-get", "install", "-y", "terraform"], check=True)
             
             print(":white_check_mark: [green]Terraform instalado via repositório HashiCorp![/green]")
             return True
@@ -211,21 +276,23 @@ class TerraformInstaller(BaseInstaller):
             else:
                 pkg_manager = "yum"
             
+            privileged = get_privileged_helper()
+            
             # Instalar yum-utils se necessário
-            subprocess.run([
-                "sudo", pkg_manager, "install", "-y", "yum-utils"
-            ], check=True, capture_output=True)
+            privileged.run([
+                pkg_manager, "install", "-y", "yum-utils"
+            ], check=True)
             
             # Adicionar repositório HashiCorp
             print(":package: [blue]Adicionando repositório HashiCorp...[/blue]")
-            subprocess.run([
-                "sudo", "yum-config-manager", "--add-repo", "https://rpm.releases.hashicorp.com/RHEL/hashicorp.repo"
+            privileged.run([
+                "yum-config-manager", "--add-repo", "https://rpm.releases.hashicorp.com/RHEL/hashicorp.repo"
             ], check=True)
             
             # Instalar Terraform
             print(":package: [blue]Instalando Terraform...[/blue]")
-            subprocess.run([
-                "sudo", pkg_manager, "install", "-y", "terraform"
+            privileged.run([
+                pkg_manager, "install", "-y", "terraform"
             ], check=True)
             
             print(":white_check_mark: [green]Terraform instalado via repositório HashiCorp![/green]")
@@ -235,62 +302,148 @@ class TerraformInstaller(BaseInstaller):
             print(f":warning: [yellow]Falha no repositório: {e}[/yellow]")
             return self._install_via_download()
     
-    def _install_via_download(self) -> bool:
+    def get_store(self, prefix: Optional[Path] = None) -> ToolStore:
+        """
+        Retorna o armazém de versões (~/.leme/tools/terraform).
+        
+        Args:
+            prefix: Outro prefixo (padrão: ~/.leme; SYSTEM_HOME para o armazém do sistema)
+            
+        Returns:
+            ToolStore: Armazém do Terraform
+        """
+        return ToolStore("terraform", ["terraform"], home=prefix)
+    
+    def published_versions(self) -> List[str]:
+        """
+        Versões finais publicadas, pelo índice de releases da HashiCorp.
+        
+        Returns:
+            List[str]: Versões publicadas (sem pré-releases)
+        
+        Raises:
+            subprocess.CalledProcessError: Se o índice não puder ser baixado
+            ValueError: Se o índice for inválido
+        """
+        index = get_artifact_cache().fetch(RELEASES_INDEX_URL, max_age=RELEASES_INDEX_MAX_AGE)
+        versions = json.loads(index.read_text()).get("versions", {})
+        return [version for version in versions if _RELEASE_RE.match(version)]
+    
+    def published_version(self, spec: str) -> Optional[str]:
+        """
+        Versão publicada mais nova que atende à restrição (ex: ">=1.6").
+        
+        Raises:
+            subprocess.CalledProcessError: Se o índice não puder ser baixado
+            ValueError: Se o índice for inválido
+        """
+        return highest_satisfying(self.published_versions(), spec)
+    
+    def _release_sha256(self, version: str, filename: str) -> Optional[str]:
+        """Lê o SHA-256 de um pacote no arquivo SHA256SUMS da release."""
+        sums = get_artifact_cache().fetch(f"{RELEASES_URL}/{version}/terraform_{version}_SHA256SUMS")
+        for line in sums.read_text().splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1] == filename:
+                return parts[0]
+        return None
+    
+    def install_version(self, version: str, prefix: Optional[Path] = None) -> Path:
+        """
+        Baixa (pelo cache de artefatos, com checksum) e extrai uma versão no armazém.
+        
+        Args:
+            version: Versão (ex: "1.6.6")
+            prefix: Outro prefixo (padrão: ~/.leme)
+            
+        Returns:
+            Path: Diretório da versão
+            
+        Raises:
+            subprocess.CalledProcessError: Se o download falhar
+            ValueError: Se a plataforma não for suportada ou o checksum não conferir
+        """
+        store = self.get_store(prefix)
+        if store.has(version):
+            return store.version_dir(version)
+        
+        arch = self._get_architecture()
+        os_name = self._get_os_name()
+        if not arch or not os_name:
+            raise ValueError("Não foi possível detectar arquitetura ou SO")
+        
+        filename = f"terraform_{version}_{os_name}_{arch}.zip"
+        print(f":arrow_down: [blue]Baixando Terraform {version} para {os_name} {arch}...[/blue]")
+        sha256 = self._release_sha256(version, filename)
+        if not sha256:
+            raise ValueError(f"{filename} não encontrado no SHA256SUMS da versão {version}")
+        zip_file = get_artifact_cache().fetch(f"{RELEASES_URL}/{version}/{filename}", sha256=sha256)
+        
+        def extract(staging: Path) -> None:
+            with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+                zip_ref.extract("terraform", staging)
+            binary = staging / "terraform"
+            binary.chmod(binary.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        
+        return store.add(version, extract)
+    
+    def use_version(self, version: str, prefix: Optional[Path] = None) -> bool:
+        """
+        Ativa uma versão do armazém, instalando-a se necessário.
+        
+        Args:
+            version: Versão (ex: "1.6.6")
+            prefix: Outro prefixo (padrão: ~/.leme)
+            
+        Returns:
+            bool: True se a versão ficou ativa
+        """
+        store = self.get_store(prefix)
+        try:
+            self.install_version(version, prefix)
+            store.activate(version)
+        except KeyError:
+            print(f":x: [red]Pacote do Terraform {version} sem o binário 'terraform'[/red]")
+            return False
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f":x: [red]{e}[/red]")
+            return False
+        except subprocess.CalledProcessError:
+            print(f":x: [red]Falha no download do Terraform {version} (a versão existe?)[/red]")
+            return False
+        return True
+    
+    def install_to_prefix(self, prefix: Path, version: str = DEFAULT_TERRAFORM_VERSION) -> bool:
+        """
+        Instala no prefixo do usuário, sem sudo nem gerenciador de pacotes.
+        
+        Args:
+            prefix: Diretório do prefixo (ex: ~/.leme)
+            version: Versão
+            
+        Returns:
+            bool: True se a instalação foi bem-sucedida
+        """
+        print(f":gear: [blue]Instalando {self.tool_name} {version} em {prefix}...[/blue]")
+        if not self.use_version(version, prefix):
+            return False
+        print(f":white_check_mark: [green]{self.tool_name} {version} em {self.get_store(prefix).shim_path()}[/green]")
+        return True
+    
+    def _install_via_download(self, version: str = DEFAULT_TERRAFORM_VERSION) -> bool:
         """Instala Terraform via download direto (método universal)."""
         print(":globe_with_meridians: [blue]Instalando via download oficial da HashiCorp...[/blue]")
         
         try:
-            # Detectar arquitetura e SO
-            arch = self._get_architecture()
-            os_name = self._get_os_name()
-            
-            if not arch or not os_name:
-                print(":x: [red]Não foi possível detectar arquitetura ou SO[/red]")
+            if not self.use_version(version, SYSTEM_HOME):
                 return False
             
-            # URL de download (sempre pegar a versão mais recente seria ideal, mas vamos usar uma estável)
-            version = "1.5.7"  # Versão estável conhecida
-            url = f"https://releases.hashicorp.com/terraform/{version}/terraform_{version}_{os_name}_{arch}.zip"
+            # /usr/local/bin/terraform aponta para o shim do armazém do root (/opt/leme),
+            # usado por todos os usuários; `use --system terraform X` troca a versão
+            self.get_store(SYSTEM_HOME).link_system_binaries()
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                zip_file = temp_path / f"terraform_{version}.zip"
-                
-                # Download
-                print(f":arrow_down: [blue]Baixando Terraform {version} para {os_name} {arch}...[/blue]")
-                result = subprocess.run([
-                    "curl", "-L", "-o", str(zip_file), url
-                ], capture_output=True)
-                
-                if result.returncode != 0:
-                    print(":x: [red]Falha no download[/red]")
-                    return False
-                
-                # Extrair
-                print(":package: [blue]Extraindo arquivo...[/blue]")
-                with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                    zip_ref.extractall(temp_path)
-                
-                # Instalar
-                terraform_binary = temp_path / "terraform"
-                if not terraform_binary.exists():
-                    print(":x: [red]Binário do Terraform não encontrado no arquivo[/red]")
-                    return False
-                
-                # Copiar para /usr/local/bin
-                install_path = Path("/usr/local/bin/terraform")
-                print(f":gear: [blue]Instalando em {install_path}...[/blue]")
-                
-                subprocess.run([
-                    "sudo", "cp", str(terraform_binary), str(install_path)
-                ], check=True)
-                
-                subprocess.run([
-                    "sudo", "chmod", "+x", str(install_path)
-                ], check=True)
-                
-                print(":white_check_mark: [green]Terraform instalado via download oficial![/green]")
-                return True
+            print(":white_check_mark: [green]Terraform instalado via download oficial![/green]")
+            return True
         
         except Exception as e:
             print(f":x: [red]Erro na instalação via download: {str(e)}[/red]")
@@ -417,7 +570,7 @@ class TerraformInstaller(BaseInstaller):
                 OperatingSystem.DEBIAN, OperatingSystem.WSL_DEBIAN
             ]:
                 try:
-                    subprocess.run(["sudo", "apt-get", "remove", "-y", "terraform"], check=True)
+                    get_privileged_helper().run(["apt-get", "remove", "-y", "terraform"], check=True)
                     print(":white_check_mark: [green]Terraform removido via apt![/green]")
                     return True
                 except subprocess.CalledProcessError:
@@ -428,7 +581,7 @@ class TerraformInstaller(BaseInstaller):
             ]:
                 pkg_manager = "dnf" if self.system_info.os_type == OperatingSystem.FEDORA else "yum"
                 try:
-                    subprocess.run(["sudo", pkg_manager, "remove", "-y", "terraform"], check=True)
+                    get_privileged_helper().run([pkg_manager, "remove", "-y", "terraform"], check=True)
                     print(f":white_check_mark: [green]Terraform removido via {pkg_manager}![/green]")
                     return True
                 except subprocess.CalledProcessError:
@@ -437,7 +590,7 @@ class TerraformInstaller(BaseInstaller):
             # Tentar remover binário manual
             binary_path = Path("/usr/local/bin/terraform")
             if binary_path.exists():
-                subprocess.run(["sudo", "rm", str(binary_path)], check=True)
+                get_privileged_helper().remove(str(binary_path))
                 print(":white_check_mark: [green]Terraform removido (binário manual)![/green]")
                 return True
             
@@ -453,20 +606,16 @@ class TerraformInstaller(BaseInstaller):
         try:
             print(":broom: [blue]Limpando repositório corrompido...[/blue]")
             
+            privileged = get_privileged_helper()
+            
             # Remover arquivo de repositório se existir
-            subprocess.run([
-                "sudo", "rm", "-f", "/etc/apt/sources.list.d/hashicorp.list"
-            ], capture_output=True)
+            privileged.remove("/etc/apt/sources.list.d/hashicorp.list")
             
             # Remover chave GPG se existir
-            subprocess.run([
-                "sudo", "rm", "-f", "/etc/apt/keyrings/hashicorp.gpg"
-            ], capture_output=True)
+            privileged.remove("/etc/apt/keyrings/hashicorp.gpg")
             
             # Tentar atualizar repositórios para limpar cache
-            subprocess.run([
-                "sudo", "apt-get", "update"
-            ], capture_output=True)
+            refresh_apt_index(check=False)
             
             print(":white_check_mark: [green]Repositório limpo com sucesso[/green]")
             
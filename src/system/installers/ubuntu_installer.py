@@ -5,6 +5,8 @@ from typing import List
 from rich import print
 
 from .base_installer import BaseInstaller
+from ..package_sources import ensure_apt_key, ensure_repo_file, refresh_apt_index
+from ..privileged_helper import get_privileged_helper
 
 
 class UbuntuInstaller(BaseInstaller):
@@ -22,7 +24,7 @@ class UbuntuInstaller(BaseInstaller):
         try:
             # 1. Atualizar repositórios
             print("  [blue]1/6[/blue] Atualizando repositórios...")
-            self._run_command(["sudo", "apt", "update"])
+            refresh_apt_index()
             
             # 2. Instalar dependências
             print("  [blue]2/6[/blue] Instalando dependências...")
@@ -38,24 +40,23 @@ class UbuntuInstaller(BaseInstaller):
             
             # 3. Adicionar chave GPG oficial do Docker
             print("  [blue]3/6[/blue] Adicionando chave GPG do Docker...")
-            self._run_command([
-                "curl", "-fsSL", "https://download.docker.com/linux/ubuntu/gpg",
-                "|", "sudo", "gpg", "--dearmor", "-o", "/usr/share/keyrings/docker-archive-keyring.gpg"
-            ], shell=True)
+            ensure_apt_key(
+                "https://download.docker.com/linux/ubuntu/gpg",
+                "/usr/share/keyrings/docker-archive-keyring.gpg"
+            )
             
             # 4. Adicionar repositório do Docker
             print("  [blue]4/6[/blue] Adicionando repositório do Docker...")
             distro = "ubuntu" if "ubuntu" in self.system_info.os_type.value else "debian"
-            repo_cmd = [
-                "echo",
-                f'"deb [arch=amd64 signed-by=/usr/share/keyrings/docker-archive-keyring.gpg] https://download.docker.com/linux/{distro} $(lsb_release -cs) stable"',
-                "|", "sudo", "tee", "/etc/apt/sources.list.d/docker.list", ">", "/dev/null"
-            ]
-            self._run_command(repo_cmd, shell=True)
+            codename = self._run_command(["lsb_release", "-cs"]).stdout.strip()
+            ensure_repo_file(
+                "/etc/apt/sources.list.d/docker.list",
+                f"deb [arch=amd64 signed-by=/usr/share/keyrings/docker-archive-keyring.gpg] https://download.docker.com/linux/{distro} {codename} stable\n"
+            )
             
             # 5. Atualizar repositórios novamente
             print("  [blue]5/6[/blue] Atualizando repositórios com Docker...")
-            self._run_command(["sudo", "apt", "update"])
+            refresh_apt_index()
             
             # 6. Instalar Docker
             print("  [blue]6/6[/blue] Instalando Docker CE...")
@@ -86,13 +87,14 @@ class UbuntuInstaller(BaseInstaller):
             import os
             username = os.getenv("USER")
             if username:
-                self._run_command(["sudo", "usermod", "-aG", "docker", username])
+                get_privileged_helper().add_user_to_group(username, "docker")
                 print(f"  [green]✓[/green] Usuário {username} adicionado ao grupo docker")
                 print("  [yellow]⚠[/yellow] Faça logout/login para aplicar as permissões")
             
             # Iniciar serviço Docker
-            self._run_command(["sudo", "systemctl", "enable", "docker"])
-            self._run_command(["sudo", "systemctl", "start", "docker"])
+            get_privileged_helper().service("enable", "docker")
+            get_privileged_helper().service("start", "docker")
+            self.wait_for_docker_ready()
             
         except Exception as e:
             print(f"  [yellow]![/yellow] Aviso: Erro na configuração de usuário: {e}")
@@ -108,8 +110,8 @@ class UbuntuInstaller(BaseInstaller):
             print(":wastebasket: Removendo Docker...")
             
             # Parar serviços
-            self._run_command(["sudo", "systemctl", "stop", "docker"], ignore_errors=True)
-            self._run_command(["sudo", "systemctl", "disable", "docker"], ignore_errors=True)
+            get_privileged_helper().service("stop", "docker", check=False)
+            get_privileged_helper().service("disable", "docker", check=False)
             
             # Remover pacotes
             self._run_command([
@@ -118,9 +120,10 @@ class UbuntuInstaller(BaseInstaller):
             ])
             
             # Remover repositório (opcional)
-            self._run_command([
-                "sudo", "rm", "-f", "/etc/apt/sources.list.d/docker.list"
-            ], ignore_errors=True)
+            try:
+                get_privileged_helper().remove("/etc/apt/sources.list.d/docker.list")
+            except subprocess.CalledProcessError:
+                pass
             
             print("  [green]✓[/green] Docker removido com sucesso!")
             return True
@@ -0,0 +1,166 @@
+"""Operações idempotentes sobre índices, chaves e repositórios de pacotes.
+
+Cada operação é registrada no diário de etapas, de modo que uma execução
+retomada não adiciona chaves novamente nem atualiza índices que já estão
+em dia.
+"""
+
+import glob
+import hashlib
+import os
+from pathlib import Path
+from typing import Union
+from urllib.parse import urlsplit
+from rich import print
+from .privileged_helper import get_privileged_helper
+from .step_journal import get_step_journal
+from ..network.mirror_selection import get_mirror_selector
+from ..network.mirrors import get_mirror, mirror_sources
+
+
+APT_SOURCE_PATTERNS = [
+    "/etc/apt/sources.list",
+    "/etc/apt/sources.list.d/*.list",
+    "/etc/apt/sources.list.d/*.sources",
+    "/etc/apt/apt.conf.d/90leme-mirror"
+]
+APT_MIRROR_CONF = "/etc/apt/apt.conf.d/90leme-mirror"
+APT_LISTS_DIR = "/var/lib/apt/lists"
+APT_INDEX_MAX_AGE = 6 * 3600  # índices com mais de 6 horas são atualizados
+
+
+def _apt_sources_digest() -> str:
+    """Calcula o hash do conteúdo de todas as fontes do apt."""
+    digest = hashlib.sha256()
+    for pattern in APT_SOURCE_PATTERNS:
+        for path in sorted(glob.glob(pattern)):
+            digest.update(path.encode())
+            try:
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                pass
+    return digest.hexdigest()
+
+
+def _apt_lists_present() -> bool:
+    """Verifica se há índices baixados em /var/lib/apt/lists."""
+    return bool(glob.glob(os.path.join(APT_LISTS_DIR, "*Release")))
+
+
+def _sync_apt_mirror_config() -> None:
+    """
+    Direciona o tráfego HTTP do apt (arquivo da distribuição) ao servidor de cache.
+
+    Repositórios HTTPS de terceiros são reescritos por `ensure_repo_file`;
+    o proxy cobre as fontes `http://` da própria distribuição. Sem mirror,
+    a configuração de uma execução anterior é removida.
+    """
+    mirror = get_mirror()
+    if mirror:
+        mirror_host = urlsplit(mirror).hostname
+        ensure_root_file(
+            APT_MIRROR_CONF,
+            f'Acquire::http::Proxy "{mirror}/";\n'
+            f'Acquire::http::Proxy::{mirror_host} "DIRECT";\n'
+        )
+    elif os.path.exists(APT_MIRROR_CONF):
+        get_privileged_helper().remove(APT_MIRROR_CONF)
+
+
+def refresh_apt_index(check: bool = True) -> bool:
+    """
+    Atualiza os índices do apt apenas se as fontes mudaram desde a última vez.
+
+    Args:
+        check: Lançar exceção se o `apt-get update` falhar
+
+    Returns:
+        bool: True se os índices estão atualizados
+
+    Raises:
+        subprocess.CalledProcessError: Se o update falhar e check=True
+    """
+    def _update() -> bool:
+        result = get_privileged_helper().run(["apt-get", "update"], check=check)
+        return result.returncode == 0
+
+    _sync_apt_mirror_config()
+    return get_step_journal().run_step(
+        "apt-update",
+        _apt_sources_digest(),
+        _update,
+        postcondition=_apt_lists_present,
+        max_age=APT_INDEX_MAX_AGE
+    )
+
+
+def ensure_apt_key(key_url: str, key_path: str) -> None:
+    """
+    Instala uma chave GPG de repositório, se ainda não estiver instalada.
+
+    Args:
+        key_url: URL da chave ASCII-armored
+        key_path: Destino do keyring binário
+
+    Raises:
+        subprocess.CalledProcessError: Se o download ou o gpg falharem
+    """
+    def _add_key() -> bool:
+        get_privileged_helper().add_key(key_url, key_path)
+        return True
+
+    get_step_journal().run_step(
+        f"key:{key_path}",
+        key_url,
+        _add_key,
+        postcondition=lambda: os.path.getsize(key_path) > 0
+    )
+
+
+def ensure_root_file(path: str, content: Union[str, bytes], mode: int = 0o644) -> bool:
+    """
+    Grava um arquivo de sistema (lista de repositório, .repo) se o conteúdo mudou.
+
+    Manter o arquivo intacto quando já está correto preserva a impressão
+    digital das fontes e evita atualizações desnecessárias dos índices.
+
+    Args:
+        path: Caminho do arquivo
+        content: Conteúdo desejado
+        mode: Permissões do arquivo
+
+    Returns:
+        bool: True se o arquivo foi (re)escrito
+    """
+    data = content.encode() if isinstance(content, str) else content
+    try:
+        if Path(path).read_bytes() == data:
+            print(f"  [dim]↷ {path} já está configurado[/dim]")
+            return False
+    except OSError:
+        pass
+
+    get_privileged_helper().write_file(path, data, mode)
+    return True
+
+
+def ensure_repo_file(path: str, content: str) -> bool:
+    """
+    Grava um arquivo de repositório apontando para a melhor origem disponível.
+
+    Com `--mirror`, as URLs passam pelo servidor de cache local; sem ele,
+    cada origem oficial é trocada pelo mirror mais rápido medido.
+
+    Args:
+        path: Caminho do arquivo (.list ou .repo)
+        content: Conteúdo com as URLs originais
+
+    Returns:
+        bool: True se o arquivo foi (re)escrito
+    """
+    if get_mirror():
+        content = mirror_sources(content)
+    else:
+        content = get_mirror_selector().apply(content)
+    return ensure_root_file(path, content)
@@ -0,0 +1,707 @@
+"""Processo auxiliar privilegiado: um único `sudo` para todas as operações de root.
+
+O processo é iniciado uma vez via `sudo` e recebe, por um pipe, requisições
+JSON (uma por linha) de um protocolo pequeno e restrito: escrita atômica de
+arquivos, cópia, chmod, remoção, criação de diretórios, links simbólicos,
+pré-compilação de bytecode em instalações conhecidas (/opt/az), montagem
+de versões no armazém do sistema (/opt/leme/tools), operações tipadas
+(chaves GPG, pacotes .pkg, grupos e serviços permitidos) e execução de
+gerenciadores de pacotes com argumentos validados.
+
+Este módulo usa apenas a biblioteca padrão, pois também é executado
+diretamente como script pelo processo privilegiado.
+"""
+
+import atexit
+import base64
+import json
+import os
+import pwd
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import Dict, List, Optional, Union
+
+
+# Executáveis que o auxiliar aceita rodar como root pelo `run` genérico, com os
+# subcomandos permitidos (os demais utilitários só são usados por operações tipadas)
+ALLOWED_EXECUTABLES = {
+    "apt": {"install", "remove", "update"},
+    "apt-get": {"install", "remove", "update"},
+    "yum": {"install", "remove", "makecache"},
+    "dnf": {"install", "remove", "makecache", "config-manager"},
+    "yum-config-manager": set(),
+}
+
+# Opções aceitas nos gerenciadores de pacotes (-o, --setopt, -c etc. são recusadas)
+ALLOWED_PACKAGE_OPTIONS = {"-y", "--yes", "-q", "--add-repo"}
+
+# Nomes de pacote (com versão/arquitetura opcional); caminhos locais são recusados
+_PACKAGE_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9+._:~=-]*$")
+
+# Gerenciadores de pacotes: instalações grandes em links lentos não têm tempo máximo
+PACKAGE_MANAGERS = {"apt", "apt-get", "yum", "dnf"}
+
+# Grupos a que o auxiliar pode adicionar usuários
+ALLOWED_GROUPS = {"docker"}
+
+# Serviços e ações do systemctl permitidos
+ALLOWED_SERVICES = {"docker"}
+SERVICE_ACTIONS = {"start", "stop", "enable", "disable", "restart", "reload"}
+
+# Diretórios de keyrings do apt (chaves desarmorizadas)
+KEYRING_PREFIXES = ["/etc/apt/keyrings/", "/usr/share/keyrings/"]
+
+# Variáveis de ambiente que o cliente pode definir (LD_PRELOAD, PATH etc. são recusadas)
+ALLOWED_ENV = {"DEBIAN_FRONTEND", "NEEDRESTART_MODE"}
+
+# Diretórios em que operações de arquivo são permitidas
+ALLOWED_PATH_PREFIXES = [
+    "/etc/apt/", "/etc/yum.repos.d/", "/etc/docker/",
+    "/usr/share/keyrings/", "/usr/local/", "/usr/bin/", "/opt/"
+]
+
+# Instalações com interpretador próprio cujo bytecode pode ser pré-compilado como root
+BYTECODE_ROOTS = ["/opt/az/"]
+
+# Armazém de versões do sistema: o usuário monta a versão em um diretório seu,
+# que o auxiliar depois passa para o root (seal) e publica com rename
+TOOL_STORE_ROOT = "/opt/leme/tools/"
+
+DEFAULT_TIMEOUT = 300  # 5 minutos (demais comandos)
+
+
+# --- Lado privilegiado (servidor) ---
+
+def _check_path(path: str) -> str:
+    """Normaliza o caminho e garante que está em um diretório permitido."""
+    # O diretório pai é resolvido; o último componente não (links são tratados como links)
+    path = os.path.abspath(path)
+    real = os.path.join(os.path.realpath(os.path.dirname(path)), os.path.basename(path))
+    if not any(real.startswith(prefix) or real + "/" == prefix for prefix in ALLOWED_PATH_PREFIXES):
+        raise PermissionError(f"Caminho não permitido: {path}")
+    return real
+
+
+def _resolve_executable(name: str) -> str:
+    """Resolve um executável no PATH do root."""
+    resolved = shutil.which(name)
+    if not resolved:
+        raise FileNotFoundError(f"Comando não encontrado: {name}")
+    return resolved
+
+
+def _check_executable(argv: List[str]) -> List[str]:
+    """
+    Garante que o comando é um gerenciador de pacotes permitido, com argumentos válidos.
+
+    Só são aceitos o subcomando permitido, as opções de ALLOWED_PACKAGE_OPTIONS,
+    nomes de pacote (sem caminhos locais, ex: ./pacote.deb) e, após --add-repo,
+    uma URL https.
+    """
+    if not argv:
+        raise PermissionError("Comando vazio")
+
+    executable = os.path.basename(argv[0])
+    if executable not in ALLOWED_EXECUTABLES:
+        raise PermissionError(f"Comando não permitido: {argv[0]}")
+
+    subcommands = ALLOWED_EXECUTABLES[executable]
+    args = list(argv[1:])
+    if subcommands:
+        positional = [arg for arg in args if not arg.startswith("-")]
+        if not positional or positional[0] not in subcommands:
+            raise PermissionError(f"Subcomando não permitido: {' '.join(argv)}")
+
+    expect_repo = False
+    for arg in args:
+        if expect_repo:
+            if not arg.startswith("https://"):
+                raise PermissionError(f"Repositório não permitido: {arg}")
+            expect_repo = False
+        elif arg.startswith("-"):
+            if arg not in ALLOWED_PACKAGE_OPTIONS:
+                raise PermissionError(f"Opção não permitida: {arg}")
+            expect_repo = arg == "--add-repo"
+        elif not _PACKAGE_NAME_RE.match(arg):
+            raise PermissionError(f"Argumento não permitido: {arg}")
+    if expect_repo:
+        raise PermissionError("--add-repo sem URL")
+
+    return [_resolve_executable(executable)] + args
+
+
+def _caller_uid() -> int:
+    """UID do usuário que iniciou o auxiliar (via sudo) ou o próprio UID."""
+    return int(os.environ.get("SUDO_UID", os.getuid()))
+
+
+def _read_source(path: str) -> bytes:
+    """
+    Lê o arquivo de origem de uma cópia.
+
+    Só são aceitos arquivos regulares (sem seguir links) do próprio usuário
+    que iniciou o auxiliar, para que a cópia não sirva para ler arquivos
+    de root (ex: /etc/shadow).
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    with os.fdopen(fd, "rb") as f:
+        info = os.fstat(f.fileno())
+        if not stat.S_ISREG(info.st_mode):
+            raise PermissionError(f"Origem não é um arquivo regular: {path}")
+        if info.st_uid != _caller_uid():
+            raise PermissionError(f"Origem não pertence ao usuário: {path}")
+        return f.read()
+
+
+def _check_store_path(path: str) -> str:
+    """Garante que o caminho é uma versão (ou temporário) dentro de TOOL_STORE_ROOT."""
+    real = _check_path(path)
+    relative = real[len(TOOL_STORE_ROOT):] if real.startswith(TOOL_STORE_ROOT) else ""
+    # <ferramenta>/<versão>: nada acima nem abaixo disso
+    if relative.count("/") != 1 or ".." in relative.split("/"):
+        raise PermissionError(f"Caminho fora do armazém: {path}")
+    return real
+
+
+def _stage_dir(path: str) -> None:
+    """Cria um diretório novo do armazém pertencente ao usuário (para ser preenchido)."""
+    os.makedirs(os.path.dirname(path), mode=0o755, exist_ok=True)
+    os.mkdir(path, 0o755)  # FileExistsError: nunca entrega um diretório existente
+    os.chown(path, _caller_uid(), int(os.environ.get("SUDO_GID", os.getgid())))
+
+
+def _seal(path: str) -> None:
+    """
+    Passa uma árvore montada pelo usuário para o root, legível por todos, sem
+    permissão de escrita para grupo/outros e sem setuid/setgid.
+
+    A árvore é percorrida de cima para baixo e cada diretório é selado antes de
+    ser listado, então o usuário não consegue trocar entradas durante a
+    operação. Só são aceitos diretórios, arquivos regulares e links do próprio
+    usuário (um hardlink para um arquivo do root, por exemplo, é recusado).
+    """
+    caller = _caller_uid()
+    fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK)
+    try:
+        info = os.fstat(fd)
+        if info.st_uid != caller:
+            raise PermissionError(f"Não pertence ao usuário: {path}")
+        if not (stat.S_ISDIR(info.st_mode) or stat.S_ISREG(info.st_mode)):
+            raise PermissionError(f"Tipo de arquivo não permitido: {path}")
+        mode = stat.S_IMODE(info.st_mode) & ~(stat.S_ISUID | stat.S_ISGID | stat.S_IWGRP | stat.S_IWOTH)
+        # Legível (e executável, se for) por todos: a umask do usuário não vale aqui
+        mode |= stat.S_IRGRP | stat.S_IROTH
+        if stat.S_ISDIR(info.st_mode) or mode & stat.S_IXUSR:
+            mode |= stat.S_IXGRP | stat.S_IXOTH
+        os.fchown(fd, 0, 0)
+        os.fchmod(fd, mode)
+        if stat.S_ISDIR(info.st_mode):
+            for entry in os.scandir(path):
+                if entry.is_symlink():
+                    if entry.stat(follow_symlinks=False).st_uid != caller:
+                        raise PermissionError(f"Não pertence ao usuário: {entry.path}")
+                    os.chown(entry.path, 0, 0, follow_symlinks=False)
+                else:
+                    _seal(entry.path)
+    finally:
+        os.close(fd)
+
+
+def _publish(src: str, dest: str, replace: bool) -> None:
+    """Publica uma versão selada com rename (trocando a existente se `replace`)."""
+    if os.lstat(src).st_uid != 0:
+        raise PermissionError(f"Versão não selada: {src}")
+    if not os.path.lexists(dest):
+        os.rename(src, dest)
+        return
+    if not replace:
+        raise FileExistsError(f"Versão já existe: {dest}")
+    old = tempfile.mkdtemp(dir=os.path.dirname(dest), prefix=f".{os.path.basename(dest)}-old-")
+    os.rename(dest, os.path.join(old, "version"))
+    os.rename(src, dest)
+    shutil.rmtree(old)
+
+
+def _check_keyring_path(path: str) -> str:
+    """Garante que o destino de uma chave é um keyring .gpg do apt."""
+    real = _check_path(path)
+    if not real.endswith(".gpg") or not any(real.startswith(prefix) for prefix in KEYRING_PREFIXES):
+        raise PermissionError(f"Keyring não permitido: {path}")
+    return real
+
+
+def _check_group_member(user: str, group: str) -> List[str]:
+    """Monta o `usermod` que adiciona um usuário existente a um grupo permitido."""
+    if group not in ALLOWED_GROUPS:
+        raise PermissionError(f"Grupo não permitido: {group}")
+    if user.startswith("-"):
+        raise PermissionError(f"Usuário inválido: {user}")
+    pwd.getpwnam(user)  # KeyError se o usuário não existir
+    return [_resolve_executable("usermod"), "-aG", group, user]
+
+
+def _check_service(action: str, unit: str) -> List[str]:
+    """Monta o `systemctl` de uma ação permitida em um serviço permitido."""
+    if action not in SERVICE_ACTIONS:
+        raise PermissionError(f"Ação não permitida: {action}")
+    if unit not in ALLOWED_SERVICES:
+        raise PermissionError(f"Serviço não permitido: {unit}")
+    return [_resolve_executable("systemctl"), action, unit]
+
+
+def _check_env(env: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Garante que só variáveis permitidas são repassadas ao comando."""
+    env = env or {}
+    refused = sorted(set(env) - ALLOWED_ENV)
+    if refused:
+        raise PermissionError(f"Variáveis de ambiente não permitidas: {', '.join(refused)}")
+    return env
+
+
+def _compile_command(directory: str) -> List[str]:
+    """
+    Monta o `compileall` de um diretório de BYTECODE_ROOTS ou de um
+    virtualenv do armazém do sistema (/opt/leme/tools/<ferramenta>/<versão>).
+
+    O interpretador é sempre o da própria instalação (ex: /opt/az/bin/python3),
+    e precisa pertencer ao root sem permissão de escrita para outros.
+    """
+    real = os.path.realpath(directory)
+    root = next((prefix for prefix in BYTECODE_ROOTS if (real + "/").startswith(prefix)), None)
+    if not root and real.startswith(TOOL_STORE_ROOT):
+        parts = real[len(TOOL_STORE_ROOT):].split("/")
+        # Só versões já publicadas (seladas): nunca um diretório temporário do usuário
+        if len(parts) > 2 and not parts[1].startswith("."):
+            version_dir = _check_store_path(TOOL_STORE_ROOT + "/".join(parts[:2]))
+            info = os.lstat(version_dir)
+            if stat.S_ISDIR(info.st_mode) and info.st_uid == 0 and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                root = version_dir + "/"
+    if not root:
+        raise PermissionError(f"Diretório não permitido: {directory}")
+    python = os.path.join(root, "bin", "python3")
+    info = os.stat(python)
+    if info.st_uid != 0 or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"Interpretador não confiável: {python}")
+    return [python, "-m", "compileall", "-q", "-j", "0", real]
+
+
+def _atomic_write(path: str, data: bytes, mode: int) -> None:
+    """Escreve em arquivo temporário no mesmo diretório e renomeia."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".leme-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _run_argv(argv: List[str], input_data: Optional[bytes] = None, timeout: Optional[float] = None,
+              env: Optional[Dict[str, str]] = None) -> Dict:
+    """Executa um comando já validado e monta a resposta do protocolo."""
+    try:
+        result = subprocess.run(argv, input=input_data, capture_output=True, env=env, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"ok": False, "error": f"Comando demorou muito para executar: {' '.join(argv)}"}
+    return {
+        "ok": True,
+        "returncode": result.returncode,
+        "stdout": base64.b64encode(result.stdout).decode(),
+        "stderr": base64.b64encode(result.stderr).decode()
+    }
+
+
+def _handle_request(request: Dict) -> Dict:
+    """Executa uma requisição do protocolo e retorna a resposta."""
+    op = request.get("op")
+
+    if op == "write_file":
+        path = _check_path(request["path"])
+        _atomic_write(path, base64.b64decode(request["data"]), int(request.get("mode", 0o644)))
+        return {"ok": True}
+
+    if op == "copy":
+        path = _check_path(request["dest"])
+        data = _read_source(request["src"])
+        _atomic_write(path, data, int(request.get("mode", 0o755)))
+        return {"ok": True}
+
+    if op == "chmod":
+        os.chmod(_check_path(request["path"]), int(request["mode"]))
+        return {"ok": True}
+
+    if op == "remove":
+        path = _check_path(request["path"])
+        if os.path.isdir(path) and not os.path.islink(path):
+            if not request.get("recursive"):
+                raise IsADirectoryError(f"É um diretório: {path}")
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.unlink(path)
+        return {"ok": True}
+
+    if op == "makedirs":
+        path = _check_path(request["path"])
+        os.makedirs(path, exist_ok=True)
+        os.chmod(path, int(request.get("mode", 0o755)))
+        return {"ok": True}
+
+    if op == "symlink":
+        link = _check_path(request["link"])
+        temp_link = f"{link}.leme-tmp"
+        if os.path.lexists(temp_link):
+            os.unlink(temp_link)
+        os.symlink(request["target"], temp_link)
+        os.replace(temp_link, link)
+        return {"ok": True}
+
+    if op == "run":
+        argv = _check_executable(request["argv"])
+        env = dict(os.environ)
+        env.update(_check_env(request.get("env")))
+        input_data = base64.b64decode(request["input"]) if request.get("input") else None
+        timeout = request.get("timeout")
+        if not timeout and os.path.basename(argv[0]) not in PACKAGE_MANAGERS:
+            timeout = DEFAULT_TIMEOUT
+        return _run_argv(argv, input_data, timeout, env)
+
+    if op == "dearmor_key":
+        path = _check_keyring_path(request["path"])
+        with tempfile.TemporaryDirectory() as gnupg_home:
+            argv = [_resolve_executable("gpg"), "--batch", "--homedir", gnupg_home, "--dearmor"]
+            result = subprocess.run(argv, input=base64.b64decode(request["data"]), capture_output=True, timeout=DEFAULT_TIMEOUT)
+        if result.returncode != 0:
+            return {"ok": False, "error": result.stderr.decode(errors="replace").strip() or "gpg --dearmor falhou"}
+        _atomic_write(path, result.stdout, 0o644)
+        return {"ok": True}
+
+    if op == "import_rpm_key":
+        with tempfile.NamedTemporaryFile(suffix=".asc") as key_file:
+            key_file.write(base64.b64decode(request["data"]))
+            key_file.flush()
+            return _run_argv([_resolve_executable("rpm"), "--import", key_file.name], timeout=DEFAULT_TIMEOUT)
+
+    if op == "install_pkg":
+        # O pacote é copiado para um arquivo do root antes de ser instalado
+        data = _read_source(request["path"])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pkg_file = os.path.join(temp_dir, "package.pkg")
+            _atomic_write(pkg_file, data, 0o600)
+            return _run_argv([_resolve_executable("installer"), "-pkg", pkg_file, "-target", "/"])
+
+    if op == "add_user_to_group":
+        return _run_argv(_check_group_member(request["user"], request["group"]), timeout=DEFAULT_TIMEOUT)
+
+    if op == "service":
+        return _run_argv(_check_service(request["action"], request["unit"]), timeout=DEFAULT_TIMEOUT)
+
+    if op == "stage_dir":
+        _stage_dir(_check_store_path(request["path"]))
+        return {"ok": True}
+
+    if op == "seal_dir":
+        _seal(_check_store_path(request["path"]))
+        return {"ok": True}
+
+    if op == "publish_dir":
+        src = _check_store_path(request["src"])
+        dest = _check_store_path(request["dest"])
+        if os.path.dirname(src) != os.path.dirname(dest):
+            raise PermissionError(f"Versão de outra ferramenta: {src}")
+        _publish(src, dest, bool(request.get("replace")))
+        return {"ok": True}
+
+    if op == "compile_bytecode":
+        argv = _compile_command(request["directory"])
+        env = {key: value for key, value in os.environ.items() if not key.startswith("PYTHON")}
+        try:
+            result = subprocess.run(argv, capture_output=True, env=env, timeout=request.get("timeout") or DEFAULT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            return {"ok": False, "error": f"Comando demorou muito para executar: {' '.join(argv)}"}
+        return {"ok": True, "returncode": result.returncode}
+
+    if op == "ping":
+        return {"ok": True, "uid": os.getuid()}
+
+    raise ValueError(f"Operação desconhecida: {op}")
+
+
+def _safe_handle(request: Dict) -> Dict:
+    """Executa a requisição convertendo exceções em respostas de erro."""
+    try:
+        return _handle_request(request)
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def serve() -> None:
+    """Laço principal do processo privilegiado (lê do stdin, responde no stdout)."""
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = {"ok": False, "error": "Requisição inválida"}
+        else:
+            response = _safe_handle(request)
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+# --- Lado do usuário (cliente) ---
+
+class PrivilegedHelper:
+    """Cliente do processo auxiliar privilegiado."""
+
+    def __init__(self):
+        """Inicializa o cliente (o processo é iniciado sob demanda)."""
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._in_process = hasattr(os, "geteuid") and os.geteuid() == 0
+
+    def _ensure_started(self) -> None:
+        """Inicia o processo privilegiado com um único `sudo`."""
+        if self._in_process or (self._process and self._process.poll() is None):
+            return
+
+        self._process = subprocess.Popen(
+            ["sudo", sys.executable, "-s", os.path.abspath(__file__), "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+
+    def _request(self, request: Dict) -> Dict:
+        """Envia uma requisição e aguarda a resposta."""
+        with self._lock:
+            if self._in_process:
+                response = _safe_handle(request)
+            else:
+                self._ensure_started()
+                try:
+                    self._process.stdin.write(json.dumps(request) + "\n")
+                    self._process.stdin.flush()
+                    line = self._process.stdout.readline()
+                except (BrokenPipeError, OSError):
+                    line = ""
+                if not line:
+                    self._process = None
+                    raise subprocess.CalledProcessError(1, ["sudo", request.get("op", "")], stderr="Processo privilegiado encerrado (sudo negado?)")
+                response = json.loads(line)
+
+        if not response.get("ok"):
+            command = request.get("argv") or [request.get("op", ""), request.get("path") or request.get("dest") or ""]
+            raise subprocess.CalledProcessError(1, command, stderr=response.get("error"))
+        return response
+
+    def write_file(self, path: str, content: Union[str, bytes], mode: int = 0o644) -> None:
+        """Escreve um arquivo como root de forma atômica."""
+        data = content.encode() if isinstance(content, str) else content
+        self._request({"op": "write_file", "path": str(path), "data": base64.b64encode(data).decode(), "mode": mode})
+
+    def copy(self, src: str, dest: str, mode: int = 0o755) -> None:
+        """Copia um arquivo para um destino de root de forma atômica."""
+        self._request({"op": "copy", "src": str(src), "dest": str(dest), "mode": mode})
+
+    def chmod(self, path: str, mode: int) -> None:
+        """Altera as permissões de um arquivo."""
+        self._request({"op": "chmod", "path": str(path), "mode": mode})
+
+    def remove(self, path: str, recursive: bool = False) -> None:
+        """Remove um arquivo (ou diretório com recursive=True); ignora se não existir."""
+        self._request({"op": "remove", "path": str(path), "recursive": recursive})
+
+    def makedirs(self, path: str, mode: int = 0o755) -> None:
+        """Cria um diretório (e os pais) se não existir."""
+        self._request({"op": "makedirs", "path": str(path), "mode": mode})
+
+    def symlink(self, target: str, link: str) -> None:
+        """Cria ou substitui um link simbólico de forma atômica."""
+        self._request({"op": "symlink", "target": str(target), "link": str(link)})
+
+    def stage_dir(self, path: str) -> None:
+        """Cria um diretório novo em TOOL_STORE_ROOT, do usuário, para montar uma versão."""
+        self._request({"op": "stage_dir", "path": str(path)})
+
+    def seal_dir(self, path: str) -> None:
+        """Passa um diretório montado pelo usuário em TOOL_STORE_ROOT para o root."""
+        self._request({"op": "seal_dir", "path": str(path)})
+
+    def publish_dir(self, src: str, dest: str, replace: bool = False) -> None:
+        """Renomeia uma versão selada para o nome final (trocando a existente se `replace`)."""
+        self._request({"op": "publish_dir", "src": str(src), "dest": str(dest), "replace": replace})
+
+    def add_key(self, key_url: str, key_path: str) -> None:
+        """
+        Baixa uma chave GPG (sem privilégios) e a grava desarmorizada como root.
+
+        Args:
+            key_url: URL da chave ASCII-armored
+            key_path: Destino do keyring binário
+
+        Raises:
+            subprocess.CalledProcessError: Se o download ou o gpg falharem
+        """
+        key_data = subprocess.run(["curl", "-fsSL", key_url], capture_output=True, check=True).stdout
+        self._request({"op": "dearmor_key", "path": str(key_path), "data": base64.b64encode(key_data).decode()})
+
+    def import_rpm_key(self, key_url: str) -> None:
+        """
+        Baixa uma chave GPG (sem privilégios) e a importa no banco do rpm.
+
+        Raises:
+            subprocess.CalledProcessError: Se o download ou o rpm falharem
+        """
+        key_data = subprocess.run(["curl", "-fsSL", key_url], capture_output=True, check=True).stdout
+        response = self._request({"op": "import_rpm_key", "data": base64.b64encode(key_data).decode()})
+        self._completed(["rpm", "--import", key_url], response, check=True, text=True)
+
+    def install_pkg(self, pkg_path: str) -> subprocess.CompletedProcess:
+        """
+        Instala um pacote .pkg do macOS (`installer -pkg ... -target /`).
+
+        Args:
+            pkg_path: Pacote baixado pelo usuário
+
+        Returns:
+            subprocess.CompletedProcess: Resultado do installer
+
+        Raises:
+            subprocess.CalledProcessError: Se o auxiliar recusar a requisição
+        """
+        response = self._request({"op": "install_pkg", "path": str(pkg_path)})
+        return self._completed(["installer", "-pkg", str(pkg_path), "-target", "/"], response, check=False, text=True)
+
+    def add_user_to_group(self, user: str, group: str, check: bool = True) -> subprocess.CompletedProcess:
+        """
+        Adiciona um usuário a um grupo de ALLOWED_GROUPS (`usermod -aG`).
+
+        Raises:
+            subprocess.CalledProcessError: Se o usermod falhar e check=True
+        """
+        response = self._request({"op": "add_user_to_group", "user": user, "group": group})
+        return self._completed(["usermod", "-aG", group, user], response, check, text=True)
+
+    def service(self, action: str, unit: str, check: bool = True) -> subprocess.CompletedProcess:
+        """
+        Executa uma ação do systemctl em um serviço de ALLOWED_SERVICES.
+
+        Raises:
+            subprocess.CalledProcessError: Se o systemctl falhar e check=True
+        """
+        response = self._request({"op": "service", "action": action, "unit": unit})
+        return self._completed(["systemctl", action, unit], response, check, text=True)
+
+    def run(
+        self,
+        argv: List[str],
+        check: bool = False,
+        input: Optional[Union[str, bytes]] = None,
+        timeout: Optional[int] = None,
+        env: Optional[Dict[str, str]] = None,
+        text: bool = True
+    ) -> subprocess.CompletedProcess:
+        """
+        Executa um gerenciador de pacotes permitido como root.
+
+        Args:
+            argv: Comando (sem `sudo`), ex: ["apt-get", "install", "-y", "git"]
+            check: Lançar CalledProcessError se o comando falhar
+            input: Dados para o stdin do comando
+            timeout: Tempo máximo em segundos (padrão: sem limite para
+                gerenciadores de pacotes, DEFAULT_TIMEOUT para os demais)
+            env: Variáveis de ambiente adicionais (só as de ALLOWED_ENV)
+            text: Decodificar stdout/stderr como texto
+
+        Returns:
+            subprocess.CompletedProcess: Resultado do comando
+
+        Raises:
+            subprocess.CalledProcessError: Se o comando falhar e check=True,
+                ou se o auxiliar recusar a requisição
+        """
+        request = {"op": "run", "argv": [str(a) for a in argv], "timeout": timeout, "env": env}
+        if input is not None:
+            data = input.encode() if isinstance(input, str) else input
+            request["input"] = base64.b64encode(data).decode()
+
+        return self._completed(argv, self._request(request), check, text)
+
+    @staticmethod
+    def _completed(argv: List[str], response: Dict, check: bool, text: bool) -> subprocess.CompletedProcess:
+        """Converte a resposta de um comando em CompletedProcess."""
+        stdout = base64.b64decode(response["stdout"])
+        stderr = base64.b64decode(response["stderr"])
+        if text:
+            stdout = stdout.decode(errors="replace")
+            stderr = stderr.decode(errors="replace")
+
+        result = subprocess.CompletedProcess(argv, response["returncode"], stdout, stderr)
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, argv, result.stdout, result.stderr)
+        return result
+
+    def compile_bytecode(self, directory: str, timeout: Optional[int] = None) -> int:
+        """
+        Pré-compila um diretório de BYTECODE_ROOTS ou do armazém do sistema com
+        o interpretador da instalação.
+
+        Args:
+            directory: Diretório (ex: site-packages de /opt/az)
+            timeout: Tempo máximo em segundos (padrão: DEFAULT_TIMEOUT)
+
+        Returns:
+            int: Código de saída do compileall
+
+        Raises:
+            subprocess.CalledProcessError: Se o auxiliar recusar a requisição
+        """
+        response = self._request({"op": "compile_bytecode", "directory": str(directory), "timeout": timeout})
+        return response["returncode"]
+
+    def close(self) -> None:
+        """Encerra o processo privilegiado."""
+        if self._process and self._process.poll() is None:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5)
+            except Exception:
+                self._process.kill()
+        self._process = None
+
+
+_helper: Optional[PrivilegedHelper] = None
+
+
+def get_privileged_helper() -> PrivilegedHelper:
+    """
+    Retorna o auxiliar privilegiado compartilhado pelo processo.
+
+    Returns:
+        PrivilegedHelper: Instância única, encerrada automaticamente na saída
+    """
+    global _helper
+    if _helper is None:
+        _helper = PrivilegedHelper()
+        atexit.register(_helper.close)
+    return _helper
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        serve()
@@ -0,0 +1,125 @@
+"""Política de respostas para os prompts da CLI (`--yes` e `--profile`).
+
+Todo prompt sim/não passa por `confirm(chave, mensagem)`. A chave identifica
+a pergunta (ex: "install.docker", "reinstall.terraform",
+"docker.add_user_to_group") e é resolvida, nesta ordem, pelo perfil, por
+`--yes` e, só então, pelo terminal.
+"""
+
+import sys
+from typing import Optional, Tuple
+
+import typer
+from rich import print
+
+from ..config.profile import Profile
+
+
+class PromptPolicy:
+    """Resolve prompts a partir de um perfil de respostas ou de `--yes`."""
+
+    def __init__(self, assume_yes: bool = False, profile: Optional[Profile] = None):
+        """
+        Inicializa a política.
+
+        Args:
+            assume_yes: Responder "sim" a todas as perguntas sem resposta no perfil
+            profile: Perfil de respostas
+        """
+        self.assume_yes = assume_yes
+        self.profile = profile
+
+    def answer_for(self, key: str) -> Optional[bool]:
+        """
+        Retorna a resposta pré-definida para uma pergunta.
+
+        Chaves são procuradas da mais específica para a mais genérica:
+        "reinstall.docker" e depois "reinstall".
+
+        Args:
+            key: Chave da pergunta
+
+        Returns:
+            Optional[bool]: Resposta, ou None se deve perguntar ao usuário
+        """
+        return self._resolve(key)[0]
+
+    def _resolve(self, key: str) -> Tuple[Optional[bool], str]:
+        """Resolve a resposta de uma pergunta e indica de onde ela veio."""
+        key = key.lower()
+
+        if self.profile:
+            parts = key.split(".")
+            for size in range(len(parts), 0, -1):
+                candidate = ".".join(parts[:size])
+                if candidate in self.profile.answers:
+                    return self.profile.answers[candidate], "perfil"
+
+            # Perguntas de instalação seguem a lista [tools] do perfil
+            if parts[0] == "install" and len(parts) == 2 and self.profile.tools:
+                return any(tool.value == parts[1] for tool in self.profile.tools), "perfil"
+
+        if self.assume_yes:
+            return True, "--yes"
+
+        return None, ""
+
+    def confirm(self, key: str, message: str, default: bool = False) -> bool:
+        """
+        Faz uma pergunta sim/não, usando a resposta pré-definida se houver.
+
+        Sem resposta pré-definida e sem terminal interativo (ex: cloud-init,
+        CI), a resposta padrão é usada em vez de bloquear.
+
+        Args:
+            key: Chave da pergunta
+            message: Texto da pergunta
+            default: Resposta padrão
+
+        Returns:
+            bool: Resposta
+        """
+        answer, origin = self._resolve(key)
+        if answer is not None:
+            print(f"{message} [dim]→ {'sim' if answer else 'não'} ({origin})[/dim]")
+            return answer
+
+        if not sys.stdin.isatty():
+            print(f"{message} [dim]→ {'sim' if default else 'não'} (sem terminal interativo)[/dim]")
+            return default
+
+        return typer.confirm(message, default=default)
+
+
+_policy = PromptPolicy()
+
+
+def configure_prompt_policy(assume_yes: bool = False, profile: Optional[Profile] = None) -> PromptPolicy:
+    """
+    Define a política de respostas usada pelo processo.
+
+    Args:
+        assume_yes: Responder "sim" a todas as perguntas sem resposta no perfil
+        profile: Perfil de respostas
+
+    Returns:
+        PromptPolicy: Política configurada
+    """
+    global _policy
+    _policy = PromptPolicy(assume_yes=assume_yes, profile=profile)
+    return _policy
+
+
+def get_prompt_policy() -> PromptPolicy:
+    """
+    Retorna a política de respostas do processo.
+
+    Returns:
+        PromptPolicy: Política atual
+    """
+    return _policy
+
+
+def confirm(key: str, message: str, default: bool = False) -> bool:
+    """Atalho para `get_prompt_policy().confirm(...)`."""
+    return _policy.confirm(key, message, default)
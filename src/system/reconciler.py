@@ -0,0 +1,87 @@
+"""Reconciliação entre o estado desejado e as ferramentas instaladas."""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional
+
+from .environment_manager import EnvironmentManager, ToolStatus
+from .version_utils import ANY_VERSION, version_satisfies
+from ..config.constants import Tool, DEVOPS_TOOLS_CONFIG
+from ..config.desired_state import DesiredState
+
+
+class ReconcileAction(str, Enum):
+    """Ação necessária para uma ferramenta convergir."""
+    INSTALL = "install"
+    UPGRADE = "upgrade"
+    KEEP = "keep"
+
+
+@dataclass
+class ReconcileStep:
+    """Diferença entre o estado desejado e o atual para uma ferramenta."""
+    tool: Tool
+    action: ReconcileAction
+    wanted: str
+    current: Optional[str] = None
+
+
+class Reconciler:
+    """Calcula o diff mínimo entre o estado desejado e o sistema."""
+
+    def __init__(self, desired: DesiredState, env_manager: Optional[EnvironmentManager] = None):
+        """
+        Inicializa o reconciliador.
+
+        Args:
+            desired: Estado desejado
+            env_manager: Gerenciador de ambiente (criado se omitido)
+        """
+        self.desired = desired
+        self.env_manager = env_manager or EnvironmentManager()
+
+    def probe(self) -> None:
+        """
+        Verifica apenas as ferramentas declaradas, em paralelo.
+
+        Ferramentas sem restrição de versão são verificadas só pela presença
+        do executável, o que torna a verificação de um host já convergido
+        praticamente instantânea.
+        """
+        presence_only = [
+            tool for tool, spec in self.desired.tools.items()
+            if spec.lower() in ANY_VERSION
+        ]
+        self.env_manager.check_tools(self.desired.tools.keys(), presence_only=presence_only)
+
+    def diff(self) -> List[ReconcileStep]:
+        """
+        Calcula a ação necessária para cada ferramenta declarada.
+
+        Returns:
+            List[ReconcileStep]: Etapas ordenadas por prioridade
+        """
+        steps = []
+        for tool, spec in self.desired.tools.items():
+            status = self.env_manager.tools_status.get(tool) or ToolStatus(tool=tool, installed=False)
+
+            if not status.installed:
+                action = ReconcileAction.INSTALL
+            elif version_satisfies(status.version, spec):
+                action = ReconcileAction.KEEP
+            else:
+                action = ReconcileAction.UPGRADE
+
+            steps.append(ReconcileStep(tool=tool, action=action, wanted=spec, current=status.version))
+
+        return sorted(steps, key=lambda s: DEVOPS_TOOLS_CONFIG[s.tool]["priority"])
+
+    def pending(self) -> List[ReconcileStep]:
+        """
+        Verifica o sistema e retorna apenas as etapas que exigem alguma ação.
+
+        Returns:
+            List[ReconcileStep]: Etapas de instalação ou atualização
+        """
+        self.probe()
+        return [step for step in self.diff() if step.action != ReconcileAction.KEEP]
@@ -0,0 +1,157 @@
+"""Mirror local do Docker Hub (registry:2 em modo pull-through cache).
+
+Um container `registry:2` com `REGISTRY_PROXY_REMOTEURL` guarda as camadas
+baixadas do Docker Hub; as máquinas do laboratório apontam o
+`registry-mirrors` do daemon.json para ele e os pulls repetidos passam a
+vir da rede local.
+"""
+
+import json
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+from rich import print
+
+from .artifact_cache import CACHE_DIR
+from .docker_engine import DockerEngineClient, DockerEngineError, ERROR_PROTOCOL, error_message
+
+
+REGISTRY_IMAGE = "registry:2"
+DEFAULT_CONTAINER_NAME = "leme-registry-mirror"
+DEFAULT_REGISTRY_PORT = 5000
+DEFAULT_UPSTREAM = "https://registry-1.docker.io"
+DEFAULT_DATA_DIR = CACHE_DIR / "registry"
+READY_TIMEOUT = 30.0
+
+
+class RegistryMirror:
+    """Gerencia o container do mirror de registry."""
+
+    def __init__(
+        self,
+        client: Optional[DockerEngineClient] = None,
+        name: str = DEFAULT_CONTAINER_NAME,
+        port: int = DEFAULT_REGISTRY_PORT,
+        data_dir: Optional[Path] = None,
+        upstream: str = DEFAULT_UPSTREAM
+    ):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            client: Cliente da Engine API
+            name: Nome do container
+            port: Porta publicada no host
+            data_dir: Diretório das camadas em cache (padrão: ~/.cache/leme/registry)
+            upstream: Registry de origem
+        """
+        self.client = client or DockerEngineClient()
+        self.name = name
+        self.port = port
+        self.data_dir = data_dir or DEFAULT_DATA_DIR
+        self.upstream = upstream
+
+    def inspect(self) -> Optional[Dict]:
+        """
+        Retorna os dados do container, ou None se ele não existir.
+
+        Raises:
+            DockerEngineError: Se o daemon não puder ser acessado
+        """
+        status, _, body = self.client.request("GET", f"/containers/{self.name}/json")
+        if status == 404:
+            return None
+        if status != 200:
+            raise DockerEngineError(f"inspect de {self.name} retornou HTTP {status}: {error_message(body)}", ERROR_PROTOCOL)
+        return json.loads(body)
+
+    def is_running(self) -> bool:
+        """Indica se o container do mirror está rodando."""
+        container = self.inspect()
+        return bool(container and container.get("State", {}).get("Running"))
+
+    def _container_spec(self) -> Dict:
+        """Definição do container para POST /containers/create."""
+        return {
+            "Image": REGISTRY_IMAGE,
+            "Env": [f"REGISTRY_PROXY_REMOTEURL={self.upstream}"],
+            "ExposedPorts": {"5000/tcp": {}},
+            "Labels": {"leme.role": "registry-mirror"},
+            "HostConfig": {
+                "PortBindings": {"5000/tcp": [{"HostPort": str(self.port)}]},
+                "Binds": [f"{self.data_dir}:/var/lib/registry"],
+                "RestartPolicy": {"Name": "always"},
+            },
+        }
+
+    def up(self) -> bool:
+        """
+        Cria (se necessário) e inicia o container do mirror.
+
+        Returns:
+            bool: True se o container foi criado ou iniciado agora,
+                False se já estava rodando
+
+        Raises:
+            DockerEngineError: Se o daemon falhar
+        """
+        container = self.inspect()
+        if container and container.get("State", {}).get("Running"):
+            print(f"  [dim]↷ Mirror {self.name} já está rodando[/dim]")
+            return False
+
+        if not container:
+            if not self.client.image_exists(REGISTRY_IMAGE):
+                print(f"  [blue]⬇[/blue] Baixando {REGISTRY_IMAGE}...")
+                self.client.pull_image(REGISTRY_IMAGE)
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            status, body = self.client.post_json(f"/containers/create?name={self.name}", self._container_spec())
+            if status != 201:
+                raise DockerEngineError(f"Falha ao criar {self.name}: {error_message(body)}", ERROR_PROTOCOL)
+
+        status, body = self.client.post_json(f"/containers/{self.name}/start")
+        if status not in (204, 304):
+            raise DockerEngineError(f"Falha ao iniciar {self.name}: {error_message(body)}", ERROR_PROTOCOL)
+        return True
+
+    def down(self) -> bool:
+        """
+        Para e remove o container (as camadas em cache são mantidas).
+
+        Returns:
+            bool: True se havia um container para remover
+
+        Raises:
+            DockerEngineError: Se o daemon falhar
+        """
+        if not self.inspect():
+            return False
+        status, _, body = self.client.request("DELETE", f"/containers/{self.name}?force=1")
+        if status not in (204, 404):
+            raise DockerEngineError(f"Falha ao remover {self.name}: {error_message(body)}", ERROR_PROTOCOL)
+        return True
+
+    def wait_ready(self, url: str, timeout: float = READY_TIMEOUT) -> bool:
+        """
+        Aguarda o registry responder em /v2/.
+
+        Args:
+            url: URL base do mirror
+            timeout: Tempo máximo em segundos
+
+        Returns:
+            bool: True se respondeu dentro do prazo
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.1
+        while time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(f"{url}/v2/", timeout=2):
+                    return True
+            except (urllib.error.URLError, OSError):
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+        return False
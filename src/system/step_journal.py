@@ -0,0 +1,178 @@
+"""Diário durável de etapas concluídas, para retomar setups interrompidos."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from rich import print
+
+
+STATE_DIR = Path(os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state") / "leme"
+JOURNAL_VERSION = 1
+
+
+def fingerprint(*inputs: Any) -> str:
+    """
+    Calcula a impressão digital das entradas de uma etapa.
+
+    Args:
+        *inputs: Valores serializáveis que determinam o resultado da etapa
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class StepJournal:
+    """Diário de etapas concluídas, persistido atomicamente em disco."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Inicializa o diário.
+
+        Args:
+            path: Arquivo do diário (padrão: ~/.local/state/leme/journal.json)
+        """
+        self.path = path or STATE_DIR / "journal.json"
+        data = self._load()
+        self.steps: Dict[str, Dict[str, Any]] = data.get("steps", {})
+        # Início e fim da última execução do setup (fim ausente = interrompida)
+        self.run: Dict[str, float] = data.get("run", {})
+
+    def _load(self) -> Dict[str, Any]:
+        """Carrega o diário do disco, ignorando arquivos corrompidos."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == JOURNAL_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save(self) -> None:
+        """Grava o diário de forma atômica (arquivo temporário + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".journal-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": JOURNAL_VERSION, "steps": self.steps, "run": self.run}, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def is_complete(self, step_id: str, step_fingerprint: str, max_age: Optional[float] = None) -> bool:
+        """
+        Verifica se a etapa foi concluída com as mesmas entradas.
+
+        Args:
+            step_id: Identificador da etapa
+            step_fingerprint: Impressão digital atual das entradas
+            max_age: Idade máxima do registro em segundos (None = sem limite)
+
+        Returns:
+            bool: True se há registro válido para a etapa
+        """
+        entry = self.steps.get(step_id)
+        if not entry or entry.get("fingerprint") != step_fingerprint:
+            return False
+        if max_age is not None and time.time() - entry.get("completed_at", 0) > max_age:
+            return False
+        return True
+
+    def record(self, step_id: str, step_fingerprint: str) -> None:
+        """Registra a conclusão de uma etapa."""
+        self.steps[step_id] = {"fingerprint": step_fingerprint, "completed_at": time.time()}
+        self._save()
+
+    def invalidate(self, step_id: str) -> None:
+        """Remove o registro de uma etapa."""
+        if self.steps.pop(step_id, None) is not None:
+            self._save()
+
+    def clear(self) -> None:
+        """Remove todos os registros."""
+        self.steps = {}
+        self.run = {}
+        self._save()
+
+    @property
+    def interrupted(self) -> bool:
+        """Indica se a última execução começou e não chegou ao fim."""
+        return "started_at" in self.run and "finished_at" not in self.run
+
+    def start_run(self) -> None:
+        """Registra o início de uma execução (sem marcador de conclusão)."""
+        self.run = {"started_at": time.time()}
+        self._save()
+
+    def finish_run(self) -> None:
+        """Registra que a execução atual chegou ao fim."""
+        self.run["finished_at"] = time.time()
+        self._save()
+
+    def run_step(
+        self,
+        step_id: str,
+        inputs: Any,
+        action: Callable[[], Any],
+        postcondition: Optional[Callable[[], bool]] = None,
+        max_age: Optional[float] = None
+    ) -> Any:
+        """
+        Executa uma etapa, pulando-a se já foi concluída com as mesmas entradas.
+
+        A etapa só é pulada se a impressão digital registrada coincidir e a
+        pós-condição (quando informada) ainda for verdadeira.
+
+        Args:
+            step_id: Identificador da etapa
+            inputs: Entradas que determinam o resultado da etapa
+            action: Função que executa a etapa
+            postcondition: Verificação de que o efeito da etapa ainda existe
+            max_age: Idade máxima do registro em segundos
+
+        Returns:
+            Any: Resultado da ação (True se a etapa foi pulada)
+        """
+        step_fingerprint = fingerprint(step_id, inputs)
+
+        if self.is_complete(step_id, step_fingerprint, max_age):
+            try:
+                still_valid = postcondition() if postcondition else True
+            except Exception:
+                still_valid = False
+            if still_valid:
+                print(f"  [dim]↷ Etapa já concluída, pulando: {step_id}[/dim]")
+                return True
+            self.invalidate(step_id)
+
+        result = action()
+        if result is not False:
+            self.record(step_id, step_fingerprint)
+        return result
+
+
+_journal: Optional[StepJournal] = None
+
+
+def get_step_journal() -> StepJournal:
+    """
+    Retorna o diário de etapas compartilhado pelo processo.
+
+    Returns:
+        StepJournal: Instância única
+    """
+    global _journal
+    if _journal is None:
+        _journal = StepJournal()
+    return _journal
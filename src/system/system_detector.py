@@ -33,11 +33,13 @@ class SystemInfo:
     """Informações do sistema."""
     
     def __init__(self, os_type: OperatingSystem, architecture: Architecture, 
-                 is_wsl: bool = False, distro_version: Optional[str] = None):
+                 is_wsl: bool = False, distro_version: Optional[str] = None,
+                 cpu_count: Optional[int] = None):
         self.os_type = os_type
         self.architecture = architecture
         self.is_wsl = is_wsl
         self.distro_version = distro_version
+        self.cpu_count = cpu_count
     
     def __str__(self):
         wsl_str = " (WSL)" if self.is_wsl else ""
@@ -66,18 +68,51 @@ class SystemDetector:
         system = platform.system().lower()
         
         if system == "linux":
-            return SystemDetector._detect_linux_distro(arch, is_wsl)
+            info = SystemDetector._detect_linux_distro(arch, is_wsl)
         elif system == "darwin":
-            return SystemDetector._detect_macos(arch)
+            info = SystemDetector._detect_macos(arch)
         elif system == "windows":
-            return SystemInfo(OperatingSystem.WINDOWS, arch)
+            info = SystemInfo(OperatingSystem.WINDOWS, arch)
         else:
-            return SystemInfo(OperatingSystem.UNKNOWN, arch)
+            info = SystemInfo(OperatingSystem.UNKNOWN, arch)
+        
+        info.cpu_count = SystemDetector._detect_cpu_count()
+        return info
+    
+    @staticmethod
+    def from_facts(os_release: str, machine: str, proc_version: str = "", nproc: str = "") -> SystemInfo:
+        """
+        Monta as informações de um sistema Linux a partir de dados coletados.
+        
+        Usado para hosts remotos, a partir do conteúdo de /etc/os-release,
+        da saída de `uname -m`, de /proc/version e de `nproc`.
+        
+        Args:
+            os_release: Conteúdo de /etc/os-release
+            machine: Saída de `uname -m`
+            proc_version: Conteúdo de /proc/version
+            nproc: Saída de `nproc`
+            
+        Returns:
+            SystemInfo com informações do sistema
+        """
+        arch = SystemDetector._parse_architecture(machine)
+        is_wsl = "microsoft" in proc_version.lower() or "wsl" in proc_version.lower()
+        distro_info = SystemDetector._parse_os_release(os_release.splitlines())
+        info = SystemDetector._detect_linux_distro(arch, is_wsl, distro_info)
+        if nproc.strip().isdigit():
+            info.cpu_count = int(nproc.strip())
+        return info
     
     @staticmethod
     def _detect_architecture() -> Architecture:
         """Detecta a arquitetura do processador."""
-        machine = platform.machine().lower()
+        return SystemDetector._parse_architecture(platform.machine())
+    
+    @staticmethod
+    def _parse_architecture(machine: str) -> Architecture:
+        """Converte o nome da máquina (uname -m) em `Architecture`."""
+        machine = machine.strip().lower()
         
         if machine in ["x86_64", "amd64"]:
             return Architecture.X86_64
@@ -86,6 +121,13 @@ class SystemDetector:
         else:
             return Architecture.UNKNOWN
     
+    @staticmethod
+    def _detect_cpu_count() -> Optional[int]:
+        """CPUs disponíveis para o processo (respeita a afinidade, ex: contêineres com --cpuset-cpus)."""
+        if hasattr(os, "sched_getaffinity"):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count()
+    
     @staticmethod
     def _is_wsl() -> bool:
         """Verifica se está rodando no WSL."""
@@ -100,9 +142,10 @@ class SystemDetector:
             return False
     
     @staticmethod
-    def _detect_linux_distro(arch: Architecture, is_wsl: bool) -> SystemInfo:
+    def _detect_linux_distro(arch: Architecture, is_wsl: bool, distro_info: Optional[Dict[str, str]] = None) -> SystemInfo:
         """Detecta a distribuição Linux."""
-        distro_info = SystemDetector._get_distro_info()
+        if distro_info is None:
+            distro_info = SystemDetector._get_distro_info()
         distro_name = distro_info.get("name", "").lower()
         version = distro_info.get("version", "")
         
@@ -148,14 +191,7 @@ class SystemDetector:
         # Tentar /etc/os-release primeiro
         try:
             with open("/etc/os-release", "r") as f:
-                for line in f:
-                    if "=" in line:
-                        key, value = line.strip().split("=", 1)
-                        value = value.strip('"')
-                        if key == "NAME":
-                            info["name"] = value
-                        elif key == "VERSION":
-                            info["version"] = value
+                info = SystemDetector._parse_os_release(f)
         except:
             pass
         
@@ -189,6 +225,20 @@ class SystemDetector:
         
         return info
     
+    @staticmethod
+    def _parse_os_release(lines) -> Dict[str, str]:
+        """Extrai nome e versão das linhas de um /etc/os-release."""
+        info = {}
+        for line in lines:
+            if "=" in line:
+                key, value = line.strip().split("=", 1)
+                value = value.strip('"')
+                if key == "NAME":
+                    info["name"] = value
+                elif key == "VERSION":
+                    info["version"] = value
+        return info
+    
     @staticmethod
     def get_package_manager(os_type: OperatingSystem) -> Optional[str]:
         """Retorna o gerenciador de pacotes para o sistema."""
@@ -0,0 +1,357 @@
+"""Configuração do Terraform CLI (~/.terraformrc): cache de plugins e mirror local.
+
+Sem configuração, cada `terraform init` baixa os providers (centenas de MB
+cada) para o `.terraform` do diretório de trabalho. Com `plugin_cache_dir`
+compartilhado, cada versão de provider é baixada uma vez por máquina; com
+um mirror em disco (layout "packed" de `terraform providers mirror`), o
+`init` resolve os providers listados sem acessar o registry.
+
+A partir do Terraform 1.4, o cache só é usado quando o `.terraform.lock.hcl`
+já tem os checksums do provider para a plataforma atual; num projeto sem lock
+file (ou com hashes de outra plataforma), o `init` baixaria tudo de novo. Por
+isso o bloco também define `plugin_cache_may_break_dependency_lock_file`,
+que volta ao comportamento anterior: o lock file passa a registrar só o
+checksum do pacote usado (rode `terraform providers lock -platform=...` se o
+projeto for usado em outras plataformas).
+
+O arquivo do usuário é preservado: a CLI só gerencia o bloco entre os
+marcadores `# >>> leme >>>` e `# <<< leme <<<`.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+from rich import print
+
+from .artifact_cache import get_artifact_cache
+from .file_utils import atomic_write_text
+
+
+TERRAFORM_DIR = Path.home() / ".terraform.d"
+PLUGIN_CACHE_DIR = TERRAFORM_DIR / "plugin-cache"
+PROVIDER_MIRROR_DIR = TERRAFORM_DIR / "providers-mirror"
+DEFAULT_REGISTRY = "registry.terraform.io"
+REGISTRY_TIMEOUT = 15
+
+BLOCK_BEGIN = "# >>> leme >>>"
+BLOCK_END = "# <<< leme <<<"
+_BLOCK_RE = re.compile(rf"^{re.escape(BLOCK_BEGIN)}\n.*?^{re.escape(BLOCK_END)}\n?", re.MULTILINE | re.DOTALL)
+_PROVIDER_RE = re.compile(r"^(?:(?P<host>[a-z0-9.-]+\.[a-z]+)/)?(?P<namespace>[\w-]+)/(?P<type>[\w-]+)@(?P<version>[\w.+-]+)$")
+
+
+def default_terraformrc() -> Path:
+    """Caminho do arquivo de configuração da CLI (respeita TF_CLI_CONFIG_FILE)."""
+    return Path(os.environ.get("TF_CLI_CONFIG_FILE") or Path.home() / ".terraformrc")
+
+
+@dataclass
+class ProviderSpec:
+    """Provider a espelhar (ex: hashicorp/aws@5.31.0)."""
+    hostname: str
+    namespace: str
+    type: str
+    version: str
+
+    @property
+    def source(self) -> str:
+        """Endereço completo do provider (ex: registry.terraform.io/hashicorp/aws)."""
+        return f"{self.hostname}/{self.namespace}/{self.type}"
+
+    def package_name(self, os_name: str, arch: str) -> str:
+        """Nome do pacote no layout do mirror."""
+        return f"terraform-provider-{self.type}_{self.version}_{os_name}_{arch}.zip"
+
+
+def parse_provider(spec: str) -> ProviderSpec:
+    """
+    Interpreta um provider no formato `[host/]namespace/tipo@versão`.
+
+    Args:
+        spec: Ex: "hashicorp/aws@5.31.0"
+
+    Returns:
+        ProviderSpec: Provider interpretado
+
+    Raises:
+        ValueError: Se o formato for inválido
+    """
+    match = _PROVIDER_RE.match(spec.strip())
+    if not match:
+        raise ValueError(f"Provider inválido: '{spec}' (use namespace/tipo@versão, ex: hashicorp/aws@5.31.0)")
+    return ProviderSpec(
+        hostname=match.group("host") or DEFAULT_REGISTRY,
+        namespace=match.group("namespace"),
+        type=match.group("type"),
+        version=match.group("version")
+    )
+
+
+def read_provider_list(path: Path) -> List[ProviderSpec]:
+    """
+    Lê a lista de providers (um por linha; `#` inicia comentário).
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+        ValueError: Se alguma linha for inválida
+    """
+    specs = []
+    for line in path.read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            specs.append(parse_provider(line))
+    return specs
+
+
+def mirrored_providers(mirror_dir: Path) -> List[str]:
+    """
+    Lista os providers presentes em um mirror (`host/namespace/tipo/...`).
+
+    Args:
+        mirror_dir: Diretório do mirror
+
+    Returns:
+        List[str]: Endereços dos providers, ordenados
+    """
+    if not mirror_dir.is_dir():
+        return []
+    sources = set()
+    for type_dir in mirror_dir.glob("*/*/*"):
+        if type_dir.is_dir() and any(type_dir.iterdir()):
+            sources.add("/".join(type_dir.relative_to(mirror_dir).parts))
+    return sorted(sources)
+
+
+def _hcl_list(values: List[str], indent: str) -> str:
+    """Formata uma lista de strings HCL, um item por linha."""
+    items = "".join(f'{indent}  "{value}",\n' for value in values)
+    return f"[\n{items}{indent}]"
+
+
+def render_block(
+    cache_dir: Optional[Path],
+    mirror_dir: Optional[Path] = None,
+    providers: Optional[List[str]] = None,
+    may_break_lock_file: bool = True
+) -> str:
+    """
+    Gera o bloco gerenciado pela CLI.
+
+    Os providers do mirror são instalados somente a partir dele (o
+    registry é excluído para eles); os demais continuam vindo do registry.
+
+    Args:
+        cache_dir: Diretório do cache de plugins (None para omitir)
+        mirror_dir: Diretório do mirror local (opcional)
+        providers: Providers presentes no mirror
+        may_break_lock_file: Usar o cache mesmo sem checksums no lock file
+            (ver o docstring do módulo)
+
+    Returns:
+        str: Bloco com os marcadores
+    """
+    lines = [BLOCK_BEGIN]
+    if cache_dir:
+        lines.append(f'plugin_cache_dir = "{cache_dir}"')
+        if may_break_lock_file:
+            lines += [
+                "# Usa o cache mesmo sem checksums no .terraform.lock.hcl (Terraform >= 1.4)",
+                "plugin_cache_may_break_dependency_lock_file = true",
+            ]
+    if mirror_dir and providers:
+        if cache_dir:
+            lines.append("")
+        lines += [
+            "provider_installation {",
+            "  filesystem_mirror {",
+            f'    path    = "{mirror_dir}"',
+            f"    include = {_hcl_list(providers, '    ')}",
+            "  }",
+            "  direct {",
+            f"    exclude = {_hcl_list(providers, '    ')}",
+            "  }",
+            "}",
+        ]
+    lines.append(BLOCK_END)
+    return "\n".join(lines) + "\n"
+
+
+def merge_terraformrc(existing: str, block: str) -> str:
+    """
+    Insere ou substitui o bloco gerenciado, preservando o resto do arquivo.
+
+    Args:
+        existing: Conteúdo atual
+        block: Bloco gerado por `render_block`
+
+    Returns:
+        str: Novo conteúdo
+    """
+    if _BLOCK_RE.search(existing):
+        return _BLOCK_RE.sub(lambda _: block, existing, count=1)
+    if existing and not existing.endswith("\n"):
+        existing += "\n"
+    return existing + ("\n" if existing else "") + block
+
+
+class TerraformCliConfig:
+    """Gera o ~/.terraformrc com cache de plugins e mirror de providers."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        cache_dir: Path = PLUGIN_CACHE_DIR,
+        mirror_dir: Optional[Path] = None
+    ):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            path: Arquivo de configuração (padrão: ~/.terraformrc ou TF_CLI_CONFIG_FILE)
+            cache_dir: Diretório do cache de plugins
+            mirror_dir: Mirror local de providers (opcional)
+        """
+        self.path = path or default_terraformrc()
+        self.cache_dir = cache_dir
+        # O Terraform exige caminhos absolutos no .terraformrc
+        self.mirror_dir = mirror_dir.expanduser().resolve() if mirror_dir else None
+
+    def _user_settings(self, existing: str) -> List[str]:
+        """Opções que o usuário já define fora do bloco gerenciado."""
+        outside = _BLOCK_RE.sub("", existing)
+        keys = ("plugin_cache_dir", "plugin_cache_may_break_dependency_lock_file", "provider_installation")
+        return [key for key in keys
+                if re.search(rf"^\s*{key}\b", outside, re.MULTILINE)]
+
+    def plan(self, pending: Optional[List[str]] = None) -> str:
+        """
+        Calcula o novo conteúdo sem gravar.
+
+        Opções já definidas pelo usuário fora do bloco não são duplicadas
+        (o Terraform rejeita `provider_installation` repetido).
+
+        Args:
+            pending: Providers que ainda serão baixados para o mirror
+                (para simular o resultado sem baixá-los)
+
+        Returns:
+            str: Conteúdo resultante
+        """
+        existing = self.path.read_text() if self.path.exists() else ""
+        user_settings = self._user_settings(existing)
+        cache_dir = None if "plugin_cache_dir" in user_settings else self.cache_dir
+        mirror_dir = None if "provider_installation" in user_settings else self.mirror_dir
+        providers = sorted(set(mirrored_providers(mirror_dir)) | set(pending or [])) if mirror_dir else []
+        if not cache_dir and not providers:
+            return _BLOCK_RE.sub("", existing)
+        may_break_lock_file = "plugin_cache_may_break_dependency_lock_file" not in user_settings
+        return merge_terraformrc(existing, render_block(cache_dir, mirror_dir, providers, may_break_lock_file))
+
+    def apply(self) -> bool:
+        """
+        Grava a configuração (atomicamente) e cria o diretório do cache.
+
+        Returns:
+            bool: True se o arquivo foi alterado
+
+        Raises:
+            OSError: Se não for possível gravar
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        existing = self.path.read_text() if self.path.exists() else ""
+        content = self.plan()
+        if content == existing:
+            return False
+        atomic_write_text(self.path, content)
+        return True
+
+
+class ProviderMirror:
+    """Popula um mirror de providers no layout "packed" do Terraform."""
+
+    def __init__(self, mirror_dir: Path, os_name: str, arch: str, parallel: int = 4):
+        """
+        Inicializa o mirror.
+
+        Args:
+            mirror_dir: Diretório do mirror
+            os_name: Sistema dos pacotes (ex: linux, darwin)
+            arch: Arquitetura dos pacotes (ex: amd64, arm64)
+            parallel: Downloads simultâneos
+        """
+        self.mirror_dir = mirror_dir
+        self.os_name = os_name
+        self.arch = arch
+        self.parallel = max(1, parallel)
+
+    def package_path(self, spec: ProviderSpec) -> Path:
+        """Caminho do pacote de um provider no mirror."""
+        return self.mirror_dir / spec.hostname / spec.namespace / spec.type / spec.package_name(self.os_name, self.arch)
+
+    def _download_info(self, spec: ProviderSpec) -> dict:
+        """Consulta no registry a URL e o SHA-256 do pacote."""
+        url = (f"https://{spec.hostname}/v1/providers/{spec.namespace}/{spec.type}/"
+               f"{spec.version}/download/{self.os_name}/{self.arch}")
+        with urllib.request.urlopen(url, timeout=REGISTRY_TIMEOUT) as response:
+            return json.loads(response.read())
+
+    def missing(self, specs: List[ProviderSpec]) -> List[ProviderSpec]:
+        """Providers da lista que ainda não estão no mirror."""
+        return [spec for spec in specs if not self.package_path(spec).exists()]
+
+    def add(self, spec: ProviderSpec) -> bool:
+        """
+        Baixa (pelo cache de artefatos, com checksum) e publica um provider.
+
+        Args:
+            spec: Provider
+
+        Returns:
+            bool: True se foi adicionado, False se já estava no mirror
+
+        Raises:
+            OSError: Se o registry não responder ou a cópia falhar
+            subprocess.CalledProcessError: Se o download falhar
+            ValueError: Se o checksum não conferir
+        """
+        dest = self.package_path(spec)
+        if dest.exists():
+            return False
+        info = self._download_info(spec)
+        artifact = get_artifact_cache().fetch(info["download_url"], sha256=info.get("shasum"))
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part = dest.with_name(dest.name + ".part")
+        shutil.copyfile(artifact, part)
+        os.replace(part, dest)
+        return True
+
+    def populate(self, specs: List[ProviderSpec]) -> bool:
+        """
+        Adiciona todos os providers listados.
+
+        Args:
+            specs: Providers
+
+        Returns:
+            bool: True se todos estão no mirror
+        """
+        def add_one(spec: ProviderSpec) -> bool:
+            label = f"{spec.source} {spec.version}"
+            try:
+                if self.add(spec):
+                    print(f"  [green]✓[/green] {label}")
+                else:
+                    print(f"  [dim]↷ {label} já está no mirror[/dim]")
+                return True
+            except (OSError, KeyError, ValueError, subprocess.CalledProcessError) as e:
+                print(f"  [red]✗[/red] {label}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            return all(list(executor.map(add_one, specs)))
@@ -0,0 +1,291 @@
+"""Armazém de versões de ferramentas (~/.leme/tools/<ferramenta>/<versão>).
+
+Cada versão fica em seu próprio diretório, publicado de forma atômica
+(montado em um diretório temporário e renomeado). A versão ativa é o link
+`current`, trocado com rename atômico; o shim em `~/.leme/bin` aponta para
+`current`, então trocar de versão não exige download, extração nem sudo.
+
+As instalações do sistema (sem `--prefix`) usam o armazém do root em
+/opt/leme, ao qual os links de /usr/local/bin apontam; as alterações nele
+passam pelo auxiliar privilegiado. O ~/.leme é usado com `--prefix` e para
+trocar de versão só para o próprio usuário.
+"""
+
+import os
+import re
+import secrets
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional
+from rich import print
+
+from .privileged_helper import get_privileged_helper
+
+
+LEME_HOME = Path(os.environ.get("LEME_HOME") or Path.home() / ".leme")
+CURRENT_LINK = "current"
+INCOMPLETE_MARKER = ".leme-incomplete"
+SYSTEM_BIN_DIR = Path("/usr/local/bin")
+# Armazém do sistema (do root, compartilhado por todos os usuários)
+SYSTEM_HOME = Path("/opt/leme")
+# Nomes de versão viram diretórios: nada de "/", "..", ocultos ou "current"
+VERSION_RE = re.compile(r"^[0-9A-Za-z][0-9A-Za-z.+-]*$")
+
+
+def version_key(version: str) -> tuple:
+    """Chave de ordenação de versões (1.10.0 depois de 1.9.8)."""
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.split(r"[.+-]", version))
+
+
+def is_valid_version(version: str) -> bool:
+    """Indica se o nome pode ser usado como diretório de versão no armazém."""
+    return bool(VERSION_RE.match(version)) and version != CURRENT_LINK and ".." not in version
+
+
+def atomic_symlink(target: str, link: Path) -> None:
+    """Cria ou troca um link simbólico com rename atômico."""
+    temp_link = link.with_name(f".{link.name}.leme-tmp")
+    if os.path.lexists(temp_link):
+        os.unlink(temp_link)
+    os.symlink(target, temp_link)
+    os.replace(temp_link, link)
+
+
+class ToolStore:
+    """Versões instaladas de uma ferramenta e o shim da versão ativa."""
+
+    def __init__(self, tool: str, binaries: List[str], home: Optional[Path] = None, bin_subdir: str = ""):
+        """
+        Inicializa o armazém.
+
+        Args:
+            tool: Nome da ferramenta (ex: "terraform")
+            binaries: Executáveis expostos em ~/.leme/bin
+            home: Raiz (padrão: ~/.leme ou LEME_HOME; SYSTEM_HOME para o armazém do sistema)
+            bin_subdir: Subdiretório dos executáveis dentro de cada versão (ex: "bin")
+        """
+        self.tool = tool
+        self.binaries = binaries
+        self.home = home or LEME_HOME
+        self.root = self.home / "tools" / tool
+        self.bin_dir = self.home / "bin"
+        self.bin_subdir = bin_subdir
+        # O armazém do sistema é do root: alterações passam pelo auxiliar privilegiado
+        self.system = self.home == SYSTEM_HOME
+
+    def _makedirs(self, path: Path) -> None:
+        """Cria um diretório do armazém (e os pais)."""
+        if self.system:
+            get_privileged_helper().makedirs(str(path))
+        else:
+            path.mkdir(parents=True, exist_ok=True)
+
+    def _symlink(self, target: str, link: Path) -> None:
+        """Cria ou troca um link do armazém com rename atômico."""
+        if self.system:
+            get_privileged_helper().symlink(target, str(link))
+        else:
+            atomic_symlink(target, link)
+
+    def _rmtree(self, path: Path) -> None:
+        """Remove um diretório do armazém, se existir."""
+        if self.system:
+            get_privileged_helper().remove(str(path), recursive=True)
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _stage(self, path: Optional[Path] = None) -> Path:
+        """
+        Cria um diretório novo, do usuário, para montar uma versão.
+
+        Args:
+            path: Diretório (padrão: um temporário na raiz do armazém)
+        """
+        if not self.system:
+            if path:
+                path.mkdir()
+                return path
+            return Path(tempfile.mkdtemp(dir=str(self.root), prefix=".leme-"))
+        path = path or self.root / f".leme-{secrets.token_hex(4)}"
+        get_privileged_helper().stage_dir(str(path))
+        return path
+
+    def _seal(self, path: Path) -> None:
+        """Finaliza um diretório montado (no sistema, passa a ser do root)."""
+        if self.system:
+            get_privileged_helper().seal_dir(str(path))
+        else:
+            os.chmod(path, 0o755)
+
+    def _publish(self, staging: Path, dest: Path, replace: bool = False) -> None:
+        """Dá à versão montada o nome final (rename atômico), trocando a existente se `replace`."""
+        if self.system:
+            get_privileged_helper().publish_dir(str(staging), str(dest), replace)
+            return
+        if replace and dest.exists():
+            old = Path(tempfile.mkdtemp(dir=str(self.root), prefix=".leme-old-"))
+            os.replace(dest, old / "version")
+            os.replace(staging, dest)
+            shutil.rmtree(old)
+        else:
+            os.replace(staging, dest)
+
+    def version_dir(self, version: str) -> Path:
+        """
+        Diretório de uma versão.
+
+        Raises:
+            ValueError: Se o nome da versão não for válido (ex: "current", "../x")
+        """
+        if not is_valid_version(version):
+            raise ValueError(f"Versão inválida de {self.tool}: {version!r}")
+        return self.root / version
+
+    def has(self, version: str) -> bool:
+        """Indica se a versão já está (completa) no armazém."""
+        path = self.version_dir(version)
+        return path.is_dir() and not (path / INCOMPLETE_MARKER).exists()
+
+    def versions(self) -> List[str]:
+        """Versões instaladas, da mais antiga para a mais nova."""
+        if not self.root.is_dir():
+            return []
+        names = [entry.name for entry in self.root.iterdir()
+                 if not entry.is_symlink() and is_valid_version(entry.name) and self.has(entry.name)]
+        return sorted(names, key=version_key)
+
+    def current(self) -> Optional[str]:
+        """Versão ativa, ou None."""
+        link = self.root / CURRENT_LINK
+        if not link.is_symlink():
+            return None
+        return Path(os.readlink(link)).name
+
+    def add(self, version: str, populate: Callable[[Path], None], relocatable: bool = True, replace: bool = False) -> Path:
+        """
+        Instala uma versão montando-a em um diretório temporário.
+
+        Uma instalação interrompida nunca deixa uma versão pela metade: o
+        diretório só aparece com o nome da versão depois de completo.
+        Conteúdo não relocável (ex: virtualenvs, que guardam caminhos
+        absolutos) é montado direto no destino e removido em caso de falha.
+        No armazém do sistema a montagem é feita sem root, em um diretório
+        do usuário que é passado para o root antes de ser publicado.
+
+        Com `replace`, uma versão já instalada é remontada ao lado e só é
+        trocada depois que a nova montagem termina; se ela falhar, a versão
+        atual continua intacta.
+
+        Args:
+            version: Versão
+            populate: Função que preenche o diretório recebido
+            relocatable: Se o conteúdo pode ser movido depois de montado
+            replace: Reinstalar a versão mesmo se já estiver no armazém
+
+        Returns:
+            Path: Diretório da versão
+
+        Raises:
+            ValueError: Se `replace` for pedido para conteúdo não relocável
+            Exception: Qualquer erro de `populate` (o temporário é removido)
+        """
+        dest = self.version_dir(version)
+        if self.has(version) and not replace:
+            return dest
+        if replace and not relocatable:
+            raise ValueError(f"{self.tool} não pode ser remontado ao lado da versão atual")
+        self._makedirs(self.root)
+
+        if not relocatable:
+            # Restos de uma instalação interrompida
+            self._rmtree(dest)
+            self._stage(dest)
+            marker = dest / INCOMPLETE_MARKER
+            marker.touch()
+            try:
+                populate(dest)
+                marker.unlink()
+                self._seal(dest)
+            except BaseException:
+                self._rmtree(dest)
+                raise
+            return dest
+
+        staging = self._stage()
+        try:
+            populate(staging)
+            self._seal(staging)
+            self._publish(staging, dest, replace)
+        except BaseException:
+            self._rmtree(staging)
+            # Outra execução publicou a mesma versão ao mesmo tempo
+            if self.has(version) and not replace:
+                return dest
+            raise
+        return dest
+
+    def shim_path(self, binary: Optional[str] = None) -> Path:
+        """Caminho do shim de um executável em ~/.leme/bin."""
+        return self.bin_dir / (binary or self.binaries[0])
+
+    def activate(self, version: str) -> None:
+        """
+        Torna uma versão a ativa (troca atômica do link `current`).
+
+        Args:
+            version: Versão já instalada
+
+        Raises:
+            FileNotFoundError: Se a versão não estiver no armazém
+        """
+        if not self.has(version):
+            raise FileNotFoundError(f"{self.tool} {version} não está instalado em {self.root}")
+        self._symlink(version, self.root / CURRENT_LINK)
+
+        if not self.bin_dir.is_dir():
+            self._makedirs(self.bin_dir)
+        for binary in self.binaries:
+            target = Path("..") / "tools" / self.tool / CURRENT_LINK / self.bin_subdir / binary
+            shim = self.shim_path(binary)
+            if not shim.is_symlink() or os.readlink(shim) != str(target):
+                self._symlink(str(target), shim)
+
+    def link_system_binaries(self, bin_dir: Path = SYSTEM_BIN_DIR) -> None:
+        """
+        Liga os executáveis em /usr/local/bin aos shims do armazém do sistema.
+
+        Só o armazém do sistema pode ser ligado: o ~/.leme de um usuário não é
+        legível pelos demais.
+
+        Raises:
+            ValueError: Se este não for o armazém do sistema
+            subprocess.CalledProcessError: Se o sudo falhar
+        """
+        if not self.system:
+            raise ValueError(f"{self.home} não é o armazém do sistema ({SYSTEM_HOME})")
+        print(f":gear: [blue]Ligando {', '.join(self.binaries)} em {bin_dir} → {self.bin_dir}...[/blue]")
+        privileged = get_privileged_helper()
+        for binary in self.binaries:
+            privileged.symlink(str(self.shim_path(binary)), str(bin_dir / binary))
+
+    def remove(self, version: str) -> None:
+        """Remove uma versão (a versão ativa não pode ser removida)."""
+        if version == self.current():
+            raise ValueError(f"{self.tool} {version} é a versão ativa")
+        path = self.version_dir(version)
+        if self.system:
+            get_privileged_helper().remove(str(path), recursive=True)
+        else:
+            shutil.rmtree(path)
+
+    def unused(self, keep: Optional[List[str]] = None) -> List[str]:
+        """Versões que não são a ativa nem estão em `keep`."""
+        protected = set(keep or [])
+        protected.add(self.current())
+        return [version for version in self.versions() if version not in protected]
+
+    def size(self, version: str) -> int:
+        """Tamanho em bytes de uma versão."""
+        return sum(path.stat().st_size for path in self.version_dir(version).rglob("*")
+                   if path.is_file() and not path.is_symlink())
@@ -0,0 +1,296 @@
+"""Instalação no espaço do usuário (`--prefix ~/.leme`), sem sudo.
+
+No modo prefixo nenhuma ferramenta passa pelo gerenciador de pacotes:
+binários são baixados pelo cache de artefatos, conferidos e extraídos em
+`<prefix>/tools/<ferramenta>/<versão>`, e ferramentas Python (Azure CLI,
+Ansible) ganham um virtualenv próprio. Os executáveis ficam em
+`<prefix>/bin`, que entra no PATH pelo arquivo `<prefix>/env`.
+
+Os virtualenvs são instalados a partir de um wheelhouse (diretório de
+wheels, por padrão ~/.cache/leme/wheelhouse). Se as wheels da versão já
+estão lá, a instalação é feita sem rede (`--no-index`); caso contrário o
+wheelhouse local é preenchido antes (`pip wheel`) e pode ser copiado ou
+servido por HTTP para as outras máquinas (`--wheelhouse URL`).
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+from typing import List, Optional, Union
+from rich import print
+
+from .artifact_cache import CACHE_DIR
+from .tool_store import LEME_HOME, ToolStore, version_key
+
+
+DEFAULT_PREFIX = LEME_HOME
+ENV_SCRIPT = "env"
+PYPI_URL = "https://pypi.org/pypi"
+PIP_TIMEOUT = 1800
+WHEELHOUSE_DIR = CACHE_DIR / "wheelhouse"
+_WHEEL_HREF_RE = re.compile(r'href="([^"#?]+\.whl)', re.IGNORECASE)
+_FINAL_VERSION_RE = re.compile(r"^\d+(?:\.\d+)*$")
+
+
+def env_script_content(prefix: Path) -> str:
+    """Conteúdo do `<prefix>/env` (POSIX sh, pode ser carregado várias vezes)."""
+    bin_dir = prefix / "bin"
+    return (
+        "# Gerado pela CLI Leme: adiciona as ferramentas do prefixo ao PATH\n"
+        f'case ":$PATH:" in\n'
+        f'  *":{bin_dir}:"*) ;;\n'
+        f'  *) export PATH="{bin_dir}:$PATH" ;;\n'
+        "esac\n"
+    )
+
+
+def write_env_script(prefix: Path) -> Path:
+    """
+    Grava o `<prefix>/env` (somente se mudou).
+
+    Args:
+        prefix: Diretório do prefixo
+
+    Returns:
+        Path: Caminho do script
+    """
+    path = prefix / ENV_SCRIPT
+    content = env_script_content(prefix)
+    if not path.exists() or path.read_text() != content:
+        prefix.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return path
+
+
+def activate_prefix(prefix: Path) -> bool:
+    """
+    Coloca `<prefix>/bin` no PATH deste processo (verificações e shims).
+
+    Args:
+        prefix: Diretório do prefixo
+
+    Returns:
+        bool: True se o diretório já estava no PATH do usuário
+    """
+    bin_dir = str(prefix / "bin")
+    paths = os.environ.get("PATH", "").split(os.pathsep)
+    if bin_dir in paths:
+        return True
+    os.environ["PATH"] = os.pathsep.join([bin_dir] + paths)
+    return False
+
+
+def print_path_snippet(prefix: Path) -> None:
+    """Mostra como colocar `<prefix>/bin` no PATH do shell."""
+    env_script = write_env_script(prefix)
+    print()
+    print(f":information_source: [cyan]Adicione {prefix / 'bin'} ao PATH (uma vez por shell):[/cyan]")
+    print(f'  [green]. "{env_script}"[/green]')
+    print("Para tornar permanente:")
+    print(f"  [green]echo '. \"{env_script}\"' >> ~/.bashrc[/green]")
+
+
+def pypi_metadata(package: str, version: Optional[str] = None) -> dict:
+    """
+    Consulta os metadados de um pacote (ou de uma versão dele) no PyPI.
+
+    Raises:
+        OSError: Se o PyPI não responder
+        ValueError: Se a resposta for inválida
+    """
+    url = f"{PYPI_URL}/{package}/{version}/json" if version else f"{PYPI_URL}/{package}/json"
+    with urllib.request.urlopen(url, timeout=15) as response:
+        return json.loads(response.read())
+
+
+def latest_pypi_version(package: str) -> str:
+    """
+    Consulta a versão mais recente de um pacote no PyPI.
+
+    Raises:
+        OSError: Se o PyPI não responder
+    """
+    return pypi_metadata(package)["info"]["version"]
+
+
+def pypi_releases(package: str) -> List[str]:
+    """
+    Versões finais publicadas de um pacote no PyPI (sem pré-releases nem yanked).
+
+    Raises:
+        OSError: Se o PyPI não responder
+        ValueError: Se a resposta for inválida
+    """
+    releases = pypi_metadata(package).get("releases", {})
+    return [
+        version for version, files in releases.items()
+        if _FINAL_VERSION_RE.match(version) and files and not all(f.get("yanked") for f in files)
+    ]
+
+
+def venv_supported() -> bool:
+    """Indica se o Python da CLI consegue criar virtualenvs com pip (Debian/Ubuntu exigem python3-venv)."""
+    result = subprocess.run([sys.executable, "-c", "import ensurepip, venv"], capture_output=True)
+    return result.returncode == 0
+
+
+def _is_url(location: str) -> bool:
+    """Indica se um wheelhouse é remoto (http/https)."""
+    return location.startswith(("http://", "https://"))
+
+
+def wheel_project(package: str) -> str:
+    """Nome do projeto como aparece nas wheels (ex: "azure-cli" → "azure_cli")."""
+    return re.sub(r"[-_.]+", "_", package).lower()
+
+
+def list_wheels(wheelhouse: Union[str, Path]) -> List[str]:
+    """
+    Lista as wheels de um wheelhouse local ou de um índice HTTP (`--find-links`).
+
+    Args:
+        wheelhouse: Diretório ou URL
+
+    Returns:
+        List[str]: Nomes dos arquivos .whl (vazio se o wheelhouse não existir ou não responder)
+    """
+    location = str(wheelhouse)
+    if _is_url(location):
+        try:
+            with urllib.request.urlopen(location, timeout=15) as response:
+                page = response.read().decode(errors="replace")
+        except OSError:
+            return []
+        return [href.rsplit("/", 1)[-1] for href in _WHEEL_HREF_RE.findall(page)]
+    path = Path(location)
+    if not path.is_dir():
+        return []
+    return [entry.name for entry in path.iterdir() if entry.name.endswith(".whl")]
+
+
+def wheelhouse_versions(wheelhouse: Union[str, Path], package: str) -> List[str]:
+    """Versões de um pacote presentes no wheelhouse, da mais antiga para a mais nova."""
+    prefix = wheel_project(package) + "-"
+    versions = {name[len(prefix):].split("-", 1)[0] for name in list_wheels(wheelhouse)
+                if name.lower().startswith(prefix)}
+    return sorted(versions, key=version_key)
+
+
+class VenvTool:
+    """Ferramenta Python instalada em um virtualenv próprio dentro do prefixo."""
+
+    def __init__(
+        self,
+        tool: str,
+        package: str,
+        binaries: List[str],
+        prefix: Optional[Path] = None,
+        wheelhouse: Optional[Union[str, Path]] = None
+    ):
+        """
+        Inicializa a ferramenta.
+
+        Args:
+            tool: Nome no armazém (ex: "azure-cli")
+            package: Pacote no PyPI (ex: "azure-cli")
+            binaries: Executáveis expostos em `<prefix>/bin`
+            prefix: Diretório do prefixo (padrão: ~/.leme)
+            wheelhouse: Diretório ou URL de wheels (padrão: ~/.cache/leme/wheelhouse)
+        """
+        self.tool = tool
+        self.package = package
+        self.store = ToolStore(tool, binaries, home=prefix or DEFAULT_PREFIX, bin_subdir="bin")
+        self.wheelhouse = str(wheelhouse or WHEELHOUSE_DIR)
+
+    def resolve_version(self, version: Optional[str] = None) -> str:
+        """
+        Resolve a versão a instalar.
+
+        Sem versão pedida, usa a mais nova do wheelhouse (instalação offline)
+        ou, se o pacote não estiver lá, a mais recente do PyPI.
+
+        Raises:
+            OSError: Se for preciso consultar o PyPI e ele não responder
+        """
+        if version:
+            return version
+        available = wheelhouse_versions(self.wheelhouse, self.package)
+        return available[-1] if available else latest_pypi_version(self.package)
+
+    def has_wheels(self, version: str) -> bool:
+        """Indica se o wheelhouse tem a wheel do pacote nesta versão."""
+        return version in wheelhouse_versions(self.wheelhouse, self.package)
+
+    def pip_install_args(self, version: str, offline: bool = False) -> List[str]:
+        """Argumentos do `pip install` de uma versão."""
+        args = ["install", "--disable-pip-version-check", "--find-links", self.wheelhouse]
+        if offline:
+            args.append("--no-index")
+        return args + [f"{self.package}=={version}"]
+
+    def pip_wheel_args(self, version: str) -> List[str]:
+        """Argumentos do `pip wheel` que preenche o wheelhouse local."""
+        return [
+            "wheel", "--disable-pip-version-check", "--find-links", self.wheelhouse,
+            "--wheel-dir", self.wheelhouse, f"{self.package}=={version}"
+        ]
+
+    def install(self, version: Optional[str] = None) -> str:
+        """
+        Cria o virtualenv da versão (se necessário) e a torna ativa.
+
+        Args:
+            version: Versão do pacote (padrão: a mais nova do wheelhouse ou do PyPI)
+
+        Returns:
+            str: Versão ativa
+
+        Raises:
+            OSError: Se o PyPI não responder
+            subprocess.CalledProcessError: Se a criação do venv ou o pip falharem
+        """
+        version = self.resolve_version(version)
+        if not self.store.has(version):
+            offline = self.has_wheels(version)
+            source = "wheelhouse" if offline else "PyPI"
+            print(f":package: [blue]Criando virtualenv de {self.package} {version} ({source})...[/blue]")
+
+            def populate(venv_dir: Path) -> None:
+                pip = [str(venv_dir / "bin" / "python"), "-m", "pip"]
+                subprocess.run([sys.executable, "-m", "venv", str(venv_dir)], check=True, capture_output=True)
+                local_wheelhouse = not _is_url(self.wheelhouse)
+                if not offline and local_wheelhouse:
+                    # Baixa/compila as wheels uma vez; as próximas instalações não usam a rede
+                    Path(self.wheelhouse).mkdir(parents=True, exist_ok=True)
+                    subprocess.run(pip + self.pip_wheel_args(version), check=True, capture_output=True, timeout=PIP_TIMEOUT)
+                try:
+                    subprocess.run(
+                        pip + self.pip_install_args(version, offline=offline or local_wheelhouse),
+                        check=True, capture_output=True, timeout=PIP_TIMEOUT
+                    )
+                except subprocess.CalledProcessError:
+                    if not offline:
+                        raise
+                    # O wheelhouse tem o pacote, mas não todas as dependências: completa pela rede
+                    print(f"  [yellow]![/yellow] Wheelhouse incompleto para {self.package} {version}; completando pelo PyPI...")
+                    if local_wheelhouse:
+                        subprocess.run(pip + self.pip_wheel_args(version), check=True, capture_output=True, timeout=PIP_TIMEOUT)
+                    subprocess.run(
+                        pip + self.pip_install_args(version, offline=local_wheelhouse),
+                        check=True, capture_output=True, timeout=PIP_TIMEOUT
+                    )
+                # Bytecode pronto: a primeira execução não paga a compilação
+                subprocess.run(
+                    [str(venv_dir / "bin" / "python"), "-m", "compileall", "-q", "-j", "0", str(venv_dir / "lib")],
+                    capture_output=True, timeout=PIP_TIMEOUT
+                )
+
+            # Virtualenvs guardam caminhos absolutos: são montados no destino final
+            self.store.add(version, populate, relocatable=False)
+        self.store.activate(version)
+        return version
+
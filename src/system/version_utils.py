@@ -0,0 +1,114 @@
+"""Utilitários para comparar versões de ferramentas."""
+
+import re
+from typing import Iterable, Optional, Tuple
+
+
+# Especificações que aceitam qualquer versão instalada
+ANY_VERSION = {"", "*", "any", "present", "latest"}
+
+_OPERATORS = (">=", "<=", "==", "!=", ">", "<", "~=")
+
+
+def parse_version(version: Optional[str]) -> Tuple[int, ...]:
+    """
+    Converte uma string de versão em tupla de inteiros.
+
+    Aceita prefixos e sufixos comuns nas saídas das ferramentas
+    (ex: "v1.28", "1.5.7", "24.0.6-rc1", "2.13.25").
+
+    Args:
+        version: Versão em texto
+
+    Returns:
+        Tuple[int, ...]: Componentes numéricos (vazia se não houver versão)
+    """
+    if not version:
+        return ()
+    match = re.search(r"\d+(?:\.\d+)*", version)
+    if not match:
+        return ()
+    return tuple(int(part) for part in match.group(0).split("."))
+
+
+def compare_versions(left: str, right: str) -> int:
+    """
+    Compara duas versões.
+
+    Args:
+        left: Primeira versão
+        right: Segunda versão
+
+    Returns:
+        int: -1 se left < right, 0 se iguais, 1 se left > right
+    """
+    a, b = parse_version(left), parse_version(right)
+    # Completar com zeros para que "1.6" == "1.6.0"
+    size = max(len(a), len(b))
+    a += (0,) * (size - len(a))
+    b += (0,) * (size - len(b))
+    return (a > b) - (a < b)
+
+
+def _matches(version: str, constraint: str) -> bool:
+    """Avalia uma única restrição (ex: ">=1.6", "1.6", "~=1.6.0")."""
+    constraint = constraint.strip()
+    operator = next((op for op in _OPERATORS if constraint.startswith(op)), "")
+    wanted = constraint[len(operator):].strip()
+
+    if not operator or operator == "==":
+        # "1.6" aceita qualquer 1.6.x
+        wanted_parts = parse_version(wanted)
+        return parse_version(version)[:len(wanted_parts)] == wanted_parts
+
+    if operator == "~=":
+        # Compatível: >= wanted e mesmo prefixo até o penúltimo componente
+        wanted_parts = parse_version(wanted)
+        prefix = wanted_parts[:-1] if len(wanted_parts) > 1 else wanted_parts
+        return compare_versions(version, wanted) >= 0 and parse_version(version)[:len(prefix)] == prefix
+
+    result = compare_versions(version, wanted)
+    return {
+        ">=": result >= 0,
+        "<=": result <= 0,
+        ">": result > 0,
+        "<": result < 0,
+        "!=": result != 0
+    }[operator]
+
+
+def version_satisfies(version: Optional[str], spec: str) -> bool:
+    """
+    Verifica se uma versão satisfaz uma especificação.
+
+    A especificação pode ser uma versão exata ou prefixo ("1.6.6", "1.6"),
+    restrições separadas por vírgula (">=1.6,<2") ou "*"/"latest" para
+    qualquer versão.
+
+    Args:
+        version: Versão instalada (None se desconhecida)
+        spec: Especificação desejada
+
+    Returns:
+        bool: True se a versão satisfaz a especificação
+    """
+    if spec.strip().lower() in ANY_VERSION:
+        return True
+    if not parse_version(version):
+        return False
+    return all(_matches(version, part) for part in spec.split(",") if part.strip())
+
+
+def highest_satisfying(versions: Iterable[str], spec: str) -> Optional[str]:
+    """
+    Escolhe a versão mais nova que satisfaz a especificação.
+
+    Args:
+        versions: Versões candidatas
+        spec: Especificação desejada
+
+    Returns:
+        Optional[str]: Versão mais nova que atende, ou None
+    """
+    matching = [v for v in versions if version_satisfies(v, spec)]
+    return max(matching, key=parse_version) if matching else None
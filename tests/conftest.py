@@ -0,0 +1,10 @@
+"""Configuração do pytest: os testes importam o pacote `src` da raiz do repositório."""
+
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = REPO_ROOT / "benchmarks" / "fixtures"
+
+sys.path.insert(0, str(REPO_ROOT))
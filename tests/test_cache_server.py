@@ -0,0 +1,155 @@
+"""Testes do servidor de cache pull-through contra um upstream local."""
+
+import http.client
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.network.cache_server import METADATA_TTL, CacheServer
+
+
+FILES = {
+    "/download.docker.com/linux/ubuntu/pool/docker-ce.deb": b"deb" * 1000,
+    "/download.docker.com/linux/ubuntu/dists/jammy/Release": b"Release v1",
+    "/archive.ubuntu.com/ubuntu/pool/main/g/git.deb": b"git",
+}
+
+
+class _Upstream(ThreadingHTTPServer):
+    """Upstream falso: serve FILES em /<host>/<caminho> e conta as requisições."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _UpstreamHandler)
+        self.requests = []
+
+
+class _UpstreamHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        data = FILES.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def upstream():
+    server = _Upstream()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path, upstream):
+    server = CacheServer(
+        port=0,
+        root=tmp_path / "mirror",
+        upstream=f"http://127.0.0.1:{upstream.server_address[1]}",
+        allowed_hosts=["download.docker.com", "archive.ubuntu.com"]
+    )
+    server.start_in_thread()
+    yield server
+    server.stop()
+
+
+def _get(server: CacheServer, path: str):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def test_package_is_fetched_once(cache, upstream):
+    """O primeiro cliente busca no upstream; os demais recebem do cache."""
+    path = "/download.docker.com/linux/ubuntu/pool/docker-ce.deb"
+    assert _get(cache, path) == (200, FILES[path])
+    assert _get(cache, path) == (200, FILES[path])
+    assert upstream.requests.count(path) == 1
+
+    status, body = _get(cache, "/_leme/stats")
+    stats = json.loads(body)
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_concurrent_clients_share_one_download(cache, upstream):
+    """Clientes simultâneos esperam o mesmo download."""
+    path = "/download.docker.com/linux/ubuntu/pool/docker-ce.deb"
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(_get(cache, path))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [(200, FILES[path])] * 8
+    assert upstream.requests.count(path) == 1
+
+
+def test_stale_index_is_revalidated(cache, upstream):
+    """Índices de repositório são buscados de novo após METADATA_TTL."""
+    path = "/download.docker.com/linux/ubuntu/dists/jammy/Release"
+    _get(cache, path)
+    cached = cache.cache_path("download.docker.com", "/linux/ubuntu/dists/jammy/Release")
+    old = time.time() - METADATA_TTL - 1
+    os.utime(cached, (old, old))
+
+    _get(cache, path)
+    assert upstream.requests.count(path) == 2
+
+
+def test_stale_index_is_served_when_upstream_is_down(cache, upstream):
+    """Com o upstream fora do ar, o índice antigo continua sendo servido."""
+    path = "/download.docker.com/linux/ubuntu/dists/jammy/Release"
+    _get(cache, path)
+    cached = cache.cache_path("download.docker.com", "/linux/ubuntu/dists/jammy/Release")
+    old = time.time() - METADATA_TTL - 1
+    os.utime(cached, (old, old))
+
+    upstream.shutdown()
+    upstream.server_close()
+    assert _get(cache, path) == (200, FILES[path])
+
+
+def test_proxy_request_keeps_scheme(cache, upstream):
+    """Requisições no formato de proxy (apt) são aceitas e mantêm o esquema."""
+    assert _get(cache, "http://archive.ubuntu.com/ubuntu/pool/main/g/git.deb") == (200, b"git")
+    assert "/archive.ubuntu.com/ubuntu/pool/main/g/git.deb" in upstream.requests
+
+    direct = CacheServer(port=0, allowed_hosts=[])
+    try:
+        assert direct.upstream_url("http", "archive.ubuntu.com", "/ubuntu/x.deb") == "http://archive.ubuntu.com/ubuntu/x.deb"
+        assert direct.upstream_url("https", "dl.k8s.io", "/v1.29.3/kubectl") == "https://dl.k8s.io/v1.29.3/kubectl"
+    finally:
+        direct.server_close()
+
+
+def test_unknown_host_is_refused(cache, upstream):
+    """Hosts fora da lista recebem 403 e não são buscados."""
+    status, _ = _get(cache, "/evil.example.com/payload.deb")
+    assert status == 403
+    assert not upstream.requests
+
+
+def test_path_traversal_is_rejected(cache, upstream):
+    """Caminhos com '..' não saem do diretório do cache."""
+    status, _ = _get(cache, "/download.docker.com/../../etc/passwd")
+    assert status == 400
+    assert not upstream.requests
@@ -0,0 +1,51 @@
+"""Testes do perfil de desempenho do daemon.json (`docker tune`)."""
+
+import json
+import shutil
+
+from conftest import FIXTURES_DIR
+from src.system.docker_daemon_config import DaemonConfig, merge_config, render_config, tuned_profile
+
+
+REGISTRY_MIRROR = "http://10.0.0.5:5000"
+
+
+def _load_fixture(name: str) -> dict:
+    return json.loads((FIXTURES_DIR / name).read_text())
+
+
+def test_tuned_profile_matches_fixture():
+    """O daemon.json de exemplo mesclado com o perfil resulta no daemon.tuned.json."""
+    existing = _load_fixture("daemon.json")
+    merged = merge_config(existing, tuned_profile(existing, [REGISTRY_MIRROR]))
+    assert render_config(merged) == (FIXTURES_DIR / "daemon.tuned.json").read_text()
+
+
+def test_tuned_profile_keeps_user_values():
+    """Opções do administrador (max-size de 50m, data-root) não são trocadas."""
+    existing = _load_fixture("daemon.json")
+    profile = tuned_profile(existing)
+    assert "max-size" not in profile.get("log-opts", {})
+    assert "data-root" not in profile
+    assert "registry-mirrors" not in profile
+
+
+def test_tuned_profile_skips_rotation_for_other_log_drivers():
+    """Com journald, a rotação de json-file não é aplicada."""
+    profile = tuned_profile({"log-driver": "journald"})
+    assert "log-driver" not in profile
+    assert "log-opts" not in profile
+    assert profile["live-restore"] is True
+
+
+def test_apply_is_idempotent(tmp_path):
+    """A segunda aplicação do perfil não altera o arquivo."""
+    path = tmp_path / "daemon.json"
+    shutil.copyfile(FIXTURES_DIR / "daemon.json", path)
+    config = DaemonConfig(str(path))
+
+    changed = config.apply(tuned_profile(config.load(), [REGISTRY_MIRROR]))
+    assert "registry-mirrors" in changed
+    assert path.read_text() == (FIXTURES_DIR / "daemon.tuned.json").read_text()
+
+    assert config.apply(tuned_profile(config.load(), [REGISTRY_MIRROR])) == []
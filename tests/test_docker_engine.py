@@ -0,0 +1,84 @@
+"""Testes do cliente da Engine API contra o daemon falso (FakeDockerEngine)."""
+
+import threading
+import time
+
+import pytest
+
+from src.system.docker_engine import (
+    ERROR_NOT_FOUND, ERROR_PROTOCOL, DockerEngineClient, FakeDockerEngine
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Daemon falso rodando em um socket temporário."""
+    server = FakeDockerEngine(str(tmp_path / "docker.sock"), version="25.0.3", api_version="1.44")
+    server.start_in_thread()
+    yield server
+    server.stop()
+
+
+def test_ping_reports_version(engine):
+    """Com o daemon vivo, /_ping e /version são consultados."""
+    status = DockerEngineClient(engine.socket_path).ping()
+    assert status.ok
+    assert status.version == "25.0.3"
+    assert status.api_version == "1.44"
+    assert ("GET", "/_ping") in engine.requests
+    assert ("GET", "/version") in engine.requests
+
+
+def test_ping_rejects_unhealthy_daemon(engine):
+    """Um /_ping diferente de 200 OK é falha de protocolo."""
+    engine.routes[("GET", "/_ping")] = (500, {"message": "starting"})
+    status = DockerEngineClient(engine.socket_path).ping()
+    assert not status.ok
+    assert status.error_kind == ERROR_PROTOCOL
+
+
+def test_ping_without_socket(tmp_path):
+    """Sem o socket, o daemon é dado como não iniciado."""
+    status = DockerEngineClient(str(tmp_path / "missing.sock")).ping()
+    assert not status.ok
+    assert status.error_kind == ERROR_NOT_FOUND
+
+
+def test_wait_until_ready_waits_for_late_daemon(tmp_path):
+    """A espera termina assim que o daemon sobe, dentro do orçamento."""
+    socket_path = str(tmp_path / "docker.sock")
+    server = FakeDockerEngine(socket_path)
+    server.server_close()  # o socket existe, mas ninguém aceita conexões ainda
+
+    started = []
+
+    def start_late() -> None:
+        late = FakeDockerEngine(socket_path)
+        late.start_in_thread()
+        started.append(late)
+
+    timer = threading.Timer(0.3, start_late)
+    timer.start()
+    try:
+        status = DockerEngineClient(socket_path).wait_until_ready(budget=5.0)
+        assert status.ok
+    finally:
+        timer.join()
+        for late in started:
+            late.stop()
+
+
+def test_wait_until_ready_gives_up_after_budget(tmp_path):
+    """Sem daemon, a espera respeita o orçamento."""
+    start = time.monotonic()
+    status = DockerEngineClient(str(tmp_path / "missing.sock")).wait_until_ready(budget=0.3)
+    assert not status.ok
+    assert time.monotonic() - start < 2.0
+
+
+def test_image_exists_uses_inspect_route(engine):
+    """image_exists consulta /images/<ref>/json."""
+    engine.routes[("GET", "/images/nginx:1.25/json")] = (200, {"Id": "sha256:abc"})
+    client = DockerEngineClient(engine.socket_path)
+    assert client.image_exists("nginx:1.25")
+    assert not client.image_exists("redis:7")
@@ -0,0 +1,100 @@
+"""Testes do ranking de mirrors contra servidores locais com atrasos diferentes."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.network.mirror_selection import DEFAULT_GROUPS, MirrorGroup, MirrorSelector, load_mirror_groups
+
+
+def _handler(delay: float):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self.server.hits += 1
+            time.sleep(delay)
+            self.send_response(206)
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"gpg\n")
+
+    return Handler
+
+
+@pytest.fixture
+def stand_ins():
+    """Um candidato lento, um rápido e um fora do ar (nessa ordem)."""
+    servers = []
+    for delay in (0.3, 0.01):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(delay))
+        server.daemon_threads = True
+        server.hits = 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    probe = ThreadingHTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    dead = f"http://127.0.0.1:{probe.server_address[1]}/fora"
+    probe.server_close()
+
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/repo" for server in servers] + [dead]
+    yield servers, urls
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fastest_healthy_candidate_wins(tmp_path, stand_ins):
+    """O mais rápido vence; o que não responde fica no final."""
+    servers, (slow, fast, dead) = stand_ins
+    group = MirrorGroup("bench", [slow, fast, dead], "/gpg")
+    selector = MirrorSelector({"bench": group}, path=tmp_path / "ranking.json", timeout=2.0)
+
+    ranking = selector.rank()["bench"]
+    assert [result.url for result in ranking] == [fast, slow, dead]
+    assert not ranking[-1].healthy
+    assert selector.best("bench") == fast
+
+
+def test_ranking_is_cached(tmp_path, stand_ins):
+    """Um segundo seletor reaproveita o ranking em disco, sem medir de novo."""
+    servers, (slow, fast, dead) = stand_ins
+    groups = {"bench": MirrorGroup("bench", [slow, fast], "/gpg")}
+    MirrorSelector(groups, path=tmp_path / "ranking.json").rank()
+    hits = [server.hits for server in servers]
+
+    assert MirrorSelector(groups, path=tmp_path / "ranking.json").best("bench") == fast
+    assert [server.hits for server in servers] == hits
+
+
+def test_single_candidate_is_not_probed(tmp_path, stand_ins):
+    """Sem alternativas, a origem é usada sem medição."""
+    servers, (slow, fast, dead) = stand_ins
+    selector = MirrorSelector({"only": MirrorGroup("only", [dead], "/gpg")}, path=tmp_path / "ranking.json")
+    assert selector.best("only") == dead
+    assert not (tmp_path / "ranking.json").exists()
+
+
+def test_apply_keeps_gpgkey_on_origin(tmp_path, stand_ins):
+    """Os arquivos de repositório trocam a origem pelo mirror, exceto gpgkey."""
+    servers, (slow, fast, dead) = stand_ins
+    selector = MirrorSelector({"bench": MirrorGroup("bench", [slow, fast], "/gpg")}, path=tmp_path / "ranking.json")
+    content = f"[bench]\nbaseurl={slow}/el9\ngpgkey={slow}/gpg\n"
+    assert selector.apply(content) == f"[bench]\nbaseurl={fast}/el9\ngpgkey={slow}/gpg\n"
+
+
+def test_defaults_only_list_vendor_origins():
+    """Os padrões só têm a origem oficial dos repositórios que o Leme adiciona."""
+    assert set(DEFAULT_GROUPS) == {"docker", "hashicorp", "microsoft"}
+    assert all(len(group.candidates) == 1 for group in DEFAULT_GROUPS.values())
+
+
+def test_mirrors_toml_overrides_candidates(tmp_path):
+    """mirrors.toml acrescenta candidatos e herda o arquivo de medição padrão."""
+    path = tmp_path / "mirrors.toml"
+    path.write_text('[hashicorp]\ncandidates = ["https://apt.releases.hashicorp.com", "https://mirror.exemplo/hashicorp/"]\n')
+    group = load_mirror_groups(path)["hashicorp"]
+    assert group.candidates == ["https://apt.releases.hashicorp.com", "https://mirror.exemplo/hashicorp"]
+    assert group.probe_path == DEFAULT_GROUPS["hashicorp"].probe_path
@@ -0,0 +1,80 @@
+"""Testes do ~/.terraformrc gerado (cache de plugins e mirror de providers)."""
+
+import pytest
+
+from conftest import FIXTURES_DIR
+from src.system.installers.terraform_installer import TerraformInstaller
+from src.system.system_detector import SystemDetector
+from src.system.terraform_cli_config import (
+    BLOCK_BEGIN, ProviderMirror, TerraformCliConfig, mirrored_providers, parse_provider
+)
+
+
+MIRROR_DIR = FIXTURES_DIR / "terraform-mirror"
+MIRRORED = ["registry.terraform.io/hashicorp/aws", "registry.terraform.io/hashicorp/azurerm"]
+
+
+def test_mirrored_providers_from_fixture():
+    """Os providers do mirror de exemplo são encontrados pelo layout de diretórios."""
+    assert mirrored_providers(MIRROR_DIR) == MIRRORED
+
+
+def test_plan_routes_mirrored_providers_to_disk(tmp_path):
+    """Providers do mirror vêm do disco e são excluídos do registry."""
+    content = TerraformCliConfig(tmp_path / "terraformrc", tmp_path / "cache", MIRROR_DIR).plan()
+    assert f'plugin_cache_dir = "{tmp_path / "cache"}"' in content
+    assert "plugin_cache_may_break_dependency_lock_file = true" in content
+    assert f'path    = "{MIRROR_DIR.resolve()}"' in content
+    for source in MIRRORED:
+        assert content.count(f'"{source}",') == 2  # include do mirror e exclude do direct
+
+
+def test_apply_preserves_user_content(tmp_path):
+    """O arquivo do usuário é mantido e a segunda aplicação não muda nada."""
+    rc = tmp_path / "terraformrc"
+    rc.write_text('credentials "app.terraform.io" {\n  token = "x"\n}\n')
+    config = TerraformCliConfig(rc, tmp_path / "cache", MIRROR_DIR)
+
+    assert config.apply()
+    content = rc.read_text()
+    assert content.startswith('credentials "app.terraform.io"')
+    assert content.count(BLOCK_BEGIN) == 1
+    assert not config.apply()
+
+
+def test_user_settings_are_not_duplicated(tmp_path):
+    """Opções já definidas fora do bloco não são repetidas (o Terraform as rejeitaria)."""
+    rc = tmp_path / "terraformrc"
+    rc.write_text('plugin_cache_dir = "/srv/cache"\nplugin_cache_may_break_dependency_lock_file = false\n')
+    content = TerraformCliConfig(rc, tmp_path / "cache", MIRROR_DIR).plan()
+    assert content.count("plugin_cache_dir") == 1
+    assert content.count("plugin_cache_may_break_dependency_lock_file") == 1
+    assert "filesystem_mirror" in content
+
+
+def test_missing_lists_only_absent_packages():
+    """Só os pacotes ausentes do mirror seriam baixados."""
+    mirror = ProviderMirror(MIRROR_DIR, "linux", "amd64")
+    specs = [parse_provider("hashicorp/aws@5.31.0"), parse_provider("hashicorp/null@3.2.2")]
+    assert [spec.type for spec in mirror.missing(specs)] == ["null"]
+
+
+def test_parse_provider_rejects_missing_version():
+    with pytest.raises(ValueError):
+        parse_provider("hashicorp/aws")
+
+
+def test_configure_cli_dry_run_does_not_download(tmp_path, monkeypatch):
+    """A simulação não baixa providers nem grava o arquivo."""
+    def fail(*args, **kwargs):
+        raise AssertionError("--dry-run não deve baixar providers")
+
+    monkeypatch.setattr(ProviderMirror, "add", fail)
+    monkeypatch.setattr(ProviderMirror, "populate", fail)
+    providers = tmp_path / "providers.txt"
+    providers.write_text("hashicorp/aws@5.31.0\nhashicorp/null@3.2.2\n")
+    rc = tmp_path / "terraformrc"
+
+    installer = TerraformInstaller(SystemDetector.detect())
+    assert installer.configure_cli(providers, MIRROR_DIR, rc, dry_run=True)
+    assert not rc.exists()